@@ -38,7 +38,7 @@ req_path = path.join(here, "requirements")
 INSTALL_REQUIRES = parse_requirements_file(path.join(req_path, "default.txt"))
 EXTRA_REQUIRES = {
     dep: parse_requirements_file(path.join(req_path, dep + ".txt"))
-    for dep in ["docs", "report", "test"]
+    for dep in ["docs", "hdf5", "highs", "parquet", "report", "test"]
 }
 
 # Arguments marked as "Required" below must be included for upload to PyPI.
@@ -191,6 +191,8 @@ setup(
             "mvs_tool=multi_vector_simulator.cli:main",
             "mvs_report=multi_vector_simulator.cli:report",
             "mvs_create_input_template=multi_vector_simulator.cli:create_input_template_folder",
+            "mvs_worker=multi_vector_simulator.worker:main",
+            "mvs_batch=multi_vector_simulator.batch:main",
         ],
     },
     # List additional URLs that are relevant to your project as a dict.
@@ -15,6 +15,10 @@ Usage from root of repository:
 
     python mvs_tool.py [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
     [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
+    [-ts [TIMESERIES_SIDECAR]] [-solver [{cbc,glpk,gurobi,highs}]] [-threads [THREADS]]
+    [-mipgap [MIP_GAP]] [-timelimit [TIME_LIMIT]] [-trace [PROFILING_TRACE]]
+    [-tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]]
+    [-pngscale [PNG_SCALE]] [-pngmaxpoints [PNG_MAX_POINTS]]
 
 Usage when multi-vector-simulator is installed as a package:
 
@@ -22,6 +26,10 @@ Usage when multi-vector-simulator is installed as a package:
 
     mvs_tool [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
     [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
+    [-ts [TIMESERIES_SIDECAR]] [-solver [{cbc,glpk,gurobi,highs}]] [-threads [THREADS]]
+    [-mipgap [MIP_GAP]] [-timelimit [TIME_LIMIT]] [-trace [PROFILING_TRACE]]
+    [-tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]]
+    [-pngscale [PNG_SCALE]] [-pngmaxpoints [PNG_MAX_POINTS]]
 
 Process MVS arguments
 
@@ -50,6 +58,38 @@ optional arguments:
     -png [SAVE_PNG]
         generate png figures of the simulation in the output_folder if True (default: False)
 
+    -ts [TIMESERIES_SIDECAR]
+        store the timeseries of the results in a binary .npz file next to the json file with
+        the results if True (default: False)
+
+    -solver [{cbc,glpk,gurobi,highs}]
+        solver of the optimization, overwrites the one of the simulation settings
+
+    -threads [THREADS]
+        number of threads used by the solver, overwrites the one of the simulation settings
+
+    -mipgap [MIP_GAP]
+        relative MIP gap of the solver, overwrites the one of the simulation settings
+
+    -timelimit [TIME_LIMIT]
+        time limit of the solver in seconds, overwrites the one of the simulation settings
+
+    -trace [PROFILING_TRACE]
+        save the duration and memory use of each stage of the simulation in a trace file in the
+        output folder if True (default: False)
+
+    -tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]
+        format(s) of the files with the timeseries of all busses, overwrites the one of the
+        simulation settings
+
+    -pngscale [PNG_SCALE]
+        scale of the png figures, ie. factor between their number of pixels and their layout
+        size (default: 5)
+
+    -pngmaxpoints [PNG_MAX_POINTS]
+        downsample the timeseries of the png figures to about this number of points before
+        rasterizing them (default: None)
+
 """
 
 import argparse
@@ -81,6 +121,12 @@ from multi_vector_simulator.utils.constants import (
     OVERWRITE,
     DISPLAY_OUTPUT,
     SAVE_PNG,
+    TIMESERIES_SIDECAR,
+    PROFILING_TRACE,
+    SOLVERS,
+    TIMESERIES_OUTPUT_FORMATS,
+    PNG_SCALE,
+    PNG_MAX_POINTS,
     LOGFILE,
     REPORT_FOLDER,
     OUTPUT_FOLDER,
@@ -91,8 +137,22 @@ from multi_vector_simulator.utils.constants import (
     ARG_REPORT_PATH,
     ARG_PATH_SIM_OUTPUT,
     ARG_DEBUG_REPORT,
+    ARG_QUEUE_FOLDER,
+    ARG_POLL_INTERVAL,
+    ARG_EXIT_WHEN_EMPTY,
+    DEFAULT_WORKER_POLL_INTERVAL,
+    ARG_N_WORKERS,
+    ARG_TIMEOUT,
+    ARG_RETRIES,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    LABEL,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_MIP_GAP,
+    SOLVER_TIME_LIMIT,
+    TIMESERIES_OUTPUT_FORMAT,
 )
-from multi_vector_simulator.utils.constants_json_strings import LABEL
 from multi_vector_simulator.version import version_num
 
 
@@ -105,7 +165,10 @@ def mvs_arg_parser():
 
         python mvs_tool.py [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
         [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
-        [--version]
+        [-ts [TIMESERIES_SIDECAR]] [-solver [{cbc,glpk,gurobi,highs}]] [-threads [THREADS]]
+        [-mipgap [MIP_GAP]] [-timelimit [TIME_LIMIT]] [-trace [PROFILING_TRACE]]
+        [-tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]]
+    [-pngscale [PNG_SCALE]] [-pngmaxpoints [PNG_MAX_POINTS]] [--version]
 
     Usage when multi-vector-simulator is installed as a package:
 
@@ -113,7 +176,10 @@ def mvs_arg_parser():
 
         mvs_tool [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
         [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
-        [--version]
+        [-ts [TIMESERIES_SIDECAR]] [-solver [{cbc,glpk,gurobi,highs}]] [-threads [THREADS]]
+        [-mipgap [MIP_GAP]] [-timelimit [TIME_LIMIT]] [-trace [PROFILING_TRACE]]
+        [-tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]]
+    [-pngscale [PNG_SCALE]] [-pngmaxpoints [PNG_MAX_POINTS]] [--version]
 
     Process MVS arguments
 
@@ -142,6 +208,38 @@ def mvs_arg_parser():
         -png [SAVE_PNG]
             generate png figures of the simulation in the output_folder if True (default: False)
 
+        -ts [TIMESERIES_SIDECAR]
+            store the timeseries of the results in a binary .npz file next to the json file
+            with the results if True (default: False)
+
+        -solver [{cbc,glpk,gurobi,highs}]
+            solver of the optimization, overwrites the one of the simulation settings
+
+        -threads [THREADS]
+            number of threads used by the solver, overwrites the one of the simulation settings
+
+        -mipgap [MIP_GAP]
+            relative MIP gap of the solver, overwrites the one of the simulation settings
+
+        -timelimit [TIME_LIMIT]
+            time limit of the solver in seconds, overwrites the one of the simulation settings
+
+        -trace [PROFILING_TRACE]
+            save the duration and memory use of each stage of the simulation in a trace file in
+            the output folder if True (default: False)
+
+        -tsformat {xlsx,csv,parquet,hdf5} [{xlsx,csv,parquet,hdf5} ...]
+            format(s) of the files with the timeseries of all busses, overwrites the one of the
+            simulation settings
+
+        -pngscale [PNG_SCALE]
+            scale of the png figures, ie. factor between their number of pixels and their
+            layout size (default: 5)
+
+        -pngmaxpoints [PNG_MAX_POINTS]
+            downsample the timeseries of the png figures to about this number of points before
+            rasterizing them (default: None)
+
         --version
             show program's version number and exit
 
@@ -212,6 +310,89 @@ def mvs_arg_parser():
         default=False,
         type=bool,
     )
+    parser.add_argument(
+        "-ts",
+        dest=TIMESERIES_SIDECAR,
+        help="store the timeseries of the results in a binary .npz file next to the json file "
+        "with the results if True (default: False)",
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+    parser.add_argument(
+        "-solver",
+        dest=SOLVER,
+        help="solver of the optimization, overwrites the one of the simulation settings",
+        nargs="?",
+        type=str,
+        default=None,
+        choices=list(SOLVERS),
+    )
+    parser.add_argument(
+        "-threads",
+        dest=SOLVER_THREADS,
+        help="number of threads used by the solver, overwrites the one of the simulation "
+        "settings",
+        nargs="?",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-mipgap",
+        dest=SOLVER_MIP_GAP,
+        help="relative MIP gap of the solver, overwrites the one of the simulation settings",
+        nargs="?",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "-timelimit",
+        dest=SOLVER_TIME_LIMIT,
+        help="time limit of the solver in seconds, overwrites the one of the simulation "
+        "settings",
+        nargs="?",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "-trace",
+        dest=PROFILING_TRACE,
+        help="save the duration and memory use of each stage of the simulation in a trace file "
+        "in the output folder if True (default: False)",
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+    parser.add_argument(
+        "-tsformat",
+        dest=TIMESERIES_OUTPUT_FORMAT,
+        help="format(s) of the files with the timeseries of all busses, overwrites the one of "
+        "the simulation settings",
+        nargs="+",
+        type=str,
+        default=None,
+        choices=list(TIMESERIES_OUTPUT_FORMATS),
+    )
+    parser.add_argument(
+        "-pngscale",
+        dest=PNG_SCALE,
+        help="scale of the png figures, ie. factor between their number of pixels and their "
+        "layout size (default: 5)",
+        nargs="?",
+        type=float,
+        default=DEFAULT_MAIN_KWARGS[PNG_SCALE],
+    )
+    parser.add_argument(
+        "-pngmaxpoints",
+        dest=PNG_MAX_POINTS,
+        help="downsample the timeseries of the png figures to about this number of points "
+        "before rasterizing them (default: None)",
+        nargs="?",
+        type=int,
+        default=None,
+    )
 
     parser.add_argument("--version", action="version", version=version_num)
 
@@ -287,6 +468,219 @@ def report_arg_parser():
     return parser
 
 
+def worker_arg_parser():
+    """Create a command line argument parser for the MVS worker
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_worker [-h] [-q [QUEUE_FOLDER]] [-poll [POLL_INTERVAL]] [-exit [EXIT_WHEN_EMPTY]]
+        [-log [{debug,info,error,warning}]]
+
+    Process mvs worker command line arguments
+
+    optional arguments:
+      -h, --help
+        show this help message and exit
+
+      -q [QUEUE_FOLDER]
+        path to a folder where the jobs are provided as json files, if not provided the jobs
+        are read as json lines from the standard input
+
+      -poll [POLL_INTERVAL]
+        time in seconds between two checks of the queue folder for new jobs (default: 1)
+
+      -exit [EXIT_WHEN_EMPTY]
+        stop the worker once the queue folder is empty (default: False)
+
+      -log [{debug,info,error,warning}]
+        level of logging in the console (default: info)
+
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_worker",
+        description="Run MVS simulations in a long-lived process, the jobs are read as json "
+        "lines from the standard input or as json files from a queue folder",
+    )
+    parser.add_argument(
+        "-q",
+        dest=ARG_QUEUE_FOLDER,
+        nargs="?",
+        type=str,
+        help="path to a folder where the jobs are provided as json files, if not provided "
+        "the jobs are read as json lines from the standard input",
+        default=None,
+    )
+    parser.add_argument(
+        "-poll",
+        dest=ARG_POLL_INTERVAL,
+        nargs="?",
+        type=float,
+        help="time in seconds between two checks of the queue folder for new jobs "
+        f"(default: {DEFAULT_WORKER_POLL_INTERVAL})",
+        default=DEFAULT_WORKER_POLL_INTERVAL,
+    )
+    parser.add_argument(
+        "-exit",
+        dest=ARG_EXIT_WHEN_EMPTY,
+        nargs="?",
+        type=bool,
+        help="stop the worker once the queue folder is empty (default: False)",
+        const=True,
+        default=False,
+    )
+    parser.add_argument(
+        "-log",
+        dest=DISPLAY_OUTPUT,
+        help="level of logging in the console",
+        nargs="?",
+        default="info",
+        const="info",
+        choices=["debug", "info", "error", "warning"],
+    )
+    return parser
+
+
+def batch_arg_parser():
+    """Create a command line argument parser for the MVS batch runner
+
+    Usage when multi-vector-simulator is installed as a package:
+
+    .. code-block:: bash
+
+        mvs_batch [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
+        [-f [OVERWRITE]] [-w [N_WORKERS]] [-timeout [TIMEOUT]] [-retries [RETRIES]]
+        [-solver [{cbc,glpk,gurobi,highs}]] [-log [{debug,info,error,warning}]]
+
+    Process mvs batch command line arguments
+
+    optional arguments:
+      -h, --help
+        show this help message and exit
+
+      -i [PATH_INPUT_FOLDER]
+        path to the folder within which the input folders of the scenarios are searched
+
+      -ext [{json,csv}]
+        type (json or csv) of the input files of the scenarios (default: 'json')
+
+      -o [PATH_OUTPUT_FOLDER]
+        path to the output folder, the results of each scenario are saved in a subfolder and
+        the summary of all scenarios in the file batch_summary.csv
+
+      -f [OVERWRITE]
+        overwrite the output folders of the scenarios if True (default: False)
+
+      -w [N_WORKERS]
+        number of scenarios simulated at the same time (default: number of CPUs)
+
+      -timeout [TIMEOUT]
+        time in seconds after which the simulation of a scenario is stopped (default: None)
+
+      -retries [RETRIES]
+        number of times a failed or stopped scenario is simulated again (default: 0)
+
+      -solver [{cbc,glpk,gurobi,highs}]
+        solver of the optimization, overwrites the one of the simulation settings
+
+      -log [{debug,info,error,warning}]
+        level of logging in the console of the batch runner (default: info)
+
+
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mvs_batch",
+        description="Run the MVS simulations of all input folders found within a folder on "
+        "a pool of processes and summarize their KPIs and timings",
+    )
+    parser.add_argument(
+        "-i",
+        dest=PATH_INPUT_FOLDER,
+        nargs="?",
+        type=str,
+        help="path to the folder within which the input folders of the scenarios are "
+        "searched",
+        default=os.getcwd(),
+    )
+    parser.add_argument(
+        "-ext",
+        dest=INPUT_TYPE,
+        nargs="?",
+        type=str,
+        help="type (json or csv) of the input files of the scenarios (default: 'json'",
+        default=JSON_EXT,
+        const=JSON_EXT,
+        choices=[JSON_EXT, CSV_EXT],
+    )
+    parser.add_argument(
+        "-o",
+        dest=PATH_OUTPUT_FOLDER,
+        nargs="?",
+        type=str,
+        help="path to the output folder, the results of each scenario are saved in a "
+        "subfolder",
+        default=DEFAULT_OUTPUT_PATH,
+    )
+    parser.add_argument(
+        "-f",
+        dest=OVERWRITE,
+        help="overwrite the output folders of the scenarios if True (default: False)",
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+    parser.add_argument(
+        "-w",
+        dest=ARG_N_WORKERS,
+        nargs="?",
+        type=int,
+        help="number of scenarios simulated at the same time (default: number of CPUs)",
+        default=None,
+    )
+    parser.add_argument(
+        "-timeout",
+        dest=ARG_TIMEOUT,
+        nargs="?",
+        type=float,
+        help="time in seconds after which the simulation of a scenario is stopped "
+        "(default: None)",
+        default=None,
+    )
+    parser.add_argument(
+        "-retries",
+        dest=ARG_RETRIES,
+        nargs="?",
+        type=int,
+        help="number of times a failed or stopped scenario is simulated again "
+        "(default: 0)",
+        default=0,
+    )
+    parser.add_argument(
+        "-solver",
+        dest=SOLVER,
+        help="solver of the optimization, overwrites the one of the simulation settings",
+        nargs="?",
+        type=str,
+        default=None,
+        choices=list(SOLVERS),
+    )
+    parser.add_argument(
+        "-log",
+        dest=DISPLAY_OUTPUT,
+        help="level of logging in the console",
+        nargs="?",
+        default="info",
+        const="info",
+        choices=["debug", "info", "error", "warning"],
+    )
+    return parser
+
+
 def check_input_folder(path_input_folder, input_type):
     """Enforces the rules for the input folder and files
 
@@ -394,6 +788,15 @@ def process_user_arguments(
     display_output=None,
     save_png=None,
     lp_file_output=False,
+    timeseries_sidecar=None,
+    solver=None,
+    threads=None,
+    mip_gap=None,
+    time_limit=None,
+    profiling_trace=None,
+    timeseries_output_format=None,
+    png_scale=None,
+    png_max_points=None,
     welcome_text=None,
 ):
     """
@@ -422,6 +825,32 @@ def process_user_arguments(
         "error": Only errors,
     :param lp_file_output:
         Save linear equation system generated as lp file
+    :param timeseries_sidecar:
+        (Optional) Store the timeseries of the results in a binary sidecar file next to the
+        json file with the results (command line "-ts")
+    :param solver:
+        (Optional) Solver of the optimization, overwrites the solver of the simulation settings
+        (command line "-solver")
+    :param threads:
+        (Optional) Number of threads of the solver, overwrites the one of the simulation
+        settings (command line "-threads")
+    :param mip_gap:
+        (Optional) Relative MIP gap of the solver, overwrites the one of the simulation
+        settings (command line "-mipgap")
+    :param time_limit:
+        (Optional) Time limit of the solver in seconds, overwrites the one of the simulation
+        settings (command line "-timelimit")
+    :param profiling_trace:
+        (Optional) Save the duration and memory use of each stage of the simulation in a trace
+        file in the output folder (command line "-trace")
+    :param timeseries_output_format:
+        (Optional) Format or list of formats of the files with the timeseries of all busses,
+        overwrites the one of the simulation settings (command line "-tsformat")
+    :param png_scale:
+        (Optional) Scale of the png figures (command line "-pngscale")
+    :param png_max_points:
+        (Optional) Downsample the timeseries of the png figures to about this number of points
+        before rasterizing them (command line "-pngmaxpoints")
     :param welcome_text:
         Text to be displayed
     :return: a dict with these arguments as keys (except welcome_text which is replaced by label)
@@ -460,6 +889,38 @@ def process_user_arguments(
     if save_png is None:
         save_png = args.get(SAVE_PNG, DEFAULT_MAIN_KWARGS[SAVE_PNG])
 
+    if timeseries_sidecar is None:
+        timeseries_sidecar = args.get(
+            TIMESERIES_SIDECAR, DEFAULT_MAIN_KWARGS[TIMESERIES_SIDECAR]
+        )
+
+    if profiling_trace is None:
+        profiling_trace = args.get(
+            PROFILING_TRACE, DEFAULT_MAIN_KWARGS[PROFILING_TRACE]
+        )
+
+    # the solver options are only set if provided, otherwise the simulation settings apply
+    if solver is None:
+        solver = args.get(SOLVER)
+
+    if threads is None:
+        threads = args.get(SOLVER_THREADS)
+
+    if mip_gap is None:
+        mip_gap = args.get(SOLVER_MIP_GAP)
+
+    if time_limit is None:
+        time_limit = args.get(SOLVER_TIME_LIMIT)
+
+    if timeseries_output_format is None:
+        timeseries_output_format = args.get(TIMESERIES_OUTPUT_FORMAT)
+
+    if png_scale is None:
+        png_scale = args.get(PNG_SCALE, DEFAULT_MAIN_KWARGS[PNG_SCALE])
+
+    if png_max_points is None:
+        png_max_points = args.get(PNG_MAX_POINTS, DEFAULT_MAIN_KWARGS[PNG_MAX_POINTS])
+
     # if the default input file does not exist, use package default input file
     if (
         path_input_folder == DEFAULT_INPUT_PATH
@@ -482,6 +943,13 @@ def process_user_arguments(
         OVERWRITE: overwrite,
         DISPLAY_OUTPUT: display_output,
         "lp_file_output": lp_file_output,
+        TIMESERIES_SIDECAR: timeseries_sidecar,
+        PROFILING_TRACE: profiling_trace,
+        SOLVER: solver,
+        SOLVER_THREADS: threads,
+        SOLVER_MIP_GAP: mip_gap,
+        SOLVER_TIME_LIMIT: time_limit,
+        TIMESERIES_OUTPUT_FORMAT: timeseries_output_format,
     }
 
     if pdf_report is True:
@@ -494,7 +962,13 @@ def process_user_arguments(
         )
 
     if save_png is True:
-        user_input.update({"path_png_figs": path_output_folder})
+        user_input.update(
+            {
+                "path_png_figs": path_output_folder,
+                PNG_SCALE: png_scale,
+                PNG_MAX_POINTS: png_max_points,
+            }
+        )
 
     if display_output == "debug":
         screen_level = logging.DEBUG
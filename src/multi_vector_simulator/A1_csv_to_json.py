@@ -31,14 +31,24 @@ Functions of this module (that need to be tested)
 - parse data from csv according to intended types - string, boolean, float, int, dict, list!
 """
 
+import filecmp
+import hashlib
 import json
 import logging
 import os
+import shutil
+import tempfile
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from multi_vector_simulator.version import version_num
 from multi_vector_simulator.utils.constants import (
     CSV_FNAME,
+    CSV_JSON_CACHE_FOLDER,
+    CSV_JSON_CACHE_MESSAGES_SUFFIX,
+    JSON_FILE_EXTENSION,
     CSV_SEPARATORS,
     REQUIRED_CSV_FILES,
     REQUIRED_CSV_PARAMETERS,
@@ -85,9 +95,12 @@ from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
     VALUE,
     ENERGY_STORAGE,
+    LOG_LEVEL,
+    LOG_MESSAGE,
 )
 
 
+from multi_vector_simulator.utils.log_capture import LogCapture, map_in_context
 from multi_vector_simulator.utils.exceptions import (
     MissingParameterError,
     CsvParsingError,
@@ -99,6 +112,9 @@ from multi_vector_simulator.utils.exceptions import (
 def create_input_json(
     input_directory,
     pass_back=True,
+    use_cache=True,
+    cache_folder=CSV_JSON_CACHE_FOLDER,
+    max_workers=None,
 ):
     """Convert csv files to json file as input for the simulation.
 
@@ -108,15 +124,43 @@ def create_input_json(
     While reading the csv files, it is checked, whether all required parameters
     for each component are provided. Missing parameters will return a warning message.
 
+    The csv files are read one after the other, or in parallel threads if `max_workers` is
+    larger than 1. The generated json file is cached with the warnings and errors logged while
+    reading the csv files: if the csv files of the `input_directory` did not change since a
+    previous call (same names, modification times and sizes), the cached json file is copied
+    into the `input_directory` instead of reading the csv files again, the checks of the
+    parameters are then not repeated but their warnings and errors are logged again.
+
     Parameters
     ----------
     input_directory, str
         path of the directory where the input csv files can be found
     pass_back, bool, optional
         if True the final json dict is returned. Otherwise it is only saved
+    use_cache, bool, optional
+        if True the json file is taken from the cache if the csv files did not change and
+        is stored in the cache otherwise. An existing `CSV_FNAME` file in the
+        `input_directory` is then also reused if it is the same as the cached one.
+        Default: True
+    cache_folder, str, optional
+        path to the folder where the generated json files are cached
+        Default: CSV_JSON_CACHE_FOLDER
+    max_workers, int, optional
+        if larger than 1, maximal number of threads reading the csv files, see
+        :class:`concurrent.futures.ThreadPoolExecutor`. Reading the few small csv files of an
+        input folder in threads is usually slower than reading them one after the other.
+        Default: None
     Returns
     -------
         None or dict
+
+    Notes
+    -----
+    Tested with:
+    - test_create_input_json_creation_of_json_file()
+    - test_create_input_json_reuses_cached_json_file()
+    - test_create_input_json_logs_cached_messages_again()
+    - test_create_input_json_in_threads_same_as_sequential()
     """
 
     logging.info(
@@ -125,7 +169,27 @@ def create_input_json(
 
     output_filename = os.path.join(input_directory, CSV_FNAME)
 
+    cache_key = None
+    cache_hit = False
+    if use_cache is True:
+        cache_key = get_csv_folder_key(input_directory)
+        cached_filename = os.path.join(cache_folder, cache_key + JSON_FILE_EXTENSION)
+        cached_messages = load_cached_messages(cache_folder, cache_key)
+        # the json files cached without their messages are generated again
+        cache_hit = cached_messages is not None and os.path.exists(cached_filename)
+
     if os.path.exists(output_filename):
+        if cache_hit is True and filecmp.cmp(
+            output_filename, cached_filename, shallow=False
+        ):
+            logging.info(
+                f"The mvs json config file {CSV_FNAME} of the input folder "
+                f"{input_directory} is up to date with the csv files, it is reused."
+            )
+            log_cached_messages(cached_messages)
+            if pass_back:
+                return output_filename
+            return
         raise FileExistsError(
             f"The mvs json config file {CSV_FNAME} already exists in the input "
             f"folder {input_directory}. This is likely due to an aborted "
@@ -133,15 +197,49 @@ def create_input_json(
             f"the folder prior to run a new simulation"
         )
 
+    if cache_hit is True:
+        shutil.copyfile(cached_filename, output_filename)
+        logging.info(
+            f"The csv files did not change since the previous run, the json file is taken "
+            f"from the cache and stored into {output_filename}\n"
+        )
+        log_cached_messages(cached_messages)
+        if pass_back:
+            return output_filename
+        return
+
     input_json = {}
 
-    # Read all csv files from path input directory
-    list_assets = []
-    for f in os.listdir(input_directory):
-        filename = str(f[:-4])
-        if filename in REQUIRED_CSV_FILES:
-            list_assets.append(filename)
-            single_dict = create_json_from_csv(input_directory, filename)
+    # the warnings and errors of the csv files are cached with the json file
+    with LogCapture() as parsing_log:
+        # Read all csv files from path input directory, they are independent from each other and
+        # can be read in parallel threads
+        list_assets = []
+        csv_filenames = []
+        for f in os.listdir(input_directory):
+            filename = str(f[:-4])
+            if filename in REQUIRED_CSV_FILES:
+                list_assets.append(filename)
+                csv_filenames.append(filename)
+            elif "storage_" in filename:
+                # the storage files are read together with the file energyStorage
+                list_assets.append(filename)
+
+        if max_workers is not None and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # the warnings of the threads are captured with the ones of the simulation
+                single_dicts = map_in_context(
+                    executor,
+                    lambda filename: create_json_from_csv(input_directory, filename),
+                    csv_filenames,
+                )
+        else:
+            single_dicts = [
+                create_json_from_csv(input_directory, filename)
+                for filename in csv_filenames
+            ]
+
+        for filename, single_dict in zip(csv_filenames, single_dicts):
             if filename in [PROJECT_DATA, ECONOMIC_DATA, SIMULATION_SETTINGS]:
                 # use filename as label
                 single_dict[filename][LABEL] = filename
@@ -157,30 +255,27 @@ def create_input_json(
                 for key, item in single_dict[filename].items():
                     item[LABEL] = key
             input_json.update(single_dict)
-        elif "storage_" in filename:
-            list_assets.append(filename)
-            # TODO
-            pass
-
-    # check if all required files are available
-    extra = list(set(list_assets) ^ set(REQUIRED_CSV_FILES))
-
-    missing_csv_files = []
-    for i in extra:
-        if i in REQUIRED_CSV_FILES:
-            missing_csv_files.append(i)
-        elif "storage_" in i:
-            pass
-        else:
-            logging.error(
-                f"File {i}.csv is an unknown filename and will not be processed."
+
+        # check if all required files are available
+        extra = list(set(list_assets) ^ set(REQUIRED_CSV_FILES))
+
+        missing_csv_files = []
+        for i in extra:
+            if i in REQUIRED_CSV_FILES:
+                missing_csv_files.append(i)
+            elif "storage_" in i:
+                pass
+            else:
+                logging.error(
+                    f"File {i}.csv is an unknown filename and will not be processed."
+                )
+
+        if len(missing_csv_files) > 0:
+            raise FileNotFoundError(
+                f"Required input files {missing_csv_files} are missing! Please add them "
+                f"into {input_directory}. The required files are {REQUIRED_CSV_FILES}"
             )
 
-    if len(missing_csv_files) > 0:
-        raise FileNotFoundError(
-            f"Required input files {missing_csv_files} are missing! Please add them "
-            f"into {input_directory}. The required files are {REQUIRED_CSV_FILES}"
-        )
     # store generated json file to file in input_directory.
     # This json will be used in the simulation.
     with open(output_filename, "w") as outfile:
@@ -189,10 +284,179 @@ def create_input_json(
         f"Json file created successfully from csv's and stored into {output_filename}\n"
     )
     logging.debug("Json created successfully from csv.")
+    if cache_key is not None:
+        store_json_in_cache(
+            output_filename, cache_folder, cache_key, messages=parsing_log.records
+        )
     if pass_back:
         return outfile.name
 
 
+def get_csv_folder_key(input_directory):
+    r"""
+    Computes the key of the csv files of an input folder in the cache of the json files
+
+    Parameters
+    ----------
+    input_directory: str
+        path of the directory where the input csv files can be found
+
+    Returns
+    -------
+    str
+        Key made of a hash of the absolute path of the folder, followed by a hash of the names,
+        modification times and sizes of its csv files and of the version of the MVS, so that
+        all keys of a folder share a prefix
+
+    Notes
+    -----
+    Tested with:
+    - test_create_input_json_reuses_cached_json_file()
+    """
+    csv_files = []
+    for entry in os.scandir(input_directory):
+        if entry.is_file() and entry.name.endswith(".csv"):
+            stat = entry.stat()
+            csv_files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    path_hash = hashlib.sha256(
+        os.path.abspath(input_directory).encode("utf-8")
+    ).hexdigest()
+    version_hash = hashlib.sha256(
+        json.dumps([version_num, sorted(csv_files)]).encode("utf-8")
+    ).hexdigest()
+    return f"{path_hash[:32]}_{version_hash[:16]}"
+
+
+def store_json_in_cache(json_filename, cache_folder, cache_key, messages=None):
+    r"""
+    Copies a json file generated from csv files into the cache of the json files
+
+    The warnings and errors logged while generating the json file are stored next to it. The
+    json files cached for previous versions of the same input folder are removed. Errors
+    while writing into the cache are only logged, as the cache is not required to run the
+    simulation.
+
+    Parameters
+    ----------
+    json_filename: str
+        path of the generated json file
+    cache_folder: str
+        path to the folder where the generated json files are cached
+    cache_key: str
+        key of the csv files of the input folder, see :py:func:`get_csv_folder_key`
+    messages: list
+        messages logged while generating the json file, as the records of
+        :py:class:`~.utils.log_capture.LogCapture`
+        Default: None
+
+    Notes
+    -----
+    Tested with:
+    - test_create_input_json_logs_cached_messages_again()
+    """
+    try:
+        os.makedirs(cache_folder, exist_ok=True)
+        # write to temporary files first so that concurrent runs never read a partial file,
+        # the messages are stored before the json file which marks a complete cache entry
+        fd, tmp_filename = tempfile.mkstemp(dir=cache_folder, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(
+                [
+                    {LOG_LEVEL: message[LOG_LEVEL], LOG_MESSAGE: message[LOG_MESSAGE]}
+                    for message in messages or []
+                ],
+                tmp_file,
+            )
+        os.replace(tmp_filename, get_cached_messages_filename(cache_folder, cache_key))
+        fd, tmp_filename = tempfile.mkstemp(dir=cache_folder, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(json_filename, tmp_filename)
+        os.replace(
+            tmp_filename, os.path.join(cache_folder, cache_key + JSON_FILE_EXTENSION)
+        )
+        prefix = cache_key.split("_")[0] + "_"
+        for entry in os.scandir(cache_folder):
+            if (
+                entry.name.startswith(prefix)
+                and entry.name.endswith(JSON_FILE_EXTENSION)
+                and not entry.name.startswith(cache_key)
+            ):
+                os.remove(entry.path)
+    except OSError as e:
+        logging.debug(f"The json file {json_filename} could not be cached: {e}")
+
+
+def get_cached_messages_filename(cache_folder, cache_key):
+    r"""
+    Returns the path of the file with the messages logged while generating a cached json file
+
+    Parameters
+    ----------
+    cache_folder: str
+        path to the folder where the generated json files are cached
+    cache_key: str
+        key of the csv files of the input folder, see :py:func:`get_csv_folder_key`
+
+    Returns
+    -------
+    str
+    """
+    return os.path.join(
+        cache_folder, cache_key + CSV_JSON_CACHE_MESSAGES_SUFFIX + JSON_FILE_EXTENSION
+    )
+
+
+def load_cached_messages(cache_folder, cache_key):
+    r"""
+    Loads the messages logged while generating a cached json file
+
+    Parameters
+    ----------
+    cache_folder: str
+        path to the folder where the generated json files are cached
+    cache_key: str
+        key of the csv files of the input folder, see :py:func:`get_csv_folder_key`
+
+    Returns
+    -------
+    list or None
+        List of dicts with the level and text of each message, None if the messages are not
+        cached or can not be read
+
+    Notes
+    -----
+    Tested with:
+    - test_create_input_json_logs_cached_messages_again()
+    """
+    try:
+        with open(get_cached_messages_filename(cache_folder, cache_key)) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def log_cached_messages(messages):
+    r"""
+    Logs again the messages logged while generating a cached json file
+
+    Parameters
+    ----------
+    messages: list
+        messages as returned by :py:func:`load_cached_messages`
+
+    Notes
+    -----
+    Tested with:
+    - test_create_input_json_logs_cached_messages_again()
+    """
+    if len(messages) > 0:
+        logging.debug(
+            "The warnings and errors of the csv files cached with the json file are logged again."
+        )
+    for message in messages:
+        logging.log(logging.getLevelName(message[LOG_LEVEL]), message[LOG_MESSAGE])
+
+
 def create_json_from_csv(
     input_directory, filename, parameters=None, asset_is_a_storage=False
 ):
@@ -243,16 +507,20 @@ def create_json_from_csv(
             f"Please check {input_directory} for correct parameter names."
         )
 
-    # allow different separators for csv files, take the first one which works
+    # allow different separators for csv files, the separators found in the header line are
+    # tried from the most frequent one on, take the first one which works
+    csv_separators = sniff_csv_separators(
+        os.path.join(input_directory, "{}.csv".format(filename))
+    )
     seperator_unknown = True
 
     idx = 0
-    while seperator_unknown is True and idx < len(CSV_SEPARATORS):
+    while seperator_unknown is True and idx < len(csv_separators):
 
         try:
             df = pd.read_csv(
                 os.path.join(input_directory, "{}.csv".format(filename)),
-                sep=CSV_SEPARATORS[idx],
+                sep=csv_separators[idx],
                 header=0,
                 index_col=0,
                 na_filter=False,
@@ -265,7 +533,7 @@ def create_json_from_csv(
 
         except pd.errors.ParserError:
             logging.warning(
-                f"The file {filename} is not separated by {CSV_SEPARATORS[idx]} or has a formatting problem somewhere"
+                f"The file {filename} is not separated by {csv_separators[idx]} or has a formatting problem somewhere"
             )
             seperator_unknown = True
             idx = idx + 1
@@ -544,6 +812,40 @@ def create_json_from_csv(
         return single_dict2
 
 
+def sniff_csv_separators(file_path):
+    r"""
+    Finds the possible separators of a csv file from its header line
+
+    Only the first line of the file is read, instead of parsing the whole file with each
+    separator of `CSV_SEPARATORS`.
+
+    Parameters
+    ----------
+    file_path: str
+        path of the csv file
+
+    Returns
+    -------
+    list
+        separators of `CSV_SEPARATORS` present in the header line, the most frequent first,
+        empty if the header line contains none of them
+
+    Notes
+    -----
+    Tested with:
+    - test_sniff_csv_separators_most_frequent_first()
+    - test_create_json_from_csv_with_unknown_separator_for_csv_raises_CsvParsingError()
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as csv_file:
+        header = csv_file.readline()
+    counts = {separator: header.count(separator) for separator in CSV_SEPARATORS}
+    # sorted is stable, the order of CSV_SEPARATORS is kept between equally frequent ones
+    return sorted(
+        [separator for separator in CSV_SEPARATORS if counts[separator] > 0],
+        key=lambda separator: -counts[separator],
+    )
+
+
 def check_storage_file_is_csv(storage_file):
     r"""
     Checks that the storage file name defined in `energyStorage.csv` has ending `.csv`.
@@ -40,6 +40,9 @@ from multi_vector_simulator.utils.constants import (
     TYPE_NDARRAY,
     TYPE_DATAFRAME,
     TYPE_TIMESTAMP,
+    SIDECAR_FILE_JSON_KEY,
+    SIDECAR_ARRAY_JSON_KEY,
+    SIDECAR_INDEX_SUFFIX,
     SIMULATION_SETTINGS,
     PATH_INPUT_FOLDER,
     PATH_OUTPUT_FOLDER,
@@ -57,7 +60,9 @@ It will be an interface to the EPA.
 """
 
 
-def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
+def convert_from_json_to_special_types(
+    a_dict, prev_key=None, time_index=None, sidecar_folder=None
+):
     """Convert the field values of the mvs result json file which are not simple types.
 
     The function is recursive to explore all nested levels
@@ -68,11 +73,20 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
         In the recursion, this is either a dict (moving down one nesting level) or a field value
     prev_key: str
         The previous key of the dict in the recursive loop
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Index set to the timeseries which have the same length
+        Default: None
+    sidecar_folder: str
+        Folder in which the sidecar files of timeseries stored in binary format
+        (see :py:func:`~.F0_output.store_as_json`) are looked for
+        Default: None (current working directory)
 
     Returns
     -------
     The original dictionary, with the serialized instances of pandas.Series,
-    pandas.DatetimeIndex, pandas.DataFrame, numpy.array converted back to their original form
+    pandas.DatetimeIndex, pandas.DataFrame, numpy.array converted back to their original form.
+    The timeseries stored in a sidecar file are only read when they are first accessed, see
+    :py:class:`~.LazyTimeseriesDict`
 
     """
 
@@ -84,26 +98,38 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
             answer = {}
             for k in a_dict:
                 answer[k] = convert_from_json_to_special_types(
-                    a_dict[k], prev_key=k, time_index=time_index
+                    a_dict[k],
+                    prev_key=k,
+                    time_index=time_index,
+                    sidecar_folder=sidecar_folder,
                 )
+            if any(isinstance(v, TimeseriesReference) for v in answer.values()):
+                answer = LazyTimeseriesDict(answer)
+        elif SIDECAR_FILE_JSON_KEY in a_dict:
+            # the values of the timeseries are stored in a binary sidecar file
+            answer = TimeseriesReference(
+                a_dict, sidecar_folder=sidecar_folder, time_index=time_index
+            )
         # TODO this cas might be obsolete with the newer version of the parser from PR #675
         elif prev_key == data_parser.MAP_MVS_EPA[TIMESERIES]:
             # the a_dict is from the EPA
-            answer = pd.Series(a_dict[DATA])
+            values = a_dict[DATA]
+            index = None
             # Set time_index to Series
             if time_index is not None:
-                if len(answer.index) > len(time_index):
+                if len(values) > len(time_index):
                     logging.warning(
                         f"The time index inferred from {SIMULATION_SETTINGS} is longer as "
                         f"the timeserie under the field {prev_key}"
                     )
-                elif len(answer.index) < len(time_index):
+                elif len(values) < len(time_index):
                     logging.warning(
                         f"The time index inferred from {SIMULATION_SETTINGS} is shorter as "
                         f"the timeserie under the field {prev_key}"
                     )
                 else:
-                    answer.index = time_index
+                    index = time_index
+            answer = convert_list_to_series(values, index=index)
 
         else:
             # the a_dict is a dictionary containing the special type key,
@@ -114,14 +140,15 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
 
             if TYPE_DATAFRAME in data_type:
                 # pandas.DataFrame
-                a_dict = json.dumps(a_dict)
-                answer = pd.read_json(a_dict, orient="split")
+                answer = convert_split_dict_to_dataframe(a_dict)
             elif TYPE_DATETIMEINDEX in data_type:
                 # pandas.DatetimeIndex
                 if time_index is not None:
                     answer = time_index
                 else:
-                    answer = pd.DatetimeIndex(a_dict.get(VALUE, []))
+                    answer = pd.DatetimeIndex(
+                        np.asarray(a_dict.get(VALUE, []), dtype="datetime64[ns]")
+                    )
 
                 answer.freq = answer.inferred_freq
             elif TYPE_SERIES in data_type:
@@ -129,23 +156,24 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
                 # extract the name of the series in case it was a tuple
                 name = a_dict.get("name", None)
 
-                # reconvert the dict to a json for conversion to pandas Series
-                answer = pd.Series(a_dict[VALUE])
-
+                values = a_dict[VALUE]
+                index = None
                 # Set time_index to Series
                 if time_index is not None:
-                    if len(answer.index) > len(time_index):
+                    if len(values) > len(time_index):
                         logging.warning(
                             f"The time index inferred from {SIMULATION_SETTINGS} is shorter as "
-                            f"the timeserie under the field {prev_key} ({len(time_index)}<{len(answer.index)})"
+                            f"the timeserie under the field {prev_key} ({len(time_index)}<{len(values)})"
                         )
-                    elif len(answer.index) < len(time_index):
+                    elif len(values) < len(time_index):
                         logging.warning(
                             f"The time index inferred from {SIMULATION_SETTINGS} is longer as "
-                            f"the timeserie under the field {prev_key} ({len(time_index)}>{len(answer.index)})"
+                            f"the timeserie under the field {prev_key} ({len(time_index)}>{len(values)})"
                         )
                     else:
-                        answer.index = time_index
+                        index = time_index
+
+                answer = convert_list_to_series(values, index=index)
 
                 # if the name was a tuple it was converted to a list via json serialization
                 if isinstance(name, list):
@@ -164,6 +192,179 @@ def convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
     return answer
 
 
+def convert_list_to_series(values, index=None):
+    """Convert a list of values of a json file to a pandas.Series
+
+    If all values are numbers (or booleans), the values are converted to a numpy array of the
+    matching dtype at once, which is much faster than letting pandas infer the type of each
+    value of the list.
+
+    Parameters
+    ----------
+    values: list
+        values of the timeserie
+    index: :pandas:`pandas.Index<frame>`
+        index of the timeserie, if None a default integer index is used
+        Default: None
+
+    Returns
+    -------
+    :pandas:`pandas.Series<series>`
+
+    Notes
+    -----
+    This function is tested with:
+    - test_B0_data_input_json.TestConversionJsonToPythonTypes
+    """
+    array = np.asarray(values)
+    if array.dtype.kind not in "biuf":
+        # the values are not all numeric (e.g. None values or strings), pandas infers the type
+        array = values
+    return pd.Series(array, index=index)
+
+
+def convert_split_dict_to_dataframe(a_dict):
+    """Convert a pandas.DataFrame serialized with the json "split" orientation back to a DataFrame
+
+    The DataFrame is built directly from the dict, without serializing it to json again to
+    parse it with pandas.read_json. Like pandas.read_json, an integer index whose values are
+    all timestamps (as stored by pandas.DataFrame.to_json) is converted to a DatetimeIndex.
+
+    Parameters
+    ----------
+    a_dict: dict
+        dict with the keys "columns", "index" and "data"
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+
+    Notes
+    -----
+    This function is tested with:
+    - test_B0_data_input_json.TestConversionJsonToPythonTypes
+    """
+    index = pd.Index(a_dict.get("index", []))
+    # timestamps are stored as integers by pandas, pandas.read_json considers integers
+    # larger than one year in seconds to be timestamps (see pandas.io.json._json.Parser)
+    if index.dtype.kind in "iu" and len(index) > 0 and (index > 31536000).all():
+        for date_unit in ("s", "ms", "us", "ns"):
+            try:
+                index = pd.to_datetime(index, unit=date_unit)
+                break
+            except (ValueError, OverflowError):
+                continue
+    return pd.DataFrame(
+        data=a_dict.get(DATA, []), index=index, columns=a_dict.get("columns", None)
+    )
+
+
+class TimeseriesReference:
+    """Reference to a timeseries stored in a binary sidecar file of a json file
+
+    Parameters
+    ----------
+    a_dict: dict
+        json object of the timeseries, as written by
+        :py:func:`~.convert_from_special_types_to_json_with_sidecar`
+    sidecar_folder: str
+        Folder in which the sidecar file is looked for
+        Default: None (current working directory)
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Index set to a pandas.Series if it has the same length
+        Default: None
+
+    Notes
+    -----
+    This class is tested with:
+    - test_F0_output.TestTimeseriesSidecar
+    """
+
+    def __init__(self, a_dict, sidecar_folder=None, time_index=None):
+        self.data_type = a_dict[DATA_TYPE_JSON_KEY]
+        self.path = os.path.join(sidecar_folder or "", a_dict[SIDECAR_FILE_JSON_KEY])
+        self.array_name = a_dict[SIDECAR_ARRAY_JSON_KEY]
+        self.columns = a_dict.get("columns", None)
+        self.time_index = time_index
+
+    def resolve(self):
+        """Read the timeseries from the sidecar file
+
+        Returns
+        -------
+        :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<frame>`
+        """
+        # only the arrays of the timeseries are read from the .npz archive
+        with np.load(self.path) as sidecar:
+            values = sidecar[self.array_name]
+            if TYPE_DATAFRAME in self.data_type:
+                index = pd.Index(sidecar[self.array_name + SIDECAR_INDEX_SUFFIX])
+        if TYPE_DATAFRAME in self.data_type:
+            answer = pd.DataFrame(values, index=index, columns=self.columns)
+        else:
+            index = None
+            if self.time_index is not None and len(values) == len(self.time_index):
+                index = self.time_index
+            answer = pd.Series(values, index=index)
+        return answer
+
+
+class LazyTimeseriesDict(dict):
+    """dict whose timeseries stored in a sidecar file are only read when first accessed
+
+    The values of type :py:class:`~.TimeseriesReference` are replaced by the timeseries they
+    reference when accessed by key, and all of them are read when the values or items of the
+    dict are iterated over (e.g. to store the dict as json or to copy it).
+
+    Notes
+    -----
+    This class is tested with:
+    - test_F0_output.TestTimeseriesSidecar
+    """
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, TimeseriesReference):
+            value = value.resolve()
+            super().__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # overriding __iter__ prevents dict() and dict.update() to copy the unresolved values
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        if key in self:
+            self[key]
+        return super().pop(key, *args)
+
+    def resolve_all(self):
+        """Read all timeseries of the dict which were not accessed yet"""
+        for key in self.keys():
+            self[key]
+
+    def values(self):
+        self.resolve_all()
+        return super().values()
+
+    def items(self):
+        self.resolve_all()
+        return super().items()
+
+    def copy(self):
+        self.resolve_all()
+        return LazyTimeseriesDict(super().copy())
+
+    def __reduce__(self):
+        # copy.deepcopy and pickle of the dict store the resolved timeseries
+        return LazyTimeseriesDict, (dict(self.items()),)
+
+
 def convert_from_special_types_to_json(o):
     """This converts all data stored in dict_values that is not compatible with the
     json format to a format that is compatible.
@@ -205,6 +406,106 @@ def convert_from_special_types_to_json(o):
     return answer
 
 
+def convert_from_special_types_to_json_with_sidecar(o, sidecar_arrays, sidecar_file):
+    """Convert data of dict_values to a json-storable value, storing timeseries in a sidecar
+
+    The values of numerical pandas.Series and pandas.DataFrame are not converted to lists but
+    collected in sidecar_arrays to be written to a binary file, only a reference to the arrays
+    is stored in the json file. All other types are converted with
+    :py:func:`~.convert_from_special_types_to_json`.
+
+    Parameters
+    ----------
+    o :
+        Any type. Object to be converted to json-storable value.
+    sidecar_arrays: dict
+        Arrays to be stored in the sidecar file, the arrays of o are added to it
+    sidecar_file: str
+        Name of the sidecar file, relative to the folder of the json file
+
+    Returns
+    -------
+    type
+        json-storable value.
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F0_output.TestTimeseriesSidecar
+    """
+    answer = None
+    if isinstance(o, pd.Series) and o.dtype.kind in "biuf":
+        answer = {DATA_TYPE_JSON_KEY: TYPE_SERIES}
+        values = o.to_numpy()
+    elif (
+        isinstance(o, pd.DataFrame)
+        and all(dtype.kind in "biuf" for dtype in o.dtypes)
+        and o.index.dtype.kind in "biufM"
+    ):
+        answer = {DATA_TYPE_JSON_KEY: TYPE_DATAFRAME}
+        # the columns are stored in the json file in the same way as pandas would
+        answer["columns"] = json.loads(o.iloc[:0].to_json(orient="split"))["columns"]
+        values = o.to_numpy()
+    if answer is None:
+        answer = convert_from_special_types_to_json(o)
+    else:
+        array_name = str(len(sidecar_arrays))
+        sidecar_arrays[array_name] = values
+        if answer[DATA_TYPE_JSON_KEY] == TYPE_DATAFRAME:
+            sidecar_arrays[array_name + SIDECAR_INDEX_SUFFIX] = o.index.to_numpy()
+        answer.update(
+            {SIDECAR_FILE_JSON_KEY: sidecar_file, SIDECAR_ARRAY_JSON_KEY: array_name}
+        )
+    return answer
+
+
+def convert_from_special_types_to_json_types(o):
+    """Convert a dict with data of dict_values to json types without encoding it to json
+
+    The result is the same as `json.loads(json.dumps(o, default=convert_from_special_types_to_json))`
+    without the round trip through a json string: dict keys are converted to str as by the json
+    encoder, tuples to lists and all other types with
+    :py:func:`~.convert_from_special_types_to_json`.
+
+    Parameters
+    ----------
+    o :
+        Any type. Object to be converted to json types.
+
+    Returns
+    -------
+    type
+        value made of dict, list, str, int, float, bool and None only.
+
+    Notes
+    -----
+    This function is tested with:
+    - test_B0_data_input_json.TestConversionJsonToPythonTypes.test_convert_to_json_types_same_as_json_round_trip
+    """
+    if o is None or type(o) in (str, int, float, bool):
+        answer = o
+    elif isinstance(o, dict):
+        answer = {
+            k if isinstance(k, str) else json.dumps(k): (
+                convert_from_special_types_to_json_types(v)
+            )
+            for k, v in o.items()
+        }
+    elif isinstance(o, (list, tuple)):
+        answer = [convert_from_special_types_to_json_types(v) for v in o]
+    elif isinstance(o, float):
+        answer = float(o)
+    elif isinstance(o, int):
+        answer = int(o)
+    elif isinstance(o, str):
+        answer = str(o)
+    else:
+        answer = convert_from_special_types_to_json_types(
+            convert_from_special_types_to_json(o)
+        )
+    return answer
+
+
 def retrieve_date_time_info(simulation_settings):
     """
     Updates simulation settings by all time-related parameters.
@@ -291,10 +592,13 @@ def load_json(
     with open(path_input_file) as json_file:
         dict_values = json.load(json_file)
 
+    # timeseries stored in a sidecar file are looked for next to the json file
+    sidecar_folder = os.path.dirname(os.path.abspath(path_input_file))
+
     # Retrieve the simulation setting in the right format
     if SIMULATION_SETTINGS in dict_values:
         dict_values[SIMULATION_SETTINGS] = convert_from_json_to_special_types(
-            dict_values[SIMULATION_SETTINGS]
+            dict_values[SIMULATION_SETTINGS], sidecar_folder=sidecar_folder
         )
         # Compute the END_DATE and the TIME_INDEX
         retrieve_date_time_info(dict_values[SIMULATION_SETTINGS])
@@ -304,7 +608,9 @@ def load_json(
         time_index = None
 
     # Convert the values inside the dict to python types
-    dict_values = convert_from_json_to_special_types(dict_values, time_index=time_index)
+    dict_values = convert_from_json_to_special_types(
+        dict_values, time_index=time_index, sidecar_folder=sidecar_folder
+    )
 
     # The user specified a value
     if path_input_folder is not None:
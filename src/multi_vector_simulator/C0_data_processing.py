@@ -50,6 +50,7 @@ from multi_vector_simulator.utils.exceptions import InvalidPeakDemandPricingPeri
 import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.C1_verification as C1
 import multi_vector_simulator.C2_economic_functions as C2
+import multi_vector_simulator.utils.timeseries_store as timeseries_store
 
 
 def all(dict_values):
@@ -1657,7 +1658,8 @@ def receive_timeseries_from_csv(
         load_from_timeseries_instead_of_file = True
 
     else:
-        data_set = pd.read_csv(file_path, sep=",", keep_default_na=True)
+        # the file is parsed once and then shared with the next simulations
+        data_set = timeseries_store.read_csv(file_path, sep=",", keep_default_na=True)
 
     # If loading the data from the file does not work (file not present), the data might be
     # already present in dict_values under TIMESERIES
@@ -1873,7 +1875,7 @@ def get_timeseries_multiple_flows(settings, dict_asset, file_name, header):
 
     # TODO if FILENAME is not defined
 
-    data_set = pd.read_csv(file_path, sep=",")
+    data_set = timeseries_store.read_csv(file_path, sep=",", keep_default_na=True)
     if len(data_set.index) == settings[PERIODS]:
         return pd.Series(data_set[header].values, index=settings[TIME_INDEX])
     elif len(data_set.index) >= settings[PERIODS]:
@@ -16,18 +16,26 @@ Functional requirements of module D0:
 - process results by giving them to the next function
 - dump oemof results
 - add simulation parameters to dict values
+- optionally reduce the energy system to typical periods of its timeseries (see D3)
+- optionally optimize the dispatch window by window with a rolling horizon (see D4)
+- solve the model with the solver and solver options of the simulation settings
 """
 
 import logging
 import os
+import threading
 import timeit
 import warnings
 
 from oemof.solph import processing
 from oemof import solph
+from pyomo.core import Constraint, Var
+from pyomo.opt import SolverFactory, SolverResults
 
 import multi_vector_simulator.D1_model_components as D1
 import multi_vector_simulator.D2_model_constraints as D2
+import multi_vector_simulator.D3_timeseries_aggregation as D3
+import multi_vector_simulator.D4_rolling_horizon as D4
 
 from multi_vector_simulator.utils.constants import (
     PATH_OUTPUT_FOLDER,
@@ -36,6 +44,15 @@ from multi_vector_simulator.utils.constants import (
     PLOT_SANKEY,
     PLOTS_ES,
     LP_FILE,
+    DEFAULT_SOLVER,
+    DEFAULT_MIP_GAP,
+    SOLVERS,
+    SOLVER_IO,
+    WARM_START_STRUCTURE,
+    WARM_START_VALUES,
+    WARM_START_BASIS,
+    WARM_STARTED,
+    SOLVE_TIME,
 )
 from multi_vector_simulator.utils.constants_json_strings import (
     ENERGY_BUSSES,
@@ -57,16 +74,40 @@ from multi_vector_simulator.utils.constants_json_strings import (
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
     MODELLING_TIME,
+    TIMESTEP_WEIGHTS,
+    TYPICAL_PERIODS,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_MIP_GAP,
+    SOLVER_TIME_LIMIT,
+    SOLVER_STATUS,
+    SOLVER_TERMINATION_CONDITION,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
+    ASSET_TABLE,
+    ENERGY_STORAGE,
+    ROLLING_HORIZON,
+    ROLLING_HORIZON_WINDOW,
+    ROLLING_HORIZON_WINDOWS,
 )
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
+    UnknownSolverError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
 )
 
+SOLVER_LOCK = threading.Lock()
 
-def run_oemof(dict_values, save_energy_system_graph=False, return_les=False):
+
+def run_oemof(
+    dict_values,
+    save_energy_system_graph=False,
+    return_les=False,
+    previous_les=None,
+    solution_store=None,
+):
     """
     Creates and solves energy system model generated from excel template inputs.
     Each component is included by calling its constructor function in D1_model_components.
@@ -84,6 +125,21 @@ def run_oemof(dict_values, save_energy_system_graph=False, return_les=False):
     return_les: bool
         if set to True, the return also includes the local_energy_system in third position
 
+    previous_les: :oemof-solph:`solph.Model <models>`
+        oemof model of a previous simulation of the same energy system, which only differs from
+        the current one by its cost parameters. If provided, the cost parameters of this model
+        are updated and it is solved again instead of building a new model. If the components
+        of both energy systems do not match, a new model is built. Not used if the dispatch is
+        optimized with a rolling horizon.
+        Default: None
+
+    solution_store: dict
+        If provided, the solution of a previous simulation stored in this dict is used as
+        starting point of the solver and is then replaced by the solution of this simulation,
+        see :py:func:`model_building.simulating`. Not used if the dispatch is optimized with a
+        rolling horizon.
+        Default: None
+
     Returns
     -------
     saves and returns oemof simulation results
@@ -91,28 +147,82 @@ def run_oemof(dict_values, save_energy_system_graph=False, return_les=False):
 
     start = timer.initalize()
 
-    model, dict_model = model_building.initialize(dict_values)
+    # the energy system is optionally reduced to typical periods of its timeseries
+    aggregation = D3.aggregate_timeseries(dict_values)
+    if aggregation is not None:
+        dict_values_model = D3.reduce_dict_values(dict_values, aggregation)
+    else:
+        dict_values_model = dict_values
+
+    # the dispatch is optionally optimized window by window
+    windows = None
+    if aggregation is None:
+        windows = D4.get_rolling_horizon_windows(dict_values)
+    elif (
+        dict_values[SIMULATION_SETTINGS].get(ROLLING_HORIZON_WINDOW, {}).get(VALUE)
+        is not None
+    ):
+        logging.warning(
+            "The rolling horizon is not applied, as the energy system is reduced to typical "
+            "periods."
+        )
 
-    model = model_building.adding_assets_to_energysystem_model(
-        dict_values, dict_model, model
-    )
+    if windows is not None:
+        model, local_energy_system, results_main, results_meta = run_rolling_horizon(
+            dict_values, windows
+        )
+        model_building.plot_networkx_graph(
+            dict_values, model, save_energy_system_graph=save_energy_system_graph
+        )
+    else:
+        model, dict_model = model_building.initialize(dict_values_model)
 
-    model_building.plot_networkx_graph(
-        dict_values, model, save_energy_system_graph=save_energy_system_graph
-    )
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values_model, dict_model, model
+        )
 
-    logging.debug("Creating oemof model based on created components and busses...")
-    local_energy_system = solph.Model(model)
-    logging.debug("Created oemof model based on created components and busses.")
+        model_building.plot_networkx_graph(
+            dict_values, model, save_energy_system_graph=save_energy_system_graph
+        )
 
-    local_energy_system = D2.add_constraints(
-        local_energy_system, dict_values, dict_model
-    )
-    model_building.store_lp_file(dict_values, local_energy_system)
+        warmstart = False
+        if previous_les is not None:
+            if model_building.update_cost_parameters(previous_les, model) is True:
+                logging.debug("Reusing the oemof model with updated cost parameters.")
+                local_energy_system = previous_les
+                model = local_energy_system.es
+                warmstart = True
+            else:
+                logging.warning(
+                    "The components of the previous oemof model do not match the ones of the "
+                    "current energy system, the oemof model is therefore built again."
+                )
 
-    model, results_main, results_meta = model_building.simulating(
-        dict_values, model, local_energy_system
-    )
+        if warmstart is False:
+            logging.debug(
+                "Creating oemof model based on created components and busses..."
+            )
+            local_energy_system = model_building.create_oemof_model(
+                dict_values_model, model
+            )
+            logging.debug("Created oemof model based on created components and busses.")
+
+            local_energy_system = D2.add_constraints(
+                local_energy_system, dict_values_model, dict_model
+            )
+        model_building.store_lp_file(dict_values, local_energy_system)
+
+        model, results_main, results_meta = model_building.simulating(
+            dict_values,
+            model,
+            local_energy_system,
+            warmstart=warmstart,
+            solution_store=solution_store,
+        )
+
+    if aggregation is not None:
+        # the results are expanded to the whole simulation period in E0
+        dict_values[SIMULATION_RESULTS][TYPICAL_PERIODS] = aggregation
 
     model_building.plot_sankey_diagramm(
         dict_values, model, save_energy_system_graph=save_energy_system_graph
@@ -126,6 +236,142 @@ def run_oemof(dict_values, save_energy_system_graph=False, return_les=False):
         return results_meta, results_main
 
 
+def run_rolling_horizon(dict_values, windows):
+    """
+    Builds and solves the oemof model of each window of a rolling horizon
+
+    The storage levels at the start of a window are the ones reached at the same timestep in the
+    previous window, the storage levels at the end of the last window are the ones at the start of
+    the first window. The results of the windows are stitched into results for the whole
+    simulation period (see D4). No lp file is stored.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs
+
+    windows: list
+        Windows of the rolling horizon, as returned by
+        :py:func:`~.D4_rolling_horizon.get_rolling_horizon_windows`
+
+    Returns
+    -------
+    The energy system and the oemof model of the last window, and the oemof results and meta
+    results of the whole simulation period
+
+    Notes
+    -----
+    The objective value stored in the simulation results and in the meta results is the sum of
+    the costs of the dispatch kept from each window, the solver time is the sum of the solver
+    times of the windows. The solver status and termination condition are the ones of the first
+    window which was not solved to optimality, or of the last window if all of them were.
+
+    This function is tested with:
+    - test_D4_rolling_horizon.TestRollingHorizonDispatch
+    """
+    storages = dict_values.get(ENERGY_STORAGE, {})
+    storage_levels = None
+    final_contents = {}
+    windows_results = []
+    windows_meta = []
+    objective_value = 0
+    simulation_time = 0
+    number_of_variables = 0
+    number_of_constraints = 0
+
+    for number, window in enumerate(windows):
+        start, stop, end = window
+        logging.info(
+            f"Optimizing window {number + 1}/{len(windows)} of the rolling horizon."
+        )
+        dict_values_window = D4.window_dict_values(dict_values, window, storage_levels)
+        model, dict_model = model_building.initialize(dict_values_window)
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values_window, dict_model, model
+        )
+        D4.unbalance_storages(dict_model)
+        local_energy_system = model_building.create_oemof_model(
+            dict_values_window, model
+        )
+        local_energy_system = D2.add_constraints(
+            local_energy_system, dict_values_window, dict_model
+        )
+        if number == len(windows) - 1:
+            local_energy_system = D4.add_final_storage_levels(
+                local_energy_system, dict_model, final_contents
+            )
+
+        model, results_main, results_meta = model_building.simulating(
+            dict_values_window, model, local_energy_system
+        )
+
+        if number == 0:
+            final_contents, _ = D4.get_storage_levels(results_main, 0, storages)
+        _, storage_levels = D4.get_storage_levels(results_main, end - start, storages)
+        windows_results.append(D4.keep_results(results_main, end - start))
+        windows_meta.append(results_meta)
+
+        window_results = dict_values_window[SIMULATION_RESULTS]
+        objective_value += D4.get_kept_objective_value(local_energy_system, end - start)
+        simulation_time += window_results[SIMULTATION_TIME]
+        number_of_variables = max(
+            number_of_variables, window_results[NUMBER_OF_VARIABLES]
+        )
+        number_of_constraints = max(
+            number_of_constraints, window_results[NUMBER_OF_CONSTRAINTS]
+        )
+
+    results_main = D4.stitch_results(results_main, windows_results)
+    model.results["main"] = results_main
+
+    status_meta = windows_meta[-1]
+    for window_meta in windows_meta:
+        if (
+            str(window_meta["solver"].get("Status")) != "ok"
+            or str(window_meta["solver"].get("Termination condition")) != "optimal"
+        ):
+            status_meta = window_meta
+            break
+    results_meta = {
+        "objective": objective_value,
+        # the bounds of the objective of a single window are left out
+        "problem": {
+            key: value
+            for key, value in windows_meta[-1]["problem"].items()
+            if key not in ("Lower bound", "Upper bound")
+        },
+        "solver": dict(
+            windows_meta[-1]["solver"],
+            **{
+                "Status": status_meta["solver"].get("Status"),
+                "Termination condition": status_meta["solver"].get(
+                    "Termination condition"
+                ),
+                "Time": simulation_time,
+            },
+        ),
+    }
+    results_meta["problem"]["Number of variables"] = number_of_variables
+    results_meta["problem"]["Number of constraints"] = number_of_constraints
+    model.results["meta"] = results_meta
+
+    dict_values[SIMULATION_RESULTS] = dict(
+        window_results,
+        **{
+            OBJECTIVE_VALUE: objective_value,
+            SOLVER_STATUS: str(results_meta["solver"]["Status"]),
+            SOLVER_TERMINATION_CONDITION: str(
+                results_meta["solver"]["Termination condition"]
+            ),
+            SIMULTATION_TIME: round(simulation_time, 2),
+            NUMBER_OF_VARIABLES: number_of_variables,
+            NUMBER_OF_CONSTRAINTS: number_of_constraints,
+            ROLLING_HORIZON: {ROLLING_HORIZON_WINDOWS: windows},
+        },
+    )
+    return model, local_energy_system, results_main, results_meta
+
+
 class model_building:
     def initialize(dict_values):
         """
@@ -138,7 +384,8 @@ class model_building:
 
         Returns
         -------
-        oemof energy model (oemof.solph.network.EnergySystem), dict_model which gathers the assets added to this model later.
+        oemof energy model (oemof.solph.network.EnergySystem), dict_model which gathers the assets added to this model later
+        and the table of the asset parameters converted to numpy arrays (see :py:func:`~.D1_model_components.build_asset_table`).
         """
         logging.info("Initializing oemof simulation.")
         model = solph.EnergySystem(
@@ -156,8 +403,49 @@ class model_building:
             OEMOF_ExtractionTurbineCHP: {},
         }
 
+        # the timeseries of the assets are converted once to the arrays used by the oemof flows
+        dict_model[ASSET_TABLE] = D1.build_asset_table(dict_values)
+
         return model, dict_model
 
+    def create_oemof_model(dict_values, model):
+        """
+        Creates the oemof model of the energy system
+
+        If the energy system is reduced to typical periods, the costs of each timestep are
+        weighted in the objective function by the number of timesteps it represents.
+
+        Parameters
+        ----------
+        dict_values: dict
+            dictionary of simulation
+
+        model: oemof.solph.network.EnergySystem
+            Model of oemof energy system
+
+        Returns
+        -------
+        :oemof-solph:`solph.Model <models>`
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.test_create_oemof_model_weighted_objective
+        """
+        timestep_weights = dict_values[SIMULATION_SETTINGS].get(TIMESTEP_WEIGHTS, None)
+        if timestep_weights is None:
+            local_energy_system = solph.Model(model)
+        else:
+            # by default oemof weights the objective with the time increment
+            objective_weighting = [
+                increment * weight
+                for increment, weight in zip(model.timeincrement, timestep_weights)
+            ]
+            local_energy_system = solph.Model(
+                model, objective_weighting=objective_weighting
+            )
+        return local_energy_system
+
     def adding_assets_to_energysystem_model(dict_values, dict_model, model, **kwargs):
         """
 
@@ -291,6 +579,216 @@ class model_building:
                 model.results["main"]
             )
 
+    def update_cost_parameters(local_energy_system, model):
+        """
+        Transfers the cost parameters of an energy system to an already built oemof model
+
+        The flows and components of both energy systems are matched by their labels. Only the
+        variable costs and the investment costs (ep_costs) are transferred, the objective
+        function of the oemof model is then rebuilt, its constraints are kept as they are.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object including all constraints of the energy system, built from a previous
+            simulation
+
+        model: `oemof.solph.network.EnergySystem`
+            oemof-solph object for energy system model, with updated cost parameters
+
+        Returns
+        -------
+        True if the cost parameters could be transferred, False if the flows of both energy
+        systems do not match (in which case local_energy_system is not modified)
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestUpdateCostParameters
+        """
+        new_flows = {(i.label, o.label): flow for (i, o), flow in model.flows().items()}
+        flows = {
+            (i.label, o.label): flow
+            for (i, o), flow in local_energy_system.flows.items()
+        }
+        if set(new_flows.keys()) != set(flows.keys()):
+            return False
+
+        for flow_label, flow in flows.items():
+            new_flow = new_flows[flow_label]
+            flow.variable_costs = new_flow.variable_costs
+            if flow.investment is not None and new_flow.investment is not None:
+                flow.investment.ep_costs = new_flow.investment.ep_costs
+
+        # the storage capacity investment is defined on the component, not on a flow
+        new_nodes = {node.label: node for node in model.nodes}
+        for node in local_energy_system.es.nodes:
+            investment = getattr(node, "investment", None)
+            new_investment = getattr(new_nodes.get(node.label), "investment", None)
+            if investment is not None and new_investment is not None:
+                investment.ep_costs = new_investment.ep_costs
+
+        # the cost expressions of the oemof blocks are replaced on purpose, pyomo's
+        # warnings about implicitly replaced components are therefore silenced
+        pyomo_logger = logging.getLogger("pyomo.core")
+        pyomo_log_level = pyomo_logger.level
+        pyomo_logger.setLevel(logging.ERROR)
+        try:
+            local_energy_system._add_objective(update=True)
+        finally:
+            pyomo_logger.setLevel(pyomo_log_level)
+        return True
+
+    def get_model_structure(local_energy_system):
+        """
+        Returns a fingerprint of the variables and constraints of an oemof model
+
+        The fingerprint is made of the labels of the nodes of the energy system and of the name
+        and size of each pyomo variable and constraint component. Two models with the same
+        fingerprint, e.g. two steps of a sweep over a parameter value, have their variables and
+        constraints in the same order, so that a solution can be transferred between them by
+        position. Unlike the names of all variables, it is cheap to compute for large models.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        tuple
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestWarmStart
+        """
+        return (
+            tuple(str(node.label) for node in local_energy_system.es.nodes),
+            tuple(
+                (component.name, len(component))
+                for component in local_energy_system.component_objects(
+                    (Var, Constraint), descend_into=True, active=True
+                )
+            ),
+        )
+
+    def get_variable_values(local_energy_system):
+        """
+        Returns the values of the variables of a solved oemof model
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        list with the value of each variable, in the order of the model
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestWarmStart
+        """
+        return [var.value for var in local_energy_system.component_data_objects(Var)]
+
+    def set_variable_values(local_energy_system, variable_values):
+        """
+        Sets the values of the variables of an oemof model from the ones of another model
+
+        Both models must have the same structure (see :py:func:`get_model_structure`). The
+        values are provided to the solvers which are warm start capable (see
+        :py:func:`simulating`).
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        variable_values: list
+            values of the variables, see :py:func:`get_variable_values`
+
+        Returns
+        -------
+        Number of variables whose value was set
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestWarmStart
+        """
+        n_values = 0
+        for var, value in zip(
+            local_energy_system.component_data_objects(Var), variable_values
+        ):
+            if value is not None:
+                var.set_value(value, skip_validation=True)
+                n_values += 1
+        return n_values
+
+    def get_solver_basis(opt):
+        """
+        Returns the basis of the last solve of pyomo's HiGHS interface
+
+        Parameters
+        ----------
+        opt: :class:`pyomo.contrib.solver.solvers.highs.Highs`
+            solver interface used to solve the model
+
+        Returns
+        -------
+        :class:`highspy.HighsBasis`, None if the solver has no valid basis
+
+        Notes
+        -----
+        pyomo does not expose the basis of HiGHS, it is therefore read from the HiGHS model of
+        the interface. An AttributeError is raised if the interface does not provide it.
+
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestWarmStart
+        """
+        basis = opt._solver_model.getBasis()
+        if basis.valid is False:
+            return None
+        return basis
+
+    def set_solver_basis(opt, solver_basis):
+        """
+        Sets the basis from which pyomo's HiGHS interface starts its next solve
+
+        The basis must be taken from a model with the same structure (see
+        :py:func:`get_model_structure`), as the columns and rows of HiGHS are matched by
+        position.
+
+        Parameters
+        ----------
+        opt: :class:`pyomo.contrib.solver.solvers.highs.Highs`
+            solver interface to which the model was passed
+
+        solver_basis: :class:`highspy.HighsBasis`
+            basis of a previous solve, see :py:func:`get_solver_basis`
+
+        Returns
+        -------
+        True if the basis was accepted by HiGHS
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestWarmStart
+        """
+        # only imported here, as HiGHS is an optional solver
+        import highspy
+
+        highs = opt._solver_model
+        if (
+            len(solver_basis.col_status) != highs.getNumCol()
+            or len(solver_basis.row_status) != highs.getNumRow()
+        ):
+            return False
+        return highs.setBasis(solver_basis) == highspy.HighsStatus.kOk
+
     def store_lp_file(dict_values, local_energy_system):
         """
         Stores linear equation system generated with pyomo as an "lp file".
@@ -317,7 +815,232 @@ class model_building:
                 io_options={"symbolic_solver_labels": True},
             )
 
-    def simulating(dict_values, model, local_energy_system):
+    def get_solver_settings(dict_values):
+        """
+        Returns the solver of the simulation and its options
+
+        The solver (default: DEFAULT_SOLVER) and the options `threads`, `mip_gap` (default:
+        DEFAULT_MIP_GAP) and `time_limit` (in seconds) are optional simulation settings. The
+        options are translated into the option names of the solver defined in SOLVERS, options
+        which are not set or not supported by the solver are left out.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        tuple with the name of the solver and a dict of its options
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestSolverSettings
+        """
+        simulation_settings = dict_values[SIMULATION_SETTINGS]
+        solver = simulation_settings.get(SOLVER, {}).get(VALUE, DEFAULT_SOLVER)
+        if solver not in SOLVERS:
+            raise UnknownSolverError(
+                f"The solver {solver} is not supported by the MVS, the supported solvers are "
+                f"{', '.join(SOLVERS)}"
+            )
+        solver_options = {}
+        for option, default in (
+            (SOLVER_THREADS, None),
+            (SOLVER_MIP_GAP, DEFAULT_MIP_GAP),
+            (SOLVER_TIME_LIMIT, None),
+        ):
+            option_value = simulation_settings.get(option, {}).get(VALUE, default)
+            if option_value is None:
+                continue
+            if SOLVERS[solver][option] is None:
+                logging.warning(
+                    f"The solver {solver} does not support the option {option}, it is ignored."
+                )
+            else:
+                solver_options[SOLVERS[solver][option]] = option_value
+        return solver, solver_options
+
+    def solve_directly(
+        local_energy_system, solver, solve_kwargs, solver_options, solution_store=None
+    ):
+        """
+        Solves the oemof model with the python interface of the solver
+
+        oemof-solph only solves models through the pyomo solver interfaces which write the model
+        to a file (e.g. lp file). This function solves the model through the direct interface of
+        the solver and stores the results the same way as :oemof-solph:`solph.Model.solve
+        <models>`, a warning is raised if the optimization did not end with an optimal solution.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        solver: str
+            name of the solver (see SOLVERS)
+
+        solve_kwargs: dict
+            keyword arguments of the solve method of the pyomo solver interface
+
+        solver_options: dict
+            options of the solver, with the option names of the pyomo solver interface
+
+        solution_store: dict
+            If provided, the solver starts from the basis stored under WARM_START_BASIS (only
+            for HiGHS) if the model has the structure stored under WARM_START_STRUCTURE, the
+            basis and structure of this optimization are then stored in their place and
+            WARM_STARTED is set to True if the solver was warm started.
+            Default: None
+
+        Returns
+        -------
+        pyomo SolverResults of the optimization
+
+        Notes
+        -----
+        The solver interfaces of `pyomo.contrib.solver` are only imported here, they are not
+        provided by the older versions of pyomo supported by oemof-solph.
+
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestSolveDirectly
+        - test_D0_modelling_and_optimization.test_solve_directly_without_pyomo_solver_interfaces
+        """
+        try:
+            from pyomo.contrib.solver.common.factory import (
+                SolverFactory as DirectSolverFactory,
+            )
+            from pyomo.contrib.solver.common.results import (
+                SolutionStatus,
+                legacy_solver_status_map,
+                legacy_termination_condition_map,
+            )
+        except ImportError as e:
+            raise ImportError(
+                f"The solver {solver} is called through the solver interfaces of "
+                f"pyomo.contrib.solver.common, which are not provided by the installed "
+                f"version of pyomo, please upgrade pyomo"
+            ) from e
+        opt = DirectSolverFactory(solver)
+        start = timeit.default_timer()
+        basis_available = False
+        warm_started = False
+        if solution_store is not None and solver == "highs":
+            structure = model_building.get_model_structure(local_energy_system)
+            try:
+                # the model is passed to the solver beforehand to set the basis
+                opt.set_instance(local_energy_system)
+                if (
+                    solution_store.get(WARM_START_STRUCTURE) == structure
+                    and solution_store.get(WARM_START_BASIS) is not None
+                ):
+                    warm_started = model_building.set_solver_basis(
+                        opt, solution_store[WARM_START_BASIS]
+                    )
+                basis_available = True
+            except AttributeError as e:
+                logging.debug(f"The basis of the solver can not be accessed: {e}")
+            else:
+                # the model has just been passed, it is not checked for changes again
+                solve_kwargs = dict(
+                    solve_kwargs,
+                    auto_updates={
+                        option: False for option in opt.config.auto_updates.keys()
+                    },
+                )
+            solution_store[WARM_START_STRUCTURE] = structure
+        results = opt.solve(
+            local_energy_system,
+            load_solutions=False,
+            raise_exception_on_nonoptimal_result=False,
+            **solve_kwargs,
+            **solver_options,
+        )
+        if solution_store is not None:
+            solution_store[WARM_STARTED] = warm_started
+            solution_store[WARM_START_BASIS] = (
+                model_building.get_solver_basis(opt) if basis_available else None
+            )
+            # the time of the solver itself, without the transfer of the model
+            solution_store[SOLVE_TIME] = results.timing_info.timer.get_total_time(
+                "optimize"
+            )
+        if results.solution_status != SolutionStatus.noSolution:
+            results.solution_loader.load_vars()
+
+        solver_results = SolverResults()
+        solver_results.problem.lower_bound = results.objective_bound
+        solver_results.problem.upper_bound = results.incumbent_objective
+        solver_results.solver.name = solver
+        solver_results.solver.status = legacy_solver_status_map[
+            results.termination_condition
+        ]
+        solver_results.solver.termination_condition = legacy_termination_condition_map[
+            results.termination_condition
+        ]
+        # the time includes the transfer of the model to the solver, also if it happened
+        # before the solve to set the basis
+        solver_results.solver.time = timeit.default_timer() - start
+        local_energy_system.es.results = solver_results
+        local_energy_system.solver_results = solver_results
+
+        status = solver_results.solver.status
+        termination_condition = solver_results.solver.termination_condition
+        if status == "ok" and termination_condition == "optimal":
+            logging.info("Optimization successful...")
+        else:
+            warnings.warn(
+                f"Optimization ended with status {status} and termination condition "
+                f"{termination_condition}",
+                UserWarning,
+            )
+        return solver_results
+
+    def check_solver_results(solver_results):
+        """
+        Raises an error if the optimization did not end with an optimal solution
+
+        The status and termination condition are read from the solver results, the warnings
+        filters of the process are not changed as they are shared with the other simulations run
+        in threads of the same process.
+
+        Parameters
+        ----------
+        solver_results: pyomo SolverResults
+            results of the solver, as returned by :oemof-solph:`solph.Model.solve <models>`
+            or :py:func:`solve_directly`
+
+        Notes
+        -----
+        This function is tested with:
+        - test_D0_modelling_and_optimization.TestCheckSolverResults
+        """
+        status = str(solver_results.solver.status)
+        termination_condition = str(solver_results.solver.termination_condition)
+        if status == "ok" and termination_condition == "optimal":
+            return
+        error_message = (
+            f"Optimization ended with status {status} and termination condition "
+            f"{termination_condition}"
+        )
+        if termination_condition == "infeasible":
+            error_message = (
+                f"The following error occurred during the mvs solver: {error_message}\n\n "
+                f"There are several reasons why this could have happened."
+                "\n\t- the energy system is not properly connected. "
+                "\n\t- the capacity of some assets might not have been optimized. "
+                "\n\t- the demands might not be supplied with the installed capacities in "
+                "current energy system. Check your maximum power demand and if your energy "
+                "production assets and/or energy conversion assets have enough capacity to "
+                "meet the total demand"
+            )
+        logging.error(error_message)
+        raise MVSOemofError(error_message)
+
+    def simulating(
+        dict_values, model, local_energy_system, warmstart=False, solution_store=None
+    ):
         """
         Initiates the oemof-solph simulation, accesses results and writes main results into dict
 
@@ -325,9 +1048,8 @@ class model_building:
         otherwise other errors related to the uncomplete simulation result might occur and it will
         be more obscure to the endusers what went wrong.
 
-        A MVS error is raised if the omoef solver warning states explicitely that
-        "termination condition infeasible", otherwise the oemof solver warning is re-raised as
-        an error.
+        A MVS error is raised if the optimization did not end with an optimal solution, see
+        :py:func:`check_solver_results`.
 
 
         Parameters
@@ -341,48 +1063,81 @@ class model_building:
         local_energy_system: object
             pyomo object storing all constraints of the energy system model
 
+        warmstart: bool
+            if True, the values of the variables stored within local_energy_system (i.e. the
+            solution of a previous simulation) are provided to the solver as a starting point,
+            provided the solver supports it
+            Default: False
+
+        solution_store: dict
+            If provided, the solution of a previous simulation stored in this dict is provided
+            to the solver as a starting point: the simplex basis (WARM_START_BASIS) for HiGHS,
+            the values of the variables (WARM_START_VALUES) for the warm start capable solvers
+            called through files (e.g. as MIP start of cbc). The solution is only used if the
+            model has the same structure (WARM_START_STRUCTURE, see
+            :py:func:`get_model_structure`) as the previous one. The solution of this simulation
+            is then stored in its place, together with the time of the solver (SOLVE_TIME) and
+            whether it was warm started (WARM_STARTED).
+            Default: None
+
         Returns
         -------
         Updated model with results, main results (flows, assets) and meta results (simulation)
         """
 
-        logging.info("Starting simulation.")
-        # turn warnings into errors
-        warnings.filterwarnings("error")
-        warnings.filterwarnings("always", category=FutureWarning)
-        try:
-            local_energy_system.solve(
-                solver="cbc",
-                solve_kwargs={
-                    "tee": False
-                },  # if tee_switch is true solver messages will be displayed
-                cmdline_options={"ratioGap": str(0.03)},
-            )  # ratioGap allowedGap mipgap
-        except UserWarning as e:
-            error_message = str(e)
-            compare_message = "termination condition infeasible"
-            if compare_message in error_message:
-                error_message = (
-                    f"The following error occurred during the mvs solver: {error_message}\n\n "
-                    f"There are several reasons why this could have happened."
-                    "\n\t- the energy system is not properly connected. "
-                    "\n\t- the capacity of some assets might not have been optimized. "
-                    "\n\t- the demands might not be supplied with the installed capacities in "
-                    "current energy system. Check your maximum power demand and if your energy "
-                    "production assets and/or energy conversion assets have enough capacity to "
-                    "meet the total demand"
+        solver, solver_options = model_building.get_solver_settings(dict_values)
+        logging.info(f"Starting simulation with solver {solver}.")
+        # if tee_switch is true solver messages will be displayed
+        solve_kwargs = {"tee": False}
+        file_based_store = (
+            solution_store is not None and SOLVERS[solver][SOLVER_IO] is not None
+        )
+        if file_based_store is True:
+            structure = model_building.get_model_structure(local_energy_system)
+            if (
+                solution_store.get(WARM_START_STRUCTURE) == structure
+                and solution_store.get(WARM_START_VALUES) is not None
+            ):
+                n_values = model_building.set_variable_values(
+                    local_energy_system, solution_store[WARM_START_VALUES]
+                )
+                warmstart = warmstart or n_values > 0
+        if warmstart is True and SOLVERS[solver][SOLVER_IO] is not None:
+            opt = SolverFactory(solver)
+            if opt.available(exception_flag=False) and opt.warm_start_capable():
+                solve_kwargs["warmstart"] = True
+        # the temporary files of the pyomo solver interfaces are managed for the whole process,
+        # the simulations run in threads of a same process are therefore solved one at a time
+        with SOLVER_LOCK:
+            if SOLVERS[solver][SOLVER_IO] is None:
+                solver_results = model_building.solve_directly(
+                    local_energy_system,
+                    solver=solver,
+                    solve_kwargs=solve_kwargs,
+                    solver_options=solver_options,
+                    solution_store=solution_store,
                 )
-                logging.error(error_message)
-                raise MVSOemofError(error_message) from None
             else:
-                raise e
-        # stop turning warnings into errors
-        warnings.resetwarnings()
+                solver_results = local_energy_system.solve(
+                    solver=solver,
+                    solver_io=SOLVERS[solver][SOLVER_IO],
+                    solve_kwargs=solve_kwargs,
+                    cmdline_options=solver_options,
+                )
+        model_building.check_solver_results(solver_results)
 
         # add results to the energy system to make it possible to store them.
         results_main = processing.results(local_energy_system)
         results_meta = processing.meta_results(local_energy_system)
 
+        if file_based_store is True:
+            solution_store[WARM_START_STRUCTURE] = structure
+            solution_store[WARM_STARTED] = solve_kwargs.get("warmstart", False)
+            solution_store[WARM_START_VALUES] = model_building.get_variable_values(
+                local_energy_system
+            )
+            solution_store[SOLVE_TIME] = results_meta["solver"]["Time"]
+
         model.results["main"] = results_main
         model.results["meta"] = results_meta
 
@@ -392,6 +1147,13 @@ class model_building:
                     LABEL: SIMULATION_RESULTS,
                     OBJECTIVE_VALUE: results_meta["objective"],
                     SIMULTATION_TIME: round(results_meta["solver"]["Time"], 2),
+                    SOLVER: solver,
+                    SOLVER_STATUS: str(results_meta["solver"]["Status"]),
+                    SOLVER_TERMINATION_CONDITION: str(
+                        results_meta["solver"]["Termination condition"]
+                    ),
+                    NUMBER_OF_VARIABLES: local_energy_system.nvariables(),
+                    NUMBER_OF_CONSTRAINTS: local_energy_system.nconstraints(),
                 }
             }
         )
@@ -399,7 +1161,7 @@ class model_building:
             "Simulation time: %s minutes.",
             round(dict_values[SIMULATION_RESULTS][SIMULTATION_TIME] / 60, 2),
         )
-        return model, results_main, results_main
+        return model, results_main, results_meta
 
 
 class timer:
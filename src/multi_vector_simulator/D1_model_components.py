@@ -10,11 +10,13 @@ Module D1 includes all functions that are required to build an oemof model with
 - add storage objects (fix, to be optimized)
 - add multiple input/output busses if required for each of the assets
 - add oemof component parameters as scalar or time series values
+- convert the time series of the assets to numpy arrays once in an asset table, before building the model
 
 """
 
 import logging
 
+import numpy as np
 import pandas as pd
 from oemof import solph
 
@@ -59,6 +61,10 @@ from multi_vector_simulator.utils.constants_json_strings import (
     BETA,
     INVESTMENT_BUS,
     REDUCABLE_DEMAND,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    ACCEPTED_ASSETS_FOR_ASSET_GROUPS,
+    ASSET_TABLE,
 )
 from multi_vector_simulator.utils.helpers import (
     get_item_if_list,
@@ -71,6 +77,157 @@ from multi_vector_simulator.utils.exceptions import (
 )
 
 
+class AssetRecord:
+    r"""
+    Parameters of an asset which are passed to the oemof flows as sequences
+
+    oemof-solph reads the sequences of the flows at each timestep while the model is built,
+    which is much slower for pandas.Series than for numpy arrays. The timeseries of an asset
+    and its parameters provided as timeseries are therefore converted once to numpy arrays and
+    stored in this compact record. Scalar parameters are stored unchanged, parameters defined
+    for multiple busses remain lists. The input and output power of a storage have their own
+    records.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        dict of the asset
+    n_timesteps: int
+        number of timesteps of the simulation, if provided the length of the timeseries is validated
+        Default: None
+    label: str
+        label of the asset used in error messages
+        Default: the label of `dict_asset`
+
+    Notes
+    -----
+    This class is tested with:
+    - test_D1_model_components.TestAssetTable
+    """
+
+    __slots__ = (
+        "label",
+        "timeseries",
+        "timeseries_normalized",
+        "availability",
+        "dispatch_price",
+        "efficiency",
+        "input_power",
+        "output_power",
+    )
+
+    def __init__(self, dict_asset, n_timesteps=None, label=None):
+        self.label = dict_asset[LABEL] if label is None else label
+        self.timeseries = self.to_array(
+            dict_asset.get(TIMESERIES), TIMESERIES, n_timesteps
+        )
+        self.timeseries_normalized = self.to_array(
+            dict_asset.get(TIMESERIES_NORMALIZED), TIMESERIES_NORMALIZED, n_timesteps
+        )
+        self.availability = self.to_array(
+            dict_asset.get(AVAILABILITY_DISPATCH), AVAILABILITY_DISPATCH, n_timesteps
+        )
+        self.dispatch_price = self.to_array(
+            dict_asset.get(DISPATCH_PRICE, {}).get(VALUE), DISPATCH_PRICE, n_timesteps
+        )
+        self.efficiency = self.to_array(
+            dict_asset.get(EFFICIENCY, {}).get(VALUE), EFFICIENCY, n_timesteps
+        )
+        self.input_power = None
+        self.output_power = None
+        if dict_asset.get(OEMOF_ASSET_TYPE) == OEMOF_GEN_STORAGE:
+            self.input_power = AssetRecord(
+                dict_asset[INPUT_POWER], n_timesteps, f"{self.label} {INPUT_POWER}"
+            )
+            self.output_power = AssetRecord(
+                dict_asset[OUTPUT_POWER], n_timesteps, f"{self.label} {OUTPUT_POWER}"
+            )
+
+    def to_array(self, value, parameter, n_timesteps=None):
+        r"""
+        Converts a timeseries to a numpy array of floats
+
+        Parameters
+        ----------
+        value: :pandas:`pandas.Series<series>` or numpy.ndarray or list or float or None
+            value of the parameter, the items of a list (one per bus) are converted separately
+        parameter: str
+            name of the parameter, used in the error message
+        n_timesteps: int
+            number of timesteps of the simulation, if provided the length of the timeseries is validated
+            Default: None
+
+        Returns
+        -------
+        The value with its timeseries converted to numpy arrays
+        """
+        if isinstance(value, list):
+            answer = [self.to_array(item, parameter, n_timesteps) for item in value]
+        elif isinstance(value, (pd.Series, np.ndarray)):
+            answer = np.asarray(value, dtype=float)
+            if n_timesteps is not None and len(answer) != n_timesteps:
+                raise WrongParameterFormatError(
+                    f"The timeseries of the parameter '{parameter}' of the asset '{self.label}' "
+                    f"has {len(answer)} values, but the simulation has {n_timesteps} timesteps."
+                )
+        else:
+            answer = value
+        return answer
+
+
+def build_asset_table(dict_values):
+    r"""
+    Converts the timeseries of all assets to numpy arrays before the oemof model is built
+
+    Parameters
+    ----------
+    dict_values: dict
+        dict of the simulation, after processing in C0
+
+    Returns
+    -------
+    dict
+        :py:class:`~.AssetRecord` of each asset, with the labels of the assets as keys
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D1_model_components.TestAssetTable
+    """
+    n_timesteps = len(dict_values[SIMULATION_SETTINGS][TIME_INDEX])
+    asset_table = {}
+    for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+        for dict_asset in dict_values.get(asset_group, {}).values():
+            asset_table[dict_asset[LABEL]] = AssetRecord(dict_asset, n_timesteps)
+    return asset_table
+
+
+def get_asset_record(dict_asset, **kwargs):
+    r"""
+    Returns the :py:class:`~.AssetRecord` of an asset
+
+    Parameters
+    ----------
+    dict_asset: dict
+        dict of the asset
+
+    Other Parameters
+    ----------------
+    asset_table: dict, optional
+        table built with :py:func:`~.build_asset_table`, if the asset is not in the table its
+        record is created from `dict_asset`
+
+    Returns
+    -------
+    :py:class:`~.AssetRecord`
+    """
+    asset_table = kwargs.get(ASSET_TABLE) or {}
+    record = asset_table.get(dict_asset[LABEL])
+    if record is None:
+        record = AssetRecord(dict_asset)
+    return record
+
+
 def check_list_parameters_transformers_single_input_single_output(
     dict_asset, n_timesteps
 ):
@@ -549,6 +706,7 @@ def transformer_constant_efficiency_fix(model, dict_asset, **kwargs):
     """
 
     missing_dispatch_prices_or_efficiencies = None
+    asset_record = get_asset_record(dict_asset, **kwargs)
 
     # check if the transformer has multiple input or multiple output busses
     if isinstance(dict_asset[INFLOW_DIRECTION], list) or isinstance(
@@ -585,9 +743,7 @@ def transformer_constant_efficiency_fix(model, dict_asset, **kwargs):
             else:
                 for i, bus in enumerate(dict_asset[INFLOW_DIRECTION]):
                     inputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
-                        variable_costs=get_item_if_list(
-                            dict_asset[DISPATCH_PRICE][VALUE], i
-                        )
+                        variable_costs=get_item_if_list(asset_record.dispatch_price, i)
                     )
 
             outputs = {
@@ -596,7 +752,7 @@ def transformer_constant_efficiency_fix(model, dict_asset, **kwargs):
                 )
             }
             efficiencies = {}
-            for i, efficiency in enumerate(dict_asset[EFFICIENCY][VALUE]):
+            for i, efficiency in enumerate(asset_record.efficiency):
                 efficiencies[kwargs[OEMOF_BUSSES][dict_asset[INFLOW_DIRECTION][i]]] = (
                     efficiency
                 )
@@ -624,13 +780,11 @@ def transformer_constant_efficiency_fix(model, dict_asset, **kwargs):
             for i, bus in enumerate(dict_asset[OUTFLOW_DIRECTION]):
                 outputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
                     nominal_value=get_item_if_list(dict_asset[INSTALLED_CAP][VALUE], i),
-                    variable_costs=get_item_if_list(
-                        dict_asset[DISPATCH_PRICE][VALUE], i
-                    ),
+                    variable_costs=get_item_if_list(asset_record.dispatch_price, i),
                 )
 
             efficiencies = {}
-            for i, efficiency in enumerate(dict_asset[EFFICIENCY][VALUE]):
+            for i, efficiency in enumerate(asset_record.efficiency):
                 efficiencies[kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION][i]]] = (
                     efficiency
                 )
@@ -675,14 +829,12 @@ def transformer_constant_efficiency_fix(model, dict_asset, **kwargs):
         outputs = {
             kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
                 nominal_value=dict_asset[INSTALLED_CAP][VALUE],
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.dispatch_price,
                 **min_load_opts,
             )
         }
         efficiencies = {
-            kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: dict_asset[EFFICIENCY][
-                VALUE
-            ]
+            kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: asset_record.efficiency
         }
 
     if missing_dispatch_prices_or_efficiencies is None:
@@ -716,6 +868,7 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
 
     """
     missing_dispatch_prices_or_efficiencies = None
+    asset_record = get_asset_record(dict_asset, **kwargs)
 
     investment_bus = dict_asset.get(INVESTMENT_BUS)
     invest_opts = {}
@@ -757,9 +910,7 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
             inputs = {}
             for i, bus in enumerate(dict_asset[INFLOW_DIRECTION]):
                 inputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
-                    variable_costs=get_item_if_list(
-                        dict_asset[DISPATCH_PRICE][VALUE], i
-                    ),
+                    variable_costs=get_item_if_list(asset_record.dispatch_price, i),
                     investment=investment if bus == investment_bus else None,
                 )
 
@@ -771,7 +922,7 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
             }
 
             efficiencies = {}
-            for i, efficiency in enumerate(dict_asset[EFFICIENCY][VALUE]):
+            for i, efficiency in enumerate(asset_record.efficiency):
                 efficiencies[kwargs[OEMOF_BUSSES][dict_asset[INFLOW_DIRECTION][i]]] = (
                     efficiency
                 )
@@ -806,7 +957,7 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
             efficiencies = {}
 
             for i, (bus, efficiency) in enumerate(
-                zip(dict_asset[OUTFLOW_DIRECTION], dict_asset[EFFICIENCY][VALUE])
+                zip(dict_asset[OUTFLOW_DIRECTION], asset_record.efficiency)
             ):
 
                 outputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
@@ -874,23 +1025,21 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
             outputs = {
                 kwargs[OEMOF_BUSSES][bus]: solph.Flow(
                     investment=investment if bus == investment_bus else None,
-                    variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
-                    max=dict_asset[AVAILABILITY_DISPATCH].values,
+                    variable_costs=asset_record.dispatch_price,
+                    max=asset_record.availability,
                 )
             }
         else:
             outputs = {
                 kwargs[OEMOF_BUSSES][bus]: solph.Flow(
                     investment=investment if bus == investment_bus else None,
-                    variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                    variable_costs=asset_record.dispatch_price,
                     **min_load_opts,
                 )
             }
 
         efficiencies = {
-            kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: dict_asset[EFFICIENCY][
-                VALUE
-            ]
+            kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: asset_record.efficiency
         }
 
     if missing_dispatch_prices_or_efficiencies is None:
@@ -920,6 +1069,7 @@ def storage_fix(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the storage object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     storage = solph.components.GenericStorage(
         label=dict_asset[LABEL],
         nominal_storage_capacity=dict_asset[STORAGE_CAPACITY][INSTALLED_CAP][
@@ -931,7 +1081,7 @@ def storage_fix(model, dict_asset, **kwargs):
                     VALUE
                 ],  # limited through installed capacity, NOT c-rate
                 # might be too much
-                variable_costs=dict_asset[INPUT_POWER][DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.input_power.dispatch_price,
             )
         },  # maximum charge possible in one timestep
         outputs={
@@ -939,7 +1089,7 @@ def storage_fix(model, dict_asset, **kwargs):
                 nominal_value=dict_asset[OUTPUT_POWER][INSTALLED_CAP][
                     VALUE
                 ],  # limited through installed capacity, NOT c-rate #todo actually, if we only have a lithium battery... crate should suffice? i mean, with crate fixed AND fixed power, this is defined two times
-                variable_costs=dict_asset[OUTPUT_POWER][DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.output_power.dispatch_price,
             )
         },  # maximum discharge possible in one timestep
         loss_rate=1
@@ -957,10 +1107,8 @@ def storage_fix(model, dict_asset, **kwargs):
         initial_storage_level=dict_asset[STORAGE_CAPACITY][SOC_INITIAL][
             VALUE
         ],  # in terms of SOC
-        inflow_conversion_factor=dict_asset[INPUT_POWER][EFFICIENCY][
-            VALUE
-        ],  # storing efficiency
-        outflow_conversion_factor=dict_asset[OUTPUT_POWER][EFFICIENCY][VALUE],
+        inflow_conversion_factor=asset_record.input_power.efficiency,  # storing efficiency
+        outflow_conversion_factor=asset_record.output_power.efficiency,
     )  # efficiency of discharge
     model.add(storage)
     kwargs[OEMOF_GEN_STORAGE].update({dict_asset[LABEL]: storage})
@@ -1004,6 +1152,7 @@ def storage_optimize(model, dict_asset, **kwargs):
             if sum(dict_asset[STORAGE_CAPACITY][losses][VALUE]) != 0:
                 minimum = 1
 
+    asset_record = get_asset_record(dict_asset, **kwargs)
     storage = solph.components.GenericStorage(
         label=dict_asset[LABEL],
         investment=solph.Investment(
@@ -1021,7 +1170,7 @@ def storage_optimize(model, dict_asset, **kwargs):
                         VALUE
                     ],  # todo: `existing needed here?`
                 ),
-                variable_costs=dict_asset[INPUT_POWER][DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.input_power.dispatch_price,
             )
         },  # maximum charge power
         outputs={
@@ -1033,7 +1182,7 @@ def storage_optimize(model, dict_asset, **kwargs):
                         VALUE
                     ],  # todo: `existing needed here?`
                 ),
-                variable_costs=dict_asset[OUTPUT_POWER][DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.output_power.dispatch_price,
             )
         },  # maximum discharge power
         loss_rate=1
@@ -1045,12 +1194,8 @@ def storage_optimize(model, dict_asset, **kwargs):
         initial_storage_level=dict_asset[STORAGE_CAPACITY][SOC_INITIAL][
             VALUE
         ],  # in terms of SOC #implication: balanced = True, ie. start=end
-        inflow_conversion_factor=dict_asset[INPUT_POWER][EFFICIENCY][
-            VALUE
-        ],  # storing efficiency
-        outflow_conversion_factor=dict_asset[OUTPUT_POWER][EFFICIENCY][
-            VALUE
-        ],  # efficiency of discharge
+        inflow_conversion_factor=asset_record.input_power.efficiency,  # storing efficiency
+        outflow_conversion_factor=asset_record.output_power.efficiency,  # efficiency of discharge
         invest_relation_input_capacity=dict_asset[INPUT_POWER][C_RATE][VALUE],
         # storage can be charged with invest_relation_output_capacity*capacity in one timeperiod
         invest_relation_output_capacity=dict_asset[OUTPUT_POWER][C_RATE][VALUE],
@@ -1076,11 +1221,12 @@ def source_non_dispatchable_fix(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the source object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     outputs = {
         kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
-            fix=dict_asset[TIMESERIES],
+            fix=asset_record.timeseries,
             nominal_value=dict_asset[INSTALLED_CAP][VALUE],
-            variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+            variable_costs=asset_record.dispatch_price,
             custom_attributes=dict(emission_factor=dict_asset[EMISSION_FACTOR][VALUE]),
         )
     }
@@ -1120,9 +1266,10 @@ def source_non_dispatchable_optimize(model, dict_asset, **kwargs):
         existing = dict_asset[INSTALLED_CAP_NORMALIZED][VALUE]
     else:
         existing = dict_asset[INSTALLED_CAP][VALUE]
+    asset_record = get_asset_record(dict_asset, **kwargs)
     outputs = {
         kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
-            fix=dict_asset[TIMESERIES_NORMALIZED],
+            fix=asset_record.timeseries_normalized,
             investment=solph.Investment(
                 ep_costs=dict_asset[SIMULATION_ANNUITY][VALUE]
                 / dict_asset[TIMESERIES_PEAK][VALUE],
@@ -1130,7 +1277,7 @@ def source_non_dispatchable_optimize(model, dict_asset, **kwargs):
                 existing=existing,
             ),
             # variable_costs are devided by time series peak as normalized time series are used as actual_value
-            variable_costs=dict_asset[DISPATCH_PRICE][VALUE]
+            variable_costs=asset_record.dispatch_price
             / dict_asset[TIMESERIES_PEAK][VALUE],
             # add emission_factor for emission contraint
             custom_attributes=dict(emission_factor=dict_asset[EMISSION_FACTOR][VALUE]),
@@ -1165,10 +1312,11 @@ def source_dispatchable_optimize(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the source object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     if TIMESERIES_NORMALIZED in dict_asset:
         outputs = {
             kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
-                max=dict_asset[TIMESERIES_NORMALIZED],
+                max=asset_record.timeseries_normalized,
                 investment=solph.Investment(
                     ep_costs=dict_asset[SIMULATION_ANNUITY][VALUE]
                     / dict_asset[TIMESERIES_PEAK][VALUE],
@@ -1176,7 +1324,7 @@ def source_dispatchable_optimize(model, dict_asset, **kwargs):
                     existing=dict_asset[INSTALLED_CAP][VALUE],
                 ),
                 # variable_costs are devided by time series peak as normalized time series are used as actual_value
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE]
+                variable_costs=asset_record.dispatch_price
                 / dict_asset[TIMESERIES_PEAK][VALUE],
                 # add emission_factor for emission contraint
                 custom_attributes=dict(
@@ -1205,7 +1353,7 @@ def source_dispatchable_optimize(model, dict_asset, **kwargs):
                     existing=dict_asset[INSTALLED_CAP][VALUE],
                     maximum=dict_asset[MAXIMUM_ADD_CAP][VALUE],
                 ),
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.dispatch_price,
                 # add emission_factor for emission contraint
                 custom_attributes=dict(
                     emission_factor=dict_asset[EMISSION_FACTOR][VALUE],
@@ -1240,12 +1388,13 @@ def source_dispatchable_fix(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the source object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     if TIMESERIES_NORMALIZED in dict_asset:
         outputs = {
             kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
-                max=dict_asset[TIMESERIES_NORMALIZED],
+                max=asset_record.timeseries_normalized,
                 nominal_value=dict_asset[INSTALLED_CAP][VALUE],
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.dispatch_price,
                 # add emission_factor for emission contraint
                 custom_attributes=dict(
                     emission_factor=dict_asset[EMISSION_FACTOR][VALUE]
@@ -1269,7 +1418,7 @@ def source_dispatchable_fix(model, dict_asset, **kwargs):
         outputs = {
             kwargs[OEMOF_BUSSES][dict_asset[OUTFLOW_DIRECTION]]: solph.Flow(
                 nominal_value=dict_asset[INSTALLED_CAP][VALUE],
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.dispatch_price,
             )
         }
         source_dispatchable = solph.components.Source(
@@ -1303,20 +1452,21 @@ def sink_dispatchable_optimize(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the sink object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     # check if the sink has multiple input busses
     if isinstance(dict_asset[INFLOW_DIRECTION], list):
         inputs = {}
         index = 0
         for bus in dict_asset[INFLOW_DIRECTION]:
             inputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE][index],
+                variable_costs=asset_record.dispatch_price[index],
                 investment=solph.Investment(),
             )
             index += 1
     else:
         inputs = {
             kwargs[OEMOF_BUSSES][dict_asset[INFLOW_DIRECTION]]: solph.Flow(
-                variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
+                variable_costs=asset_record.dispatch_price,
                 investment=solph.Investment(),
             )
         }
@@ -1350,19 +1500,20 @@ def sink_non_dispatchable(model, dict_asset, **kwargs):
     Indirectly updated `model` and dict of asset in `kwargs` with the sink object.
 
     """
+    asset_record = get_asset_record(dict_asset, **kwargs)
     # check if the sink has multiple input busses
     if isinstance(dict_asset[INFLOW_DIRECTION], list):
         inputs = {}
         index = 0
         for bus in dict_asset[INFLOW_DIRECTION]:
             inputs[kwargs[OEMOF_BUSSES][bus]] = solph.Flow(
-                fix=dict_asset[TIMESERIES], nominal_value=1
+                fix=asset_record.timeseries, nominal_value=1
             )
             index += 1
     else:
         inputs = {
             kwargs[OEMOF_BUSSES][dict_asset[INFLOW_DIRECTION]]: solph.Flow(
-                fix=dict_asset[TIMESERIES], nominal_value=1
+                fix=asset_record.timeseries, nominal_value=1
             )
         }
 
@@ -1396,7 +1547,7 @@ def sink_demand_reduction(model, dict_asset, **kwargs):
 
     """
     demand_reduction_factor = 1 - dict_asset[EFFICIENCY][VALUE]
-    tot_demand = dict_asset[TIMESERIES]
+    tot_demand = get_asset_record(dict_asset, **kwargs).timeseries
     non_critical_demand_ts = tot_demand * demand_reduction_factor
     non_critical_demand_peak = non_critical_demand_ts.max()
     if non_critical_demand_peak == 0:
@@ -13,6 +13,7 @@ constraints should be tested in-code (examples) and by comparing the lp file gen
 import logging
 import pyomo.environ as po
 from oemof.solph import constraints
+from oemof.solph import sequence
 
 from multi_vector_simulator.utils.constants import DEFAULT_WEIGHTS_ENERGY_CARRIERS
 
@@ -38,6 +39,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     MINIMAL_DEGREE_OF_AUTONOMY,
     DSO_FEEDIN,
     NET_ZERO_ENERGY,
+    SIMULATION_SETTINGS,
+    TIMESTEP_WEIGHTS,
 )
 
 # Keys for dicts renewable_assets and non_renewable_assets
@@ -47,6 +50,49 @@ RENEWABLE_SHARE_ASSET_FLOW = "renewable_share_asset_flow"
 OEMOF_SOLPH_OBJECT_BUS = "oemof_solph_object_bus"
 
 
+def flow_sum(model, dict_values, flow_input, flow_output):
+    r"""
+    Sum of a flow of the energy system model over all timesteps
+
+    If the energy system is reduced to typical periods (see D3), the flow of each timestep is
+    weighted by the number of timesteps it represents.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model to which constraint is added.
+
+    dict_values: dict
+        All simulation parameters
+
+    flow_input: :oemof-solph: <oemof.solph.node>
+        Node from which the flow originates
+
+    flow_output: :oemof-solph: <oemof.solph.node>
+        Node to which the flow goes
+
+    Returns
+    -------
+    pyomo expression of the sum of the flow
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_flow_sum_weighted_with_timestep_weights()
+    """
+    timestep_weights = dict_values.get(SIMULATION_SETTINGS, {}).get(
+        TIMESTEP_WEIGHTS, None
+    )
+    if timestep_weights is None:
+        answer = sum(model.flow[flow_input, flow_output, :, :])
+    else:
+        answer = sum(
+            model.flow[flow_input, flow_output, p, t] * timestep_weights[t]
+            for p, t in model.TIMEINDEX
+        )
+    return answer
+
+
 def add_constraints(local_energy_system, dict_values, dict_model):
     r"""
     Adds all constraints activated in constraints.csv to the energy system model.
@@ -128,14 +174,40 @@ def constraint_maximum_emissions(model, dict_values, dict_model=None):
 
     Notes
     -----
+    If the energy system is reduced to typical periods (see D3), the emissions of each timestep
+    are weighted by the number of timesteps it represents, as in :py:func:`~.flow_sum`. The
+    emission factors of the flows are not changed.
+
     Tested with:
     - D2.test_constraint_maximum_emissions()
+    - D2.test_constraint_maximum_emissions_weighted_with_timestep_weights()
 
     """
     maximum_emissions = dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE]
     if maximum_emissions is not None:
-        # Updates the model with the constraint for maximum amount of emissions
-        constraints.emission_limit(model, limit=maximum_emissions)
+        timestep_weights = dict_values.get(SIMULATION_SETTINGS, {}).get(
+            TIMESTEP_WEIGHTS, None
+        )
+        if timestep_weights is None:
+            # Updates the model with the constraint for maximum amount of emissions
+            constraints.emission_limit(model, limit=maximum_emissions)
+        else:
+            # the energy system is reduced to typical periods, the emissions of each timestep
+            # are weighted by the number of timesteps it represents
+            model.integral_limit_emission_factor = po.Expression(
+                expr=sum(
+                    model.flow[flow_input, flow_output, p, t]
+                    * model.timeincrement[t]
+                    * sequence(flow.emission_factor)[t]
+                    * timestep_weights[t]
+                    for (flow_input, flow_output), flow in model.flows.items()
+                    if hasattr(flow, "emission_factor")
+                    for p, t in model.TIMEINDEX
+                )
+            )
+            model.integral_limit_emission_factor_constraint = po.Constraint(
+                expr=(model.integral_limit_emission_factor <= maximum_emissions)
+            )
         logging.info("Added maximum emission constraint.")
         answer = model
     else:
@@ -191,13 +263,11 @@ def constraint_minimal_renewable_share(model, dict_values, dict_model):
             # Get the flows from all renewable assets
             for asset in renewable_assets:
                 generation = (
-                    sum(
-                        model.flow[
-                            renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
+                        renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
                     )
                     * renewable_assets[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                     * renewable_assets[asset][RENEWABLE_SHARE_ASSET_FLOW]
@@ -208,13 +278,11 @@ def constraint_minimal_renewable_share(model, dict_values, dict_model):
             # Get the flows from all non renewable assets
             for asset in non_renewable_assets:
                 generation = (
-                    sum(
-                        model.flow[
-                            non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_ASSET],
+                        non_renewable_assets[asset][OEMOF_SOLPH_OBJECT_BUS],
                     )
                     * non_renewable_assets[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                     * (1 - non_renewable_assets[asset][RENEWABLE_SHARE_ASSET_FLOW])
@@ -454,13 +522,11 @@ def constraint_minimal_degree_of_autonomy(model, dict_values, dict_model):
             for asset in demands:
 
                 demand_one_asset = (
-                    sum(
-                        model.flow[
-                            demands[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            demands[asset][OEMOF_SOLPH_OBJECT_ASSET],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        demands[asset][OEMOF_SOLPH_OBJECT_BUS],
+                        demands[asset][OEMOF_SOLPH_OBJECT_ASSET],
                     )
                     * demands[asset][WEIGHTING_FACTOR_ENERGY_CARRIER]
                 )
@@ -469,17 +535,15 @@ def constraint_minimal_degree_of_autonomy(model, dict_values, dict_model):
             # Get the flows from providers and add weighing
             for asset in energy_provider_consumption_sources:
                 consumption_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_BUS
-                            ],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_ASSET
+                        ],
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_BUS
+                        ],
                     )
                     * energy_provider_consumption_sources[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
@@ -751,17 +815,15 @@ def constraint_net_zero_energy(model, dict_values, dict_model):
             # Get the flows from provider sources and add weighing
             for asset in energy_provider_consumption_sources:
                 consumption_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            energy_provider_consumption_sources[asset][
-                                OEMOF_SOLPH_OBJECT_BUS
-                            ],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_ASSET
+                        ],
+                        energy_provider_consumption_sources[asset][
+                            OEMOF_SOLPH_OBJECT_BUS
+                        ],
                     )
                     * energy_provider_consumption_sources[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
@@ -772,15 +834,11 @@ def constraint_net_zero_energy(model, dict_values, dict_model):
             # Get the flows from provider sources and add weighing
             for asset in energy_provider_feedin_sinks:
                 feedin_of_one_provider = (
-                    sum(
-                        model.flow[
-                            energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_BUS],
-                            energy_provider_feedin_sinks[asset][
-                                OEMOF_SOLPH_OBJECT_ASSET
-                            ],
-                            :,
-                            :,
-                        ]
+                    flow_sum(
+                        model,
+                        dict_values,
+                        energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_BUS],
+                        energy_provider_feedin_sinks[asset][OEMOF_SOLPH_OBJECT_ASSET],
                     )
                     * energy_provider_feedin_sinks[asset][
                         WEIGHTING_FACTOR_ENERGY_CARRIER
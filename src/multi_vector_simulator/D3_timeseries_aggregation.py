@@ -0,0 +1,437 @@
+r"""
+Module D3 - Timeseries aggregation
+==================================
+
+Module D3 reduces the number of timesteps of the optimization by aggregating the timeseries of
+the energy system into typical periods (e.g. typical days):
+- cluster the periods of all input timeseries into a given number of typical periods
+- reduce the timeseries of the energy system to the sequence of typical periods
+- weight each timestep of the reduced energy system by the number of timesteps it represents
+- expand the results of the optimization of the reduced energy system back to the full
+  simulation period
+
+The aggregation is only performed if the parameter TYPICAL_PERIODS is provided in the simulation
+settings, the length of a typical period is set in hours with the optional parameter
+TYPICAL_PERIOD_LENGTH (default: DEFAULT_TYPICAL_PERIOD_LENGTH).
+
+The periods are clustered with a k-medoids algorithm, the typical periods are therefore actual
+periods of the simulation. The first typical period is the most central one, the next ones are
+chosen to be the most distant to the already chosen typical periods, so that extreme periods
+(e.g. the day of the peak demand) are likely to be represented.
+
+Storages are modelled over the sequence of typical periods, their state of charge is therefore
+only an approximation of the one of the full simulation period.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from multi_vector_simulator.utils.constants import DEFAULT_TYPICAL_PERIOD_LENGTH
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    TIME_INDEX,
+    TIMESTEP,
+    PERIODS,
+    TYPICAL_PERIODS,
+    TYPICAL_PERIOD_LENGTH,
+    TIMESTEP_WEIGHTS,
+    PERIOD_ORDER,
+)
+
+# keys of the dict_values which are not inputs of the energy system model
+NON_MODEL_KEYS = (SIMULATION_SETTINGS, SIMULATION_RESULTS)
+
+
+def get_typical_periods_settings(simulation_settings):
+    r"""
+    Get the number and length of the typical periods requested in the simulation settings
+
+    Parameters
+    ----------
+    simulation_settings: dict
+        Simulation settings of dict_values
+
+    Returns
+    -------
+    Tuple with the number of typical periods and their length in number of timesteps, None if
+    no aggregation is requested or if it would not reduce the number of timesteps
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D3_timeseries_aggregation.TestTypicalPeriodsSettings
+    """
+    number_of_periods = simulation_settings.get(TYPICAL_PERIODS, {}).get(VALUE, None)
+    if not number_of_periods:
+        return None
+
+    period_length = simulation_settings.get(TYPICAL_PERIOD_LENGTH, {}).get(
+        VALUE, DEFAULT_TYPICAL_PERIOD_LENGTH
+    )
+    timesteps_per_period = period_length * 60 / simulation_settings[TIMESTEP][VALUE]
+    if timesteps_per_period != int(timesteps_per_period) or timesteps_per_period < 1:
+        raise ValueError(
+            f"The {TYPICAL_PERIOD_LENGTH} ({period_length} hours) must be a multiple of the "
+            f"{TIMESTEP} of the simulation ({simulation_settings[TIMESTEP][VALUE]} minutes)."
+        )
+    timesteps_per_period = int(timesteps_per_period)
+
+    number_of_timesteps = len(simulation_settings[TIME_INDEX])
+    if int(number_of_periods) * timesteps_per_period >= number_of_timesteps:
+        logging.info(
+            f"The {number_of_periods} typical periods of {period_length} hours would cover "
+            f"the whole simulation period, the timeseries are therefore not aggregated."
+        )
+        return None
+
+    return int(number_of_periods), timesteps_per_period
+
+
+def iterate_timeseries(a_dict, number_of_timesteps):
+    r"""
+    Yield all timeseries of an energy system
+
+    Parameters
+    ----------
+    a_dict: dict or list
+        Nested structure of dict_values which is explored recursively
+    number_of_timesteps: int
+        Number of timesteps of the simulation, only pandas.Series of this length are considered
+        to be timeseries
+
+    Yields
+    ------
+    :pandas:`pandas.Series<series>`
+    """
+    if isinstance(a_dict, dict):
+        values = a_dict.values()
+    elif isinstance(a_dict, list):
+        values = a_dict
+    else:
+        values = []
+    for value in values:
+        if isinstance(value, pd.Series):
+            if len(value) == number_of_timesteps:
+                yield value
+        else:
+            yield from iterate_timeseries(value, number_of_timesteps)
+
+
+def cluster_periods(timeseries, number_of_periods, timesteps_per_period):
+    r"""
+    Cluster the periods of timeseries into typical periods with a k-medoids algorithm
+
+    Parameters
+    ----------
+    timeseries: :numpy:`numpy.ndarray`
+        Array of shape (number of timeseries, number of timesteps)
+    number_of_periods: int
+        Number of typical periods
+    timesteps_per_period: int
+        Number of timesteps of a period
+
+    Returns
+    -------
+    Tuple with the indexes of the periods chosen as typical periods (in chronological order) and
+    the index of the typical period representing each period of the simulation. If the number of
+    timesteps is not a multiple of the period length, the last, incomplete, period is represented
+    by the typical period whose first timesteps are the closest to it.
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D3_timeseries_aggregation.TestClusterPeriods
+    """
+    timeseries = np.atleast_2d(np.asarray(timeseries, dtype=float))
+    number_of_timesteps = timeseries.shape[1]
+
+    # scale all timeseries between 0 and 1 so that they have the same influence on the clusters
+    minimum = timeseries.min(axis=1, keepdims=True)
+    spread = timeseries.max(axis=1, keepdims=True) - minimum
+    spread[spread == 0] = 1
+    timeseries = (timeseries - minimum) / spread
+
+    number_of_full_periods = number_of_timesteps // timesteps_per_period
+    number_of_periods = min(number_of_periods, number_of_full_periods)
+    features = (
+        timeseries[:, : number_of_full_periods * timesteps_per_period]
+        .reshape(timeseries.shape[0], number_of_full_periods, timesteps_per_period)
+        .transpose(1, 0, 2)
+        .reshape(number_of_full_periods, -1)
+    )
+
+    squared_norms = (features**2).sum(axis=1)
+    distances = (
+        squared_norms[:, None] + squared_norms[None, :] - 2 * features @ features.T
+    )
+    distances = np.maximum(distances, 0)
+
+    # initial medoids: the most central period, then the periods the most distant to the
+    # already chosen medoids
+    medoids = [int(distances.sum(axis=1).argmin())]
+    while len(medoids) < number_of_periods:
+        distance_to_medoids = distances[:, medoids].min(axis=1)
+        if distance_to_medoids.max() == 0:
+            # all remaining periods are identical to one of the medoids
+            break
+        medoids.append(int(distance_to_medoids.argmax()))
+    medoids = np.array(medoids)
+
+    for _ in range(100):
+        labels = distances[:, medoids].argmin(axis=1)
+        new_medoids = medoids.copy()
+        for cluster in range(len(medoids)):
+            members = np.flatnonzero(labels == cluster)
+            if len(members) > 0:
+                within_distances = distances[np.ix_(members, members)].sum(axis=1)
+                new_medoids[cluster] = members[within_distances.argmin()]
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids = new_medoids
+
+    # sort the typical periods chronologically
+    order = np.argsort(medoids)
+    typical_periods = medoids[order]
+    period_order = np.argsort(order)[distances[:, medoids].argmin(axis=1)]
+
+    remaining_timesteps = (
+        number_of_timesteps - number_of_full_periods * timesteps_per_period
+    )
+    if remaining_timesteps > 0:
+        last_period = timeseries[:, number_of_full_periods * timesteps_per_period :]
+        deviations = [
+            (
+                (last_period - timeseries[:, start : start + remaining_timesteps]) ** 2
+            ).sum()
+            for start in typical_periods * timesteps_per_period
+        ]
+        period_order = np.append(period_order, int(np.argmin(deviations)))
+
+    return typical_periods, period_order
+
+
+def get_reduced_positions(period_order, timesteps_per_period, number_of_timesteps):
+    r"""
+    Position of the timestep of the reduced energy system representing each original timestep
+
+    Parameters
+    ----------
+    period_order: list
+        Index of the typical period representing each period of the simulation
+    timesteps_per_period: int
+        Number of timesteps of a period
+    number_of_timesteps: int
+        Number of timesteps of the simulation
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray` of length number_of_timesteps
+    """
+    positions = (
+        np.asarray(period_order)[:, None] * timesteps_per_period
+        + np.arange(timesteps_per_period)[None, :]
+    ).flatten()
+    return positions[:number_of_timesteps]
+
+
+def aggregate_timeseries(dict_values):
+    r"""
+    Cluster the timeseries of the energy system into typical periods, if requested
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs, after processing by C0
+
+    Returns
+    -------
+    A dict with the indexes of the typical periods (TYPICAL_PERIODS), the typical period
+    representing each period of the simulation (PERIOD_ORDER) and the length of the periods in
+    timesteps (TYPICAL_PERIOD_LENGTH), None if no aggregation is requested
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D3_timeseries_aggregation.TestAggregateTimeseries
+    """
+    settings = get_typical_periods_settings(dict_values[SIMULATION_SETTINGS])
+    if settings is None:
+        return None
+    number_of_periods, timesteps_per_period = settings
+
+    number_of_timesteps = len(dict_values[SIMULATION_SETTINGS][TIME_INDEX])
+    timeseries = []
+    for key in dict_values:
+        if key not in NON_MODEL_KEYS:
+            timeseries.extend(
+                ts.to_numpy(dtype=float)
+                for ts in iterate_timeseries(dict_values[key], number_of_timesteps)
+            )
+    if len(timeseries) == 0:
+        logging.info("The energy system has no timeseries to aggregate.")
+        return None
+
+    typical_periods, period_order = cluster_periods(
+        np.vstack(timeseries), number_of_periods, timesteps_per_period
+    )
+    logging.info(
+        f"The {len(timeseries)} timeseries of the energy system were aggregated into "
+        f"{len(typical_periods)} typical periods of {timesteps_per_period} timesteps."
+    )
+    return {
+        TYPICAL_PERIODS: typical_periods.tolist(),
+        PERIOD_ORDER: period_order.tolist(),
+        TYPICAL_PERIOD_LENGTH: timesteps_per_period,
+    }
+
+
+def reduce_timeseries(a_dict, number_of_timesteps, positions, time_index):
+    r"""
+    Copy a nested structure of dict_values with its timeseries reduced to the typical periods
+
+    The dicts and lists are copied, the other values are not.
+
+    Parameters
+    ----------
+    a_dict: variable
+        In the recursion, this is either a dict or list (moving down one nesting level) or a
+        field value
+    number_of_timesteps: int
+        Number of timesteps of the simulation
+    positions: :numpy:`numpy.ndarray`
+        Positions of the timesteps of the typical periods within the simulation period
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the reduced timeseries
+
+    Returns
+    -------
+    Copy of a_dict
+    """
+    if isinstance(a_dict, dict):
+        answer = {
+            k: reduce_timeseries(v, number_of_timesteps, positions, time_index)
+            for k, v in a_dict.items()
+        }
+    elif isinstance(a_dict, list):
+        answer = [
+            reduce_timeseries(v, number_of_timesteps, positions, time_index)
+            for v in a_dict
+        ]
+    elif isinstance(a_dict, pd.Series) and len(a_dict) == number_of_timesteps:
+        answer = pd.Series(
+            a_dict.to_numpy()[positions], index=time_index, name=a_dict.name
+        )
+    else:
+        answer = a_dict
+    return answer
+
+
+def reduce_dict_values(dict_values, aggregation):
+    r"""
+    Build the simulation inputs of the energy system reduced to its typical periods
+
+    The time index of the reduced energy system has the frequency of the simulation and starts
+    at the start date of the simulation, the typical periods follow each other chronologically.
+    The weight of each timestep (number of timesteps of the simulation it represents) is
+    stored under TIMESTEP_WEIGHTS in the simulation settings of the reduced energy system.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs, after processing by C0
+    aggregation: dict
+        Typical periods, as returned by :py:func:`~.aggregate_timeseries`
+
+    Returns
+    -------
+    Copy of dict_values with reduced timeseries, dict_values is not modified
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D3_timeseries_aggregation.TestAggregateTimeseries
+    """
+    full_time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    number_of_timesteps = len(full_time_index)
+    timesteps_per_period = aggregation[TYPICAL_PERIOD_LENGTH]
+
+    # positions of the timesteps of the typical periods within the simulation period
+    positions = (
+        np.asarray(aggregation[TYPICAL_PERIODS])[:, None] * timesteps_per_period
+        + np.arange(timesteps_per_period)[None, :]
+    ).flatten()
+    time_index = pd.date_range(
+        start=full_time_index[0],
+        periods=len(positions),
+        freq=full_time_index.freq
+        or pd.Timedelta(minutes=dict_values[SIMULATION_SETTINGS][TIMESTEP][VALUE]),
+    )
+
+    answer = {}
+    for key in dict_values:
+        if key in NON_MODEL_KEYS:
+            answer[key] = dict(dict_values[key])
+        else:
+            answer[key] = reduce_timeseries(
+                dict_values[key], number_of_timesteps, positions, time_index
+            )
+
+    answer[SIMULATION_SETTINGS][TIME_INDEX] = time_index
+    answer[SIMULATION_SETTINGS][PERIODS] = len(time_index)
+    answer[SIMULATION_SETTINGS][TIMESTEP_WEIGHTS] = np.bincount(
+        get_reduced_positions(
+            aggregation[PERIOD_ORDER], timesteps_per_period, number_of_timesteps
+        ),
+        minlength=len(time_index),
+    )
+    return answer
+
+
+def expand_results(results_main, aggregation, time_index):
+    r"""
+    Expand the oemof results of the reduced energy system to the whole simulation period
+
+    Each period of the simulation takes the results of the typical period representing it.
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results of the reduced energy system, as output by processing.results()
+    aggregation: dict
+        Typical periods, as returned by :py:func:`~.aggregate_timeseries`
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the simulation
+
+    Returns
+    -------
+    The oemof simulation results with sequences on the time index of the simulation (and the
+    timestep inferred after its end, as for oemof results)
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D3_timeseries_aggregation.TestExpandResults
+    """
+    positions = get_reduced_positions(
+        aggregation[PERIOD_ORDER], aggregation[TYPICAL_PERIOD_LENGTH], len(time_index)
+    )
+    number_of_reduced_timesteps = (
+        len(aggregation[TYPICAL_PERIODS]) * aggregation[TYPICAL_PERIOD_LENGTH]
+    )
+    # oemof sequences contain one more timestep than the time index, it is kept as last value
+    positions = np.append(positions, number_of_reduced_timesteps)
+    frequency = time_index.freq or (time_index[1] - time_index[0])
+    full_index = time_index.append(pd.DatetimeIndex([time_index[-1] + frequency]))
+
+    answer = {}
+    for key, results in results_main.items():
+        sequences = results["sequences"]
+        if len(sequences.index) == number_of_reduced_timesteps + 1:
+            sequences = sequences.iloc[positions]
+            sequences.index = full_index
+        answer[key] = dict(results, sequences=sequences)
+    return answer
@@ -0,0 +1,508 @@
+r"""
+Module D4 - Rolling horizon
+===========================
+
+Module D4 splits the optimization of the dispatch of an energy system into consecutive windows
+of the simulation period, which are optimized one after the other (rolling horizon):
+- get the windows of the simulation period from the length and overlap requested in the
+  simulation settings
+- check that the energy system is a pure dispatch problem, ie. that no capacity is optimized at a
+  cost, that the storage capacities are fixed and that no constraint is defined over the whole
+  simulation period
+- build the simulation inputs of each window, the storage levels at the start of a window are the
+  ones reached at the same timestep in the previous window
+- stitch the results of the windows back into results for the whole simulation period
+
+The rolling horizon is only applied if the parameter ROLLING_HORIZON_WINDOW is provided in the
+simulation settings, in hours. The optional parameter ROLLING_HORIZON_OVERLAP (in hours, default:
+DEFAULT_ROLLING_HORIZON_OVERLAP) extends each window beyond the start of the next one, so that
+the dispatch at the end of a window anticipates the following timesteps. Only the results of the
+timesteps up to the start of the next window are kept.
+
+As the memory needed to build and solve the model grows with its number of timesteps, long
+simulation periods with small timesteps can be simulated with a bounded memory use.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+
+from multi_vector_simulator.D3_timeseries_aggregation import (
+    NON_MODEL_KEYS,
+    reduce_timeseries,
+)
+from multi_vector_simulator.utils.constants import DEFAULT_ROLLING_HORIZON_OVERLAP
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    LABEL,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    TIMESTEP,
+    PERIODS,
+    CONSTRAINTS,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    STORAGE_CAPACITY,
+    OPTIMIZE_CAP,
+    SIMULATION_ANNUITY,
+    INSTALLED_CAP,
+    SOC_INITIAL,
+    OEMOF_GEN_STORAGE,
+    ROLLING_HORIZON_WINDOW,
+    ROLLING_HORIZON_OVERLAP,
+)
+
+# name of the sequence of the storage levels in the oemof results
+STORAGE_CONTENT = "storage_content"
+
+
+def get_rolling_horizon_settings(simulation_settings):
+    r"""
+    Get the length and the overlap of the windows requested in the simulation settings
+
+    Parameters
+    ----------
+    simulation_settings: dict
+        Simulation settings of dict_values
+
+    Returns
+    -------
+    Tuple with the length and the overlap of the windows in number of timesteps, None if no
+    rolling horizon is requested or if a window would cover the whole simulation period
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestRollingHorizonSettings
+    """
+    window_length = simulation_settings.get(ROLLING_HORIZON_WINDOW, {}).get(VALUE, None)
+    if not window_length:
+        return None
+    overlap_length = simulation_settings.get(ROLLING_HORIZON_OVERLAP, {}).get(
+        VALUE, DEFAULT_ROLLING_HORIZON_OVERLAP
+    )
+
+    timestep = simulation_settings[TIMESTEP][VALUE]
+    answer = []
+    for parameter, length in (
+        (ROLLING_HORIZON_WINDOW, window_length),
+        (ROLLING_HORIZON_OVERLAP, overlap_length),
+    ):
+        timesteps = length * 60 / timestep
+        if timesteps != int(timesteps) or timesteps < 0:
+            raise ValueError(
+                f"The {parameter} ({length} hours) must be a multiple of the {TIMESTEP} of the "
+                f"simulation ({timestep} minutes)."
+            )
+        answer.append(int(timesteps))
+    window, overlap = answer
+
+    if overlap >= window:
+        raise ValueError(
+            f"The {ROLLING_HORIZON_OVERLAP} ({overlap_length} hours) must be shorter than the "
+            f"{ROLLING_HORIZON_WINDOW} ({window_length} hours)."
+        )
+
+    if window >= len(simulation_settings[TIME_INDEX]):
+        logging.info(
+            f"The window of {window_length} hours of the rolling horizon covers the whole "
+            f"simulation period, the dispatch is therefore optimized at once."
+        )
+        return None
+
+    return window, overlap
+
+
+def get_windows(number_of_timesteps, window, overlap):
+    r"""
+    Split the simulation period into consecutive windows
+
+    Parameters
+    ----------
+    number_of_timesteps: int
+        Number of timesteps of the simulation
+    window: int
+        Length of a window in timesteps
+    overlap: int
+        Number of timesteps of a window after the start of the next window
+
+    Returns
+    -------
+    list of [start, stop, end] positions of the windows, the window covers the timesteps from
+    start to stop (excluded), its results are kept from start to end (excluded), end being the
+    start of the next window
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestWindows
+    """
+    step = window - overlap
+    windows = []
+    start = 0
+    while start < number_of_timesteps:
+        stop = min(start + window, number_of_timesteps)
+        end = number_of_timesteps if stop == number_of_timesteps else start + step
+        windows.append([start, stop, end])
+        start = end
+    return windows
+
+
+def get_period_couplings(dict_values):
+    r"""
+    List what couples the timesteps of the simulation period beyond the storages
+
+    The dispatch can only be optimized window by window if no capacity is optimized at a cost,
+    as the optimal capacity depends on the whole simulation period, if the capacity of the
+    storages is fixed and if no constraint is defined over the whole simulation period.
+    Capacities optimized without costs (e.g. the feed-in and consumption of energy providers
+    without peak demand pricing) do not couple the timesteps.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs, after processing by C0
+
+    Returns
+    -------
+    list of the labels of the assets with capacities coupling the timesteps and of the active
+    constraints, empty if the problem is a pure dispatch problem
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestPeriodCouplings
+    """
+    couplings = []
+    for asset_group in (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_STORAGE):
+        for dict_asset in dict_values.get(asset_group, {}).values():
+            if dict_asset[OPTIMIZE_CAP][VALUE] is False:
+                continue
+            # the levels of a storage are relative to its capacity, which has to be known
+            if (
+                asset_group == ENERGY_STORAGE
+                or dict_asset[SIMULATION_ANNUITY][VALUE] != 0
+            ):
+                couplings.append(dict_asset[LABEL])
+
+    for constraint, dict_constraint in dict_values.get(CONSTRAINTS, {}).items():
+        if dict_constraint[VALUE] not in (None, 0, False):
+            couplings.append(constraint)
+    return couplings
+
+
+def get_rolling_horizon_windows(dict_values):
+    r"""
+    Get the windows of the rolling horizon, if requested and applicable
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs, after processing by C0
+
+    Returns
+    -------
+    list of windows, as returned by :py:func:`~.get_windows`, None if the dispatch is optimized
+    at once
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestPeriodCouplings
+    """
+    settings = get_rolling_horizon_settings(dict_values[SIMULATION_SETTINGS])
+    if settings is None:
+        return None
+
+    couplings = get_period_couplings(dict_values)
+    if len(couplings) > 0:
+        logging.warning(
+            f"The dispatch can not be optimized with a rolling horizon, as the following "
+            f"capacities or constraints depend on the whole simulation period: "
+            f"{', '.join(couplings)}. The whole simulation period is optimized at once."
+        )
+        return None
+
+    window, overlap = settings
+    windows = get_windows(len(dict_values[SIMULATION_SETTINGS][TIME_INDEX]), *settings)
+    logging.info(
+        f"The dispatch is optimized with a rolling horizon of {len(windows)} windows of "
+        f"{window} timesteps (overlap of {overlap} timesteps)."
+    )
+    return windows
+
+
+def window_dict_values(dict_values, window, storage_levels=None):
+    r"""
+    Build the simulation inputs of a window of the simulation period
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs, after processing by C0
+    window: list
+        start, stop and end positions of the window, as returned by :py:func:`~.get_windows`
+    storage_levels: dict
+        Initial storage level (relative to the storage capacity) of each storage, with the
+        labels of the storages as keys, the initial storage levels of dict_values are used if
+        not provided
+        Default: None
+
+    Returns
+    -------
+    Copy of dict_values with the timeseries of the window, dict_values is not modified
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestWindowDictValues
+    """
+    full_time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    number_of_timesteps = len(full_time_index)
+    start, stop = window[0], window[1]
+    positions = np.arange(start, stop)
+    time_index = full_time_index[start:stop]
+
+    answer = {}
+    for key in dict_values:
+        if key in NON_MODEL_KEYS:
+            answer[key] = dict(dict_values[key])
+        else:
+            answer[key] = reduce_timeseries(
+                dict_values[key], number_of_timesteps, positions, time_index
+            )
+
+    answer[SIMULATION_SETTINGS][TIME_INDEX] = time_index
+    answer[SIMULATION_SETTINGS][PERIODS] = len(time_index)
+
+    if storage_levels is not None:
+        for dict_asset in answer.get(ENERGY_STORAGE, {}).values():
+            if dict_asset[LABEL] in storage_levels:
+                dict_asset[STORAGE_CAPACITY][SOC_INITIAL] = dict(
+                    dict_asset[STORAGE_CAPACITY][SOC_INITIAL],
+                    **{VALUE: storage_levels[dict_asset[LABEL]]},
+                )
+    return answer
+
+
+def unbalance_storages(dict_model):
+    r"""
+    Allow the storages of a window to end at another level than the one they start with
+
+    The storages of the oemof model are balanced by default, ie. their level at the end of the
+    simulation period equals their level at its start. Within a rolling horizon, this condition
+    is replaced by a constraint on the level at the end of the last window, see
+    :py:func:`~.add_final_storage_levels`. Storages without initial level (which is then
+    optimized) remain balanced, so that they can not start full for free.
+
+    Parameters
+    ----------
+    dict_model: dict
+        oemof components of the window, the storages have to be added to the energy system but
+        the oemof model must not be built yet
+
+    Returns
+    -------
+    None
+    """
+    for storage in dict_model[OEMOF_GEN_STORAGE].values():
+        if storage.initial_storage_level is not None:
+            storage.balanced = False
+
+
+def add_final_storage_levels(local_energy_system, dict_model, final_levels):
+    r"""
+    Constrain the storage content at the end of the last window
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph:`solph.Model <models>`
+        oemof model of the last window
+    dict_model: dict
+        oemof components of the last window
+    final_levels: dict
+        Storage content at the end of the simulation period, with the labels of the storages as
+        keys, usually the storage content at the start of the first window
+
+    Returns
+    -------
+    Updated local_energy_system
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestRollingHorizonDispatch
+    """
+    storages = {
+        dict_model[OEMOF_GEN_STORAGE][label]: level
+        for label, level in final_levels.items()
+        if label in dict_model[OEMOF_GEN_STORAGE]
+    }
+    if len(storages) == 0:
+        return local_energy_system
+
+    block = local_energy_system.GenericStorageBlock
+    last_timepoint = local_energy_system.TIMEPOINTS.at(-1)
+
+    def final_storage_level_rule(model, storage):
+        return block.storage_content[storage, last_timepoint] == storages[storage]
+
+    local_energy_system.rolling_horizon_final_storage_level = po.Constraint(
+        list(storages), rule=final_storage_level_rule
+    )
+    return local_energy_system
+
+
+def get_storage_levels(results_main, position, storages):
+    r"""
+    Get the storage contents at a timestep of the results of a window
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results of the window, as output by processing.results()
+    position: int
+        Position of the timestep within the window
+    storages: dict
+        Storage assets of dict_values (ENERGY_STORAGE)
+
+    Returns
+    -------
+    Tuple of two dicts with the labels of the storages as keys: their content and their level
+    relative to the storage capacity
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestRollingHorizonDispatch
+    """
+    storage_contents = {}
+    for key, results in results_main.items():
+        if key[1] is None and STORAGE_CONTENT in results["sequences"]:
+            storage_contents[str(key[0])] = float(
+                results["sequences"][STORAGE_CONTENT].iloc[position]
+            )
+
+    contents = {}
+    levels = {}
+    for dict_asset in storages.values():
+        label = dict_asset[LABEL]
+        if label in storage_contents:
+            contents[label] = storage_contents[label]
+            capacity = dict_asset[STORAGE_CAPACITY][INSTALLED_CAP][VALUE]
+            levels[label] = contents[label] / capacity if capacity else 0
+    return contents, levels
+
+
+def get_kept_objective_value(local_energy_system, length):
+    r"""
+    Get the part of the objective value of a window due to the timesteps of which the results are kept
+
+    As no capacity is optimized at a cost within a rolling horizon, the objective value consists
+    of the variable costs of the flows only.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph:`solph.Model <models>`
+        Solved oemof model of the window
+    length: int
+        Number of timesteps of the window of which the results are kept
+
+    Returns
+    -------
+    float, variable costs of the flows over the first timesteps of the window
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestRollingHorizonDispatch
+    """
+    objective_value = 0
+    for i, o in local_energy_system.FLOWS:
+        variable_costs = local_energy_system.flows[i, o].variable_costs
+        if variable_costs[0] is None:
+            continue
+        for p, t in local_energy_system.TIMEINDEX:
+            if t < length:
+                objective_value += (
+                    local_energy_system.flow[i, o, p, t].value
+                    * local_energy_system.objective_weighting[t]
+                    * variable_costs[t]
+                )
+    return objective_value
+
+
+def keep_results(results_main, length):
+    r"""
+    Keep the results of the first timesteps of a window, until the start of the next window
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results of the window, as output by processing.results()
+    length: int
+        Number of timesteps kept, the last row of the sequences (after the last timestep) is kept
+        as well
+
+    Returns
+    -------
+    dict with the labels of the nodes of each result as keys, and the results with their
+    sequences cut as values
+    """
+    answer = {}
+    for key, results in results_main.items():
+        sequences = results["sequences"]
+        answer[(str(key[0]), str(key[1]))] = dict(
+            results, sequences=sequences.iloc[list(range(length)) + [-1]]
+        )
+    return answer
+
+
+def stitch_results(results_main, windows_results):
+    r"""
+    Stitch the results of the windows into results for the whole simulation period
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results of the last window, as output by processing.results(), the
+        keys of the stitched results are taken from them
+    windows_results: list
+        Results kept from each window, as returned by :py:func:`~.keep_results`
+
+    Returns
+    -------
+    The oemof simulation results with sequences on the time index of the simulation (and the
+    timestep inferred after its end, as for oemof results). The scalars of the results (e.g.
+    capacities optimized without cost) are the maximum over all windows.
+
+    Notes
+    -----
+    This function is tested with:
+    - test_D4_rolling_horizon.TestStitchResults
+    """
+    answer = {}
+    for key, results in results_main.items():
+        label_key = (str(key[0]), str(key[1]))
+        window_results = [
+            kept_results[label_key]
+            for kept_results in windows_results
+            if label_key in kept_results
+        ]
+        # the row after the last timestep of each window is only kept for the last window
+        sequences = pd.concat(
+            [window["sequences"].iloc[:-1] for window in window_results]
+            + [window_results[-1]["sequences"].iloc[-1:]]
+        )
+        scalars = [
+            window["scalars"] for window in window_results if len(window["scalars"]) > 0
+        ]
+        if len(scalars) > 0:
+            scalars = pd.concat(scalars, axis=1).max(axis=1)
+        else:
+            scalars = results["scalars"]
+        answer[key] = dict(results, sequences=sequences, scalars=scalars)
+    return answer
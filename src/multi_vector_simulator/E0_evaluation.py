@@ -10,14 +10,15 @@ Module E0 evaluates the oemof results and calculates the KPI
 
 import logging
 
-from oemof import solph
 import pandas as pd
 
+import multi_vector_simulator.D3_timeseries_aggregation as D3
 import multi_vector_simulator.E1_process_results as E1
 import multi_vector_simulator.E2_economics as E2
 import multi_vector_simulator.E3_indicator_calculation as E3
 
 import multi_vector_simulator.E4_verification as E4
+import multi_vector_simulator.E5_kpi_engine as E5
 
 from multi_vector_simulator.utils.constants import SOC
 
@@ -57,6 +58,9 @@ from multi_vector_simulator.utils.constants_json_strings import (
     LIFETIME_PRICE_DISPATCH,
     FLOW,
     COST_DISPATCH,
+    SIMULATION_RESULTS,
+    TIME_INDEX,
+    TYPICAL_PERIODS,
 )
 
 from multi_vector_simulator.utils.constants_output import (
@@ -92,13 +96,24 @@ def evaluate_dict(dict_values, results_main, results_meta):
     - test_E0.evaluation.test_evaluate_dict_fields_values_in_output_dict_are_dataframes()
     """
 
+    aggregation = dict_values.get(SIMULATION_RESULTS, {}).get(TYPICAL_PERIODS, None)
+    if aggregation is not None:
+        # the energy system was reduced to typical periods, its results are expanded to the
+        # whole simulation period so that flows and costs are evaluated over this period
+        results_main = D3.expand_results(
+            results_main, aggregation, dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+        )
+
     initalize_kpi(dict_values)
 
+    # Convert the oemof results once into a matrix of all flows, trimmed with E1.cut_below_micro
+    result_matrix = E1.get_result_matrix(results_main)
+
     bus_data = {}
     # Store all information related to busses in bus_data
     for bus in dict_values[ENERGY_BUSSES]:
         # Read all energy flows from busses
-        bus_data.update({bus: solph.views.node(results_main, bus)})
+        bus_data.update({bus: E1.get_bus_data(result_matrix, bus)})
 
     logging.info("Evaluating optimized capacities and dispatch.")
     # Evaluate timeseries and store to a large DataFrame for each bus:
@@ -108,8 +123,8 @@ def evaluate_dict(dict_values, results_main, results_meta):
     for storage in dict_values[ENERGY_STORAGE]:
         bus_data.update(
             {
-                dict_values[ENERGY_STORAGE][storage][LABEL]: solph.views.node(
-                    results_main,
+                dict_values[ENERGY_STORAGE][storage][LABEL]: E1.get_bus_data(
+                    result_matrix,
                     dict_values[ENERGY_STORAGE][storage][LABEL],
                 )
             }
@@ -120,18 +135,6 @@ def evaluate_dict(dict_values, results_main, results_meta):
             dict_values[ENERGY_STORAGE][storage],
         )
 
-        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
-            E2.get_costs(
-                dict_values[ENERGY_STORAGE][storage][storage_item],
-                dict_values[ECONOMIC_DATA],
-            )
-
-        E2.lcoe_assets(dict_values[ENERGY_STORAGE][storage], ENERGY_STORAGE)
-        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
-            store_result_matrix(
-                dict_values[KPI], dict_values[ENERGY_STORAGE][storage][storage_item]
-            )
-
         if (
             dict_values[ENERGY_STORAGE][storage][INFLOW_DIRECTION]
             in dict_values[OPTIMIZED_FLOWS].keys()
@@ -173,11 +176,9 @@ def evaluate_dict(dict_values, results_main, results_meta):
                 dict_asset=dict_values[group][asset],
                 asset_group=group,
             )
-            E2.get_costs(dict_values[group][asset], dict_values[ECONOMIC_DATA])
-            E2.lcoe_assets(dict_values[group][asset], group)
-            if group == ENERGY_PRODUCTION:
-                E3.calculate_emissions_from_flow(dict_values[group][asset])
-            store_result_matrix(dict_values[KPI], dict_values[group][asset])
+
+    # Calculate costs, levelized costs and emissions of all assets at once and store them to the KPI matrices
+    E5.add_kpi_of_assets(dict_values)
 
     # Add fix project costs
     process_fixcost(dict_values)
@@ -250,32 +251,13 @@ def store_result_matrix(dict_kpi, dict_asset, fix_cost=False):
 
     """
 
-    round_to_comma = 5
-
     for kpi_storage in [KPI_COST_MATRIX, KPI_SCALAR_MATRIX]:
         if fix_cost == True and kpi_storage == KPI_SCALAR_MATRIX:
             pass
         else:
-            asset_result_dict = {}
-            for key in dict_kpi[kpi_storage].columns.values:
-                # Check if called value is in oemof results -> Remember: check if pandas index has certain index: pd.object.index.contains(key)
-                if key in dict_asset:
-                    if isinstance(dict_asset[key], str):
-                        asset_result_dict.update({key: dict_asset[key]})
-                    elif isinstance(dict_asset[key], bool):
-                        asset_result_dict.update({key: dict_asset[key]})
-                    elif dict_asset[key] is None:
-                        asset_result_dict.update({key: None})
-                    elif isinstance(dict_asset[key], dict):
-                        if VALUE in dict_asset[key].keys():
-                            if dict_asset[key][VALUE] is not None:
-                                asset_result_dict.update(
-                                    {key: round(dict_asset[key][VALUE], round_to_comma)}
-                                )
-                    else:
-                        asset_result_dict.update(
-                            {key: round(dict_asset[key], round_to_comma)}
-                        )
+            asset_result_dict = E5.get_kpi_matrix_row(
+                dict_asset, dict_kpi[kpi_storage].columns.values
+            )
 
             asset_result_df = pd.DataFrame([asset_result_dict])
 
@@ -3,6 +3,7 @@ Module E1 process results
 =========================
 
 Module E1 processes the oemof results.
+- convert the oemof results once into a matrix of all flows and a table of all scalars
 - receive time series per bus for all assets
 - write time series to dictionary
 - get optimal capacity of optimized assets
@@ -12,6 +13,7 @@ Module E1 processes the oemof results.
 
 import logging
 import copy
+import numpy as np
 import pandas as pd
 from multi_vector_simulator.utils.helpers import reducable_demand_name
 from multi_vector_simulator.utils.constants import TYPE_NONE, TOTAL_FLOW
@@ -80,6 +82,10 @@ OEMOF_SEQUENCES = "sequences"
 OEMOF_INVEST = "invest"
 OEMOF_SCALARS = "scalars"
 OEMOF_STORAGE_CONTENT = "storage_content"
+# Names of the levels of the columns of the flow matrix and of the index of the scalars table
+RESULT_MATRIX_LEVELS = ["from", "to", "type"]
+# Key of the bus data of which the values were already trimmed with cut_below_micro
+CUT_BELOW_MICRO = "cut_below_micro"
 
 # Determines which assets are defined by...
 # a influx from a bus
@@ -98,9 +104,11 @@ def cut_below_micro(value, label):
     Oemof termination is dependent on the simulation settings of oemof solph. Thus, it can terminate the optimization if the results are with certain bounds, which can sometimes lead to negative decision variables (capacities, flows). Negative values do not make sense in this context. If the values are between -10^-6 and 0, we assume that they can be rounded to 0, as they result from the precision settings of the solver. In that case the value is overwritten for the futher post-processing. This should also avoid SOC timeseries with doubtful values outside of [0,1]. If any value is a higher negative value then the threshold, its value is not changed but a warning raised.
     Similarily, if a positive devision variable is detected that has a value lower then the theshold, it is assumed that this only happends because of the solver settings, and the values below the theshold are rounded to 0.
 
+    A pd.DataFrame is trimmed column by column, as if each of its columns was a pd.Series, with vectorized operations over all columns at once.
+
     Parameters
     ----------
-    value: float or pd.Series
+    value: float, pd.Series or pd.DataFrame
         Decision variable determined by oemof
 
     label: str
@@ -109,7 +117,7 @@ def cut_below_micro(value, label):
     Returns
     -------
 
-    value: float of pd.Series
+    value: float, pd.Series or pd.DataFrame
         Decision variable with rounded values in case that slight negative values or positive values were observed.
 
     Notes
@@ -126,6 +134,7 @@ def cut_below_micro(value, label):
     - E1.test_cut_below_micro_pd_Series_0
     - E1.test_cut_below_micro_pd_Series_larger_0
     - E1.test_cut_below_micro_pd_Series_larger_0_smaller_threshold
+    - E1.TestCutBelowMicroDataFrame
     """
     text_block_start = f"The value of {label} is below 0"
     text_block_set_0 = f"Negative value (s) are smaller than {-THRESHOLD}. This is likely a result of the termination/precision settings of the cbc solver. As the difference is marginal, the value will be set to 0. "
@@ -135,14 +144,40 @@ def cut_below_micro(value, label):
         f"Check if the dispatch of asset {label} as per the oemof results is within the defined margin of precision ({THRESHOLD})"
     )
 
+    # flows of several assets, trimmed column by column
+    if isinstance(value, pd.DataFrame):
+        values = value.to_numpy(dtype=float, copy=True)
+        # missing values (e.g. after the last timestep) are not considered
+        negative = (values < 0).any(axis=0)
+        small_negative = negative & (np.isnan(values) | (values > -THRESHOLD)).all(
+            axis=0
+        )
+        if small_negative.any():
+            logging.debug(
+                f"{text_block_start} for {small_negative.sum()} column(s). {text_block_set_0}"
+            )
+            values[:, small_negative] = np.maximum(values[:, small_negative], 0)
+        for column in np.flatnonzero(negative & ~small_negative):
+            logging.warning(
+                f"The value of {label} {value.columns[column]} is below 0. At least one value exceeds the scale of {-THRESHOLD}. The highest negative value is {np.nanmin(values[:, column])}. "
+                + text_block_oemof
+            )
+        below_threshold = (values > 0) & (values < THRESHOLD)
+        if below_threshold.any():
+            logging.debug(
+                f"There are {below_threshold.sum()} instances in which there are positive values smaller then the threshold."
+            )
+            values[below_threshold] = 0
+        value = pd.DataFrame(values, index=value.index, columns=value.columns)
+
     # flows
-    if isinstance(value, pd.Series):
+    elif isinstance(value, pd.Series):
         # Identifies any negative values. Decision variables should not have a negative value
         if (value < 0).any():
             log_msg = text_block_start
             # Counts the incidents, in which the value is below 0.
             if isinstance(value, pd.Series):
-                instances = sum(value < 0)
+                instances = (value < 0).sum()
                 log_msg += f" in {instances} instances. "
             # Checks that all values are at least within the threshold for negative values.
             if (value > -THRESHOLD).all():
@@ -152,25 +187,18 @@ def cut_below_micro(value, label):
             # If any value has a large negative value (lower then threshold), no values are changed.
             else:
                 test = value.clip(upper=-THRESHOLD).abs()
-                log_msg += f"At least one value exceeds the scale of {-THRESHOLD}. The highest negative value is -{max(test)}. "
+                log_msg += f"At least one value exceeds the scale of {-THRESHOLD}. The highest negative value is -{test.max()}. "
                 log_msg += text_block_oemof
                 logging.warning(log_msg)
 
         # Determine if there are any positive values that are between 0 and the threshold:
-        # Clip to interval
-        positive_threshold = value.clip(lower=0, upper=THRESHOLD)
-        # Determine instances in which bounds are met: 1=either 0 or larger threshold, 0=smaller threshold
-        positive_threshold = (positive_threshold == 0) + (
-            positive_threshold == THRESHOLD
-        )
-        # Instances in which values are in determined interval:
-        instances = len(value) - sum(positive_threshold)
+        below_threshold = (value > 0) & (value < THRESHOLD)
+        instances = below_threshold.sum()
         if instances > 0:
             logging.debug(
                 f"There are {instances} instances in which there are positive values smaller then the threshold."
             )
-            # Multiply with positive_threshold (1=either 0 or larger threshold, 0=smaller threshold)
-            value = value * positive_threshold
+            value = value.mask(below_threshold, 0)
 
     # capacities
     else:
@@ -197,6 +225,145 @@ def cut_below_micro(value, label):
     return value
 
 
+def get_result_matrix(results_main):
+    r"""
+    Converts the oemof results into a matrix of all flows and a table of all scalars
+
+    The oemof results are converted only once, instead of once per bus and storage with
+    `solph.views.node`. The flows are trimmed with :py:func:`~.cut_below_micro` at once, as
+    well as the optimized capacities.
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results as output by processing.results()
+
+    Returns
+    -------
+    dict with the sequences of all results under OEMOF_SEQUENCES (pd.DataFrame with one column
+    per sequence, labelled by the labels of the nodes of the flow and the type of sequence,
+    ie. (from, to, type)) and the scalars of all results under OEMOF_SCALARS (pd.Series with
+    the same index)
+
+    Notes
+    -----
+    Tested with:
+    - E1.TestResultMatrix
+    """
+    sequences = {}
+    scalars = {}
+    for (node_from, node_to), results in results_main.items():
+        # nodes are labelled as in `solph.views.node`, a missing node as "None"
+        key = (str(node_from), str(node_to))
+        if not results[OEMOF_SEQUENCES].empty:
+            sequences[key] = results[OEMOF_SEQUENCES]
+        if not results[OEMOF_SCALARS].empty:
+            scalars[key] = results[OEMOF_SCALARS]
+
+    if len(sequences) > 0:
+        sequences = pd.concat(sequences, axis=1).sort_index(axis=1)
+        sequences = cut_below_micro(sequences, "flow")
+    else:
+        sequences = pd.DataFrame(
+            columns=pd.MultiIndex.from_tuples([], names=RESULT_MATRIX_LEVELS)
+        )
+    sequences.columns.names = RESULT_MATRIX_LEVELS
+
+    if len(scalars) > 0:
+        scalars = pd.concat(scalars).sort_index()
+        # the optimized capacities are trimmed as single values
+        optimal_capacities = scalars[scalars.index.get_level_values(2) == OEMOF_INVEST]
+        for key in optimal_capacities.index[optimal_capacities <= -THRESHOLD]:
+            logging.warning(
+                f"The value of {key[0]}/{key[1]} {OEMOF_INVEST} is below 0 and exceeds the scale of {-THRESHOLD}, with {scalars[key]}. All oemof decision variables should be positive so this needs to be investigated. "
+            )
+        within_threshold = optimal_capacities.index[
+            (optimal_capacities > -THRESHOLD) & (optimal_capacities < THRESHOLD)
+        ]
+        scalars[within_threshold] = 0
+    else:
+        scalars = pd.Series(
+            dtype=float,
+            index=pd.MultiIndex.from_tuples([], names=RESULT_MATRIX_LEVELS),
+        )
+    scalars.index.names = RESULT_MATRIX_LEVELS
+
+    return {OEMOF_SEQUENCES: sequences, OEMOF_SCALARS: scalars}
+
+
+def get_bus_data(result_matrix, node):
+    r"""
+    Gets the results of a node (bus or storage) from the result matrix
+
+    Parameters
+    ----------
+    result_matrix: dict
+        Flow matrix and scalars table, as returned by :py:func:`~.get_result_matrix`
+
+    node: str
+        Label of the node
+
+    Returns
+    -------
+    dict with the same structure as the output of `solph.views.node`: the sequences of the
+    flows into and out of the node (pd.DataFrame) with the keys ((from, to), type) and the
+    scalars (pd.Series, if any) with the same keys. As the values are already trimmed, the
+    key CUT_BELOW_MICRO is True.
+
+    Notes
+    -----
+    Tested with:
+    - E1.TestResultMatrix
+    """
+    bus = {CUT_BELOW_MICRO: True}
+    for result_type in (OEMOF_SCALARS, OEMOF_SEQUENCES):
+        results = result_matrix[result_type]
+        labels = results.columns if result_type == OEMOF_SEQUENCES else results.index
+        of_node = (labels.get_level_values(0) == node) | (
+            labels.get_level_values(1) == node
+        )
+        if not of_node.any():
+            continue
+        keys = [
+            ((node_from, node_to), variable)
+            for node_from, node_to, variable in labels[of_node]
+        ]
+        if result_type == OEMOF_SEQUENCES:
+            results = results.loc[:, of_node]
+            results.columns = keys
+        else:
+            results = results[of_node]
+            results.index = keys
+        bus[result_type] = results
+    return bus
+
+
+def get_bus_sequence(bus, key, label):
+    r"""
+    Gets a sequence of the results of a bus, trimmed with :py:func:`~.cut_below_micro`
+
+    Parameters
+    ----------
+    bus: dict
+        Results of the bus, as returned by :py:func:`~.get_bus_data` or `solph.views.node`
+
+    key: tuple
+        Key of the sequence, ((from, to), type)
+
+    label: str
+        String to be mentioned in the debug messages of :py:func:`~.cut_below_micro`
+
+    Returns
+    -------
+    pd.Series of the sequence, it is only trimmed if the results of the bus were not trimmed
+    yet
+    """
+    sequence = bus[OEMOF_SEQUENCES][key]
+    if bus.get(CUT_BELOW_MICRO, False) is False:
+        sequence = cut_below_micro(sequence, label)
+    return sequence
+
+
 def get_timeseries_per_bus(dict_values, bus_data):
     r"""
     Reads simulation results of all busses and stores time series.
@@ -218,7 +385,7 @@ def get_timeseries_per_bus(dict_values, bus_data):
     Tested with:
     - test_get_timeseries_per_bus_two_timeseries_for_directly_connected_storage()
 
-    #Todo: This is a duplicate of the `E1.get_flow()` assertions, and thus `E1.cut_below_micro` is applied twice for each flow. This should rather be merged into the other functions.
+    The flows of bus data returned by :py:func:`~.get_bus_data` are not trimmed again with `E1.cut_below_micro`.
 
     Returns
     -------
@@ -230,44 +397,35 @@ def get_timeseries_per_bus(dict_values, bus_data):
     )
     bus_data_timeseries = {}
     for bus in bus_data.keys():
-        bus_data_timeseries.update(
-            {bus: pd.DataFrame(index=dict_values[SIMULATION_SETTINGS][TIME_INDEX])}
-        )
-
+        sequences = bus_data[bus].get(OEMOF_SEQUENCES, pd.DataFrame())
+        flows = {}
         # obtain flows that flow into the bus
-        to_bus = {
-            key[0][0]: key
-            for key in bus_data[bus][OEMOF_SEQUENCES].keys()
-            if key[0][1] == bus and key[1] == OEMOF_FLOW
-        }
-        for asset in to_bus:
-            flow = bus_data[bus][OEMOF_SEQUENCES][to_bus[asset]]
-            flow = cut_below_micro(flow, bus + "/" + asset)
-            bus_data_timeseries[bus][asset] = flow
-        # obtain flows that flow out of the bus
-        from_bus = {
-            key[0][1]: key
-            for key in bus_data[bus][OEMOF_SEQUENCES].keys()
-            if key[0][0] == bus and key[1] == OEMOF_FLOW
-        }
-        for asset in from_bus:
-            try:
-                # if `asset` already exists add input/output power to column name
-                # (occurs for storages that are directly added to a bus)
-                bus_data_timeseries[bus][asset]
-                # asset is already in bus_data_timeseries[bus]. Therefore a renaming is necessary:
-                bus_data_timeseries[bus].rename(
-                    columns={asset: " ".join([asset, OUTPUT_POWER])}, inplace=True
+        for key in sequences.keys():
+            if key[0][1] == bus and key[1] == OEMOF_FLOW:
+                flows[key[0][0]] = get_bus_sequence(
+                    bus_data[bus], key, bus + "/" + key[0][0]
                 )
-                # Now the "from_bus" ie. the charging/input power of the storage asset is added to the data set:
-                bus_data_timeseries[bus][" ".join([asset, INPUT_POWER])] = -bus_data[
-                    bus
-                ][OEMOF_SEQUENCES][from_bus[asset]]
-            except KeyError:
-                # The asset was not previously added to the `OPTIMIZED_FLOWS`, ie. is not a storage asset
-                bus_data_timeseries[bus][asset] = -bus_data[bus][OEMOF_SEQUENCES][
-                    from_bus[asset]
-                ]
+        # obtain flows that flow out of the bus
+        for key in sequences.keys():
+            if key[0][0] == bus and key[1] == OEMOF_FLOW:
+                asset = key[0][1]
+                if asset in flows:
+                    # asset is already in the flows of the bus, this occurs for storages that are
+                    # directly added to a bus. Therefore a renaming is necessary:
+                    flows = {
+                        (
+                            " ".join([asset, OUTPUT_POWER]) if name == asset else name
+                        ): flow
+                        for name, flow in flows.items()
+                    }
+                    # Now the "from_bus" ie. the charging/input power of the storage asset is added to the data set:
+                    asset = " ".join([asset, INPUT_POWER])
+                flows[asset] = -sequences[key]
+        bus_data_timeseries[bus] = pd.DataFrame(
+            flows,
+            index=dict_values[SIMULATION_SETTINGS][TIME_INDEX],
+            columns=list(flows),
+        )
 
     dict_values.update({OPTIMIZED_FLOWS: bus_data_timeseries})
 
@@ -295,21 +453,21 @@ def get_storage_results(settings, storage_bus, dict_asset):
     storage.
 
     """
-    power_charge = storage_bus[OEMOF_SEQUENCES][
-        ((dict_asset[INFLOW_DIRECTION], dict_asset[LABEL]), OEMOF_FLOW)
-    ]
-    power_charge = cut_below_micro(power_charge, dict_asset[LABEL] + " charge flow")
+    power_charge = get_bus_sequence(
+        storage_bus,
+        ((dict_asset[INFLOW_DIRECTION], dict_asset[LABEL]), OEMOF_FLOW),
+        dict_asset[LABEL] + " charge flow",
+    )
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
         dict_asset=dict_asset[INPUT_POWER],
         flow=power_charge.dropna(),
     )
 
-    power_discharge = storage_bus[OEMOF_SEQUENCES][
-        ((dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION]), OEMOF_FLOW)
-    ]
-    power_discharge = cut_below_micro(
-        power_discharge, dict_asset[LABEL] + " discharge flow"
+    power_discharge = get_bus_sequence(
+        storage_bus,
+        ((dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION]), OEMOF_FLOW),
+        dict_asset[LABEL] + " discharge flow",
     )
 
     add_info_flows(
@@ -318,11 +476,10 @@ def get_storage_results(settings, storage_bus, dict_asset):
         flow=power_discharge.dropna(),
     )
 
-    storage_capacity = storage_bus[OEMOF_SEQUENCES][
-        ((dict_asset[LABEL], TYPE_NONE), OEMOF_STORAGE_CONTENT)
-    ]
-    storage_capacity = cut_below_micro(
-        storage_capacity, dict_asset[LABEL] + " " + STORAGE_CAPACITY
+    storage_capacity = get_bus_sequence(
+        storage_bus,
+        ((dict_asset[LABEL], TYPE_NONE), OEMOF_STORAGE_CONTENT),
+        dict_asset[LABEL] + " " + STORAGE_CAPACITY,
     )
 
     add_info_flows(
@@ -660,7 +817,8 @@ def get_optimal_cap(bus, dict_asset, flow_tuple):
             and (flow_tuple, OEMOF_INVEST) in bus[OEMOF_SCALARS]
         ):
             optimal_capacity = bus[OEMOF_SCALARS][(flow_tuple, OEMOF_INVEST)]
-            optimal_capacity = cut_below_micro(optimal_capacity, dict_asset[LABEL])
+            if bus.get(CUT_BELOW_MICRO, False) is False:
+                optimal_capacity = cut_below_micro(optimal_capacity, dict_asset[LABEL])
             if TIMESERIES_PEAK in dict_asset:
                 if dict_asset[TIMESERIES_PEAK][VALUE] > 0:
                     dict_asset.update(
@@ -739,20 +897,19 @@ def get_flow(settings, bus, dict_asset, flow_tuple, multi_bus=None):
 
     if dict_asset.get(TYPE_ASSET) == "reducable_demand":
         flow_tuple = (flow_tuple[0], reducable_demand_name(dict_asset[LABEL]))
-        flow = bus[OEMOF_SEQUENCES][(flow_tuple, OEMOF_FLOW)]
-        flow = cut_below_micro(flow, dict_asset[LABEL] + FLOW)
+        flow = get_bus_sequence(bus, (flow_tuple, OEMOF_FLOW), dict_asset[LABEL] + FLOW)
         flow_tuple = (
             flow_tuple[0],
             reducable_demand_name(dict_asset[LABEL], critical=True),
         )
 
-        flow_crit = bus[OEMOF_SEQUENCES][(flow_tuple, OEMOF_FLOW)]
-        flow_crit = cut_below_micro(flow_crit, dict_asset[LABEL] + FLOW)
+        flow_crit = get_bus_sequence(
+            bus, (flow_tuple, OEMOF_FLOW), dict_asset[LABEL] + FLOW
+        )
         flow = flow + flow_crit
 
     else:
-        flow = bus[OEMOF_SEQUENCES][(flow_tuple, OEMOF_FLOW)]
-        flow = cut_below_micro(flow, dict_asset[LABEL] + FLOW)
+        flow = get_bus_sequence(bus, (flow_tuple, OEMOF_FLOW), dict_asset[LABEL] + FLOW)
 
     add_info_flows(
         evaluated_period=settings[EVALUATED_PERIOD][VALUE],
@@ -807,8 +964,7 @@ def add_info_flows(evaluated_period, dict_asset, flow, type=None, bus_name=None)
     - E1.test_add_info_flows_1_day()
     - E1.test_add_info_flows_storage_capacity()
     """
-    total_flow = sum(flow)
-    # import ipdb;ipdb.set_trace()
+    total_flow = flow.sum()
     if bus_name is None:
         dict_asset.update({FLOW: flow})
     else:
@@ -831,7 +987,7 @@ def add_info_flows(evaluated_period, dict_asset, flow, type=None, bus_name=None)
                         VALUE: total_flow * 365 / evaluated_period,
                         UNIT: "kWh",
                     },
-                    PEAK_FLOW: {VALUE: max(flow), UNIT: "kW"},
+                    PEAK_FLOW: {VALUE: flow.max(), UNIT: "kW"},
                     AVERAGE_FLOW: {VALUE: flow.mean(), UNIT: "kW"},
                 }
             )
@@ -864,9 +1020,9 @@ def add_info_flows(evaluated_period, dict_asset, flow, type=None, bus_name=None)
                 )
 
             if PEAK_FLOW not in dict_asset:
-                dict_asset.update({PEAK_FLOW: {bus_name: max(flow), UNIT: "kW"}})
+                dict_asset.update({PEAK_FLOW: {bus_name: flow.max(), UNIT: "kW"}})
             else:
-                dict_asset[PEAK_FLOW][bus_name] = max(flow)
+                dict_asset[PEAK_FLOW][bus_name] = flow.max()
 
             if AVERAGE_FLOW not in dict_asset:
                 dict_asset.update({AVERAGE_FLOW: {bus_name: flow.mean(), UNIT: "kW"}})
@@ -22,6 +22,12 @@ import logging
 import pandas as pd
 import warnings
 
+import multi_vector_simulator.E5_kpi_engine as E5
+from multi_vector_simulator.E5_kpi_engine import (
+    MissingParametersForEconomicEvaluation,
+    all_list_in_dict,
+)
+
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
     CURR,
@@ -67,11 +73,6 @@ from multi_vector_simulator.utils.constants_json_strings import (
 )
 
 
-class MissingParametersForEconomicEvaluation(UserWarning):
-    "Warning if one or more parameters are missing for economic post-processing  of an asset"
-    pass
-
-
 def get_costs(dict_asset, economic_data):
     r"""
     Calculates economic KPI of the asset handed to the function
@@ -98,6 +99,8 @@ def get_costs(dict_asset, economic_data):
     - ANNUITY_TOTAL
     - ANNUITY_OM
 
+    The KPI are calculated with `E5.calculate_costs`.
+
     Tested with:
     - test_all_cost_info_parameters_added_to_dict_asset()
     - Test_Economic_KPI.test_benchmark_Economic_KPI_C2_E2()
@@ -131,112 +134,13 @@ def get_costs(dict_asset, economic_data):
         ],
     )
 
-    # Part of the investment costs to be paid upfront at t=0
-    costs_investment_upfront = calculate_costs_upfront_investment(
-        capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-        specific_cost=dict_asset[SPECIFIC_COSTS][VALUE],
-        development_costs=dict_asset[DEVELOPMENT_COSTS][VALUE],
-    )
-
-    dict_asset.update(
-        {COST_UPFRONT: {VALUE: costs_investment_upfront, UNIT: economic_data[CURR]}}
-    )
-
-    # Part of the investment costs to be paid due to replacements
-    costs_replacement = calculate_costs_replacement(
-        specific_replacement_of_initial_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_INSTALLED
-        ][VALUE],
-        specific_replacement_of_optimized_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
-        ][VALUE],
-        initial_capacity=dict_asset[INSTALLED_CAP][VALUE],
-        optimized_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-    )
-
-    dict_asset.update(
-        {COST_REPLACEMENT: {VALUE: costs_replacement, UNIT: economic_data[CURR]}}
-    )
-
-    # Total investment costs including investments into the asset, replacement costs and development costs
-    costs_investment_lifetime = calculate_total_capital_costs(
-        upfront=dict_asset[COST_UPFRONT][VALUE],
-        replacement=dict_asset[COST_REPLACEMENT][VALUE],
-    )
-
-    dict_asset.update(
-        {COST_INVESTMENT: {VALUE: costs_investment_lifetime, UNIT: economic_data[CURR]}}
-    )
-
-    # Operation and management expenditures over the project lifetime
-    operation_and_management_expenditures = (
-        calculate_operation_and_management_expenditures(
-            specific_om_cost=dict_asset[LIFETIME_SPECIFIC_COST_OM][VALUE],
-            installed_capacity=dict_asset[INSTALLED_CAP][VALUE],
-            optimized_add_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-        )
-    )
-    dict_asset.update(
-        {
-            COST_OM: {
-                VALUE: operation_and_management_expenditures,
-                UNIT: economic_data[CURR],
-            }
-        }
-    )
-
-    # Dispatch expenditures of the asset over the project lifetime
-    if isinstance(dict_asset.get(OUTFLOW_DIRECTION, None), list):
-        costs_dispatch = 0
-        for bus in dict_asset[OUTFLOW_DIRECTION]:
-            costs_dispatch += calculate_dispatch_expenditures(
-                dispatch_price=dict_asset[LIFETIME_PRICE_DISPATCH][VALUE],
-                flow=dict_asset[FLOW][bus],
-                asset=dict_asset[LABEL],
-            )
-    else:
-        costs_dispatch = calculate_dispatch_expenditures(
-            dispatch_price=dict_asset[LIFETIME_PRICE_DISPATCH][VALUE],
-            flow=dict_asset[FLOW],
-            asset=dict_asset[LABEL],
-        )
-
-    dict_asset.update(
-        {COST_DISPATCH: {VALUE: costs_dispatch, UNIT: economic_data[CURR]}}
-    )
-
-    # Total operational expenditures over the lifetime
-    total_operational_expenditures = calculate_total_operational_expenditures(
-        dict_asset[COST_OM][VALUE], dict_asset[COST_DISPATCH][VALUE]
-    )
-    dict_asset.update({COST_OPERATIONAL_TOTAL: {VALUE: total_operational_expenditures}})
-
-    # Total costs of the assets, capital and operational
-    total_asset_costs_over_lifetime = calculate_total_asset_costs_over_lifetime(
-        dict_asset[COST_INVESTMENT][VALUE], dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
-    )
-    dict_asset.update(
-        {
-            COST_TOTAL: {
-                VALUE: total_asset_costs_over_lifetime,
-                UNIT: economic_data[CURR],
-            }
-        }
-    )
-
-    dict_asset.update(
-        {
-            ANNUITY_TOTAL: {
-                VALUE: dict_asset[COST_TOTAL][VALUE] * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-            ANNUITY_OM: {
-                VALUE: dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
-                * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-        }
+    # The costs are calculated by the KPI engine, with the asset as single column
+    flow = E5.get_dispatch_flow(dict_asset)
+    kpi_arrays = E5.build_kpi_arrays(
+        [(None, dict_asset)], len(flow), parameters=E5.COST_PARAMETERS
     )
+    kpi = E5.calculate_costs(kpi_arrays, economic_data[CRF][VALUE])
+    E5.store_kpi(dict_asset, kpi, 0, economic_data[CURR])
 
 
 def calculate_total_asset_costs_over_lifetime(
@@ -453,38 +357,6 @@ def calculate_total_operational_expenditures(
     return total_operational_expenditures
 
 
-def all_list_in_dict(dict_asset, list):
-    r"""
-    Checks if all items of a list are withing the keys of a dictionary
-
-    Parameters
-    ----------
-    dict_asset: dict
-        Dict with the keys to be evaluated
-
-    list: list
-        List of keys (parameter in strings) that should be in dict
-
-    Returns
-    -------
-    boolean: bool
-        True: All items in keys of the dict
-        False: At least one item is not in keys of the dict
-    """
-    boolean = all([name in dict_asset for name in list]) is True
-    if boolean is False:
-        missing_parameters = []
-        for name in list:
-            if name not in dict_asset:
-                missing_parameters.append(name)
-        missing_parameters = ", ".join(map(str, missing_parameters))
-        raise MissingParametersForEconomicEvaluation(
-            f"Asset {dict_asset[LABEL]} is missing parameters for the economic evaluation: {missing_parameters}."
-            f"These parameters are needed for E2.get_costs(). Please check the E modules."
-        )
-    return boolean
-
-
 def lcoe_assets(dict_asset, asset_group):
     r"""
     Calculates the levelized cost of electricity (lcoe) of each asset. [Follow this link for information](docs/MVS_Outputs.rst)
@@ -510,46 +382,14 @@ def lcoe_assets(dict_asset, asset_group):
         LCOE\_ASSET = \frac{A}{ E_{throughput} } \\
         \textrm{If } E_{throughput} = 0, LCOE\_ASSET = 0
 
+    The LCOE_ASSET are calculated with `E5.calculate_levelized_costs` and
+    `E5.add_levelized_costs_of_storage`.
     """
 
-    lcoe_a = 0
-
     if asset_group == ENERGY_STORAGE:
-        if dict_asset[OUTPUT_POWER][TOTAL_FLOW][VALUE] > 0:
-            storage_annuity = (
-                dict_asset[INPUT_POWER][ANNUITY_TOTAL][VALUE]
-                + dict_asset[OUTPUT_POWER][ANNUITY_TOTAL][VALUE]
-                + dict_asset[STORAGE_CAPACITY][ANNUITY_TOTAL][VALUE]
-            )
-            lcoe_a = storage_annuity / dict_asset[OUTPUT_POWER][TOTAL_FLOW][VALUE]
-
-        for component in [INPUT_POWER, OUTPUT_POWER]:
-            if dict_asset[component][TOTAL_FLOW][VALUE] > 0:
-                lcoe_a_component = (
-                    dict_asset[component][ANNUITY_TOTAL][VALUE]
-                    / dict_asset[component][TOTAL_FLOW][VALUE]
-                )
-                dict_asset[component].update(
-                    {LCOE_ASSET: {VALUE: lcoe_a_component, UNIT: CURR + "/kWh"}}
-                )
-                if component == INPUT_POWER:
-                    lcoe_a_component = (
-                        dict_asset[STORAGE_CAPACITY][ANNUITY_TOTAL][VALUE]
-                        / dict_asset[component][TOTAL_FLOW][VALUE]
-                    )
-                    dict_asset[STORAGE_CAPACITY].update(
-                        {LCOE_ASSET: {VALUE: lcoe_a_component, UNIT: CURR + "/kWh"}}
-                    )
-            else:
-                dict_asset[component].update(
-                    {LCOE_ASSET: {VALUE: 0, UNIT: CURR + "/kWh"}}
-                )
-                if component == INPUT_POWER:
-                    dict_asset[STORAGE_CAPACITY].update(
-                        {LCOE_ASSET: {VALUE: 0, UNIT: CURR + "/kWh"}}
-                    )
-
-    elif dict_asset[TOTAL_FLOW][VALUE] > 0:
-        lcoe_a = dict_asset[ANNUITY_TOTAL][VALUE] / dict_asset[TOTAL_FLOW][VALUE]
-
-    dict_asset.update({LCOE_ASSET: {VALUE: lcoe_a, UNIT: CURR + "/kWh"}})
+        E5.add_levelized_costs_of_storage(dict_asset)
+    else:
+        lcoe_a = E5.calculate_levelized_costs(
+            [dict_asset[ANNUITY_TOTAL][VALUE]], [dict_asset[TOTAL_FLOW][VALUE]]
+        )[0]
+        dict_asset.update({LCOE_ASSET: {VALUE: lcoe_a, UNIT: CURR + "/kWh"}})
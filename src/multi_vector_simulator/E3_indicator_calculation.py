@@ -16,6 +16,7 @@ In module E3 the technical KPI are evaluated:
 
 import logging
 
+import multi_vector_simulator.E5_kpi_engine as E5
 from multi_vector_simulator.utils.constants import DEFAULT_WEIGHTS_ENERGY_CARRIERS
 from multi_vector_simulator.utils.constants import PROJECT_DATA
 from multi_vector_simulator.utils.constants_json_strings import (
@@ -1035,6 +1036,8 @@ def calculate_emissions_from_flow(dict_asset):
 
     Notes
     -----
+    The emissions are calculated with `E5.calculate_emissions`.
+
     Tested with:
     - E3.test_calculate_emissions_from_flow()
     - E3.test_calculate_emissions_from_flow_zero_emissions
@@ -1045,7 +1048,9 @@ def calculate_emissions_from_flow(dict_asset):
         Updated `dict_asset` with TOTAL_EMISSIONS of the asset in kgCO2eq/a (UNIT_EMISSIONS).
 
     """
-    emissions = dict_asset[TOTAL_FLOW][VALUE] * dict_asset[EMISSION_FACTOR][VALUE]
+    emissions = E5.calculate_emissions(
+        [dict_asset[TOTAL_FLOW][VALUE]], [dict_asset[EMISSION_FACTOR][VALUE]]
+    )[0]
     dict_asset.update({TOTAL_EMISSIONS: {VALUE: emissions, UNIT: UNIT_EMISSIONS}})
 
 
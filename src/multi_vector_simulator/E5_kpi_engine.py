@@ -0,0 +1,601 @@
+r"""
+Module E5 - KPI engine
+======================
+
+Module E5 calculates the KPI of all assets at once with array operations, instead of asset by
+asset:
+- gather the flows of all assets in a matrix (one column per asset) and their dispatch prices
+  in a matrix of the same shape
+- gather the economic parameters, capacities, total flows and emission factors of all assets in
+  vectors
+- calculate the costs, annuities, levelized costs and emissions of all assets
+- store the KPI in the dicts of the assets and fill the KPI_COST_MATRIX and KPI_SCALAR_MATRIX
+
+The formulas of the KPI are only defined here: `E2.get_costs`, `E2.lcoe_assets` and
+`E3.calculate_emissions_from_flow`, which evaluate a single asset, call the array functions of
+this module with one column.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    UNIT,
+    CURR,
+    UNIT_YEAR,
+    VALUE,
+    LABEL,
+    CRF,
+    ECONOMIC_DATA,
+    KPI,
+    KPI_COST_MATRIX,
+    KPI_SCALAR_MATRIX,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_STORAGE,
+    STORAGE_CAPACITY,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    OUTFLOW_DIRECTION,
+    FLOW,
+    TOTAL_FLOW,
+    INSTALLED_CAP,
+    OPTIMIZED_ADD_CAP,
+    DEVELOPMENT_COSTS,
+    SPECIFIC_COSTS,
+    LIFETIME_SPECIFIC_COST,
+    LIFETIME_SPECIFIC_COST_OM,
+    LIFETIME_PRICE_DISPATCH,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+    EMISSION_FACTOR,
+    TOTAL_EMISSIONS,
+    UNIT_EMISSIONS,
+    COST_UPFRONT,
+    COST_REPLACEMENT,
+    COST_INVESTMENT,
+    COST_OM,
+    COST_DISPATCH,
+    COST_OPERATIONAL_TOTAL,
+    COST_TOTAL,
+    ANNUITY_TOTAL,
+    ANNUITY_OM,
+    LCOE_ASSET,
+)
+
+# Asset groups evaluated by the KPI engine, in the order of the rows of the KPI matrices
+ASSET_GROUPS_EVALUATED = [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]
+STORAGE_COMPONENTS = [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]
+
+# Parameters of the assets needed to calculate their costs, gathered in vectors
+COST_PARAMETERS = [
+    INSTALLED_CAP,
+    OPTIMIZED_ADD_CAP,
+    DEVELOPMENT_COSTS,
+    SPECIFIC_COSTS,
+    LIFETIME_SPECIFIC_COST_OM,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+]
+# Parameters of the assets gathered in vectors
+ASSET_PARAMETERS = COST_PARAMETERS + [TOTAL_FLOW]
+
+# Decimals of the values stored in the KPI matrices
+ROUND_TO_COMMA = 5
+
+
+class MissingParametersForEconomicEvaluation(UserWarning):
+    "Warning if one or more parameters are missing for economic post-processing  of an asset"
+    pass
+
+
+def all_list_in_dict(dict_asset, list):
+    r"""
+    Checks if all items of a list are withing the keys of a dictionary
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Dict with the keys to be evaluated
+
+    list: list
+        List of keys (parameter in strings) that should be in dict
+
+    Returns
+    -------
+    boolean: bool
+        True: All items in keys of the dict
+        False: At least one item is not in keys of the dict
+    """
+    boolean = all([name in dict_asset for name in list]) is True
+    if boolean is False:
+        missing_parameters = []
+        for name in list:
+            if name not in dict_asset:
+                missing_parameters.append(name)
+        missing_parameters = ", ".join(map(str, missing_parameters))
+        raise MissingParametersForEconomicEvaluation(
+            f"Asset {dict_asset[LABEL]} is missing parameters for the economic evaluation: {missing_parameters}."
+            f"These parameters are needed for E2.get_costs(). Please check the E modules."
+        )
+    return boolean
+
+
+def get_evaluated_assets(dict_values):
+    r"""
+    Lists the assets of which the KPI are calculated, in the order of the rows of the KPI matrices
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs and results, the flows and optimized capacities of the assets
+        are already processed by E1
+
+    Returns
+    -------
+    list of (asset_group, dict_asset), the components of the storages (storage capacity, input
+    and output power) are listed first, as separate assets of the group ENERGY_STORAGE
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestEvaluatedAssets
+    """
+    assets = []
+    for dict_storage in dict_values.get(ENERGY_STORAGE, {}).values():
+        for component in STORAGE_COMPONENTS:
+            assets.append((ENERGY_STORAGE, dict_storage[component]))
+    for asset_group in ASSET_GROUPS_EVALUATED:
+        for dict_asset in dict_values.get(asset_group, {}).values():
+            assets.append((asset_group, dict_asset))
+    return assets
+
+
+def get_dispatch_flow(dict_asset):
+    r"""
+    Gets the flow of an asset for which its dispatch price is paid
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset with its FLOW, as processed by E1
+
+    Returns
+    -------
+    pd.Series of the flow, the sum of the flows into all output busses for an asset with
+    several output busses
+    """
+    flow = dict_asset[FLOW]
+    if isinstance(dict_asset.get(OUTFLOW_DIRECTION, None), list):
+        flow = sum(flow[bus] for bus in dict_asset[OUTFLOW_DIRECTION])
+    return flow
+
+
+def get_dispatch_price(dict_asset):
+    r"""
+    Gets the dispatch price of an asset over the project lifetime per timestep
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset with its LIFETIME_PRICE_DISPATCH
+
+    Returns
+    -------
+    float or np.ndarray, the sum of the dispatch prices for an asset with several dispatch
+    prices (ie. one per flow)
+    """
+    dispatch_price = dict_asset[LIFETIME_PRICE_DISPATCH][VALUE]
+    if isinstance(dispatch_price, list):
+        return sum(
+            get_dispatch_price(
+                {
+                    LIFETIME_PRICE_DISPATCH: {VALUE: price},
+                    LABEL: dict_asset[LABEL] + " (list entry)",
+                }
+            )
+            for price in dispatch_price
+        )
+    elif isinstance(dispatch_price, (float, int)):
+        return dispatch_price
+    elif isinstance(dispatch_price, pd.Series):
+        return dispatch_price.to_numpy(dtype=float)
+    else:
+        raise TypeError(
+            f"The dispatch price of asset {dict_asset[LABEL]} is neither float, list nor pd.Series but {type(dispatch_price)}."
+            f"Please adapt E5.get_dispatch_price() to evaluate the dispatch_expenditures of the asset."
+        )
+
+
+def build_kpi_arrays(assets, number_of_timesteps, parameters=ASSET_PARAMETERS):
+    r"""
+    Gathers the flows, dispatch prices and parameters of all assets in arrays
+
+    Parameters
+    ----------
+    assets: list
+        Assets to be evaluated, as returned by :py:func:`~.get_evaluated_assets`
+
+    number_of_timesteps: int
+        Number of rows of the matrices, ie. the length of the longest flow
+
+    parameters: list
+        Parameters of the assets gathered in vectors
+        Default: ASSET_PARAMETERS
+
+    Returns
+    -------
+    dict with the matrix of the flows (FLOW) and of the dispatch prices
+    (LIFETIME_PRICE_DISPATCH), with one row per timestep and one column per asset, and a vector
+    with one value per asset for each of the parameters and for the EMISSION_FACTOR
+    (0 if the asset has none)
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestKpiArrays
+    """
+    number_of_assets = len(assets)
+    flows = np.zeros((number_of_timesteps, number_of_assets))
+    dispatch_prices = np.zeros((number_of_timesteps, number_of_assets))
+    vectors = {
+        parameter: np.zeros(number_of_assets)
+        for parameter in parameters + [EMISSION_FACTOR]
+    }
+
+    for column, (asset_group, dict_asset) in enumerate(assets):
+        # Testing, if the dict_asset includes all parameters necessary for the evaluation
+        all_list_in_dict(
+            dict_asset,
+            [
+                LIFETIME_SPECIFIC_COST,
+                OPTIMIZED_ADD_CAP,
+                DEVELOPMENT_COSTS,
+                SPECIFIC_COSTS,
+                LIFETIME_PRICE_DISPATCH,
+                FLOW,
+            ],
+        )
+        # flows shorter than the matrix (ie. all but the storage contents, which have a value
+        # at the end of the last timestep) are padded with zeros
+        flow = np.asarray(get_dispatch_flow(dict_asset), dtype=float)
+        flows[: len(flow), column] = flow
+        dispatch_price = get_dispatch_price(dict_asset)
+        if isinstance(dispatch_price, np.ndarray):
+            dispatch_prices[: len(dispatch_price), column] = dispatch_price
+        else:
+            dispatch_prices[:, column] = dispatch_price
+        for parameter in parameters:
+            value = dict_asset[parameter][VALUE]
+            vectors[parameter][column] = 0 if value is None else value
+        if asset_group == ENERGY_PRODUCTION and EMISSION_FACTOR in dict_asset:
+            vectors[EMISSION_FACTOR][column] = dict_asset[EMISSION_FACTOR][VALUE] or 0
+
+    return dict(vectors, **{FLOW: flows, LIFETIME_PRICE_DISPATCH: dispatch_prices})
+
+
+def calculate_costs(kpi_arrays, crf):
+    r"""
+    Calculates the costs and annuities of all assets
+
+    Parameters
+    ----------
+    kpi_arrays: dict
+        Flows, dispatch prices and the COST_PARAMETERS of the assets, as returned by
+        :py:func:`~.build_kpi_arrays`
+
+    crf: float
+        Capital recovery factor of the project
+
+    Returns
+    -------
+    dict with a vector with one value per asset for each KPI: COST_UPFRONT, COST_REPLACEMENT,
+    COST_INVESTMENT, COST_OM, COST_DISPATCH, COST_OPERATIONAL_TOTAL, COST_TOTAL,
+    ANNUITY_TOTAL and ANNUITY_OM
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestCalculateKpi
+    """
+    installed_capacity = kpi_arrays[INSTALLED_CAP]
+    optimized_capacity = kpi_arrays[OPTIMIZED_ADD_CAP]
+
+    kpi = {
+        COST_UPFRONT: kpi_arrays[SPECIFIC_COSTS] * optimized_capacity
+        + kpi_arrays[DEVELOPMENT_COSTS],
+        COST_REPLACEMENT: kpi_arrays[SPECIFIC_REPLACEMENT_COSTS_INSTALLED]
+        * installed_capacity
+        + kpi_arrays[SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED] * optimized_capacity,
+        COST_OM: kpi_arrays[LIFETIME_SPECIFIC_COST_OM]
+        * (installed_capacity + optimized_capacity),
+        COST_DISPATCH: (kpi_arrays[FLOW] * kpi_arrays[LIFETIME_PRICE_DISPATCH]).sum(
+            axis=0
+        ),
+    }
+    kpi[COST_INVESTMENT] = kpi[COST_UPFRONT] + kpi[COST_REPLACEMENT]
+    kpi[COST_OPERATIONAL_TOTAL] = kpi[COST_OM] + kpi[COST_DISPATCH]
+    kpi[COST_TOTAL] = kpi[COST_INVESTMENT] + kpi[COST_OPERATIONAL_TOTAL]
+    kpi[ANNUITY_TOTAL] = kpi[COST_TOTAL] * crf
+    kpi[ANNUITY_OM] = kpi[COST_OPERATIONAL_TOTAL] * crf
+    return kpi
+
+
+def calculate_levelized_costs(annuity, total_flow):
+    r"""
+    Calculates the levelized costs of all assets
+
+    Parameters
+    ----------
+    annuity: np.ndarray
+        Total annuity of each asset
+
+    total_flow: np.ndarray
+        Total flow of each asset
+
+    Returns
+    -------
+    np.ndarray with the LCOE_ASSET of each asset
+
+    Notes
+    -----
+
+    .. math::
+
+        LCOE\_ASSET = \frac{A}{ E_{throughput} } \\
+        \textrm{If } E_{throughput} = 0, LCOE\_ASSET = 0
+
+    Tested with:
+    - test_E5_kpi_engine.TestCalculateKpi
+    """
+    annuity = np.asarray(annuity, dtype=float)
+    total_flow = np.asarray(total_flow, dtype=float)
+    return np.divide(
+        annuity, total_flow, out=np.zeros(len(total_flow)), where=total_flow > 0
+    )
+
+
+def calculate_emissions(total_flow, emission_factor):
+    r"""
+    Calculates the total emissions of all assets in kg per year
+
+    Parameters
+    ----------
+    total_flow: np.ndarray
+        Total flow of each asset
+
+    emission_factor: np.ndarray
+        Emission factor of each asset
+
+    Returns
+    -------
+    np.ndarray with the TOTAL_EMISSIONS of each asset in kgCO2eq/a (UNIT_EMISSIONS)
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestCalculateKpi
+    """
+    return np.asarray(total_flow, dtype=float) * np.asarray(
+        emission_factor, dtype=float
+    )
+
+
+def calculate_kpi(kpi_arrays, crf):
+    r"""
+    Calculates the costs, annuities, levelized costs and emissions of all assets
+
+    Parameters
+    ----------
+    kpi_arrays: dict
+        Flows, dispatch prices and parameters of the assets, as returned by
+        :py:func:`~.build_kpi_arrays`
+
+    crf: float
+        Capital recovery factor of the project
+
+    Returns
+    -------
+    dict with a vector with one value per asset for each KPI of
+    :py:func:`~.calculate_costs`, LCOE_ASSET and TOTAL_EMISSIONS
+
+    Notes
+    -----
+    The LCOE_ASSET of the components of storages are overwritten by
+    :py:func:`~.add_levelized_costs_of_storage`.
+
+    Tested with:
+    - test_E5_kpi_engine.TestCalculateKpi
+    """
+    kpi = calculate_costs(kpi_arrays, crf)
+    kpi[LCOE_ASSET] = calculate_levelized_costs(
+        kpi[ANNUITY_TOTAL], kpi_arrays[TOTAL_FLOW]
+    )
+    kpi[TOTAL_EMISSIONS] = calculate_emissions(
+        kpi_arrays[TOTAL_FLOW], kpi_arrays[EMISSION_FACTOR]
+    )
+    return kpi
+
+
+def store_kpi(dict_asset, kpi, column, currency):
+    r"""
+    Stores the costs, annuities and levelized costs of an asset in its dict
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset to be updated
+
+    kpi: dict
+        KPI of the assets, as returned by :py:func:`~.calculate_costs` or
+        :py:func:`~.calculate_kpi`
+
+    column: int
+        Index of the asset in the vectors of the KPI
+
+    currency: str
+        Currency of the project
+
+    Returns
+    -------
+    Updated dict_asset with each KPI calculated for it
+    """
+    units = {
+        COST_UPFRONT: currency,
+        COST_REPLACEMENT: currency,
+        COST_INVESTMENT: currency,
+        COST_OM: currency,
+        COST_DISPATCH: currency,
+        COST_TOTAL: currency,
+        ANNUITY_TOTAL: CURR + "/" + UNIT_YEAR,
+        ANNUITY_OM: CURR + "/" + UNIT_YEAR,
+        LCOE_ASSET: CURR + "/kWh",
+    }
+    for kpi_name, unit in units.items():
+        if kpi_name in kpi:
+            dict_asset.update({kpi_name: {VALUE: kpi[kpi_name][column], UNIT: unit}})
+    dict_asset.update(
+        {COST_OPERATIONAL_TOTAL: {VALUE: kpi[COST_OPERATIONAL_TOTAL][column]}}
+    )
+
+
+def add_levelized_costs_of_storage(dict_storage):
+    r"""
+    Calculates the levelized costs of a storage and of its components
+
+    Parameters
+    ----------
+    dict_storage: dict
+        Storage with the ANNUITY_TOTAL and TOTAL_FLOW of its components
+
+    Returns
+    -------
+    Updated dict_storage with the LCOE_ASSET of the storage, based on the annuities of all its
+    components and on the flow of its output power, and of its components: the input and output
+    powers are based on their own annuity and flow, the storage capacity on its annuity and on the
+    flow of the input power
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestAddKpiOfAssets
+    """
+    annuity = {
+        component: dict_storage[component][ANNUITY_TOTAL][VALUE]
+        for component in STORAGE_COMPONENTS
+    }
+    input_flow = dict_storage[INPUT_POWER][TOTAL_FLOW][VALUE]
+    output_flow = dict_storage[OUTPUT_POWER][TOTAL_FLOW][VALUE]
+    lcoe = calculate_levelized_costs(
+        [
+            sum(annuity.values()),
+            annuity[STORAGE_CAPACITY],
+            annuity[INPUT_POWER],
+            annuity[OUTPUT_POWER],
+        ],
+        [output_flow, input_flow, input_flow, output_flow],
+    )
+    for dict_asset, lcoe_asset in zip(
+        [dict_storage] + [dict_storage[component] for component in STORAGE_COMPONENTS],
+        lcoe,
+    ):
+        dict_asset.update({LCOE_ASSET: {VALUE: lcoe_asset, UNIT: CURR + "/kWh"}})
+
+
+def get_kpi_matrix_row(dict_asset, columns):
+    r"""
+    Gets the values of an asset for the columns of a KPI matrix
+
+    Strings, booleans and None are stored as they are, values of dicts (with key VALUE) and
+    numbers are rounded to ROUND_TO_COMMA decimals.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        All information known for a specific asset
+
+    columns: list
+        Columns of the KPI matrix
+
+    Returns
+    -------
+    dict with the values of the asset for the columns found in dict_asset
+    """
+    row = {}
+    for key in columns:
+        if key in dict_asset:
+            if isinstance(dict_asset[key], (str, bool)):
+                row.update({key: dict_asset[key]})
+            elif dict_asset[key] is None:
+                row.update({key: None})
+            elif isinstance(dict_asset[key], dict):
+                if VALUE in dict_asset[key].keys():
+                    if dict_asset[key][VALUE] is not None:
+                        row.update({key: round(dict_asset[key][VALUE], ROUND_TO_COMMA)})
+            else:
+                row.update({key: round(dict_asset[key], ROUND_TO_COMMA)})
+    return row
+
+
+def add_kpi_of_assets(dict_values):
+    r"""
+    Calculates the KPI of all assets and stores them in the assets and in the KPI matrices
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs and results, the flows and optimized capacities of the assets
+        are already processed by E1 and the KPI are initialized by `E0.initalize_kpi`
+
+    Returns
+    -------
+    Updated dict_values, each asset is updated with the KPI of :py:func:`~.calculate_kpi`
+    (TOTAL_EMISSIONS only for ENERGY_PRODUCTION assets, LCOE_ASSET also for the storages as a
+    whole) and has a row in the KPI_COST_MATRIX and in the KPI_SCALAR_MATRIX
+
+    Notes
+    -----
+    Tested with:
+    - test_E5_kpi_engine.TestAddKpiOfAssets
+    """
+    assets = get_evaluated_assets(dict_values)
+    if len(assets) == 0:
+        return dict_values
+    number_of_timesteps = max(
+        len(get_dispatch_flow(dict_asset)) for _, dict_asset in assets
+    )
+    logging.debug(
+        f"Calculating the KPI of {len(assets)} assets over {number_of_timesteps} timesteps."
+    )
+    kpi_arrays = build_kpi_arrays(assets, number_of_timesteps)
+    kpi = calculate_kpi(kpi_arrays, dict_values[ECONOMIC_DATA][CRF][VALUE])
+
+    currency = dict_values[ECONOMIC_DATA][CURR]
+    for column, (asset_group, dict_asset) in enumerate(assets):
+        store_kpi(dict_asset, kpi, column, currency)
+        if asset_group == ENERGY_PRODUCTION:
+            dict_asset.update(
+                {
+                    TOTAL_EMISSIONS: {
+                        VALUE: kpi[TOTAL_EMISSIONS][column],
+                        UNIT: UNIT_EMISSIONS,
+                    }
+                }
+            )
+
+    # the levelized costs of the storages depend on the flows of several components
+    for dict_storage in dict_values.get(ENERGY_STORAGE, {}).values():
+        add_levelized_costs_of_storage(dict_storage)
+
+    for kpi_storage in [KPI_COST_MATRIX, KPI_SCALAR_MATRIX]:
+        columns = dict_values[KPI][kpi_storage].columns.values
+        rows = pd.DataFrame(
+            [get_kpi_matrix_row(dict_asset, columns) for _, dict_asset in assets]
+        )
+        dict_values[KPI][kpi_storage] = pd.concat(
+            [dict_values[KPI][kpi_storage], rows], ignore_index=True
+        )
+    return dict_values
@@ -5,7 +5,7 @@ Module F0 - Output
 The model F0 output defines all functions that store evaluation results to file.
 - Aggregate demand profiles to a total demand profile
 - Plot all energy flows for both 14 and 365 days for each energy bus
-- Store timeseries of all energy flows to excel (one sheet = one energy bus)
+- Store timeseries of all energy flows to excel (one sheet = one energy bus), csv, parquet or HDF5
 - Execute function: plot optimised capacities as a barchart (F1)
 - Execute function: plot all annuities as a barchart (F1)
 - Store scalars/KPI to excel
@@ -13,23 +13,19 @@ The model F0 output defines all functions that store evaluation results to file.
 - Store dictionary to Json
 """
 
+import functools
 import json
 import logging
 import os
 
+import numpy as np
 import pandas as pd
 
-from multi_vector_simulator.B0_data_input_json import convert_from_special_types_to_json
+from multi_vector_simulator.B0_data_input_json import (
+    convert_from_special_types_to_json,
+    convert_from_special_types_to_json_with_sidecar,
+)
 from multi_vector_simulator.E1_process_results import get_units_of_cost_matrix_entries
-import multi_vector_simulator.F1_plotting as F1_plots
-
-try:
-    import multi_vector_simulator.F2_autoreport as autoreport
-
-    AUTOREPORT = True
-except ModuleNotFoundError:
-    logging.warning("The reporting feature is disabled")
-    AUTOREPORT = False
 
 from multi_vector_simulator.utils.constants import (
     SIMULATION_SETTINGS,
@@ -42,6 +38,17 @@ from multi_vector_simulator.utils.constants import (
 from multi_vector_simulator.utils.constants import (
     JSON_WITH_RESULTS,
     JSON_FILE_EXTENSION,
+    NPZ_FILE_EXTENSION,
+    TIMESERIES_FORMAT_XLSX,
+    TIMESERIES_FORMAT_CSV,
+    TIMESERIES_FORMAT_PARQUET,
+    TIMESERIES_FORMAT_HDF5,
+    TIMESERIES_OUTPUT_FORMATS,
+    DEFAULT_TIMESERIES_OUTPUT_FORMAT,
+    TIMESERIES_ALL_BUSSES,
+    TIMESERIES_CSV_CHUNK_SIZE,
+    EXCEL_MAX_ROWS,
+    DEFAULT_PNG_SCALE,
 )
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
@@ -56,15 +63,26 @@ from multi_vector_simulator.utils.constants_json_strings import (
     PROJECT_DATA,
     ECONOMIC_DATA,
     SIMULATION_RESULTS,
+    TIMESERIES_OUTPUT_FORMAT,
+    VALUE,
     LOGS,
     ERRORS,
     WARNINGS,
     FIX_COST,
     ENERGY_BUSSES,
 )
-
-
-def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
+from multi_vector_simulator.utils.exceptions import UnknownOutputFormatError
+
+
+def evaluate_dict(
+    dict_values,
+    path_pdf_report=None,
+    path_png_figs=None,
+    timeseries_sidecar=False,
+    png_scale=DEFAULT_PNG_SCALE,
+    png_max_points=None,
+    static_pdf=False,
+):
     """This is the main function of F0. It calls all functions that prepare the simulation output, ie. Storing all simulation output into excellent files, bar charts, and graphs.
 
     Parameters
@@ -78,6 +96,24 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
     path_png_figs : (str)
         if provided, generate png figures of the simulation's results to the given path
 
+    timeseries_sidecar : (bool)
+        if True, the timeseries of the json file with the results are stored in a binary
+        sidecar file, see :py:func:`~.store_as_json`
+
+    png_scale : (int or float)
+        scale of the png figures, ie. factor between their number of pixels and their layout size
+        Default: DEFAULT_PNG_SCALE
+
+    png_max_points : (int)
+        if provided, the timeseries of the png figures with more points are downsampled to
+        about this number of points before being rasterized
+        Default: None
+
+    static_pdf : (bool)
+        if True, the pdf report is printed from a static html version of the report with
+        :py:func:`~.F2_autoreport.print_static_pdf` instead of from the served dash app
+        Default: False
+
     Returns
     -------
     type
@@ -89,15 +125,17 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
         "Summarizing simulation results to results_timeseries and results_scalars_assets."
     )
 
-    parse_simulation_log(
-        path_log_file=os.path.join(
-            dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], LOGFILE
-        ),
-        dict_values=dict_values,
-    )
+    # the log messages are parsed from the log file if they were not captured during the simulation
+    if LOGS not in dict_values[SIMULATION_RESULTS]:
+        parse_simulation_log(
+            path_log_file=os.path.join(
+                dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], LOGFILE
+            ),
+            dict_values=dict_values,
+        )
 
-    # storing all flows to exel.
-    store_timeseries_all_busses_to_excel(dict_values)
+    # storing all flows to excel, csv, parquet and/or hdf5 files
+    store_timeseries_all_busses(dict_values)
 
     # Write everything to file with multiple tabs
     store_scalars_to_excel(dict_values)
@@ -106,41 +144,75 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
         dict_values,
         dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
         JSON_WITH_RESULTS,
+        timeseries_sidecar=timeseries_sidecar,
     )
 
-    # generate png figures
+    # generate png figures, all figures are collected and saved at once
     if path_png_figs is not None:
+        # plotly and graphviz are only imported if figures are requested
+        import multi_vector_simulator.F1_plotting as F1_plots
+
+        render_queue = F1_plots.PlotRenderQueue(
+            scale=png_scale, max_points=png_max_points
+        )
         # plot demand timeseries
         F1_plots.plot_timeseries(
-            dict_values, data_type=DEMANDS, file_path=path_png_figs
+            dict_values,
+            data_type=DEMANDS,
+            file_path=path_png_figs,
+            render_queue=render_queue,
         )
         # plot demand timeseries for the first 2 weeks only
         F1_plots.plot_timeseries(
-            dict_values, data_type=DEMANDS, max_days=14, file_path=path_png_figs
+            dict_values,
+            data_type=DEMANDS,
+            max_days=14,
+            file_path=path_png_figs,
+            render_queue=render_queue,
         )
 
         # plot supply timeseries
         F1_plots.plot_timeseries(
-            dict_values, data_type=RESOURCES, file_path=path_png_figs
+            dict_values,
+            data_type=RESOURCES,
+            file_path=path_png_figs,
+            render_queue=render_queue,
         )
         # plot supply timeseries for the first 2 weeks only
         F1_plots.plot_timeseries(
-            dict_values, data_type=RESOURCES, max_days=14, file_path=path_png_figs
+            dict_values,
+            data_type=RESOURCES,
+            max_days=14,
+            file_path=path_png_figs,
+            render_queue=render_queue,
         )
 
         # plot power flows in the energy system
-        F1_plots.plot_instant_power(dict_values, file_path=path_png_figs)
+        F1_plots.plot_instant_power(
+            dict_values, file_path=path_png_figs, render_queue=render_queue
+        )
 
         # plot optimal capacities if there are optimized assets
-        F1_plots.plot_optimized_capacities(dict_values, file_path=path_png_figs)
+        F1_plots.plot_optimized_capacities(
+            dict_values, file_path=path_png_figs, render_queue=render_queue
+        )
 
         # plot annuity, first-investment and om costs
-        F1_plots.plot_piecharts_of_costs(dict_values, file_path=path_png_figs)
+        F1_plots.plot_piecharts_of_costs(
+            dict_values, file_path=path_png_figs, render_queue=render_queue
+        )
+
+        render_queue.render()
 
     # generate a pdf report
     if path_pdf_report is not None:
-        app = autoreport.create_app(dict_values)
-        autoreport.print_pdf(app, path_pdf_report=path_pdf_report)
+        import multi_vector_simulator.F2_autoreport as autoreport
+
+        if static_pdf is True:
+            autoreport.print_static_pdf(dict_values, path_pdf_report=path_pdf_report)
+        else:
+            app = autoreport.create_app(dict_values)
+            autoreport.print_pdf(app, path_pdf_report=path_pdf_report)
         logging.info(
             "Generating PDF report of the simulation: {}".format(path_pdf_report)
         )
@@ -203,7 +275,7 @@ def store_timeseries_all_busses_to_excel(dict_values):
 
     """
 
-    timeseries_output_file = "/timeseries_all_busses" + ".xlsx"
+    timeseries_output_file = "/" + TIMESERIES_ALL_BUSSES + ".xlsx"
     with pd.ExcelWriter(
         dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER] + timeseries_output_file
     ) as open_file:  # doctest: +SKIP
@@ -213,6 +285,214 @@ def store_timeseries_all_busses_to_excel(dict_values):
     logging.debug("Saved flows at busses to: %s.", timeseries_output_file)
 
 
+def store_timeseries_all_busses_to_csv(
+    dict_values, chunksize=TIMESERIES_CSV_CHUNK_SIZE
+):
+    """Stores the timeseries of each bus in a csv file, written in chunks of rows
+
+    The files are stored in the folder `timeseries_all_busses` of the output folder, with the
+    name of the bus as file name.
+
+    Parameters
+    ----------
+    dict_values :
+        dict Of all input and output parameters up to F0
+
+    chunksize : int
+        Number of rows written at once to a csv file
+        Default: TIMESERIES_CSV_CHUNK_SIZE
+
+    Returns
+    -------
+    Path of the folder with the csv files
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F0_output.TestTimeseriesOutputFormats
+    """
+    folder = os.path.join(
+        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], TIMESERIES_ALL_BUSSES
+    )
+    os.makedirs(folder, exist_ok=True)
+    for bus in dict_values[OPTIMIZED_FLOWS]:
+        dict_values[OPTIMIZED_FLOWS][bus].to_csv(
+            os.path.join(folder, bus + ".csv"), chunksize=chunksize
+        )
+
+    logging.debug("Saved flows at busses to: %s.", folder)
+    return folder
+
+
+def store_timeseries_all_busses_to_parquet(dict_values):
+    """Stores the timeseries of each bus in a parquet file
+
+    The files are stored in the folder `timeseries_all_busses` of the output folder, with the
+    name of the bus as file name. Writing parquet files requires pyarrow or fastparquet.
+
+    Parameters
+    ----------
+    dict_values :
+        dict Of all input and output parameters up to F0
+
+    Returns
+    -------
+    Path of the folder with the parquet files
+    """
+    folder = os.path.join(
+        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], TIMESERIES_ALL_BUSSES
+    )
+    os.makedirs(folder, exist_ok=True)
+    for bus in dict_values[OPTIMIZED_FLOWS]:
+        dict_values[OPTIMIZED_FLOWS][bus].to_parquet(
+            os.path.join(folder, bus + ".parquet")
+        )
+
+    logging.debug("Saved flows at busses to: %s.", folder)
+    return folder
+
+
+def store_timeseries_all_busses_to_hdf5(dict_values):
+    """Stores the timeseries of all busses in a HDF5 file, with one key per bus
+
+    Writing HDF5 files requires pytables.
+
+    Parameters
+    ----------
+    dict_values :
+        dict Of all input and output parameters up to F0
+
+    Returns
+    -------
+    Path of the HDF5 file
+    """
+    file_path = os.path.join(
+        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
+        TIMESERIES_ALL_BUSSES + ".h5",
+    )
+    with pd.HDFStore(file_path, mode="w") as store:
+        for bus in dict_values[OPTIMIZED_FLOWS]:
+            store.put(bus, dict_values[OPTIMIZED_FLOWS][bus])
+
+    logging.debug("Saved flows at busses to: %s.", file_path)
+    return file_path
+
+
+def get_timeseries_output_formats(dict_values):
+    """Returns the formats in which the timeseries of all busses are stored
+
+    The formats are defined by the optional simulation setting TIMESERIES_OUTPUT_FORMAT, either
+    a single format, a comma separated string or a list of formats (see
+    TIMESERIES_OUTPUT_FORMATS). If it is None or empty, the timeseries are not stored in a
+    separate file. The default is DEFAULT_TIMESERIES_OUTPUT_FORMAT.
+
+    Parameters
+    ----------
+    dict_values :
+        dict Of all input and output parameters
+
+    Returns
+    -------
+    list of the formats
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F0_output.TestTimeseriesOutputFormats
+    """
+    output_formats = (
+        dict_values[SIMULATION_SETTINGS]
+        .get(TIMESERIES_OUTPUT_FORMAT, {})
+        .get(VALUE, DEFAULT_TIMESERIES_OUTPUT_FORMAT)
+    )
+    if output_formats is None:
+        output_formats = []
+    elif isinstance(output_formats, str):
+        output_formats = output_formats.split(",")
+
+    output_formats = [
+        output_format.strip().lower()
+        for output_format in output_formats
+        if output_format.strip() != ""
+    ]
+    unknown_formats = [
+        output_format
+        for output_format in output_formats
+        if output_format not in TIMESERIES_OUTPUT_FORMATS
+    ]
+    if len(unknown_formats) > 0:
+        raise UnknownOutputFormatError(
+            f"The format(s) {', '.join(unknown_formats)} of the {TIMESERIES_OUTPUT_FORMAT} are "
+            f"not supported by the MVS, the supported formats are "
+            f"{', '.join(TIMESERIES_OUTPUT_FORMATS)}"
+        )
+    # remove duplicates while keeping the order
+    return list(dict.fromkeys(output_formats))
+
+
+def store_timeseries_all_busses(dict_values):
+    """Stores the timeseries of all busses in the formats of the simulation settings
+
+    If a bus has more timesteps than an Excel sheet can hold (EXCEL_MAX_ROWS) or if the
+    optional dependency of a format is not installed, the timeseries are stored as csv files
+    instead.
+
+    Parameters
+    ----------
+    dict_values :
+        dict Of all input and output parameters up to F0
+
+    Returns
+    -------
+    list of the formats in which the timeseries were stored
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F0_output.TestTimeseriesOutputFormats
+    """
+    output_formats = get_timeseries_output_formats(dict_values)
+
+    if TIMESERIES_FORMAT_XLSX in output_formats and any(
+        len(timeseries) >= EXCEL_MAX_ROWS
+        for timeseries in dict_values[OPTIMIZED_FLOWS].values()
+    ):
+        logging.warning(
+            f"The timeseries of the busses have more rows than an Excel sheet can hold "
+            f"({EXCEL_MAX_ROWS}), they are stored as csv files instead."
+        )
+        output_formats[output_formats.index(TIMESERIES_FORMAT_XLSX)] = (
+            TIMESERIES_FORMAT_CSV
+        )
+
+    stored_formats = []
+    for output_format in output_formats:
+        if output_format in stored_formats:
+            continue
+        try:
+            TIMESERIES_WRITERS[output_format](dict_values)
+        except ImportError as e:
+            logging.error(
+                f"The timeseries of the busses could not be stored in the format "
+                f"{output_format} ({e}), they are stored as csv files instead."
+            )
+            output_format = TIMESERIES_FORMAT_CSV
+            if output_format in stored_formats:
+                continue
+            TIMESERIES_WRITERS[output_format](dict_values)
+        stored_formats.append(output_format)
+    return stored_formats
+
+
+# functions storing the timeseries of all busses in each format
+TIMESERIES_WRITERS = {
+    TIMESERIES_FORMAT_XLSX: store_timeseries_all_busses_to_excel,
+    TIMESERIES_FORMAT_CSV: store_timeseries_all_busses_to_csv,
+    TIMESERIES_FORMAT_PARQUET: store_timeseries_all_busses_to_parquet,
+    TIMESERIES_FORMAT_HDF5: store_timeseries_all_busses_to_hdf5,
+}
+
+
 def parse_simulation_log(path_log_file, dict_values):
     """Gather a log file with several log messages, this function gathers them all and inputs them into the dict with
     all input and output parameters up to F0
@@ -266,7 +546,9 @@ def parse_simulation_log(path_log_file, dict_values):
     dict_values[SIMULATION_RESULTS].update({LOGS: log_dict})
 
 
-def store_as_json(dict_values, output_folder=None, file_name=None):
+def store_as_json(
+    dict_values, output_folder=None, file_name=None, timeseries_sidecar=False
+):
     """Converts dict_values to JSON format and saves dict_values as a JSON file or return json
 
     Parameters
@@ -279,23 +561,48 @@ def store_as_json(dict_values, output_folder=None, file_name=None):
     file_name : (str)
         Name of the file the json should be stored as
         Default None
+    timeseries_sidecar : (bool)
+        If True and file_name is provided, the values of the numerical timeseries are stored in
+        binary format in the file <file_name>.npz next to the json file, which only contains
+        references to them. :py:func:`~.B0_data_input_json.load_json` reads them back lazily.
+        Default False
 
     Returns
     -------
     If file_name is provided, the json variable converted from the dict_values is saved under
     this file_name, otherwise the json variable is returned
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F0_output.TestTimeseriesSidecar
     """
+    sidecar_arrays = {}
+    if timeseries_sidecar is True and file_name is not None:
+        default = functools.partial(
+            convert_from_special_types_to_json_with_sidecar,
+            sidecar_arrays=sidecar_arrays,
+            sidecar_file=file_name + NPZ_FILE_EXTENSION,
+        )
+    else:
+        default = convert_from_special_types_to_json
+
     json_data = json.dumps(
         dict_values,
         skipkeys=False,
         sort_keys=True,
-        default=convert_from_special_types_to_json,
+        default=default,
         indent=4,
     )
     if file_name is not None:
         file_path = os.path.abspath(os.path.join(output_folder, file_name + ".json"))
 
         if os.path.exists(os.path.dirname(file_path)):
+            if len(sidecar_arrays) > 0:
+                np.savez(
+                    os.path.join(output_folder, file_name + NPZ_FILE_EXTENSION),
+                    **sidecar_arrays,
+                )
             myfile = open(file_path, "w")
 
             myfile.write(json_data)
@@ -13,6 +13,8 @@ Module F1 describes all the functions that create plots.
 import logging
 import os
 import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
 import numpy as np
 
 import pandas as pd
@@ -21,6 +23,7 @@ PLOTLY_INSTALLED = False
 try:
     import plotly.graph_objs as go
     import plotly.express as px
+    import plotly.io as pio
 
     PLOTLY_INSTALLED = True
 except ModuleNotFoundError:
@@ -41,6 +44,7 @@ from multi_vector_simulator.utils.constants import (
     PATHS_TO_PLOTS,
     PLOT_SANKEY,
     SOC,
+    DEFAULT_PNG_SCALE,
 )
 
 from multi_vector_simulator.utils.constants_json_strings import (
@@ -505,7 +509,13 @@ def get_color(idx_line, color_list=None):
 
 
 def save_plots_to_disk(
-    fig_obj, file_name, file_path="", width=None, height=None, scale=None
+    fig_obj,
+    file_name,
+    file_path="",
+    width=None,
+    height=None,
+    scale=None,
+    render_queue=None,
 ):
     r"""
     This function saves the plots generated using the Plotly library in this module to the outputs folder.
@@ -533,6 +543,10 @@ def save_plots_to_disk(
         The scale by which the plotly image ought to be multiplied.
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the plot is added to the queue and only saved when the queue is rendered
+        Default: None
+
     Returns
     -------
     Nothing is returned. This function call results in the plots being saved as .png images to the disk.
@@ -541,13 +555,224 @@ def save_plots_to_disk(
     if not file_name.endswith("png"):
         file_name = file_name + ".png"
 
+    file_path_out = os.path.join(file_path, file_name)
+    if render_queue is not None:
+        render_queue.add(
+            fig_obj, file_path_out, width=width, height=height, scale=scale
+        )
+        return
+
     logging.info("Saving {} under {}".format(file_name, file_path))
 
-    file_path_out = os.path.join(file_path, file_name)
     with open(file_path_out, "wb") as fp:
         fig_obj.write_image(fp, width=width, height=height, scale=scale)
 
 
+def downsample_figure(fig_obj, max_points):
+    r"""
+    Reduces the number of points of the long timeseries of a figure
+
+    The points of each line trace with more than `max_points` points are split into
+    `max_points / 2` consecutive buckets, of which only the points with the minimal and the
+    maximal value are kept. The peaks of the timeseries are therefore still visible once the
+    figure is rasterized.
+
+    Parameters
+    ----------
+    fig_obj: :class:`plotly.graph_objs.Figure`
+        Figure to be downsampled
+
+    max_points: int
+        Maximal number of points of each trace
+
+    Returns
+    -------
+    :class:`plotly.graph_objs.Figure`, a downsampled copy of the figure
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F1_plotting.TestPlotRenderQueue
+    """
+    fig_obj = go.Figure(fig_obj)
+    n_buckets = max(max_points // 2, 1)
+    for trace in fig_obj.data:
+        if trace.type != "scatter" or trace.y is None or len(trace.y) <= max_points:
+            continue
+        y_values = np.asarray(trace.y, dtype=float)
+        n_points = len(y_values)
+        bucket_size = int(np.ceil(n_points / n_buckets))
+        # the last bucket is padded with nan, which are ignored by nanargmin and nanargmax
+        buckets = np.full(n_buckets * bucket_size, np.nan)
+        buckets[:n_points] = y_values
+        buckets = buckets.reshape(-1, bucket_size)
+        # buckets only containing padding values are dropped
+        buckets = buckets[~np.isnan(buckets).all(axis=1)]
+        offsets = np.arange(len(buckets)) * bucket_size
+        kept = np.unique(
+            np.concatenate(
+                [
+                    offsets + np.nanargmin(buckets, axis=1),
+                    offsets + np.nanargmax(buckets, axis=1),
+                ]
+            )
+        )
+        trace.update(
+            y=y_values[kept],
+            x=None if trace.x is None else np.asarray(trace.x)[kept],
+        )
+    return fig_obj
+
+
+def write_plot_image(plot):
+    r"""
+    Saves a figure of a :class:`PlotRenderQueue` as image
+
+    Parameters
+    ----------
+    plot: dict
+        Figure (as dict) with the path of the image and its width, height and scale
+
+    Returns
+    -------
+    Path of the image
+    """
+    fig_obj = go.Figure(plot["fig"])
+    with open(plot["file"], "wb") as fp:
+        fig_obj.write_image(
+            fp, width=plot["width"], height=plot["height"], scale=plot["scale"]
+        )
+    return plot["file"]
+
+
+def kaleido_exports_several_images():
+    r"""
+    Checks if plotly and kaleido can export several figures within one kaleido session
+
+    plotly>=6.1 provides :func:`plotly.io.write_images` also if kaleido<1.0 is installed,
+    which then raises an error, the version of kaleido is therefore checked as well.
+
+    Returns
+    -------
+    True if :func:`plotly.io.write_images` is provided and kaleido>=1.0 is installed
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F1_plotting.TestPlotRenderQueue
+    """
+    if not hasattr(pio, "write_images"):
+        return False
+    try:
+        kaleido_version = metadata.version("kaleido")
+    except metadata.PackageNotFoundError:
+        return False
+    try:
+        return int(kaleido_version.split(".")[0]) >= 1
+    except ValueError:
+        return False
+
+
+class PlotRenderQueue:
+    r"""Collects figures and saves them as images all at once
+
+    Saving the figures one at a time with kaleido is the slowest step of the png export. The
+    queue collects them and exports them concurrently once :py:meth:`render` is called, with
+    a single kaleido session if the installed kaleido supports it (kaleido>=1.0) or on a pool
+    of processes otherwise.
+
+    Parameters
+    ----------
+    scale: int or float
+        Scale of all images, overwrites the scale of each figure if not None
+        Default: None
+
+    max_points: int
+        If not None, the timeseries with more points are downsampled before being rasterized,
+        see :py:func:`downsample_figure`
+        Default: None
+
+    n_workers: int
+        Number of processes exporting the figures if kaleido does not export several figures
+        at once, if None the number of CPUs
+        Default: None
+
+    Notes
+    -----
+    This class is tested with:
+    - test_F1_plotting.TestPlotRenderQueue
+    """
+
+    def __init__(self, scale=None, max_points=None, n_workers=None):
+        self.scale = scale
+        self.max_points = max_points
+        self.n_workers = n_workers
+        self.plots = []
+
+    def add(self, fig_obj, file, width=None, height=None, scale=None):
+        r"""Adds a figure to the queue
+
+        Parameters
+        ----------
+        fig_obj: :class:`plotly.graph_objs.Figure`
+            Figure to be saved
+
+        file: str
+            Path of the image
+
+        width: int or float
+            The width of the image in pixels.
+
+        height: int or float
+            The height of the image in pixels.
+
+        scale: int or float
+            The scale of the image, if the queue has no scale
+        """
+        if self.max_points is not None:
+            fig_obj = downsample_figure(fig_obj, self.max_points)
+        if self.scale is not None:
+            scale = self.scale
+        self.plots.append(
+            {
+                "fig": fig_obj,
+                "file": file,
+                "width": width,
+                "height": height,
+                "scale": scale,
+            }
+        )
+
+    def render(self):
+        r"""Saves all figures of the queue as images and empties the queue
+
+        Returns
+        -------
+        List of the paths of the images
+        """
+        plots, self.plots = self.plots, []
+        if len(plots) == 0:
+            return []
+        logging.info(f"Saving {len(plots)} figures as images")
+
+        if kaleido_exports_several_images() is True:
+            # kaleido>=1.0 exports all figures within one session
+            pio.write_images(
+                fig=[plot["fig"] for plot in plots],
+                file=[plot["file"] for plot in plots],
+                width=[plot["width"] for plot in plots],
+                height=[plot["height"] for plot in plots],
+                scale=[plot["scale"] for plot in plots],
+            )
+        else:
+            for plot in plots:
+                plot["fig"] = plot["fig"].to_dict()
+            n_workers = self.n_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(plots))) as pool:
+                list(pool.map(write_plot_image, plots))
+        return [plot["file"] for plot in plots]
+
+
 def get_fig_style_dict():
     styling_dict = dict(
         showgrid=True,
@@ -569,6 +794,7 @@ def create_plotly_line_fig(
     y_axis_name=None,
     color_for_plot="#0A2342",
     file_path=None,
+    render_queue=None,
 ):
     r"""
     Create figure for generic timeseries lineplots
@@ -594,6 +820,10 @@ def create_plotly_line_fig(
     file_path: str
         Path where the image shall be saved if not None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     fig :class:`plotly.graph_objs.Figure`
@@ -637,10 +867,11 @@ def create_plotly_line_fig(
         save_plots_to_disk(
             fig_obj=fig,
             file_path=file_path,
+            render_queue=render_queue,
             file_name=name_file,
             width=1200,
             height=600,
-            scale=5,
+            scale=DEFAULT_PNG_SCALE,
         )
 
     return fig
@@ -653,6 +884,7 @@ def plot_timeseries(
     max_days=None,
     color_list=None,
     file_path=None,
+    render_queue=None,
 ):
     r"""Plot timeseries as line chart.
 
@@ -680,6 +912,10 @@ def plot_timeseries(
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     Dict with html DOM id for the figure as key and :class:`plotly.graph_objs.Figure` as value
@@ -730,6 +966,7 @@ def plot_timeseries(
             y_axis_name="kW",
             color_for_plot=get_color(i, color_list),
             file_path=file_path,
+            render_queue=render_queue,
         )
         if file_path is None:
             plots[comp_id] = fig
@@ -757,6 +994,7 @@ def create_plotly_barplot_fig(
     y_axis_name=None,
     file_name="barplot.png",
     file_path=None,
+    render_queue=None,
 ):
     r"""
     Create figure for specific capacities barplot
@@ -794,6 +1032,10 @@ def create_plotly_barplot_fig(
     file_path: str
         Path where the image shall be saved if not None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     fig: :class:`plotly.graph_objs.Figure`
@@ -851,10 +1093,11 @@ def create_plotly_barplot_fig(
         save_plots_to_disk(
             fig_obj=fig,
             file_path=file_path,
+            render_queue=render_queue,
             file_name=file_name,
             width=1200,
             height=600,
-            scale=5,
+            scale=DEFAULT_PNG_SCALE,
         )
 
     return fig
@@ -863,6 +1106,7 @@ def create_plotly_barplot_fig(
 def plot_optimized_capacities(
     dict_values,
     file_path=None,
+    render_queue=None,
 ):
     """Plot capacities as a bar chart.
 
@@ -875,6 +1119,10 @@ def plot_optimized_capacities(
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     Dict with html DOM id for the figure as key and :class:`plotly.graph_objs.Figure` as value
@@ -922,6 +1170,7 @@ def plot_optimized_capacities(
         y_axis_name="Capacities",
         file_name=name_file,
         file_path=file_path,
+        render_queue=render_queue,
     )
 
     return {"capacities_plot": fig}
@@ -935,6 +1184,7 @@ def create_plotly_flow_fig(
     color_list=None,
     file_name="flows.png",
     file_path=None,
+    render_queue=None,
 ):
     r"""Generate figure of an asset's flow.
 
@@ -963,6 +1213,10 @@ def create_plotly_flow_fig(
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     fig: :class:`plotly.graph_objs.Figure`
@@ -1014,16 +1268,17 @@ def create_plotly_flow_fig(
         save_plots_to_disk(
             fig_obj=fig,
             file_path=file_path,
+            render_queue=render_queue,
             file_name=file_name,
             width=1200,
             height=600,
-            scale=5,
+            scale=DEFAULT_PNG_SCALE,
         )
 
     return fig
 
 
-def plot_instant_power(dict_values, file_path=None):
+def plot_instant_power(dict_values, file_path=None, render_queue=None):
     """Plotting timeseries of instantaneous power for each assets within the energy system
 
     Parameters
@@ -1035,6 +1290,10 @@ def plot_instant_power(dict_values, file_path=None):
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     multi_plots: dict
@@ -1069,6 +1328,7 @@ def plot_instant_power(dict_values, file_path=None):
                 y_legend="SOC",
                 plot_title=title,
                 file_path=file_path,
+                render_queue=render_queue,
                 file_name=f"SOC_{bus}_power.png",
             )
             if file_path is None:
@@ -1094,6 +1354,7 @@ def plot_instant_power(dict_values, file_path=None):
             y_legend=bus + " in kW",
             plot_title=title,
             file_path=file_path,
+            render_queue=render_queue,
             file_name=bus + "_power.png",
         )
         if file_path is None:
@@ -1109,6 +1370,7 @@ def create_plotly_piechart_fig(
     color_scheme=None,
     file_name="costs.png",
     file_path=None,
+    render_queue=None,
 ):
     r"""Generate figure with piechart plot.
 
@@ -1136,6 +1398,10 @@ def create_plotly_piechart_fig(
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     fig: :class:`plotly.graph_objs.Figure`
@@ -1191,16 +1457,17 @@ def create_plotly_piechart_fig(
         save_plots_to_disk(
             fig_obj=fig,
             file_path=file_path,
+            render_queue=render_queue,
             file_name=file_name,
             width=1200,
             height=600,
-            scale=5,
+            scale=DEFAULT_PNG_SCALE,
         )
 
     return fig
 
 
-def plot_piecharts_of_costs(dict_values, file_path=None):
+def plot_piecharts_of_costs(dict_values, file_path=None, render_queue=None):
     """Plotting piecharts of different cost parameters (ie. annuity, total cost, etc...)
 
     Parameters
@@ -1212,6 +1479,10 @@ def plot_piecharts_of_costs(dict_values, file_path=None):
         Path where the image shall be saved if not None
         Default: None
 
+    render_queue: :class:`PlotRenderQueue`
+        If provided, the image is added to the queue instead of being saved directly
+        Default: None
+
     Returns
     -------
     pie_plots: dict
@@ -1296,6 +1567,7 @@ def plot_piecharts_of_costs(dict_values, file_path=None):
             color_scheme=scheme_choosen,
             file_name=file_name,
             file_path=file_path,
+            render_queue=render_queue,
         )
 
         if file_path is None:
@@ -8,6 +8,10 @@ This script generates a report of the simulation automatically, with all the imp
 import base64
 import os
 import pickle
+import re
+import socket
+from html import escape
+from pathlib import Path
 
 # Imports for generating pdf automatically
 import threading
@@ -99,7 +103,7 @@ OUTPUT_FOLDER = os.path.join(REPO_PATH, OUTPUT_FOLDER)
 CSV_FOLDER = os.path.join(REPO_PATH, OUTPUT_FOLDER, INPUTS_COPY, CSV_ELEMENTS)
 
 
-async def _print_pdf_from_chrome(path_pdf_report):
+async def _print_pdf_from_chrome(path_pdf_report, url="http://127.0.0.1:8050"):
     r"""
     This function generates the PDF report from the web app rendered on a Chromium-based browser.
 
@@ -109,6 +113,10 @@ async def _print_pdf_from_chrome(path_pdf_report):
         Path and filename to which the pdf report should be stored
         Default: Default: os.path.join(OUTPUT_FOLDER, "out.pdf")
 
+    url: str
+        Address of the web app
+        Default: "http://127.0.0.1:8050"
+
     Returns
     -------
     Does not return anything, but saves a PDF file in file path provided by the user.
@@ -116,9 +124,7 @@ async def _print_pdf_from_chrome(path_pdf_report):
 
     browser = await launch()
     page = await browser.newPage()
-    await page.goto(
-        "http://127.0.0.1:8050", {"waitUntil": "domcontentloaded", "timeout": 120000}
-    )
+    await page.goto(url, {"waitUntil": "domcontentloaded", "timeout": 120000})
     await page.waitForSelector(
         ".dash-cell",
         {
@@ -133,7 +139,24 @@ async def _print_pdf_from_chrome(path_pdf_report):
     print("*" * 10)
 
 
-def print_pdf(app=None, path_pdf_report=os.path.join(OUTPUT_FOLDER, "out.pdf")):
+def get_free_port():
+    r"""Returns a port of the local host which is not in use
+
+    The operating system attributes a free ephemeral port when binding to port 0, so that
+    several apps can be served at the same time on one host.
+
+    Returns
+    -------
+    port: int
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def print_pdf(
+    app=None, path_pdf_report=os.path.join(OUTPUT_FOLDER, "out.pdf"), port=None
+):
     r"""Runs the dash app in a thread and print a pdf before exiting
 
     Parameters
@@ -144,19 +167,34 @@ def print_pdf(app=None, path_pdf_report=os.path.join(OUTPUT_FOLDER, "out.pdf")):
     path_pdf_report: str
         Path where the pdf report should be saved.
 
+    port: int
+        Port on which the app is served. If None, a free port is used if an app is provided,
+        otherwise the app is expected at the default port of dash (8050)
+        Default: None
+
     Returns
     -------
     None, but saves a pdf printout of the provided app under the provided path
+
+    Notes
+    -----
+    The app has to be served and loaded in a browser, use :py:func:`print_static_pdf` to
+    save a pdf report without serving an app.
     """
 
+    if port is None:
+        port = 8050 if app is None else get_free_port()
+
     # if an app handle is provided, serve it locally in a separated thread
     if app is not None:
-        td = threading.Thread(target=app.run_server)
+        td = threading.Thread(target=app.run_server, kwargs={"port": port})
         td.daemon = True
         td.start()
 
     # Emulates a webdriver
-    asyncio.get_event_loop().run_until_complete(_print_pdf_from_chrome(path_pdf_report))
+    asyncio.get_event_loop().run_until_complete(
+        _print_pdf_from_chrome(path_pdf_report, url=f"http://127.0.0.1:{port}")
+    )
 
     if app is not None:
         td.join(20)
@@ -1115,6 +1153,350 @@ def create_app(results_json, path_sim_output=None):
     return app
 
 
+# Names of the html attributes which differ from the properties of dash html components
+STATIC_HTML_ATTRIBUTES = {"className": "class", "htmlFor": "for"}
+# Properties of dash html components which only matter in the app
+STATIC_HTML_IGNORED_PROPS = (
+    "n_clicks",
+    "n_clicks_timestamp",
+    "disable_n_clicks",
+    "loading_state",
+    "key",
+)
+STATIC_HTML_VOID_TAGS = ("img", "hr", "br", "input", "meta", "link", "col", "wbr")
+
+
+def style_to_css(style):
+    r"""Converts the style of a dash component into an inline css declaration
+
+    Parameters
+    ----------
+    style: dict
+        Style of a dash component, the css properties may be written in camelCase
+
+    Returns
+    -------
+    str
+        Inline css declaration, e.g. "font-weight: bold; page-break-before: always"
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F2_autoreport.TestStaticReport.test_style_to_css_converts_camel_case
+    """
+    return "; ".join(
+        "{}: {}".format(re.sub(r"([A-Z])", r"-\1", prop).lower(), value)
+        for prop, value in style.items()
+    )
+
+
+def render_static_table(props):
+    r"""Renders the properties of a dash DataTable as a html table
+
+    Parameters
+    ----------
+    props: dict
+        Properties of the :class:`dash_table.DataTable`, its columns, data and styles
+
+    Returns
+    -------
+    str
+        Html table with the content and the styles of the DataTable
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F2_autoreport.TestStaticReport.test_render_static_table
+    """
+    columns = props.get("columns", [])
+    cell_style = style_to_css(props.get("style_cell", {}))
+    header_style = style_to_css(
+        {**props.get("style_cell", {}), **props.get("style_header", {})}
+    )
+
+    # only the conditions on the row index are supported
+    row_styles = {}
+    for condition in props.get("style_data_conditional", []):
+        condition = dict(condition)
+        row_index = condition.pop("if", {}).get("row_index")
+        if row_index is not None:
+            row_styles[row_index] = style_to_css(condition)
+
+    header = "".join(
+        f'<th style="{escape(header_style)}">{escape(str(col["name"]))}</th>'
+        for col in columns
+    )
+    rows = []
+    for idx, record in enumerate(props.get("data", [])):
+        row_style = row_styles.get(idx, row_styles.get("odd" if idx % 2 else "even"))
+        row_attribute = "" if row_style is None else f' style="{escape(row_style)}"'
+        cells = "".join(
+            f'<td style="{escape(cell_style)}">{escape(str(record.get(col["id"], "")))}</td>'
+            for col in columns
+        )
+        rows.append(f"<tr{row_attribute}>{cells}</tr>")
+    return '<table class="dash-table"><thead><tr>{}</tr></thead><tbody>{}</tbody></table>'.format(
+        header, "".join(rows)
+    )
+
+
+def render_static_html(component):
+    r"""Renders a dash layout as static html
+
+    The html components are converted into the corresponding html tags and the DataTables into
+    html tables. The interactive graphs are left out, as the report layout already contains
+    pre-rendered images of each figure.
+
+    Parameters
+    ----------
+    component: dash component, list, str or number
+        Layout or part of the layout of a dash app
+
+    Returns
+    -------
+    str
+        Html code of the layout
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F2_autoreport.TestStaticReport
+    """
+    if component is None:
+        return ""
+    if isinstance(component, (list, tuple)):
+        return "".join(render_static_html(child) for child in component)
+    if isinstance(component, (str, int, float)):
+        return escape(str(component))
+
+    component_json = component.to_plotly_json()
+    props = dict(component_json["props"])
+    if component_json["namespace"] == "dash_table":
+        return render_static_table(props)
+    if component_json["namespace"] != "dash_html_components":
+        # interactive components such as dcc.Graph are only part of the app
+        return ""
+
+    tag = component_json["type"].lower()
+    children = props.pop("children", None)
+    attributes = ""
+    for prop, value in props.items():
+        if value is None or prop in STATIC_HTML_IGNORED_PROPS:
+            continue
+        if prop == "style":
+            value = style_to_css(value)
+        attribute = STATIC_HTML_ATTRIBUTES.get(prop, prop.lower())
+        attributes += f' {attribute}="{escape(str(value))}"'
+
+    if tag in STATIC_HTML_VOID_TAGS:
+        return f"<{tag}{attributes}>"
+    return f"<{tag}{attributes}>{render_static_html(children)}</{tag}>"
+
+
+def create_static_report(results_json, path_sim_output=None):
+    r"""Creates the report as a standalone html document
+
+    The layout of the app of :py:func:`create_app` is rendered with
+    :py:func:`render_static_html` and the css files of its asset folder are embedded in the
+    document, so that it can be printed to pdf without serving the app.
+
+    Parameters
+    ----------
+    results_json: dict
+        Dict with all simulation parameters and results
+
+    path_sim_output: str
+        Path to the mvs simulation's output files' folder
+        Default: output path saved in the result_json
+
+    Returns
+    -------
+    str
+        Html document of the report
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F2_autoreport.TestStaticReport.test_create_static_report_is_standalone
+    """
+    app = create_app(results_json, path_sim_output=path_sim_output)
+
+    head = [
+        '<meta charset="utf-8">',
+        f"<title>{escape(app.title)}</title>",
+    ]
+    for stylesheet in app.config.external_stylesheets:
+        if isinstance(stylesheet, str):
+            stylesheet = {"href": stylesheet, "rel": "stylesheet"}
+        attributes = "".join(
+            f' {attribute}="{escape(str(value))}"'
+            for attribute, value in stylesheet.items()
+        )
+        head.append(f"<link{attributes}>")
+    asset_folder = app.config.assets_folder
+    for file_name in sorted(os.listdir(asset_folder)):
+        if file_name.endswith(".css"):
+            with open(os.path.join(asset_folder, file_name), "r") as css_file:
+                head.append(f"<style>{css_file.read()}</style>")
+
+    return "<!DOCTYPE html><html><head>{}</head><body>{}</body></html>".format(
+        "".join(head), render_static_html(app.layout)
+    )
+
+
+class StaticReportPrinter:
+    r"""Prints standalone html reports to pdf with one headless browser
+
+    The browser is launched once when entering the context and used for all reports, each
+    report is printed in its own page from a html file, so no app needs to be served.
+    pyppeteer controls the browser through a free ephemeral port, so that several printers
+    can run on the same host.
+
+    Examples
+    --------
+    ::
+
+        with StaticReportPrinter() as printer:
+            printer.print_pdfs({path_pdf_1: report_html_1, path_pdf_2: report_html_2})
+
+    Notes
+    -----
+    This class is tested with:
+    - test_F2_autoreport.TestStaticReportPrinter
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.browser = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        r"""Launches the headless browser"""
+        if self.browser is None:
+            # signal handlers can only be set from the main thread
+            self.browser = self.loop.run_until_complete(
+                launch(
+                    handleSIGINT=False,
+                    handleSIGTERM=False,
+                    handleSIGHUP=False,
+                )
+            )
+
+    def close(self):
+        r"""Closes the browser and the event loop of the printer"""
+        if self.browser is not None:
+            self.loop.run_until_complete(self.browser.close())
+            self.browser = None
+        self.loop.close()
+
+    async def _print_page(self, report_html, path_pdf_report):
+        path_pdf_report = os.path.abspath(path_pdf_report)
+        os.makedirs(os.path.dirname(path_pdf_report), exist_ok=True)
+        # the html document is saved next to the pdf and loaded from disk
+        path_html_report = os.path.splitext(path_pdf_report)[0] + ".html"
+        with open(path_html_report, "w", encoding="utf-8") as html_file:
+            html_file.write(report_html)
+
+        page = await self.browser.newPage()
+        try:
+            # the uri escapes spaces and special characters and handles windows paths
+            await page.goto(
+                Path(path_html_report).resolve().as_uri(),
+                {"waitUntil": "load", "timeout": 120000},
+            )
+            await page.pdf(
+                {"path": path_pdf_report, "format": "A4", "printBackground": True}
+            )
+        finally:
+            await page.close()
+        logging.info(f"The report was saved under {path_pdf_report}")
+        return path_pdf_report
+
+    async def _print_pages(self, reports):
+        return await asyncio.gather(
+            *[
+                self._print_page(report_html, path_pdf_report)
+                for path_pdf_report, report_html in reports.items()
+            ]
+        )
+
+    def print_pdfs(self, reports):
+        r"""Prints several reports concurrently
+
+        Parameters
+        ----------
+        reports: dict
+            Html documents of the reports, as returned by :py:func:`create_static_report`,
+            with the paths of the pdf reports as keys. The html documents are saved
+            next to the pdf files.
+
+        Returns
+        -------
+        List of the paths of the pdf reports
+        """
+        self.open()
+        return self.loop.run_until_complete(self._print_pages(reports))
+
+    def print_pdf(self, report_html, path_pdf_report):
+        r"""Prints a report
+
+        Parameters
+        ----------
+        report_html: str
+            Html document of the report, as returned by :py:func:`create_static_report`
+
+        path_pdf_report: str
+            Path where the pdf report should be saved.
+
+        Returns
+        -------
+        Path of the pdf report
+        """
+        return self.print_pdfs({path_pdf_report: report_html})[0]
+
+
+def print_static_pdf(results_json, path_pdf_report, path_sim_output=None, printer=None):
+    r"""Saves the report of a simulation as pdf without serving the dash app
+
+    Parameters
+    ----------
+    results_json: dict
+        Dict with all simulation parameters and results
+
+    path_pdf_report: str
+        Path where the pdf report should be saved.
+
+    path_sim_output: str
+        Path to the mvs simulation's output files' folder
+        Default: output path saved in the result_json
+
+    printer: :class:`StaticReportPrinter`
+        Printer to reuse, e.g. to save the reports of many simulations, if None a printer is
+        launched for this report only
+        Default: None
+
+    Returns
+    -------
+    Path of the pdf report
+
+    Notes
+    -----
+    This function is tested with:
+    - test_F2_autoreport.TestStaticReportPrinter.test_print_static_pdf_reuses_printer
+    """
+    report_html = create_static_report(results_json, path_sim_output=path_sim_output)
+    if printer is not None:
+        return printer.print_pdf(report_html, path_pdf_report)
+    with StaticReportPrinter() as printer:
+        return printer.print_pdf(report_html, path_pdf_report)
+
+
 if __name__ == "__main__":
     from multi_vector_simulator.utils.constants import REPO_PATH, OUTPUT_FOLDER
     from multi_vector_simulator.B0_data_input_json import load_json
@@ -0,0 +1,462 @@
+"""
+Batch
+=====
+
+The batch runner simulates the scenarios of all input folders found within a folder (see
+:py:func:`~.utils.find_json_input_folders` and :py:func:`~.utils.find_csv_input_folders`) and
+summarizes their KPIs and timings in one table.
+
+- Each scenario is simulated by :py:func:`~.cli.main` in a process of its own, at most
+  ``n_workers`` at the same time. Where processes are forked (e.g. on Linux), they inherit the
+  modules imported once by the batch runner, so that the scenarios do not pay the start of
+  python and the imports of the MVS, as they would with one call of ``mvs_tool`` per folder.
+- The results and the log file of a scenario are saved in a subfolder of the output folder,
+  with the path of the input folder relative to the searched folder.
+- A scenario which fails or exceeds the timeout is simulated again up to ``retries`` times, the
+  process of a scenario exceeding the timeout is terminated without affecting the other ones.
+- The file ``batch_summary.csv`` of the output folder lists for each scenario its status, the
+  number of attempts, the duration and error of its last attempt, the objective value, the
+  wall time of each simulation stage and the scalar KPIs.
+
+Usage:
+
+.. code-block:: bash
+
+    mvs_batch -i path_scenarios_folder -o path_output_folder -w 4 -timeout 600 -retries 1
+"""
+
+import collections
+import contextlib
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+
+import pandas as pd
+
+import multi_vector_simulator.A0_initialization as A0
+import multi_vector_simulator.cli as cli
+from multi_vector_simulator.utils import (
+    find_json_input_folders,
+    find_csv_input_folders,
+)
+from multi_vector_simulator.worker import setup_worker_logging
+from multi_vector_simulator.utils.constants import (
+    JSON_EXT,
+    CSV_EXT,
+    PATH_INPUT_FOLDER,
+    PATH_OUTPUT_FOLDER,
+    INPUT_TYPE,
+    OVERWRITE,
+    DISPLAY_OUTPUT,
+    SOLVER,
+    JSON_WITH_RESULTS,
+    JSON_FILE_EXTENSION,
+    ARG_N_WORKERS,
+    ARG_TIMEOUT,
+    ARG_RETRIES,
+    JOB_STATUS,
+    JOB_ERROR,
+    JOB_DURATION,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_TIMEOUT,
+    BATCH_SCENARIO,
+    BATCH_ATTEMPTS,
+    BATCH_SUMMARY,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+    MODELLING_TIME,
+    SIMULTATION_TIME,
+    PROFILING,
+    KPI,
+    KPI_SCALARS_DICT,
+)
+
+
+def find_scenarios(path_input_folder, input_type=JSON_EXT, ignore_folder=None):
+    r"""Finds the input folders of the scenarios within a folder
+
+    Parameters
+    ----------
+    path_input_folder: str
+        Path to the folder within which the input folders are searched
+
+    input_type: str
+        "json" for the folders with a json input file, "csv" for the folders with a
+        csv_elements subfolder
+        Default: "json"
+
+    ignore_folder: str
+        Path to a folder within which the input folders are not considered, e.g. the output
+        folder of the batch, which contains a copy of the inputs of each scenario
+        Default: None
+
+    Returns
+    -------
+    Sorted list of the paths to the input folders
+
+    Notes
+    -----
+    This function is tested with:
+    - test_batch.TestFindScenarios
+    """
+    if input_type == CSV_EXT:
+        scenarios = find_csv_input_folders(path_input_folder)
+    else:
+        scenarios = find_json_input_folders(path_input_folder)
+    if ignore_folder is not None:
+        ignore_folder = os.path.abspath(ignore_folder)
+        scenarios = [
+            path
+            for path in scenarios
+            if os.path.commonpath([os.path.abspath(path), ignore_folder])
+            != ignore_folder
+        ]
+    return sorted(scenarios)
+
+
+def get_scenario_name(path_input_folder, path_scenario):
+    r"""Returns the path of the input folder of a scenario relative to the searched folder
+
+    The name of the searched folder is used if it is itself the input folder of the scenario.
+    """
+    name = os.path.relpath(path_scenario, path_input_folder)
+    if name == os.curdir:
+        name = os.path.basename(os.path.abspath(path_input_folder))
+    return name
+
+
+def run_scenario(connection, **kwargs):
+    r"""Simulates a scenario with :py:func:`~.cli.main`, target of the process of the scenario
+
+    Parameters
+    ----------
+    connection: :class:`multiprocessing.connection.Connection`
+        Connection on which None is sent if the simulation succeeded, its error message
+        otherwise
+    kwargs:
+        Keyword arguments of :py:func:`~.cli.main`
+    """
+    # the command line arguments of the batch runner are not the ones of mvs_tool
+    sys.argv = sys.argv[:1]
+    try:
+        # the messages printed by the scenarios running in parallel are not displayed
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            cli.main(**kwargs)
+    except Exception as e:
+        # the traceback is saved in the log file of the scenario
+        logging.exception("The simulation of the scenario failed")
+        connection.send(f"{type(e).__name__}: {e}")
+    else:
+        connection.send(None)
+    finally:
+        connection.close()
+
+
+def get_scenario_summary(path_output_folder):
+    r"""Returns the objective value, the timings and the scalar KPIs of a simulated scenario
+
+    Parameters
+    ----------
+    path_output_folder: str
+        Path to the output folder of the scenario
+
+    Returns
+    -------
+    dict
+        The objective value and the solver times of the simulation results, the wall time of
+        each simulation stage (with the suffix " wall_time") and the scalar KPIs, empty if the
+        results can not be read
+
+    Notes
+    -----
+    This function is tested with:
+    - test_batch.TestRunBatch
+    """
+    path_results = os.path.join(
+        path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION
+    )
+    try:
+        with open(path_results, "r") as json_file:
+            results = json.load(json_file)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"The results {path_results} can not be read: {e}")
+        return {}
+
+    summary = {}
+    simulation_results = results.get(SIMULATION_RESULTS, {})
+    for key in (OBJECTIVE_VALUE, MODELLING_TIME, SIMULTATION_TIME):
+        if key in simulation_results:
+            summary[key] = simulation_results[key]
+    for stage, measures in simulation_results.get(PROFILING, {}).items():
+        summary[f"{stage} wall_time"] = measures.get("wall_time")
+    for kpi, value in results.get(KPI, {}).get(KPI_SCALARS_DICT, {}).items():
+        if isinstance(value, (int, float)):
+            summary[kpi] = value
+    return summary
+
+
+def run_batch(
+    path_input_folder,
+    path_output_folder,
+    input_type=JSON_EXT,
+    overwrite=False,
+    n_workers=None,
+    timeout=None,
+    retries=0,
+    **simulation_kwargs,
+):
+    r"""Simulates the scenarios of all input folders found within a folder
+
+    Parameters
+    ----------
+    path_input_folder: str
+        Path to the folder within which the input folders of the scenarios are searched, see
+        :py:func:`find_scenarios`
+
+    path_output_folder: str
+        Path to the output folder, the results and the log file of each scenario are saved in
+        a subfolder and the summary of all scenarios in the file BATCH_SUMMARY
+
+    input_type: str
+        Type of the input files of the scenarios, "json" or "csv"
+        Default: "json"
+
+    overwrite: bool
+        If False, the scenarios whose output subfolder already exists are not simulated and
+        are listed as failed
+        Default: False
+
+    n_workers: int
+        Number of scenarios simulated at the same time, if None the number of CPUs
+        Default: None
+
+    timeout: int or float
+        Time in seconds after which the process of a scenario is terminated, if None the
+        scenarios are not limited in time
+        Default: None
+
+    retries: int
+        Number of times a scenario which failed or exceeded the timeout is simulated again
+        Default: 0
+
+    simulation_kwargs:
+        Other keyword arguments of :py:func:`~.cli.main`, e.g. solver or pdf_report
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+        Summary with one row per scenario, in the order of their names, see the module
+        description
+
+    Notes
+    -----
+    This function is tested with:
+    - test_batch.TestRunBatch
+    """
+    n_workers = os.cpu_count() if n_workers is None else max(1, n_workers)
+    # forked processes inherit the modules imported by the batch runner
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    scenarios = find_scenarios(
+        path_input_folder, input_type=input_type, ignore_folder=path_output_folder
+    )
+    logging.info(
+        f"{len(scenarios)} scenarios found in {path_input_folder}, they are simulated "
+        f"with {n_workers} processes"
+    )
+
+    summaries = {}
+    pending = collections.deque()
+    for path_scenario in scenarios:
+        name = get_scenario_name(path_input_folder, path_scenario)
+        path_scenario_output = os.path.join(path_output_folder, name)
+        summaries[name] = {BATCH_SCENARIO: name, BATCH_ATTEMPTS: 0}
+        if overwrite is False and os.path.exists(path_scenario_output):
+            summaries[name].update(
+                {
+                    JOB_STATUS: JOB_FAILED,
+                    JOB_ERROR: f"The output folder {path_scenario_output} already exists",
+                }
+            )
+            continue
+        pending.append(
+            (
+                name,
+                dict(
+                    simulation_kwargs,
+                    path_input_folder=path_scenario,
+                    path_output_folder=path_scenario_output,
+                    input_type=input_type,
+                    # the attempts of a scenario overwrite the results of the previous ones
+                    overwrite=True,
+                    display_output="error",
+                ),
+            )
+        )
+
+    running = {}
+    try:
+        while len(pending) > 0 or len(running) > 0:
+            while len(pending) > 0 and len(running) < n_workers:
+                name, scenario_kwargs = pending.popleft()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=run_scenario, args=(sender,), kwargs=scenario_kwargs
+                )
+                process.start()
+                sender.close()
+                summaries[name][BATCH_ATTEMPTS] += 1
+                running[process.sentinel] = (
+                    process,
+                    receiver,
+                    name,
+                    scenario_kwargs,
+                    time.perf_counter(),
+                )
+
+            # wait until a process ends or the next scenario exceeds the timeout
+            wait_time = None
+            if timeout is not None:
+                wait_time = max(
+                    0,
+                    min(start for *_, start in running.values())
+                    + timeout
+                    - time.perf_counter(),
+                )
+            multiprocessing.connection.wait(list(running), timeout=wait_time)
+
+            for sentinel, (process, receiver, name, scenario_kwargs, start) in list(
+                running.items()
+            ):
+                duration = time.perf_counter() - start
+                if process.exitcode is None:
+                    if timeout is None or duration < timeout:
+                        continue
+                    process.terminate()
+                    process.join()
+                    status = JOB_TIMEOUT
+                    error = f"The simulation exceeded the timeout of {timeout} s"
+                else:
+                    process.join()
+                    if receiver.poll():
+                        error = receiver.recv()
+                    else:
+                        error = f"The process ended with exit code {process.exitcode}"
+                    status = JOB_DONE if error is None else JOB_FAILED
+                receiver.close()
+                del running[sentinel]
+
+                summaries[name].update(
+                    {JOB_STATUS: status, JOB_DURATION: duration, JOB_ERROR: error}
+                )
+                if status == JOB_DONE:
+                    logging.info(
+                        f"The scenario {name} was simulated in {duration:.1f} s"
+                    )
+                    summaries[name].update(
+                        get_scenario_summary(scenario_kwargs[PATH_OUTPUT_FOLDER])
+                    )
+                elif summaries[name][BATCH_ATTEMPTS] <= retries:
+                    logging.warning(f"The scenario {name} is simulated again: {error}")
+                    pending.append((name, scenario_kwargs))
+                else:
+                    logging.error(f"The scenario {name} failed: {error}")
+    finally:
+        # the remaining scenarios are stopped if the batch is interrupted
+        for process, *_ in running.values():
+            process.terminate()
+            process.join()
+
+    summary = pd.DataFrame([summaries[name] for name in sorted(summaries)])
+    os.makedirs(path_output_folder, exist_ok=True)
+    path_summary = os.path.join(path_output_folder, BATCH_SUMMARY)
+    summary.to_csv(path_summary, index=False)
+    n_done = int((summary[JOB_STATUS] == JOB_DONE).sum()) if len(summary) > 0 else 0
+    logging.info(
+        f"{n_done} of {len(summary)} scenarios were simulated, the summary was saved "
+        f"under {path_summary}"
+    )
+    return summary
+
+
+def main(**kwargs):
+    r"""Starts the MVS batch runner
+
+    Other Parameters
+    ----------------
+    path_input_folder: str, optional
+        Path to the folder within which the input folders of the scenarios are searched
+        (command line "-i").
+        Default: the current working directory.
+    input_type: str, optional
+        Type of the input files of the scenarios, "json" or "csv" (command line "-ext").
+        Default: "json".
+    path_output_folder: str, optional
+        Path to the output folder (command line "-o").
+        Default: DEFAULT_OUTPUT_PATH.
+    overwrite: bool, optional
+        Overwrite the output folders of the scenarios (command line "-f").
+        Default: False.
+    n_workers: int, optional
+        Number of scenarios simulated at the same time (command line "-w").
+        Default: number of CPUs.
+    timeout: int or float, optional
+        Time in seconds after which the simulation of a scenario is stopped (command line
+        "-timeout").
+        Default: None.
+    retries: int, optional
+        Number of times a failed or stopped scenario is simulated again (command line
+        "-retries").
+        Default: 0.
+    solver: str, optional
+        Solver of the optimization, overwrites the one of the simulation settings (command
+        line "-solver").
+        Default: None.
+    display_output: str, optional
+        Level of the logging messages of the batch runner, "debug", "info", "warning" or
+        "error" (command line "-log").
+        Default: "info".
+
+    Other keyword arguments are passed to :py:func:`~.cli.main` for each scenario.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+        Summary of the scenarios, see :py:func:`run_batch`
+    """
+    # Parse the arguments from the command line
+    parser = A0.batch_arg_parser()
+    args = vars(parser.parse_args())
+    # Give priority from user input kwargs over command line arguments
+    args.update(kwargs)
+
+    setup_worker_logging(args.pop(DISPLAY_OUTPUT, "info"))
+
+    # the solver is only set if provided, otherwise the simulation settings apply
+    if args.get(SOLVER) is None:
+        args.pop(SOLVER, None)
+
+    return run_batch(
+        args.pop(PATH_INPUT_FOLDER),
+        args.pop(PATH_OUTPUT_FOLDER),
+        input_type=args.pop(INPUT_TYPE, JSON_EXT),
+        overwrite=args.pop(OVERWRITE, False),
+        n_workers=args.pop(ARG_N_WORKERS, None),
+        timeout=args.pop(ARG_TIMEOUT, None),
+        retries=args.pop(ARG_RETRIES, 0),
+        **args,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -38,20 +38,11 @@ import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E0_evaluation as E0
 import multi_vector_simulator.F0_output as F0
 
-try:
-    from multi_vector_simulator.F2_autoreport import (
-        create_app,
-        open_in_browser,
-        print_pdf,
-    )
-except ModuleNotFoundError:
-    logging.warning(
-        "Some packages are mising to generate automatic report, if you want to install them use \n\tpip install multi-vector-simulator[report]"
-    )
-
 from multi_vector_simulator.version import version_num, version_date
 
 from multi_vector_simulator.utils import copy_inputs_template
+from multi_vector_simulator.utils.profiling import Profiler
+from multi_vector_simulator.utils.log_capture import LogCapture
 
 from multi_vector_simulator.utils.constants import (
     REPO_PATH,
@@ -73,6 +64,17 @@ from multi_vector_simulator.utils.constants import (
     JSON_PROCESSED,
     JSON_FILE_EXTENSION,
     MVS_CONFIG,
+    TIMESERIES_SIDECAR,
+    PROFILING_TRACE,
+    VALUE,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_MIP_GAP,
+    SOLVER_TIME_LIMIT,
+    TIMESERIES_OUTPUT_FORMAT,
+    PNG_SCALE,
+    PNG_MAX_POINTS,
+    DEFAULT_MAIN_KWARGS,
 )
 
 
@@ -106,6 +108,35 @@ def main(**kwargs):
     lp_file_output : bool, optional
         Specifies whether linear equation system generated is saved as lp file.
         Default: False.
+    timeseries_sidecar : bool, optional
+        Specifies whether the timeseries of the results are stored in a binary .npz file
+        next to the json file with the results, instead of within the json file.
+        Default: False.
+    solver : str, optional
+        Solver of the optimization (one of `utils.constants.SOLVERS`), overwrites the solver
+        of the simulation settings. Default: None.
+    threads : int, optional
+        Number of threads used by the solver, overwrites the simulation settings.
+        Default: None.
+    mip_gap : float, optional
+        Relative MIP gap of the solver, overwrites the simulation settings. Default: None.
+    time_limit : float, optional
+        Time limit of the solver in seconds, overwrites the simulation settings.
+        Default: None.
+    profiling_trace : bool, optional
+        Specifies whether the duration and memory use of each stage of the simulation are saved
+        in a trace file (Chrome trace event format) in `path_output_folder`. They are always
+        stored in the simulation results. Default: False.
+    timeseries_output_format : str or list, optional
+        Format(s) of the files with the timeseries of all busses (see
+        `utils.constants.TIMESERIES_OUTPUT_FORMATS`), overwrites the simulation settings.
+        Default: None.
+    png_scale : int or float, optional
+        Scale of the png figures, ie. factor between their number of pixels and their layout
+        size. Default: 5.
+    png_max_points : int, optional
+        If provided, the timeseries of the png figures are downsampled to about this number of
+        points before being rasterized. Default: None.
 
     """
 
@@ -122,74 +153,114 @@ def main(**kwargs):
         + "\n Reference: https://zenodo.org/record/4610237 \n \n "
     )
 
-    logging.debug("Accessing script: A0_initialization")
-
-    user_input = A0.process_user_arguments(welcome_text=welcome_text, **kwargs)
-
-    # Read all inputs
-    #    print("")
-    #    # todo: is user input completely used?
-    #    dict_values = data_input.load_json(user_input[PATH_INPUT_FILE ])
-
-    move_copy_config_file = False
-
-    if user_input[INPUT_TYPE] == CSV_EXT:
-        logging.debug("Accessing script: A1_csv_to_json")
-        move_copy_config_file = True
-        A1.create_input_json(
-            input_directory=os.path.join(user_input[PATH_INPUT_FOLDER], CSV_ELEMENTS)
-        )
-
-    logging.debug("Accessing script: B0_data_input_json")
-    dict_values = B0.load_json(
-        user_input[PATH_INPUT_FILE],
-        path_input_folder=user_input[PATH_INPUT_FOLDER],
-        path_output_folder=user_input[PATH_OUTPUT_FOLDER],
-        move_copy=move_copy_config_file,
-        set_default_values=True,
-    )
-    F0.store_as_json(
-        dict_values,
-        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER_INPUTS],
-        MVS_CONFIG,
-    )
-
-    print("")
-    logging.debug("Accessing script: C0_data_processing")
-    C0.all(dict_values)
+    log_capture = LogCapture()
+    profiler = Profiler(callback=log_capture.set_stage)
 
-    F0.store_as_json(
-        dict_values,
-        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
-        JSON_PROCESSED,
-    )
-
-    if "path_pdf_report" in user_input or "path_png_figs" in user_input:
-        save_energy_system_graph = True
-    else:
-        save_energy_system_graph = False
-
-    print("")
-    logging.debug("Accessing script: D0_modelling_and_optimization")
-    results_meta, results_main = D0.run_oemof(
-        dict_values,
-        save_energy_system_graph=save_energy_system_graph,
-    )
-
-    print("")
-    logging.debug("Accessing script: E0_evaluation")
-    E0.evaluate_dict(dict_values, results_main, results_meta)
+    logging.debug("Accessing script: A0_initialization")
+    with profiler.stage("A0_initialization"):
+        user_input = A0.process_user_arguments(welcome_text=welcome_text, **kwargs)
+
+    # the handlers of the root logger are defined by A0, the messages of the following stages
+    # are kept with the results of the simulation
+    with log_capture:
+        # Read all inputs
+        #    print("")
+        #    # todo: is user input completely used?
+        #    dict_values = data_input.load_json(user_input[PATH_INPUT_FILE ])
+
+        move_copy_config_file = False
+
+        if user_input[INPUT_TYPE] == CSV_EXT:
+            logging.debug("Accessing script: A1_csv_to_json")
+            move_copy_config_file = True
+            with profiler.stage("A1_csv_to_json"):
+                A1.create_input_json(
+                    input_directory=os.path.join(
+                        user_input[PATH_INPUT_FOLDER], CSV_ELEMENTS
+                    )
+                )
 
-    logging.debug("Accessing script: F0_outputs")
-    F0.evaluate_dict(
-        dict_values,
-        path_pdf_report=user_input.get("path_pdf_report", None),
-        path_png_figs=user_input.get("path_png_figs", None),
-    )
+        logging.debug("Accessing script: B0_data_input_json")
+        with profiler.stage("B0_data_input_json"):
+            dict_values = B0.load_json(
+                user_input[PATH_INPUT_FILE],
+                path_input_folder=user_input[PATH_INPUT_FOLDER],
+                path_output_folder=user_input[PATH_OUTPUT_FOLDER],
+                move_copy=move_copy_config_file,
+                set_default_values=True,
+            )
+            log_capture.set_asset_labels(dict_values)
+            for setting in (
+                SOLVER,
+                SOLVER_THREADS,
+                SOLVER_MIP_GAP,
+                SOLVER_TIME_LIMIT,
+                TIMESERIES_OUTPUT_FORMAT,
+            ):
+                if user_input.get(setting) is not None:
+                    dict_values[SIMULATION_SETTINGS][setting] = {
+                        VALUE: user_input[setting]
+                    }
+            # unknown output formats are raised before the simulation
+            F0.get_timeseries_output_formats(dict_values)
+            F0.store_as_json(
+                dict_values,
+                dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER_INPUTS],
+                MVS_CONFIG,
+            )
+
+        print("")
+        logging.debug("Accessing script: C0_data_processing")
+        with profiler.stage("C0_data_processing"):
+            C0.all(dict_values)
+
+            F0.store_as_json(
+                dict_values,
+                dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
+                JSON_PROCESSED,
+            )
+
+        if "path_pdf_report" in user_input or "path_png_figs" in user_input:
+            save_energy_system_graph = True
+        else:
+            save_energy_system_graph = False
+
+        print("")
+        logging.debug("Accessing script: D0_modelling_and_optimization")
+        with profiler.stage("D0_modelling_and_optimization"):
+            results_meta, results_main = D0.run_oemof(
+                dict_values,
+                save_energy_system_graph=save_energy_system_graph,
+            )
+
+        print("")
+        logging.debug("Accessing script: E0_evaluation")
+        with profiler.stage("E0_evaluation"):
+            E0.evaluate_dict(dict_values, results_main, results_meta)
+
+        # the stages up to E0 are stored with the results, F0 is only part of the trace file
+        profiler.add_to_dict_values(dict_values)
+        log_capture.add_to_dict_values(dict_values)
+
+        logging.debug("Accessing script: F0_outputs")
+        with profiler.stage("F0_output"):
+            F0.evaluate_dict(
+                dict_values,
+                path_pdf_report=user_input.get("path_pdf_report", None),
+                path_png_figs=user_input.get("path_png_figs", None),
+                timeseries_sidecar=user_input.get(TIMESERIES_SIDECAR, False),
+                png_scale=user_input.get(PNG_SCALE, DEFAULT_MAIN_KWARGS[PNG_SCALE]),
+                png_max_points=user_input.get(PNG_MAX_POINTS, None),
+            )
+
+    if user_input.get(PROFILING_TRACE, False) is True:
+        profiler.save_trace(user_input[PATH_OUTPUT_FOLDER])
     return 1
 
 
-def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
+def report(
+    pdf=None, path_simulation_output_json=None, path_pdf_report=None, static_pdf=False
+):
     """Display the report of a MVS simulation
 
     Command line use:
@@ -215,6 +286,10 @@ def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
         path to the simulation result json file 'json_with_results.json'
     path_pdf_report: str
         path to save the pdf report
+    static_pdf: bool
+        if True the pdf report is printed from a static html version of the report instead of
+        from the served dash app, see :py:func:`~.F2_autoreport.print_static_pdf`
+        Default: False
 
     Returns
     -------
@@ -222,6 +297,20 @@ def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
     Save a pdf report if option -pdf is provided, otherwise display the report as an app
     """
 
+    # the packages of the report are only imported when a report is requested
+    try:
+        from multi_vector_simulator.F2_autoreport import (
+            create_app,
+            open_in_browser,
+            print_pdf,
+            print_static_pdf,
+        )
+    except ModuleNotFoundError:
+        logging.error(
+            "Some packages are mising to generate automatic report, if you want to install them use \n\tpip install multi-vector-simulator[report]"
+        )
+        raise
+
     # Parse the arguments from the command line
     parser = A0.report_arg_parser()
     args = vars(parser.parse_args())
@@ -263,12 +352,19 @@ def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
         dict_values = B0.load_json(
             path_simulation_output_json, flag_missing_values=False
         )
-        test_app = create_app(dict_values, path_sim_output=path_sim_output)
-        banner = "*" * 40
-        print(banner + "\nPress ctrl+c to stop the report server\n" + banner)
-        if pdf is True:
+        if pdf is True and static_pdf is True:
+            print_static_pdf(
+                dict_values,
+                path_pdf_report=path_pdf_report,
+                path_sim_output=path_sim_output,
+            )
+        elif pdf is True:
+            test_app = create_app(dict_values, path_sim_output=path_sim_output)
             print_pdf(test_app, path_pdf_report=path_pdf_report)
         else:
+            test_app = create_app(dict_values, path_sim_output=path_sim_output)
+            banner = "*" * 40
+            print(banner + "\nPress ctrl+c to stop the report server\n" + banner)
             if args.get(ARG_DEBUG_REPORT) is True:
                 test_app.run_server(debug=True)
             else:
@@ -33,10 +33,16 @@ child:      Child file, one of the main functions of the tool.
 child-sub:  Sub-child function, feeds only back to child functions
 """
 
+import asyncio
+import copy
+import functools
 import logging
 import json
+import multiprocessing
 import os
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
 from oemof.tools import logger
 import oemof.solph as solph
@@ -75,7 +81,16 @@ from multi_vector_simulator.utils.constants_json_strings import (
     OPTIMIZED_ADD_CAP,
     VALUE,
 )
-from multi_vector_simulator.utils.constants import TYPE_STR
+from multi_vector_simulator.utils.constants import (
+    TYPE_STR,
+    RESULT_CACHE_FOLDER,
+    STREAM_CHUNK_SIZE,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+)
+from multi_vector_simulator.utils.result_cache import ResultCache
+from multi_vector_simulator.utils.profiling import Profiler, StageReporter
+from multi_vector_simulator.utils.log_capture import LogCapture
 from multi_vector_simulator.utils.helpers import get_asset_types
 
 
@@ -214,6 +229,65 @@ def run_simulation(json_dict, epa_format=True, verbatim=False, **kwargs):
      lp_file_output : bool, optional
          Specifies whether linear equation system generated is saved as lp file.
          Default: False.
+     previous_les : :oemof-solph:`solph.Model <models>`, optional
+         oemof model of a previous simulation of the same energy system which only differs by
+         its cost parameters, it is then updated and solved again instead of building a new
+         model, see :py:func:`~.D0_modelling_and_optimization.run_oemof`.
+         Default: None.
+     return_les : bool, optional
+         if set to True, the return also includes the oemof model of the simulation in second
+         position, so that it can be provided as previous_les to a next simulation.
+         Default: False.
+     use_cache : bool, optional
+         if True, the results in EPA format are stored in an on-disk cache, and returned
+         directly from this cache if the same inputs are simulated again, see
+         :py:class:`~.utils.result_cache.ResultCache`. The cache is never used if return_les
+         is True.
+         Default: True.
+     cache_folder : str, optional
+         Path to the folder of the result cache.
+         Default: RESULT_CACHE_FOLDER.
+     profiling : bool, optional
+         if True, the wall time, CPU time and peak RSS of each stage of the simulation are
+         stored in the simulation results, see :py:class:`~.utils.profiling.Profiler`. The
+         result cache is then not used.
+         Default: False.
+     solution_store : dict, optional
+         if provided, the solution of a previous simulation stored in this dict is used as
+         starting point of the solver, it is then replaced by the solution of this simulation,
+         see :py:func:`~.D0_modelling_and_optimization.model_building.simulating`. The result
+         cache is then not used.
+         Default: None.
+     profiling_trace : str, optional
+         Path to a folder where the stages of the simulation are saved in a trace file (Chrome
+         trace event format), only used if profiling is True.
+         Default: None.
+     setup_logging : bool, optional
+         if False, the logging handlers are not redefined and display_output is ignored, e.g.
+         in the long-lived process of :py:mod:`~.worker` which sets them up once.
+         Default: True.
+     progress : func, optional
+         function called with the name of a stage of the simulation (see SIMULATION_STAGES)
+         and STAGE_STARTED when the stage starts, then with STAGE_FINISHED or STAGE_FAILED when
+         it ends, see :py:class:`~.utils.profiling.Profiler`. The stages after B0 are skipped
+         if the results are provided from the result cache.
+         Default: None.
+     output_sections : list, optional
+         paths of the sections of the results in EPA format to return, e.g.
+         [("kpi", "scalars"), ("energy_production", "pv_plant", "flow")], see
+         :py:func:`~.utils.data_parser.get_output_groups`. Only these sections are converted
+         to EPA format and the table of the flows of all busses ("raw_results") is only built
+         if requested. The result cache is then only read, not written. Only used if
+         epa_format is True.
+         Default: None, all sections are returned.
+     stream : bool, optional
+         if True, an iterator over the json text of the results in EPA format is returned
+         instead of the results, with the timeseries split in chunks, see
+         :py:func:`~.stream_json`. Only used if epa_format is True.
+         Default: False.
+     stream_chunk_size : int, optional
+         number of values of a timeseries in each chunk of the streamed results.
+         Default: STREAM_CHUNK_SIZE.
 
     """
     display_output = kwargs.get("display_output", None)
@@ -230,7 +304,8 @@ def run_simulation(json_dict, epa_format=True, verbatim=False, **kwargs):
         screen_level = logging.INFO
 
     # Define logging settings and path for saving log
-    logger.define_logging(screen_level=screen_level)
+    if kwargs.get("setup_logging", True) is True:
+        logger.define_logging(screen_level=screen_level)
 
     welcome_text = (
         "\n \n Multi-Vector Simulation Tool (MVS) V"
@@ -247,82 +322,442 @@ def run_simulation(json_dict, epa_format=True, verbatim=False, **kwargs):
 
     logging.info(welcome_text)
 
-    logging.debug("Accessing script: B0_data_input_json")
-    dict_values = B0.convert_from_json_to_special_types(json_dict)
-
-    # if True will return the lp file's content in dict_values
-    lp_file_output = dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE]
-    # to avoid the lp file being saved somewhere on the server
-    dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE] = False
+    output_sections = kwargs.get("output_sections", None)
+    if epa_format is False:
+        output_sections = None
+    elif output_sections is not None:
+        # unknown sections are raised before the simulation
+        output_groups = data_parser.get_output_groups(output_sections)
+
+    def format_answer(epa_answer):
+        if kwargs.get("stream", False) is True:
+            epa_answer = stream_json(
+                epa_answer,
+                chunk_size=kwargs.get("stream_chunk_size", STREAM_CHUNK_SIZE),
+            )
+        return epa_answer
 
-    print("")
-    logging.debug("Accessing script: C0_data_processing")
-    C0.all(dict_values)
+    profiling = kwargs.get("profiling", False)
+    log_capture = LogCapture()
+    progress = kwargs.get("progress", None)
 
-    print("")
-    logging.debug("Accessing script: D0_modelling_and_optimization")
-    results_meta, results_main, local_energy_system = D0.run_oemof(
-        dict_values, return_les=True
-    )
+    def report_stage(stage, status):
+        log_capture.set_stage(stage, status)
+        if progress is not None:
+            progress(stage, status)
 
-    br = OemofBusResults(
-        results_main,
-        busses_info=dict_values[ENERGY_BUSSES],
-        asset_types=get_asset_types(dict_values),
-    )  # if AUTO_CREATED_HIGHLIGHT not in bl])
-
-    if lp_file_output is True:
-        logging.debug("Saving the content of the model's lp file")
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            local_energy_system.write(
-                os.path.join(tmpdirname, "lp_file.lp"),
-                io_options={"symbolic_solver_labels": True},
+    if profiling is True:
+        profiler = Profiler(callback=report_stage)
+    else:
+        # the stages are only reported, without sampling the memory use in a thread
+        profiler = StageReporter(callback=report_stage)
+
+    # the warnings and errors of this simulation are kept with its results
+    with log_capture:
+        logging.debug("Accessing script: B0_data_input_json")
+        with profiler.stage("B0_data_input_json"):
+            dict_values = B0.convert_from_json_to_special_types(json_dict)
+        log_capture.set_asset_labels(dict_values)
+
+        result_cache = None
+        if (
+            epa_format is True
+            and kwargs.get("use_cache", True) is True
+            and kwargs.get("return_les", False) is False
+            and kwargs.get("solution_store", None) is None
+            and profiling is False
+        ):
+            result_cache = ResultCache(
+                folder=kwargs.get("cache_folder", RESULT_CACHE_FOLDER)
+            )
+            cache_key = result_cache.key(dict_values, verbatim=verbatim)
+            json_values = result_cache.get(cache_key)
+            if json_values is not None:
+                logging.info(
+                    "The results of this simulation are provided from the result cache."
+                )
+                answer = json.loads(json_values)
+                if output_sections is not None:
+                    answer = data_parser.select_output_sections(answer, output_sections)
+                return format_answer(answer)
+
+        # if True will return the lp file's content in dict_values
+        lp_file_output = dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE]
+        # to avoid the lp file being saved somewhere on the server
+        dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE] = False
+
+        print("")
+        logging.debug("Accessing script: C0_data_processing")
+        with profiler.stage("C0_data_processing"):
+            C0.all(dict_values)
+
+        print("")
+        logging.debug("Accessing script: D0_modelling_and_optimization")
+        with profiler.stage("D0_modelling_and_optimization"):
+            results_meta, results_main, local_energy_system = D0.run_oemof(
+                dict_values,
+                return_les=True,
+                previous_les=kwargs.get("previous_les", None),
+                solution_store=kwargs.get("solution_store", None),
             )
-            with open(os.path.join(tmpdirname, "lp_file.lp")) as fp:
-                file_content = fp.read()
-
-        dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE] = file_content
-        dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][UNIT] = TYPE_STR
-
-    print("")
-    logging.debug("Accessing script: E0_evaluation")
-    E0.evaluate_dict(dict_values, results_main, results_meta)
-
-    # Correct the optimized values
-    for asset_group in [
-        ENERGY_PRODUCTION,
-        ENERGY_CONSUMPTION,
-        ENERGY_CONVERSION,
-        ENERGY_PROVIDERS,
-        ENERGY_STORAGE,
-    ]:
-        for asset_name, asset in dict_values[asset_group].items():
-            if (
-                asset.get(OPTIMIZE_CAP, {VALUE: False}).get(VALUE, False) is True
-                and TIMESERIES_PEAK in asset
-            ):
-                corrected_optimized_capacity = asset[OPTIMIZED_ADD_CAP][VALUE]
-                br.loc[
-                    br.index.get_level_values("asset") == asset_name, "investments"
-                ] = corrected_optimized_capacity
-
-    dict_values["raw_results"] = br.to_json()  # to_dict(orient="split") #
-
-    logging.debug("Convert results to json")
-
-    if epa_format is True:
-        epa_dict_values = data_parser.convert_mvs_params_to_epa(
-            dict_values, verbatim=verbatim
+
+        # the table of the flows of all busses is only built if it is returned
+        raw_results_requested = (
+            output_sections is None or "raw_results" in output_groups
         )
+        if raw_results_requested is True:
+            br = OemofBusResults(
+                results_main,
+                busses_info=dict_values[ENERGY_BUSSES],
+                asset_types=get_asset_types(dict_values),
+            )  # if AUTO_CREATED_HIGHLIGHT not in bl])
+
+        if lp_file_output is True:
+            logging.debug("Saving the content of the model's lp file")
+            with tempfile.TemporaryDirectory() as tmpdirname:
+                local_energy_system.write(
+                    os.path.join(tmpdirname, "lp_file.lp"),
+                    io_options={"symbolic_solver_labels": True},
+                )
+                with open(os.path.join(tmpdirname, "lp_file.lp")) as fp:
+                    file_content = fp.read()
+
+            dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE] = file_content
+            dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][UNIT] = TYPE_STR
+
+        print("")
+        logging.debug("Accessing script: E0_evaluation")
+        with profiler.stage("E0_evaluation"):
+            E0.evaluate_dict(dict_values, results_main, results_meta)
+
+        if raw_results_requested is True:
+            # Correct the optimized values
+            for asset_group in [
+                ENERGY_PRODUCTION,
+                ENERGY_CONSUMPTION,
+                ENERGY_CONVERSION,
+                ENERGY_PROVIDERS,
+                ENERGY_STORAGE,
+            ]:
+                for asset_name, asset in dict_values[asset_group].items():
+                    if (
+                        asset.get(OPTIMIZE_CAP, {VALUE: False}).get(VALUE, False)
+                        is True
+                        and TIMESERIES_PEAK in asset
+                    ):
+                        corrected_optimized_capacity = asset[OPTIMIZED_ADD_CAP][VALUE]
+                        br.loc[
+                            br.index.get_level_values("asset") == asset_name,
+                            "investments",
+                        ] = corrected_optimized_capacity
+
+            dict_values["raw_results"] = br.to_json()  # to_dict(orient="split") #
+        log_capture.add_to_dict_values(dict_values)
+
+        if profiling is True:
+            # the conversion of the results is only part of the trace file
+            profiler.add_to_dict_values(dict_values)
+
+        logging.debug("Convert results to json")
+
+        with profiler.stage("F0_output"):
+            if epa_format is True and output_sections is not None:
+                # only the requested sections are converted, without a round trip through json
+                epa_dict_values = data_parser.convert_mvs_params_to_epa(
+                    dict_values, verbatim=verbatim, output_sections=output_sections
+                )
+                answer = format_answer(
+                    B0.convert_from_special_types_to_json_types(epa_dict_values)
+                )
+            elif epa_format is True:
+                epa_dict_values = data_parser.convert_mvs_params_to_epa(
+                    dict_values, verbatim=verbatim
+                )
 
-        json_values = F0.store_as_json(epa_dict_values)
-        answer = json.loads(json_values)
-    else:
-        answer = dict_values
+                json_values = F0.store_as_json(epa_dict_values)
+                answer = format_answer(json.loads(json_values))
+                if result_cache is not None:
+                    result_cache.set(cache_key, json_values)
+            else:
+                answer = dict_values
+
+        if profiling is True and kwargs.get("profiling_trace", None) is not None:
+            profiler.save_trace(kwargs["profiling_trace"])
+
+    if kwargs.get("return_les", False) is True:
+        answer = answer, local_energy_system
 
     return answer
 
 
+def stream_json(value, chunk_size=STREAM_CHUNK_SIZE):
+    r"""Iterate over the json text of a value, with its long lists split in chunks
+
+    The concatenation of the chunks is the json text of the value, e.g. to send the results
+    of :py:func:`run_simulation` as a streamed response without building the whole text.
+
+    Parameters
+    ----------
+    value: dict
+        value made of json types only, e.g. results of :py:func:`run_simulation` in EPA format
+
+    chunk_size: int
+        maximal number of values of a list (e.g. a timeseries) within one chunk
+        Default: STREAM_CHUNK_SIZE
+
+    Returns
+    -------
+    Iterator over the chunks of the json text of value
+
+    Notes
+    -----
+    This function is tested with:
+    - test_server.TestOutputSections.test_stream_json_same_as_json_dumps
+    """
+    if isinstance(value, dict):
+        yield "{"
+        for i, (key, item) in enumerate(value.items()):
+            yield ("" if i == 0 else ", ") + json.dumps(key) + ": "
+            yield from stream_json(item, chunk_size=chunk_size)
+        yield "}"
+    elif isinstance(value, list) and any(
+        isinstance(item, (dict, list)) for item in value
+    ):
+        yield "["
+        for i, item in enumerate(value):
+            if i > 0:
+                yield ", "
+            yield from stream_json(item, chunk_size=chunk_size)
+        yield "]"
+    elif isinstance(value, list) and len(value) > chunk_size:
+        yield "["
+        for start in range(0, len(value), chunk_size):
+            yield ("" if start == 0 else ", ") + json.dumps(
+                value[start : start + chunk_size]
+            )[1:-1]
+        yield "]"
+    else:
+        yield json.dumps(value)
+
+
+# stages of run_simulation reported to its progress callback, in the order they are run
+SIMULATION_STAGES = (
+    "B0_data_input_json",
+    "C0_data_processing",
+    "D0_modelling_and_optimization",
+    "E0_evaluation",
+    "F0_output",
+)
+
+# manager of the queues forwarding the progress of simulations run in other processes
+_progress_manager = None
+
+
+def _get_progress_manager():
+    global _progress_manager
+    if _progress_manager is None:
+        _progress_manager = multiprocessing.Manager()
+    return _progress_manager
+
+
+def _run_simulation_in_process(json_dict, progress_queue, kwargs):
+    """Runs a simulation in a process of a pool, its progress is put in the queue"""
+    return run_simulation(
+        json_dict,
+        progress=lambda stage, status: progress_queue.put((stage, status)),
+        **kwargs,
+    )
+
+
+class SimulationJob:
+    r"""Handle of a simulation submitted with :py:func:`submit_simulation`
+
+    The job collects the progress events of the simulation, ie. the tuples (stage, status) with
+    the stages of SIMULATION_STAGES and the status STAGE_STARTED, STAGE_FINISHED or
+    STAGE_FAILED, in the event loop in which it was submitted.
+
+    Parameters
+    ----------
+    loop: :class:`asyncio.AbstractEventLoop`
+        event loop in which the job was submitted
+
+    Examples
+    --------
+    ::
+
+        job = submit_simulation(json_dict)
+        async for stage, status in job.events():
+            print(f"{stage} {status}, {job.progress:.0%} done")
+        results = await job.result()
+
+    Notes
+    -----
+    This class is tested with:
+    - test_server.TestSubmitSimulation
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = None
+        self.progress_events = []
+        self._listeners = []
+
+    def _start(self, future):
+        self.future = future
+        self.future.add_done_callback(self._notify_listeners)
+
+    def _add_event(self, stage, status):
+        event = (stage, status)
+        self.progress_events.append(event)
+        for listener in self._listeners:
+            listener.put_nowait(event)
+
+    def _notify_listeners(self, future):
+        for listener in self._listeners:
+            listener.put_nowait(None)
+
+    def report(self, stage, status):
+        r"""Adds a progress event to the job, can be called from any thread"""
+        self.loop.call_soon_threadsafe(self._add_event, stage, status)
+
+    @property
+    def stage(self):
+        r"""Name of the last stage which started, None if the simulation has not started yet"""
+        for stage, status in reversed(self.progress_events):
+            if status == STAGE_STARTED:
+                return stage
+        return None
+
+    @property
+    def progress(self):
+        r"""Share of the stages of the simulation which are finished, between 0 and 1"""
+        if self.done() and self.future.cancelled() is False:
+            if self.future.exception() is None:
+                return 1.0
+        finished = {
+            stage for stage, status in self.progress_events if status == STAGE_FINISHED
+        }
+        return len(finished.intersection(SIMULATION_STAGES)) / len(SIMULATION_STAGES)
+
+    def done(self):
+        r"""Returns True if the simulation is over, successfully or not"""
+        return self.future.done()
+
+    def cancel(self):
+        r"""Cancels the simulation if it has not started yet
+
+        Returns
+        -------
+        True if the simulation was cancelled
+        """
+        return self.future.cancel()
+
+    async def result(self):
+        r"""Waits for the simulation and returns the results of :py:func:`run_simulation`
+
+        The exception raised by the simulation, if any, is raised again.
+        """
+        return await self.future
+
+    async def events(self):
+        r"""Iterates over the progress events of the simulation until it is over
+
+        The events which occurred before the iteration are provided first.
+        """
+        listener = asyncio.Queue()
+        for event in self.progress_events:
+            listener.put_nowait(event)
+        if self.done() is True:
+            listener.put_nowait(None)
+        self._listeners.append(listener)
+        try:
+            while True:
+                event = await listener.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._listeners.remove(listener)
+
+
+def submit_simulation(json_dict, executor=None, **kwargs):
+    r"""
+    Starts a simulation of :py:func:`run_simulation` in an executor and returns its handle
+
+    This function has to be called from a coroutine (or a callback) of a running asyncio event
+    loop, which is not blocked by the simulation, so that a server process can run and follow
+    several simulations at once.
+
+    Parameters
+    ----------
+    json_dict: dict
+        json from http request, it is copied so that the same input can be submitted several
+        times
+    executor: :class:`concurrent.futures.Executor`, optional
+        executor running the simulation, if None the default executor of the event loop (a
+        pool of threads). The solver is called by one thread of a process at a time (see
+        :py:data:`~.D0_modelling_and_optimization.SOLVER_LOCK`). With a :class:`concurrent.futures.ProcessPoolExecutor` the
+        simulations run in parallel without sharing the GIL, their progress is then forwarded
+        through a queue of a :class:`multiprocessing.Manager`, the arguments previous_les,
+        return_les and solution_store are not supported.
+        Default: None
+    kwargs:
+        keyword arguments of :py:func:`run_simulation`. The logging handlers are not redefined
+        for each simulation, unless setup_logging is True.
+
+    Returns
+    -------
+    :class:`SimulationJob`
+
+    Notes
+    -----
+    This function is tested with:
+    - test_server.TestSubmitSimulation
+    """
+    loop = asyncio.get_running_loop()
+    job = SimulationJob(loop)
+    # the logging handlers are shared by the simulations run at the same time
+    kwargs.setdefault("setup_logging", False)
+
+    if isinstance(executor, ProcessPoolExecutor):
+        progress_queue = _get_progress_manager().Queue()
+
+        def forward_progress():
+            for event in iter(progress_queue.get, None):
+                job.report(*event)
+
+        forwarder = threading.Thread(target=forward_progress, daemon=True)
+        forwarder.start()
+
+        async def run_in_process():
+            try:
+                return await loop.run_in_executor(
+                    executor,
+                    _run_simulation_in_process,
+                    json_dict,
+                    progress_queue,
+                    kwargs,
+                )
+            finally:
+                # all progress events are reported before the job is done
+                progress_queue.put(None)
+                await loop.run_in_executor(None, forwarder.join)
+
+        job._start(asyncio.ensure_future(run_in_process()))
+    else:
+        # run_simulation converts its input in place, the jobs should not share it
+        json_dict = copy.deepcopy(json_dict)
+        job._start(
+            loop.run_in_executor(
+                executor,
+                functools.partial(
+                    run_simulation, json_dict, progress=job.report, **kwargs
+                ),
+            )
+        )
+    return job
+
+
 def run_sensitivity_analysis_step(
     json_input, step_idx, output_variables, epa_format=True, **kwargs
 ):
@@ -352,6 +787,18 @@ def run_sensitivity_analysis_step(
      lp_file_output : bool, optional
          Specifies whether linear equation system generated is saved as lp file.
          Default: False.
+     previous_les : :oemof-solph:`solph.Model <models>`, optional
+         oemof model of a previous step which only differs by its cost parameters, see
+         :py:func:`~.run_simulation`.
+         Default: None.
+     return_les : bool, optional
+         if set to True, the return also includes the oemof model of the step in second
+         position.
+         Default: False.
+     solution_store : dict, optional
+         dict storing the solution of the previous step, used as starting point of the solver,
+         see :py:func:`~.run_simulation`.
+         Default: None.
 
     """
 
@@ -369,9 +816,17 @@ def run_sensitivity_analysis_step(
             f"It can therefore not be processed."
         )
 
+    return_les = kwargs.get("return_les", False)
     sim_output_json = run_simulation(
-        simulation_input, display_output="error", epa_format=epa_format
+        simulation_input,
+        display_output="error",
+        epa_format=epa_format,
+        previous_les=kwargs.get("previous_les", None),
+        return_les=return_les,
+        solution_store=kwargs.get("solution_store", None),
     )
+    if return_les is True:
+        sim_output_json, local_energy_system = sim_output_json
     output_variables_paths = nested_dict_crawler(sim_output_json)
 
     output_parameters = {}
@@ -401,4 +856,7 @@ def run_sensitivity_analysis_step(
                     ".".join(output_param_path)
                 )
 
-    return {"step_idx": step_idx, "output_values": output_parameters}
+    answer = {"step_idx": step_idx, "output_values": output_parameters}
+    if return_les is True:
+        answer = answer, local_energy_system
+    return answer
@@ -1,10 +1,18 @@
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
 from multi_vector_simulator.utils import (
     get_nested_value,
     set_nested_value,
     split_nested_path,
 )
+from multi_vector_simulator.utils.constants import (
+    COST_PARAMETERS,
+    WARM_STARTED,
+    SOLVE_TIME,
+)
+from multi_vector_simulator.utils.constants_json_strings import VALUE
 from multi_vector_simulator.server import run_simulation
 from multi_vector_simulator.B0_data_input_json import (
     load_json,
@@ -13,7 +21,13 @@ from multi_vector_simulator.B0_data_input_json import (
 
 
 def single_param_variation_analysis(
-    param_values, json_input, json_path_to_param_value, json_path_to_output_value=None
+    param_values,
+    json_input,
+    json_path_to_param_value,
+    json_path_to_output_value=None,
+    n_workers=None,
+    reuse_model=False,
+    warm_start=False,
 ):
     r"""Run mvs simulations by varying one of the input parameters to access output's sensitivity
 
@@ -30,10 +44,39 @@ def single_param_variation_analysis(
         collection of succession of keys which lead the value of an output parameter of interest in
         the json dict of the simulation's output. The order of keys is to be read from left to
         right. In the case of str, each key should be separated by a `.` or a `,`.
+    n_workers: int, optional
+        number of worker processes used to run the simulation steps concurrently. If None or 1,
+        the steps are run one after the other within the current process.
+        Default: None
+    reuse_model: bool, optional
+        if True and the varied parameter is one of the COST_PARAMETERS, the oemof model is only
+        built for the first step, the following steps update its cost coefficients and solve
+        it again starting from the previous solution. Only available if the steps are run
+        within the current process (n_workers None or 1).
+        Default: False
+    warm_start: bool, optional
+        if True, the solution of each step is used as starting point of the solver for the next
+        step, see :py:func:`~.D0_modelling_and_optimization.model_building.simulating`. With
+        HiGHS the simplex basis is reused if the variables and constraints of both steps are the
+        same, the solvers called through files and capable of warm starts (e.g. cbc, gurobi)
+        receive the values of the variables as MIP start. Only available if the steps are run
+        within the current process (n_workers None or 1).
+        Default: False
 
     Returns
     -------
-    The simulation output json matched to the list of variied parameter values
+    The simulation output json matched to the list of variied parameter values, in the same order
+    as `param_values`. If a simulation step fails, its output is None and the error message is
+    listed under the key "errors" at the same position, the other steps are still carried out.
+    If warm_start is True, the time of the solver of each step is listed under the key
+    "solve_times", whether it was warm started under the key "warm_started" and the relative
+    reduction of the mean solve time of the warm started steps compared to the steps started
+    from scratch under the key "solve_time_reduction" (None if either kind of step is missing).
+
+    Notes
+    -----
+    This function is tested with:
+    - test_sensitivity.TestSingleParamVariationAnalysis
     """
 
     # Process the argument json_input based on its type
@@ -50,31 +93,192 @@ def single_param_variation_analysis(
             f"It can therefore not be processed."
         )
     param_path_tuple = split_nested_path(json_path_to_param_value)
-    answer = []
-    if simulation_input is not None:
-        for param_val in param_values:
-            # modify the value of the parameter before running a new simulation
-            modified_input = set_nested_value(
-                simulation_input, param_val, param_path_tuple
+    parallel = n_workers is not None and n_workers > 1
+
+    if reuse_model is True:
+        param_name = [key for key in param_path_tuple if key != VALUE][-1]
+        if param_name not in COST_PARAMETERS:
+            logging.warning(
+                f"The varied parameter {param_name} is not one of {COST_PARAMETERS}, the oemof "
+                f"model will therefore be built anew for each step."
             )
-            # run a simulation with next value of the variable parameter and convert the result to
-            # mvs special json type
-            sim_output_json = run_simulation(
-                modified_input, display_output="error", epa_format=False
+            reuse_model = False
+        elif parallel is True:
+            logging.warning(
+                "The oemof model cannot be reused between steps run on different worker "
+                "processes, it will therefore be built anew for each step."
             )
-            print(sim_output_json)
-            if json_path_to_output_value is None:
-                answer.append(sim_output_json)
-            else:
-                output_parameters = {}
-                # for each of the output parameter path, add the value located under this path in
-                # the final json dict, that could also be applied to the full json dict as
-                # post-processing
-                for output_param in json_path_to_output_value:
-                    output_param = split_nested_path(output_param)
-                    output_parameters[output_param] = get_nested_value(
-                        sim_output_json, output_param
+            reuse_model = False
+    if warm_start is True and parallel is True:
+        logging.warning(
+            "The solution of a step cannot be used as starting point of the next step if "
+            "they are run on different worker processes, the solver will therefore start "
+            "from scratch for each step."
+        )
+        warm_start = False
+
+    answer = []
+    errors = []
+    solve_times = []
+    warm_started = []
+    if simulation_input is not None:
+        steps_args = [
+            (simulation_input, param_val, param_path_tuple, json_path_to_output_value)
+            for param_val in param_values
+        ]
+        if parallel is False:
+            model_store = {} if reuse_model is True else None
+            solution_store = {} if warm_start is True else None
+            steps_results = []
+            for step_args in steps_args:
+                steps_results.append(
+                    run_variation_step(
+                        *step_args,
+                        model_store=model_store,
+                        solution_store=solution_store,
                     )
-                answer.append(output_parameters)
+                )
+                if solution_store is not None:
+                    # the solve time is missing if the step failed before the solver
+                    solve_times.append(solution_store.pop(SOLVE_TIME, None))
+                    warm_started.append(solution_store.pop(WARM_STARTED, False))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = [
+                    executor.submit(run_variation_step, *step_args)
+                    for step_args in steps_args
+                ]
+                steps_results = []
+                for future in futures:
+                    # failures within the worker process itself (e.g. killed process) are
+                    # not caught by run_variation_step
+                    try:
+                        steps_results.append(future.result())
+                    except Exception as e:
+                        steps_results.append((None, f"{type(e).__name__}: {e}"))
+
+        for param_val, (step_output, step_error) in zip(param_values, steps_results):
+            if step_error is not None:
+                logging.error(
+                    f"The simulation with parameter value {param_val} under "
+                    f"{param_path_tuple} failed: {step_error}"
+                )
+            answer.append(step_output)
+            errors.append(step_error)
+
+    sweep_results = {"parameters": param_values, "outputs": answer, "errors": errors}
+    if warm_start is True:
+        sweep_results["solve_times"] = solve_times
+        sweep_results["warm_started"] = warm_started
+        sweep_results["solve_time_reduction"] = get_solve_time_reduction(
+            solve_times, warm_started
+        )
+    return sweep_results
+
+
+def get_solve_time_reduction(solve_times, warm_started):
+    r"""Relative reduction of the mean solve time of the warm started steps of a sweep
+
+    Parameters
+    ----------
+    solve_times: list of float
+        time of the solver of each step, None if the solver was not called
+    warm_started: list of bool
+        whether the solver of each step was warm started
 
-    return {"parameters": param_values, "outputs": answer}
+    Returns
+    -------
+    1 minus the ratio of the mean solve time of the warm started steps to the mean solve time
+    of the steps started from scratch, None if there is no step of either kind
+
+    Notes
+    -----
+    This function is tested with:
+    - test_sensitivity.TestSingleParamVariationAnalysis
+    """
+    warm_times = [t for t, w in zip(solve_times, warm_started) if t is not None and w]
+    cold_times = [
+        t for t, w in zip(solve_times, warm_started) if t is not None and not w
+    ]
+    if len(warm_times) == 0 or len(cold_times) == 0 or sum(cold_times) == 0:
+        return None
+    mean_warm_time = sum(warm_times) / len(warm_times)
+    mean_cold_time = sum(cold_times) / len(cold_times)
+    return 1 - mean_warm_time / mean_cold_time
+
+
+def run_variation_step(
+    simulation_input,
+    param_val,
+    param_path_tuple,
+    json_path_to_output_value=None,
+    model_store=None,
+    solution_store=None,
+):
+    r"""Run a single mvs simulation of a parameter variation analysis
+
+    Parameters
+    ----------
+    simulation_input: dict
+        input parameters for the multi-vector simulation
+    param_val: variable type
+        value of the varied parameter for this step
+    param_path_tuple: tuple
+        succession of keys which lead the value of the parameter to vary in the simulation_input
+    json_path_to_output_value: tuple of tuple or str, optional
+        see :py:func:`~.single_param_variation_analysis`
+    model_store: dict, optional
+        if provided, the oemof model stored under the key "les" is reused for this step (see
+        :py:func:`~.server.run_simulation`) and the oemof model of this step is then stored
+        under this key for the next step
+        Default: None
+    solution_store: dict, optional
+        if provided, the solution of the previous step stored in this dict is used as starting
+        point of the solver and the solution of this step is then stored in its place (see
+        :py:func:`~.server.run_simulation`)
+        Default: None
+
+    Returns
+    -------
+    Tuple with the output of the step (or None in case of failure) and the error message (or
+    None in case of success)
+    """
+    try:
+        # modify the value of the parameter before running a new simulation
+        modified_input = set_nested_value(simulation_input, param_val, param_path_tuple)
+        # run a simulation with next value of the variable parameter and convert the result to
+        # mvs special json type
+        simulation_kwargs = {}
+        if solution_store is not None:
+            simulation_kwargs["solution_store"] = solution_store
+        if model_store is None:
+            sim_output_json = run_simulation(
+                modified_input,
+                display_output="error",
+                epa_format=False,
+                **simulation_kwargs,
+            )
+        else:
+            sim_output_json, model_store["les"] = run_simulation(
+                modified_input,
+                display_output="error",
+                epa_format=False,
+                previous_les=model_store.get("les", None),
+                return_les=True,
+                **simulation_kwargs,
+            )
+        if json_path_to_output_value is None:
+            step_output = sim_output_json
+        else:
+            step_output = {}
+            # for each of the output parameter path, add the value located under this path in
+            # the final json dict, that could also be applied to the full json dict as
+            # post-processing
+            for output_param in json_path_to_output_value:
+                output_param = split_nested_path(output_param)
+                step_output[output_param] = get_nested_value(
+                    sim_output_json, output_param
+                )
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return step_output, None
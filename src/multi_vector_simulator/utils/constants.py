@@ -4,6 +4,7 @@ General Constants
 """
 
 import os
+import tempfile
 from copy import deepcopy
 
 from multi_vector_simulator.utils.constants_json_strings import *
@@ -42,6 +43,29 @@ LOGFILE = "mvs_logfile.log"
 PDF_REPORT = "simulation_report.pdf"
 # name of lp file stored to dick
 LP_FILE = "lp_file.lp"
+# folder where the results of the simulations run in server mode are cached
+RESULT_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "mvs_result_cache")
+# number of values of a timeseries in each chunk of the results streamed by the server
+STREAM_CHUNK_SIZE = 1000
+# maximal size of the result cache in bytes
+RESULT_CACHE_MAX_SIZE = 500 * 1024**2
+# folder where the timeseries parsed from csv files are stored as numpy files
+TIMESERIES_STORE_FOLDER = os.path.join(tempfile.gettempdir(), "mvs_timeseries_store")
+# folder where the json files generated from the csv input files are cached
+CSV_JSON_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "mvs_csv_json_cache")
+# suffix of the files listing the warnings and errors logged while generating a cached json file
+CSV_JSON_CACHE_MESSAGES_SUFFIX = "_messages"
+
+# name of the file with the profiling trace of a simulation (Chrome trace event format)
+PROFILING_TRACE_FILE = "profiling_trace.json"
+# time between two samples of the memory use of the process while profiling, in seconds
+PROFILING_SAMPLING_INTERVAL = 0.01
+# status of the stages of a simulation reported to the progress callback
+STAGE_STARTED = "started"
+STAGE_FINISHED = "finished"
+STAGE_FAILED = "failed"
+# maximal number of warnings and of errors of a simulation kept in memory with its results
+LOG_CAPTURE_MAX_RECORDS = 1000
 
 # path of the pdf report path
 REPORT_FOLDER = "report"
@@ -53,6 +77,37 @@ ARG_REPORT_PATH = "report_path"
 ARG_PATH_SIM_OUTPUT = "output_folder"
 ARG_DEBUG_REPORT = "debug_report"
 
+# variables used for the worker parser
+ARG_QUEUE_FOLDER = "queue_folder"
+ARG_POLL_INTERVAL = "poll_interval"
+ARG_EXIT_WHEN_EMPTY = "exit_when_empty"
+# subfolders of the queue folder of the worker with the jobs being simulated and their results
+WORKER_RUNNING_FOLDER = "running"
+WORKER_RESULTS_FOLDER = "results"
+# time between two checks of the queue folder for new jobs, in seconds
+DEFAULT_WORKER_POLL_INTERVAL = 1
+# keys of the jobs and results of the worker
+JOB_ID = "id"
+JOB_INPUT = "input"
+JOB_OPTIONS = "options"
+JOB_STATUS = "status"
+JOB_RESULT = "result"
+JOB_ERROR = "error"
+JOB_DURATION = "duration"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# variables used for the batch parser
+ARG_N_WORKERS = "n_workers"
+ARG_TIMEOUT = "timeout"
+ARG_RETRIES = "retries"
+# status of a scenario of the batch runner which exceeded its timeout
+JOB_TIMEOUT = "timeout"
+# columns of the summary of the batch runner and name of its file
+BATCH_SCENARIO = "scenario"
+BATCH_ATTEMPTS = "attempts"
+BATCH_SUMMARY = "batch_summary.csv"
+
 # default paths to input, output and sequences folders
 DEFAULT_INPUT_PATH = os.path.join(REPO_PATH, INPUT_FOLDER)
 DEFAULT_OUTPUT_PATH = os.path.join(REPO_PATH, OUTPUT_FOLDER)
@@ -65,11 +120,20 @@ INPUT_TYPE = "input_type"
 OVERWRITE = "overwrite"
 DISPLAY_OUTPUT = "display_output"
 SAVE_PNG = "save_png"
+TIMESERIES_SIDECAR = "timeseries_sidecar"
+PROFILING_TRACE = "profiling_trace"
+PNG_SCALE = "png_scale"
+PNG_MAX_POINTS = "png_max_points"
+
+# default scale of the png figures, ie. factor between the number of pixels and the layout size
+DEFAULT_PNG_SCALE = 5
 
 # Filenames of the json files stored to disc:
 JSON_PROCESSED = "json_input_processed"
 JSON_WITH_RESULTS = "json_with_results"
 JSON_FILE_EXTENSION = ".json"
+# Extension of the file storing the timeseries of a json file in binary format
+NPZ_FILE_EXTENSION = ".npz"
 
 USER_INPUT_ARGUMENTS = (
     PATH_INPUT_FILE,
@@ -89,6 +153,10 @@ DEFAULT_MAIN_KWARGS = dict(
     path_output_folder=DEFAULT_OUTPUT_PATH,
     display_output="info",
     lp_file_output=False,
+    timeseries_sidecar=False,
+    profiling_trace=False,
+    png_scale=DEFAULT_PNG_SCALE,
+    png_max_points=None,
 )
 # list of csv filename which must be present within the CSV_ELEMENTS folder with the parameters
 # associated to each of these filenames
@@ -218,6 +286,91 @@ DEFAULT_CONSTRAINT_VALUES = {
 }
 
 
+# parameters which only influence the cost coefficients of the oemof model, when one of them is
+# varied in a sensitivity analysis the oemof model of the previous step can be reused
+COST_PARAMETERS = (
+    DEVELOPMENT_COSTS,
+    SPECIFIC_COSTS,
+    SPECIFIC_COSTS_OM,
+    DISPATCH_PRICE,
+    ENERGY_PRICE,
+    FEEDIN_TARIFF,
+    PEAK_DEMAND_PRICING,
+    LIFETIME,
+    DISCOUNTFACTOR,
+    PROJECT_DURATION,
+    TAX,
+)
+
+# default length of the typical periods in hours, if the timeseries are aggregated
+DEFAULT_TYPICAL_PERIOD_LENGTH = 24
+
+# default overlap of the windows in hours, if the dispatch is optimized with a rolling horizon
+DEFAULT_ROLLING_HORIZON_OVERLAP = 0
+
+# default solver of the optimization and its relative MIP gap
+DEFAULT_SOLVER = "cbc"
+DEFAULT_MIP_GAP = 0.03
+
+# interface of pyomo used to communicate with a solver, None if the solver is called directly
+SOLVER_IO = "solver_io"
+
+# supported solvers and the name of their options (None if the solver has no such option)
+SOLVERS = {
+    "cbc": {
+        SOLVER_IO: "lp",
+        SOLVER_THREADS: "threads",
+        SOLVER_MIP_GAP: "ratioGap",
+        SOLVER_TIME_LIMIT: "sec",
+    },
+    "glpk": {
+        SOLVER_IO: "lp",
+        SOLVER_THREADS: None,
+        SOLVER_MIP_GAP: "mipgap",
+        SOLVER_TIME_LIMIT: "tmlim",
+    },
+    "gurobi": {
+        SOLVER_IO: "lp",
+        SOLVER_THREADS: "Threads",
+        SOLVER_MIP_GAP: "MIPGap",
+        SOLVER_TIME_LIMIT: "TimeLimit",
+    },
+    # HiGHS is called through its python interface highspy, with the options of pyomo's interface
+    "highs": {
+        SOLVER_IO: None,
+        SOLVER_THREADS: "threads",
+        SOLVER_MIP_GAP: "rel_gap",
+        SOLVER_TIME_LIMIT: "time_limit",
+    },
+}
+
+# keys of the store of the solution of a simulation, used as starting point of the next one
+WARM_START_STRUCTURE = "model_structure"
+WARM_START_VALUES = "variable_values"
+WARM_START_BASIS = "basis"
+WARM_STARTED = "warm_started"
+SOLVE_TIME = "solve_time"
+
+# formats of the files with the timeseries of all busses, Excel (one sheet per bus), csv and
+# parquet (one file per bus) or HDF5 (one key per bus)
+TIMESERIES_FORMAT_XLSX = "xlsx"
+TIMESERIES_FORMAT_CSV = "csv"
+TIMESERIES_FORMAT_PARQUET = "parquet"
+TIMESERIES_FORMAT_HDF5 = "hdf5"
+TIMESERIES_OUTPUT_FORMATS = (
+    TIMESERIES_FORMAT_XLSX,
+    TIMESERIES_FORMAT_CSV,
+    TIMESERIES_FORMAT_PARQUET,
+    TIMESERIES_FORMAT_HDF5,
+)
+DEFAULT_TIMESERIES_OUTPUT_FORMAT = TIMESERIES_FORMAT_XLSX
+# name of the file (or folder with one file per bus) with the timeseries of all busses
+TIMESERIES_ALL_BUSSES = "timeseries_all_busses"
+# number of rows written at once to the csv files with the timeseries of all busses
+TIMESERIES_CSV_CHUNK_SIZE = 8760
+# maximum number of rows of an Excel sheet
+EXCEL_MAX_ROWS = 1048576
+
 # Instroducting new parameters (later to be merged into list ll.77)
 WARNING_TEXT = "warning_text"
 REQUIRED_IN_CSV_ELEMENTS = "required in files"
@@ -231,6 +384,11 @@ TYPE_SERIES = "pandas_Series"
 TYPE_DATAFRAME = "pandas_Dataframe"
 TYPE_NDARRAY = "numpy_ndarray"
 TYPE_TIMESTAMP = "pandas_Timestamp"
+# name of the keys linking a timeseries of a json file to its values in the sidecar file
+SIDECAR_FILE_JSON_KEY = "sidecar_file"
+SIDECAR_ARRAY_JSON_KEY = "sidecar_array"
+# suffix of the name of the array storing the index of a pandas.DataFrame in the sidecar file
+SIDECAR_INDEX_SUFFIX = "_index"
 TYPE_BOOL = "bool"
 TYPE_INT64 = "numpy_int64"
 TYPE_STR = "str"
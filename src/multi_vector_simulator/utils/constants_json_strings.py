@@ -33,6 +33,8 @@ OEMOF_SOURCE = "source"
 OEMOF_SINK = "sink"
 OEMOF_BUSSES = "bus"
 OEMOF_ExtractionTurbineCHP = "extractionTurbineCHP"
+# Table of the parameters of the assets converted to numpy arrays for the oemof model
+ASSET_TABLE = "asset_table"
 
 # Dict generated from above defined strings
 ACCEPTED_ASSETS_FOR_ASSET_GROUPS = {
@@ -65,6 +67,19 @@ EVALUATED_PERIOD = "evaluated_period"
 START_DATE = "start_date"
 TIMESTEP = "timestep"
 PERIODS = "periods"
+# Simulation settings: aggregation of the timeseries into typical periods (optional)
+TYPICAL_PERIODS = "typical_periods"
+TYPICAL_PERIOD_LENGTH = "typical_period_length"
+# Simulation settings: rolling horizon optimization of the dispatch (optional)
+ROLLING_HORIZON_WINDOW = "rolling_horizon_window"
+ROLLING_HORIZON_OVERLAP = "rolling_horizon_overlap"
+# Simulation settings: solver of the optimization and its options (optional)
+SOLVER = "solver"
+SOLVER_THREADS = "threads"
+SOLVER_MIP_GAP = "mip_gap"
+SOLVER_TIME_LIMIT = "time_limit"
+# Simulation settings: formats of the files with the timeseries of all busses (optional)
+TIMESERIES_OUTPUT_FORMAT = "timeseries_output_format"
 LONGITUDE = "longitude"
 LATITUDE = "latitude"
 
@@ -138,6 +153,10 @@ UNIT_SPECIFIC_EMISSIONS = "kgCO2eq/kWheleq"
 # Preprocessing: Time
 END_DATE = "end_date"
 TIME_INDEX = "time_index"
+TIMESTEP_WEIGHTS = "timestep_weights"
+PERIOD_ORDER = "period_order"
+ROLLING_HORIZON = "rolling_horizon"
+ROLLING_HORIZON_WINDOWS = "windows"
 TIMESERIES = "timeseries"
 TIMESERIES_NORMALIZED = "timeseries_normalized"
 TIMESERIES_PEAK = "timeseries_peak"
@@ -211,11 +230,28 @@ SIMULATION_RESULTS = "simulation_results"
 OBJECTIVE_VALUE = "objective_value"
 SIMULTATION_TIME = "simulation_time"
 MODELLING_TIME = "modelling_time"
+SOLVER_STATUS = "solver_status"
+SOLVER_TERMINATION_CONDITION = "solver_termination_condition"
+NUMBER_OF_VARIABLES = "number_of_variables"
+NUMBER_OF_CONSTRAINTS = "number_of_constraints"
+
+# Profiling of the stages of the simulation
+PROFILING = "profiling"
+WALL_TIME = "wall_time"
+CPU_TIME = "cpu_time"
+PEAK_RSS = "peak_rss"
 
 # Logs
 LOGS = "logs"
 ERRORS = "errors"
 WARNINGS = "warnings"
+LOG_RECORDS = "records"
+LOG_DROPPED = "dropped_records"
+LOG_LEVEL = "level"
+LOG_MESSAGE = "message"
+LOG_MODULE = "module"
+LOG_STAGE = "stage"
+LOG_ASSET = "asset"
 
 # Names for KPI output
 KPI = "kpi"
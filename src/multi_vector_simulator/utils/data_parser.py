@@ -12,7 +12,6 @@ This module defines all functions to convert formats between EPA and MVS
 import pprint
 import logging
 import json
-from copy import deepcopy
 
 from multi_vector_simulator.utils import compare_input_parameters_with_reference
 
@@ -31,6 +30,7 @@ from multi_vector_simulator.utils.constants import (
 
 from multi_vector_simulator.utils.constants_json_strings import (
     PROJECT_DATA,
+    PROFILING,
     ECONOMIC_DATA,
     SIMULATION_SETTINGS,
     CONSTRAINTS,
@@ -160,7 +160,7 @@ EPA_PARAM_KEYS = {
         KPI_SCALAR_MATRIX,
     ],
     "raw_results": ["index", "columns", "data"],
-    "simulation_results": ["logs"],
+    "simulation_results": ["logs", PROFILING],
 }
 
 # Fields expected for assets' parameters of json returned to EPA
@@ -265,6 +265,137 @@ EPA_ASSET_KEYS = {
     ENERGY_BUSSES: [LABEL, "assets", "energy_vector"],
 }
 
+# Sections of the json returned to EPA, with the parameter or asset group they are converted from
+EPA_OUTPUT_SECTIONS = {
+    MAP_MVS_EPA.get(group, group): group
+    for group in list(EPA_PARAM_KEYS) + list(EPA_ASSET_KEYS)
+}
+
+
+def copy_nested_dicts(value):
+    r"""Copy the dicts of a nested structure, sharing the other values with the original one
+
+    Lists are only copied if they contain dicts or lists (as parsed from json, not their
+    subclasses), the lists of values (e.g. the values of the timeseries) are shared with the
+    original structure and should not be modified in place. This is much cheaper than
+    `copy.deepcopy` for the parameters of an energy system.
+
+    Parameters
+    ----------
+    value:
+        nested structure of dicts and lists, e.g. parameters in EPA format
+
+    Returns
+    -------
+    Copy of value, which can be modified at any nesting level without modifying value, as long
+    as the lists of values are replaced instead of modified in place
+
+    Notes
+    -----
+    This function is tested with:
+    - test_benchmark_performance.TestEpaConversion.test_epa_to_mvs_input_not_modified
+    """
+    if isinstance(value, dict):
+        answer = {k: copy_nested_dicts(v) for k, v in value.items()}
+    elif isinstance(value, list) and not {dict, list}.isdisjoint(map(type, value)):
+        # the types of the items are compared at once, as the lists of values can be long
+        answer = [copy_nested_dicts(v) for v in value]
+    else:
+        answer = value
+    return answer
+
+
+def get_output_groups(output_sections):
+    r"""Find the parameter and asset groups needed for the requested sections of the EPA json
+
+    Parameters
+    ----------
+    output_sections: list
+        paths of the requested sections of the json returned to EPA, each path is either the
+        name of a section (str), e.g. "kpi", or a tuple (or list) of keys within the json, e.g.
+        ("kpi", "scalars"). The assets of an asset group are selected by their label, e.g.
+        ("energy_production", "pv_plant", "flow").
+
+    Returns
+    -------
+    dict with the MVS parameter and asset groups needed as keys and the set of the first keys
+    requested within each group as values, or None if the whole group is requested
+
+    Notes
+    -----
+    This function is tested with:
+    - test_server.TestOutputSections.test_unknown_section_raises_value_error
+    - test_server.TestOutputSections.test_output_groups_of_sections
+    """
+    groups = {}
+    for path in output_sections:
+        path = (path,) if isinstance(path, str) else tuple(path)
+        if len(path) == 0 or path[0] not in EPA_OUTPUT_SECTIONS:
+            raise ValueError(
+                f"The output section {path} is not known, the available sections are "
+                f"{', '.join(EPA_OUTPUT_SECTIONS)}."
+            )
+        group = EPA_OUTPUT_SECTIONS[path[0]]
+        if len(path) == 1 or (group in groups and groups[group] is None):
+            groups[group] = None
+        else:
+            groups.setdefault(group, set()).add(path[1])
+    return groups
+
+
+def select_output_sections(epa_dict, output_sections):
+    r"""Keep only the requested sections of the json returned to EPA
+
+    Parameters
+    ----------
+    epa_dict: dict
+        parameters in EPA format, see :py:func:`~.convert_mvs_params_to_epa`
+
+    output_sections: list
+        paths of the requested sections, see :py:func:`~.get_output_groups`
+
+    Returns
+    -------
+    dict with the same structure as epa_dict, restricted to the requested sections, the assets
+    of an asset group keep their label
+
+    Notes
+    -----
+    This function is tested with:
+    - test_server.TestOutputSections.test_select_output_sections
+    - test_server.TestOutputSections.test_missing_path_raises_key_error
+    """
+    selection = {}
+    for path in output_sections:
+        path = (path,) if isinstance(path, str) else tuple(path)
+        source, target = epa_dict, selection
+        for depth, key in enumerate(path):
+            is_last_key = depth == len(path) - 1
+            if isinstance(source, list):
+                # the assets of an asset group are selected by their label
+                asset = next((a for a in source if a.get(LABEL) == key), None)
+                if asset is None:
+                    raise KeyError(
+                        f"The output section {path} does not exist, there is no asset {key}."
+                    )
+                selected_asset = next((a for a in target if a.get(LABEL) == key), None)
+                if selected_asset is None or is_last_key:
+                    if selected_asset is not None:
+                        target.remove(selected_asset)
+                    selected_asset = asset if is_last_key else {LABEL: key}
+                    target.append(selected_asset)
+                source, target = asset, selected_asset
+            elif isinstance(source, dict) and key in source:
+                if is_last_key:
+                    target[key] = source[key]
+                else:
+                    if key not in target:
+                        target[key] = [] if isinstance(source[key], list) else {}
+                    source, target = source[key], target[key]
+            else:
+                raise KeyError(f"The output section {path} does not exist.")
+    return selection
+
 
 def convert_epa_params_to_mvs(epa_dict):
     """Convert the EPA output parameters to MVS input parameters
@@ -310,7 +441,8 @@ def convert_epa_params_to_mvs(epa_dict):
         - Default value for `EMISSION_FACTOR` added
         - `DISPATCHABILITY` is always `False`, as no dispatchable fuel assets possible right now. Must be tackeld by EPA.
     """
-    epa_dict = deepcopy(epa_dict)
+    # only the dicts are copied, the timeseries are shared with the original epa_dict
+    epa_dict = copy_nested_dicts(epa_dict)
     dict_values = {}
 
     # Loop though one-dimensional energy system data (parameters directly in group)
@@ -593,7 +725,7 @@ def convert_epa_params_to_mvs(epa_dict):
     return dict_values
 
 
-def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
+def convert_mvs_params_to_epa(mvs_dict, verbatim=False, output_sections=None):
     """Convert the MVS output parameters to EPA format
 
     Parameters
@@ -601,6 +733,11 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
     mvs_dict: dict
         output parameters from MVS
 
+    output_sections: list
+        if provided, only the requested sections of the EPA json are converted and returned,
+        see :py:func:`~.get_output_groups`
+        Default: None
+
     Returns
     -------
     epa_dict: dict
@@ -609,9 +746,18 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
     """
 
     epa_dict = {}
+    output_groups = None
+    if output_sections is not None:
+        output_groups = get_output_groups(output_sections)
 
     # manage which parameters are kept and which one are removed in epa_dict
     for param_group in EPA_PARAM_KEYS:
+        if output_groups is not None and param_group not in output_groups:
+            continue
+        if output_groups is None or output_groups[param_group] is None:
+            requested_keys = None
+        else:
+            requested_keys = {MAP_EPA_MVS.get(k, k) for k in output_groups[param_group]}
 
         # translate field name from mvs to epa
         param_group_epa = MAP_MVS_EPA.get(param_group, param_group)
@@ -625,8 +771,10 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
             for k in keys_list:
                 # ditch all subfields which are not present in the EPA_PARAM_KEYS value corresponding
                 # to the parameter group (except for CONSTRAINTS)
-                if k not in EPA_PARAM_KEYS[param_group] or param_group in (
-                    CONSTRAINTS,
+                if (
+                    k not in EPA_PARAM_KEYS[param_group]
+                    or param_group in (CONSTRAINTS,)
+                    or (requested_keys is not None and k not in requested_keys)
                 ):
                     epa_dict[param_group_epa].pop(k)
                 else:
@@ -660,9 +808,17 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
 
     # manage which assets parameters are kept and which one are removed in epa_dict
     for asset_group in EPA_ASSET_KEYS:
+        if output_groups is not None and asset_group not in output_groups:
+            continue
         list_asset = []
         for asset_label in mvs_dict[asset_group]:
             # mvs[asset_group] is a dict we want to change into a list
+            if (
+                output_groups is not None
+                and output_groups[asset_group] is not None
+                and asset_label not in output_groups[asset_group]
+            ):
+                continue
 
             # each asset is also a dict
             asset = mvs_dict[asset_group][asset_label]
@@ -741,7 +897,7 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
     for asset_group in EPA_ASSET_KEYS:
         extra_keys[asset_group] = []
         missing_keys[asset_group] = []
-        for asset in epa_dict[MAP_MVS_EPA[asset_group]]:
+        for asset in epa_dict.get(MAP_MVS_EPA[asset_group], []):
             asset_keys = list(asset.keys())
             # loop over the actual fields of the asset
             for k in asset_keys:
@@ -764,4 +920,7 @@ def convert_mvs_params_to_epa(mvs_dict, verbatim=False):
         print("#" * 10 + " Extra values " + "#" * 12)
         pp.pprint(extra_keys)
 
+    if output_sections is not None:
+        epa_dict = select_output_sections(epa_dict, output_sections)
+
     return epa_dict
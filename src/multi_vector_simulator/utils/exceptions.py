@@ -8,6 +8,18 @@ class MVSOemofError(ValueError):
     """Exception raised for missing parameters of a csv input file."""
 
 
+class UnknownSolverError(ValueError):
+    """Exception raised if the solver of the simulation settings is not in SOLVERS"""
+
+    pass
+
+
+class UnknownOutputFormatError(ValueError):
+    """Exception raised if a format of the timeseries output is not in TIMESERIES_OUTPUT_FORMATS"""
+
+    pass
+
+
 class WrongOemofAssetForGroupError(ValueError):
     """Exception raised when an asset group has an asset with an denied oemof type"""
 
@@ -0,0 +1,251 @@
+r"""
+Log capture
+===========
+
+Collect the warnings and errors of a simulation in memory while it runs
+
+- Attach a logging handler to the root logger for the duration of a simulation, which only keeps
+  the messages logged within the context of the simulation (the thread running it and the tasks
+  it submits to other threads with :py:func:`map_in_context`), so that several simulations run
+  at the same time in one process do not mix their messages
+- Record the level, message, module, stage of the simulation and asset concerned by each message
+- Keep a bounded number of messages per level and count the ones which are dropped
+- Store the messages in `dict_values[SIMULATION_RESULTS][LOGS]`, instead of parsing the log file
+  at the end of the simulation
+"""
+
+import contextvars
+import logging
+import re
+
+from multi_vector_simulator.utils.constants import (
+    LOG_CAPTURE_MAX_RECORDS,
+    STAGE_STARTED,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_RESULTS,
+    LABEL,
+    LOGS,
+    ERRORS,
+    WARNINGS,
+    LOG_RECORDS,
+    LOG_DROPPED,
+    LOG_LEVEL,
+    LOG_MESSAGE,
+    LOG_MODULE,
+    LOG_STAGE,
+    LOG_ASSET,
+    ENERGY_BUSSES,
+    ENERGY_CONSUMPTION,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_PROVIDERS,
+    ENERGY_STORAGE,
+)
+
+# log captures entered in the current context, the context is copied to the threads which run
+# tasks of the simulation by map_in_context
+ACTIVE_LOG_CAPTURES = contextvars.ContextVar("active_log_captures", default=())
+
+# asset groups of dict_values whose labels are looked for in the captured messages
+ASSET_GROUPS = (
+    ENERGY_BUSSES,
+    ENERGY_CONSUMPTION,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_PROVIDERS,
+    ENERGY_STORAGE,
+)
+
+
+class LogCapture(logging.Handler):
+    r"""Logging handler keeping the warnings and errors of one simulation in memory
+
+    Only the messages logged within the context of the handler are kept, i.e. by the thread
+    which entered it and by the tasks which this thread runs in other threads with
+    :py:func:`map_in_context`. The handler is attached to the root logger within its context,
+    the handlers of the root logger should therefore be defined (e.g. by
+    :py:func:`A0.process_user_arguments`) before entering it.
+
+    Parameters
+    ----------
+    max_records: int
+        maximal number of messages kept per level (warnings and errors), the following ones are
+        only counted
+        Default: LOG_CAPTURE_MAX_RECORDS
+
+    level: int
+        minimal level of the messages kept
+        Default: logging.WARNING
+
+    Notes
+    -----
+    Messages are only captured if the level of the root logger lets them through.
+
+    This class is tested with:
+    - test_utils.TestLogCapture
+
+    Examples
+    --------
+    >>> log_capture = LogCapture()
+    >>> profiler = Profiler(callback=log_capture.set_stage)
+    >>> with log_capture:
+    ...     with profiler.stage("C0_data_processing"):
+    ...         C0.all(dict_values)
+    >>> log_capture.add_to_dict_values(dict_values)
+    """
+
+    def __init__(self, max_records=LOG_CAPTURE_MAX_RECORDS, level=logging.WARNING):
+        super().__init__(level=level)
+        self.max_records = max_records
+        self.stage = None
+        self.asset_pattern = None
+        self.records = []
+        self.number_of_records = {ERRORS: 0, WARNINGS: 0}
+        self.dropped = 0
+        self.context_token = None
+        # the filter runs in the thread logging the message, it therefore sees its context
+        self.addFilter(lambda record: self in ACTIVE_LOG_CAPTURES.get())
+
+    def __enter__(self):
+        self.context_token = ACTIVE_LOG_CAPTURES.set(
+            ACTIVE_LOG_CAPTURES.get() + (self,)
+        )
+        logging.getLogger().addHandler(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        logging.getLogger().removeHandler(self)
+        ACTIVE_LOG_CAPTURES.reset(self.context_token)
+        self.context_token = None
+
+    def set_stage(self, stage, status=STAGE_STARTED):
+        r"""Set the stage of the simulation attached to the following messages
+
+        The signature matches the callback of :py:class:`Profiler`, the stage is reset once it
+        is finished or failed.
+
+        Parameters
+        ----------
+        stage: str
+            name of the stage, e.g. "C0_data_processing"
+
+        status: str
+            STAGE_STARTED, STAGE_FINISHED or STAGE_FAILED
+            Default: STAGE_STARTED
+        """
+        self.stage = stage if status == STAGE_STARTED else None
+
+    def set_asset_labels(self, dict_values):
+        r"""Look for the labels of the assets of dict_values in the following messages
+
+        Messages logged with the asset label as `extra={"asset": label}` do not need it.
+
+        Parameters
+        ----------
+        dict_values: dict
+            all simulation parameters, with the asset groups of ASSET_GROUPS
+        """
+        labels = set()
+        for group in ASSET_GROUPS:
+            for key, asset in dict_values.get(group, {}).items():
+                labels.add(key)
+                if isinstance(asset, dict) and isinstance(asset.get(LABEL), str):
+                    labels.add(asset[LABEL])
+        labels.discard("")
+        if len(labels) > 0:
+            # the longest labels are tried first, e.g. "pv plant" before "pv"
+            self.asset_pattern = re.compile(
+                "|".join(
+                    re.escape(label) for label in sorted(labels, key=len, reverse=True)
+                )
+            )
+        else:
+            self.asset_pattern = None
+
+    def emit(self, record):
+        level = ERRORS if record.levelno >= logging.ERROR else WARNINGS
+        if self.number_of_records[level] >= self.max_records:
+            self.dropped += 1
+            return
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        asset = getattr(record, LOG_ASSET, None)
+        if asset is None and self.asset_pattern is not None:
+            match = self.asset_pattern.search(message)
+            if match is not None:
+                asset = match.group(0)
+        self.number_of_records[level] += 1
+        self.records.append(
+            {
+                LOG_LEVEL: record.levelname,
+                LOG_MESSAGE: message,
+                LOG_MODULE: record.module,
+                LOG_STAGE: self.stage,
+                LOG_ASSET: asset,
+            }
+        )
+
+    def add_to_dict_values(self, dict_values):
+        r"""Store the captured messages in `dict_values[SIMULATION_RESULTS][LOGS]`
+
+        The messages of each level are numbered as in :py:func:`F0.parse_simulation_log`,
+        the details of each message are listed in emission order under LOG_RECORDS.
+
+        Parameters
+        ----------
+        dict_values: dict
+            dict of the simulation, SIMULATION_RESULTS is created if it does not exist yet
+
+        Returns
+        -------
+        Updated dict_values
+        """
+        logs = {ERRORS: {}, WARNINGS: {}}
+        for record in self.records:
+            level = ERRORS if record[LOG_LEVEL] in ("ERROR", "CRITICAL") else WARNINGS
+            logs[level][len(logs[level]) + 1] = record[LOG_MESSAGE]
+        logs[LOG_RECORDS] = [dict(record) for record in self.records]
+        logs[LOG_DROPPED] = self.dropped
+        simulation_results = dict_values.setdefault(
+            SIMULATION_RESULTS, {LABEL: SIMULATION_RESULTS}
+        )
+        simulation_results[LOGS] = logs
+        return dict_values
+
+
+def map_in_context(executor, function, iterable):
+    r"""Maps a function on the items of an iterable in the threads of an executor
+
+    Each call runs within a copy of the context of the calling thread, so that the messages it
+    logs are captured by the :py:class:`LogCapture` entered by the calling thread.
+
+    Parameters
+    ----------
+    executor: :class:`concurrent.futures.ThreadPoolExecutor`
+        executor running the calls
+
+    function: callable
+        function called with each item of the iterable
+
+    iterable: iterable
+        items passed to the function
+
+    Returns
+    -------
+    List of the results of the calls, in the order of the items
+
+    Notes
+    -----
+    This function is tested with:
+    - test_utils.TestLogCapture
+    """
+    futures = [
+        # a context can only be entered by one thread at a time, each call gets its own copy
+        executor.submit(contextvars.copy_context().run, function, item)
+        for item in iterable
+    ]
+    return [future.result() for future in futures]
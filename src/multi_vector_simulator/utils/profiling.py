@@ -0,0 +1,226 @@
+r"""
+Profiling
+=========
+
+Measure the duration and memory use of the stages of a simulation
+
+- Wall time, CPU time and peak resident set size (RSS) of each stage of the simulation, e.g. of
+  each module from A0 to F0
+- Store the measures in `dict_values[SIMULATION_RESULTS][PROFILING]`
+- Save the stages as a trace file in the Chrome trace event format, which can be displayed with
+  chrome://tracing or https://ui.perfetto.dev
+- Report the start and the end of each stage to a callback, e.g. to display the progress of a
+  simulation, also without measuring the stages with :py:class:`StageReporter`
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import timeit
+from contextlib import contextmanager
+
+import psutil
+
+from multi_vector_simulator.utils.constants import (
+    PROFILING_SAMPLING_INTERVAL,
+    PROFILING_TRACE_FILE,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_FAILED,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_RESULTS,
+    LABEL,
+    PROFILING,
+    WALL_TIME,
+    CPU_TIME,
+    PEAK_RSS,
+)
+
+# conversion of bytes to megabytes
+BYTES_PER_MB = 1024**2
+
+
+class StageReporter:
+    r"""Report the start and the end of the stages of a simulation to a callback
+
+    It provides the :py:meth:`stage` context manager of :py:class:`Profiler` without measuring
+    the stages, e.g. to report the progress of a simulation which is not profiled.
+
+    Parameters
+    ----------
+    callback: func
+        function called with the name of a stage and STAGE_STARTED when the stage starts, then
+        with STAGE_FINISHED or STAGE_FAILED (if an exception is raised) when it ends
+        Default: None
+
+    Notes
+    -----
+    This class is tested with:
+    - test_utils.TestStageReporter
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+
+    @contextmanager
+    def stage(self, name):
+        r"""Report the start and the end of the code run within the context
+
+        Parameters
+        ----------
+        name: str
+            name of the stage
+        """
+        if self.callback is not None:
+            self.callback(name, STAGE_STARTED)
+        status = STAGE_FAILED
+        try:
+            yield
+            status = STAGE_FINISHED
+        finally:
+            if self.callback is not None:
+                self.callback(name, status)
+
+
+class Profiler:
+    r"""Record the wall time, CPU time and peak RSS of the stages of a simulation
+
+    Each stage is measured within the context manager :py:meth:`stage`, which can also be used
+    as a function decorator. The resident set size of the process is sampled in a background
+    thread while a stage is running, its peak is therefore exact up to the sampling interval.
+
+    Parameters
+    ----------
+    sampling_interval: float
+        time between two samples of the resident set size of the process, in seconds
+        Default: PROFILING_SAMPLING_INTERVAL
+
+    callback: func
+        function called with the name of a stage and STAGE_STARTED when the stage starts, then
+        with STAGE_FINISHED or STAGE_FAILED (if an exception is raised) when it ends
+        Default: None
+
+    Notes
+    -----
+    This class is tested with:
+    - test_utils.TestProfiler
+    """
+
+    def __init__(self, sampling_interval=PROFILING_SAMPLING_INTERVAL, callback=None):
+        self.sampling_interval = sampling_interval
+        self.callback = callback
+        self.process = psutil.Process()
+        self.stages = {}
+        self.trace_events = []
+        self.start = timeit.default_timer()
+
+    @contextmanager
+    def stage(self, name):
+        r"""Measure the wall time, CPU time and peak RSS of the code run within the context
+
+        Parameters
+        ----------
+        name: str
+            name of the stage, a stage measured several times is recorded under its last measure
+
+        Examples
+        --------
+        >>> profiler = Profiler()
+        >>> with profiler.stage("C0_data_processing"):
+        ...     C0.all(dict_values)
+        """
+        if self.callback is not None:
+            self.callback(name, STAGE_STARTED)
+        peak_rss = [self.process.memory_info().rss]
+        stop_sampling = threading.Event()
+
+        def sample_rss():
+            while not stop_sampling.wait(self.sampling_interval):
+                peak_rss[0] = max(peak_rss[0], self.process.memory_info().rss)
+
+        sampler = threading.Thread(target=sample_rss, daemon=True)
+        sampler.start()
+        start_wall = timeit.default_timer()
+        start_cpu = time.process_time()
+        status = STAGE_FAILED
+        try:
+            yield
+            status = STAGE_FINISHED
+        finally:
+            wall_time = timeit.default_timer() - start_wall
+            cpu_time = time.process_time() - start_cpu
+            stop_sampling.set()
+            sampler.join()
+            peak = max(peak_rss[0], self.process.memory_info().rss)
+            self.stages[name] = {
+                WALL_TIME: round(wall_time, 3),
+                CPU_TIME: round(cpu_time, 3),
+                PEAK_RSS: round(peak / BYTES_PER_MB, 1),
+            }
+            self.trace_events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": round((start_wall - self.start) * 1e6),
+                    "dur": round(wall_time * 1e6),
+                    "pid": self.process.pid,
+                    "tid": threading.get_ident(),
+                    "args": {CPU_TIME: cpu_time, PEAK_RSS: peak / BYTES_PER_MB},
+                }
+            )
+            logging.debug(
+                f"Stage {name}: wall time {wall_time:.2f} s, CPU time {cpu_time:.2f} s, "
+                f"peak RSS {peak / BYTES_PER_MB:.0f} MB"
+            )
+            if self.callback is not None:
+                self.callback(name, status)
+
+    def add_to_dict_values(self, dict_values):
+        r"""Store the measures of the stages in `dict_values[SIMULATION_RESULTS][PROFILING]`
+
+        The wall time and CPU time are in seconds, the peak RSS in megabytes.
+
+        Parameters
+        ----------
+        dict_values: dict
+            dict of the simulation, SIMULATION_RESULTS is created if it does not exist yet
+
+        Returns
+        -------
+        Updated dict_values
+        """
+        simulation_results = dict_values.setdefault(
+            SIMULATION_RESULTS, {LABEL: SIMULATION_RESULTS}
+        )
+        simulation_results[PROFILING] = {
+            name: dict(measures) for name, measures in self.stages.items()
+        }
+        return dict_values
+
+    def save_trace(self, path, file_name=PROFILING_TRACE_FILE):
+        r"""Save the stages in a json file in the Chrome trace event format
+
+        Parameters
+        ----------
+        path: str
+            path to the folder where the trace file is saved
+        file_name: str
+            name of the trace file
+            Default: PROFILING_TRACE_FILE
+
+        Returns
+        -------
+        Path of the trace file
+        """
+        file_path = os.path.join(path, file_name)
+        with open(file_path, "w") as fp:
+            json.dump(
+                {"traceEvents": self.trace_events, "displayTimeUnit": "ms"},
+                fp,
+                indent=2,
+            )
+        logging.info(f"The profiling trace of the simulation is saved in {file_path}")
+        return file_path
@@ -0,0 +1,120 @@
+r"""
+Result cache
+============
+
+On-disk cache of the results of simulations run with :py:func:`~.server.run_simulation`
+
+- Compute a canonical hash of the simulation inputs (including the content of the timeseries and
+  the version of the MVS)
+- Store the json results of a simulation under this hash
+- Return the stored results if the same inputs are simulated again
+- Evict the least recently used results once the cache exceeds its maximal size
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from multi_vector_simulator.B0_data_input_json import convert_from_special_types_to_json
+from multi_vector_simulator.version import version_num
+from multi_vector_simulator.utils.constants import (
+    RESULT_CACHE_FOLDER,
+    RESULT_CACHE_MAX_SIZE,
+    JSON_FILE_EXTENSION,
+)
+
+
+class ResultCache:
+    r"""Cache of simulation results stored as json files within a folder
+
+    Parameters
+    ----------
+    folder: str
+        path to the folder where the results are stored, it is created if it does not exist
+        Default: RESULT_CACHE_FOLDER
+    max_size: int
+        maximal size of the cache in bytes, the least recently used results are removed when
+        this size is exceeded
+        Default: RESULT_CACHE_MAX_SIZE
+
+    Notes
+    -----
+    This class is tested with:
+    - test_utils.TestResultCache
+    """
+
+    def __init__(self, folder=RESULT_CACHE_FOLDER, max_size=RESULT_CACHE_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+        os.makedirs(self.folder, exist_ok=True)
+
+    @staticmethod
+    def key(dict_values, **options):
+        r"""Compute the hash of simulation inputs
+
+        Parameters
+        ----------
+        dict_values: dict
+            simulation inputs, after conversion with
+            :py:func:`~.B0_data_input_json.convert_from_json_to_special_types`
+        options:
+            other options of the simulation which influence its results (e.g. the output format)
+
+        Returns
+        -------
+        Hexadecimal sha256 hash of the inputs, options and MVS version
+        """
+        canonical_json = json.dumps(
+            {"inputs": dict_values, "options": options, "version": version_num},
+            sort_keys=True,
+            default=convert_from_special_types_to_json,
+        )
+        return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.folder, key + JSON_FILE_EXTENSION)
+
+    def get(self, key):
+        r"""Return the json results stored under the key or None if they are not in the cache"""
+        file_path = self.path(key)
+        try:
+            with open(file_path) as json_file:
+                json_values = json_file.read()
+        except FileNotFoundError:
+            return None
+        # mark the results as recently used for the eviction
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            pass
+        return json_values
+
+    def set(self, key, json_values):
+        r"""Store json results under the key and evict old results if needed"""
+        # write to a temporary file first so that concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(json_values)
+        os.replace(tmp_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        r"""Remove the least recently used results until the cache fits within max_size"""
+        cached_files = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith(JSON_FILE_EXTENSION):
+                stat = entry.stat()
+                cached_files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in cached_files)
+        for _, size, file_path in sorted(cached_files):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(file_path)
+                logging.debug(f"Removed simulation results {file_path} from the cache")
+            except FileNotFoundError:
+                pass
+            total_size -= size
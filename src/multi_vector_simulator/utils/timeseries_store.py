@@ -0,0 +1,204 @@
+r"""
+Timeseries store
+================
+
+On-disk store of the timeseries read from csv files by :py:mod:`~.C0_data_processing`
+
+- Parse each csv file once and save its columns as a numpy file, keyed by the path, the
+  modification time and the size of the csv file
+- Load the saved columns as a memory map instead of parsing the csv file again, so that the
+  processes simulating the steps of a sweep skip the parsing and share the same pages of memory
+- Remove the columns saved for a previous version of a csv file when it is parsed again
+
+Only csv files with numeric columns are stored, other files are parsed each time.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from multi_vector_simulator.utils.constants import TIMESERIES_STORE_FOLDER
+
+NUMPY_FILE_EXTENSION = ".npy"
+
+
+class TimeseriesStore:
+    r"""Store of parsed csv files saved as numpy files within a folder
+
+    Parameters
+    ----------
+    folder: str
+        path to the folder where the parsed csv files are stored, it is created if it does not
+        exist
+        Default: TIMESERIES_STORE_FOLDER
+
+    Notes
+    -----
+    This class is tested with:
+    - test_utils.TestTimeseriesStore
+    """
+
+    def __init__(self, folder=TIMESERIES_STORE_FOLDER):
+        self.folder = folder
+        os.makedirs(self.folder, exist_ok=True)
+
+    @staticmethod
+    def key(file_path, **read_options):
+        r"""Compute the key of a csv file
+
+        Parameters
+        ----------
+        file_path: str
+            path of the csv file
+        read_options:
+            keyword arguments of :func:`pandas.read_csv`
+
+        Returns
+        -------
+        Key made of a hash of the absolute path and of the options, followed by a hash of the
+        modification time and the size of the file, so that all keys of a file share a prefix
+        """
+        stat = os.stat(file_path)
+        path_hash = hashlib.sha256(
+            json.dumps(
+                [os.path.abspath(file_path), read_options], sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+        version_hash = hashlib.sha256(
+            f"{stat.st_mtime_ns}-{stat.st_size}".encode("utf-8")
+        ).hexdigest()
+        return f"{path_hash[:32]}_{version_hash[:16]}"
+
+    def path(self, key):
+        return os.path.join(self.folder, key + NUMPY_FILE_EXTENSION)
+
+    def get(self, key):
+        r"""Return the DataFrame stored under the key or None if it is not in the store
+
+        The values of the DataFrame are a copy-on-write memory map of the stored file: they
+        can be modified without altering the store.
+        """
+        try:
+            records = np.load(self.path(key), mmap_mode="c")
+        except (FileNotFoundError, ValueError):
+            return None
+        columns = list(records.dtype.names)
+        # all columns share the same dtype, the records are viewed as a 2D array without copy
+        values = records.view(records.dtype[0]).reshape(len(records), len(columns))
+        return pd.DataFrame(values, columns=columns, copy=False)
+
+    def set(self, key, data_set):
+        r"""Store the numeric columns of a DataFrame under the key
+
+        The columns are converted to a common dtype. Returns False if the DataFrame has
+        non-numeric columns or column names which are not unique strings, it is then not
+        stored.
+        """
+        dtypes = data_set.dtypes.tolist()
+        if len(dtypes) == 0 or not all(
+            pd.api.types.is_numeric_dtype(dtype)
+            and not pd.api.types.is_bool_dtype(dtype)
+            for dtype in dtypes
+        ):
+            return False
+        columns = data_set.columns.tolist()
+        if not all(isinstance(column, str) for column in columns) or len(
+            set(columns)
+        ) != len(columns):
+            return False
+        common_dtype = np.result_type(*dtypes)
+        records = np.empty(
+            len(data_set.index),
+            dtype=[(column, common_dtype) for column in columns],
+        )
+        for column in columns:
+            records[column] = data_set[column].to_numpy(dtype=common_dtype)
+
+        # write to a temporary file first so that concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            np.save(tmp_file, records)
+        os.replace(tmp_path, self.path(key))
+        self.remove_previous_versions(key)
+        return True
+
+    def remove_previous_versions(self, key):
+        r"""Remove the stored DataFrames of the same file and options with another key"""
+        prefix = key.split("_")[0] + "_"
+        for entry in os.scandir(self.folder):
+            if (
+                entry.name.startswith(prefix)
+                and entry.name.endswith(NUMPY_FILE_EXTENSION)
+                and entry.name != key + NUMPY_FILE_EXTENSION
+            ):
+                try:
+                    os.remove(entry.path)
+                    logging.debug(f"Removed outdated timeseries {entry.path}")
+                except FileNotFoundError:
+                    pass
+
+    def read_csv(self, file_path, **read_options):
+        r"""Read a csv file from the store, parse and store it if it is not in the store yet
+
+        Parameters
+        ----------
+        file_path: str
+            path of the csv file
+        read_options:
+            keyword arguments of :func:`pandas.read_csv`
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<frame>`
+        """
+        key = self.key(file_path, **read_options)
+        data_set = self.get(key)
+        if data_set is None:
+            data_set = pd.read_csv(file_path, **read_options)
+            try:
+                if self.set(key, data_set) is True:
+                    # return the memory map, shared with the other readers of the file
+                    data_set = self.get(key)
+            except OSError as e:
+                logging.debug(f"The timeseries of {file_path} could not be stored: {e}")
+        return data_set
+
+
+_default_store = None
+
+
+def read_csv(file_path, **read_options):
+    r"""Read a csv file with the default :class:`TimeseriesStore`
+
+    If the folder of the store can not be created, the csv file is parsed with
+    :func:`pandas.read_csv` directly.
+
+    Parameters
+    ----------
+    file_path: str
+        path of the csv file
+    read_options:
+        keyword arguments of :func:`pandas.read_csv`
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+
+    Notes
+    -----
+    This function is tested with:
+    - test_utils.TestTimeseriesStore
+    """
+    global _default_store
+    if _default_store is None:
+        try:
+            _default_store = TimeseriesStore()
+        except OSError as e:
+            logging.debug(f"The timeseries store could not be created: {e}")
+            return pd.read_csv(file_path, **read_options)
+    return _default_store.read_csv(file_path, **read_options)
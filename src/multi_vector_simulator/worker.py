@@ -0,0 +1,358 @@
+"""
+Worker
+======
+
+The worker runs the simulations of :py:func:`~.server.run_simulation` in a long-lived process,
+so that the interpreter start, the imports, the logging setup and the loading of the solver
+interface are paid once for all jobs instead of once per simulation.
+
+A job is a json object with the keys
+
+- ``id``: identifier of the job, returned with its result
+- ``input``: json of the energy system, as provided to :py:func:`~.server.run_simulation`
+- ``options`` (optional): keyword arguments of :py:func:`~.server.run_simulation`, e.g.
+  ``epa_format`` or ``use_cache``
+
+and its result is a json object with the keys ``id``, ``status`` ("done" or "failed"),
+``duration`` (in seconds) and either ``result`` or ``error``.
+
+The jobs are read either
+
+- as json lines from the standard input, each result is written as a json line to the standard
+  output (the logging messages are displayed on the standard error)
+- or as json files from a queue folder. Each job file is moved to the subfolder ``running``
+  while it is simulated, so that several workers can share a queue folder, and its result is
+  saved under the same name in the subfolder ``results``. The job files should be written
+  under another extension and renamed once complete, as any json file of the queue folder
+  can be claimed.
+
+Usage:
+
+.. code-block:: bash
+
+    mvs_worker < jobs.jsonl > results.jsonl
+    mvs_worker -q path_queue_folder
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+
+import multi_vector_simulator.A0_initialization as A0
+import multi_vector_simulator.F0_output as F0
+import multi_vector_simulator.server as server
+from multi_vector_simulator.utils.constants import (
+    DISPLAY_OUTPUT,
+    ARG_QUEUE_FOLDER,
+    ARG_POLL_INTERVAL,
+    ARG_EXIT_WHEN_EMPTY,
+    DEFAULT_WORKER_POLL_INTERVAL,
+    WORKER_RUNNING_FOLDER,
+    WORKER_RESULTS_FOLDER,
+    JSON_FILE_EXTENSION,
+    JOB_ID,
+    JOB_INPUT,
+    JOB_OPTIONS,
+    JOB_STATUS,
+    JOB_RESULT,
+    JOB_ERROR,
+    JOB_DURATION,
+    JOB_DONE,
+    JOB_FAILED,
+)
+
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+
+def setup_worker_logging(display_output="info", stream=None):
+    r"""Defines the logging handler of the worker once for all jobs
+
+    The messages are displayed on the standard error, as the standard output is used to
+    return the results of the jobs.
+
+    Parameters
+    ----------
+    display_output: str
+        Level of the displayed logging messages, "debug", "info", "warning" or "error"
+        Default: "info"
+
+    stream: file-like
+        Stream on which the logging messages are displayed, if None the standard error
+        Default: None
+
+    Returns
+    -------
+    The logging handler
+    """
+    handler = logging.StreamHandler(sys.stderr if stream is None else stream)
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s-%(levelname)s-%(message)s", "%H:%M:%S")
+    )
+    log = logging.getLogger("")
+    log.handlers = [handler]
+    log.setLevel(LOG_LEVELS.get(display_output, logging.INFO))
+    return handler
+
+
+def run_job(job):
+    r"""Runs the simulation of a job and returns its result
+
+    The job is simulated with the logging handlers of the worker, the handlers and the level
+    of the root logger as well as the warnings filters are restored after the simulation and
+    any error is returned in the result of the job, so that a job can not alter the jobs
+    simulated after it.
+
+    Parameters
+    ----------
+    job: dict
+        Job with the keys JOB_ID, JOB_INPUT and optionally JOB_OPTIONS
+
+    Returns
+    -------
+    dict
+        Result of the job with the keys JOB_ID, JOB_STATUS, JOB_DURATION and JOB_RESULT or
+        JOB_ERROR
+
+    Notes
+    -----
+    This function is tested with:
+    - test_worker.TestRunJob
+    """
+    answer = {JOB_ID: job.get(JOB_ID)}
+    log = logging.getLogger("")
+    handlers, level = list(log.handlers), log.level
+    start = time.perf_counter()
+    try:
+        options = dict(job.get(JOB_OPTIONS, {}))
+        # the oemof model can not be returned as json, the result is written at once
+        options.pop("return_les", None)
+        options.pop("stream", None)
+        # anything printed during the simulation is displayed with the logging messages, the
+        # warnings filters changed by the simulation are restored (one job runs at a time)
+        with contextlib.redirect_stdout(sys.stderr), warnings.catch_warnings():
+            result = server.run_simulation(
+                job[JOB_INPUT], setup_logging=False, **options
+            )
+        if options.get("epa_format", True) is False:
+            # the results in mvs format still contain pandas objects
+            result = json.loads(F0.store_as_json(result))
+        answer[JOB_STATUS] = JOB_DONE
+        answer[JOB_RESULT] = result
+    except Exception as e:
+        logging.exception(f"The job {answer[JOB_ID]} failed")
+        answer[JOB_STATUS] = JOB_FAILED
+        answer[JOB_ERROR] = f"{type(e).__name__}: {e}"
+    finally:
+        log.handlers = handlers
+        log.setLevel(level)
+    answer[JOB_DURATION] = time.perf_counter() - start
+    return answer
+
+
+def serve_json_lines(input_stream=None, output_stream=None):
+    r"""Runs the jobs read as json lines and writes their results as json lines
+
+    Parameters
+    ----------
+    input_stream: file-like
+        Stream with one job per line, if None the standard input
+        Default: None
+
+    output_stream: file-like
+        Stream on which the result of each job is written as soon as it is available, if None
+        the standard output
+        Default: None
+
+    Returns
+    -------
+    Number of jobs run
+
+    Notes
+    -----
+    This function is tested with:
+    - test_worker.TestServeJsonLines
+    """
+    input_stream = sys.stdin if input_stream is None else input_stream
+    output_stream = sys.stdout if output_stream is None else output_stream
+    n_jobs = 0
+    for line in input_stream:
+        if line.strip() == "":
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            answer = {
+                JOB_ID: None,
+                JOB_STATUS: JOB_FAILED,
+                JOB_ERROR: f"The job is not valid json: {e}",
+            }
+        else:
+            answer = run_job(job)
+        output_stream.write(json.dumps(answer) + "\n")
+        output_stream.flush()
+        n_jobs += 1
+    return n_jobs
+
+
+def claim_next_job(queue_folder):
+    r"""Moves the oldest job file of the queue folder into its running subfolder
+
+    Parameters
+    ----------
+    queue_folder: str
+        Path to the queue folder
+
+    Returns
+    -------
+    Path of the claimed job file in the running subfolder, None if the queue is empty
+
+    Notes
+    -----
+    The job file is moved with an atomic rename, if another worker claimed the same file first
+    the next one is tried.
+    """
+    running_folder = os.path.join(queue_folder, WORKER_RUNNING_FOLDER)
+    job_files = []
+    for entry in os.scandir(queue_folder):
+        if entry.is_file() and entry.name.endswith(JSON_FILE_EXTENSION):
+            try:
+                job_files.append((entry.stat().st_mtime, entry.name, entry.path))
+            except FileNotFoundError:
+                # the job was claimed by another worker in the meantime
+                continue
+    for _, job_name, path_job in sorted(job_files):
+        path_running_job = os.path.join(running_folder, job_name)
+        try:
+            os.replace(path_job, path_running_job)
+        except FileNotFoundError:
+            continue
+        return path_running_job
+    return None
+
+
+def serve_queue_folder(
+    queue_folder, poll_interval=DEFAULT_WORKER_POLL_INTERVAL, exit_when_empty=False
+):
+    r"""Runs the jobs provided as json files in the queue folder
+
+    Parameters
+    ----------
+    queue_folder: str
+        Path to the queue folder, the job files are json files directly within this folder
+
+    poll_interval: int or float
+        Time in seconds between two checks of the queue folder when it is empty
+        Default: DEFAULT_WORKER_POLL_INTERVAL
+
+    exit_when_empty: bool
+        If True the function returns once the queue folder is empty
+        Default: False
+
+    Returns
+    -------
+    Number of jobs run
+
+    Notes
+    -----
+    This function is tested with:
+    - test_worker.TestServeQueueFolder
+    """
+    running_folder = os.path.join(queue_folder, WORKER_RUNNING_FOLDER)
+    results_folder = os.path.join(queue_folder, WORKER_RESULTS_FOLDER)
+    os.makedirs(running_folder, exist_ok=True)
+    os.makedirs(results_folder, exist_ok=True)
+
+    n_jobs = 0
+    while True:
+        path_running_job = claim_next_job(queue_folder)
+        if path_running_job is None:
+            if exit_when_empty is True:
+                return n_jobs
+            time.sleep(poll_interval)
+            continue
+
+        job_name = os.path.basename(path_running_job)
+        try:
+            with open(path_running_job, "r") as json_file:
+                job = json.load(json_file)
+        except (OSError, json.JSONDecodeError) as e:
+            answer = {
+                JOB_STATUS: JOB_FAILED,
+                JOB_ERROR: f"The job can not be read: {e}",
+            }
+        else:
+            answer = run_job(job)
+        # the job file name is used as id if the job does not provide one
+        if answer.get(JOB_ID) is None:
+            answer[JOB_ID] = os.path.splitext(job_name)[0]
+
+        # the result file only appears once it is complete
+        path_result = os.path.join(results_folder, job_name)
+        with open(path_result + ".tmp", "w") as json_file:
+            json.dump(answer, json_file)
+        os.replace(path_result + ".tmp", path_result)
+        os.remove(path_running_job)
+        n_jobs += 1
+        logging.info(
+            f"The result of the job {answer[JOB_ID]} was saved under {path_result}"
+        )
+
+
+def main(**kwargs):
+    r"""Starts the MVS worker
+
+    Other Parameters
+    ----------------
+    queue_folder: str, optional
+        Path to a folder where the jobs are provided as json files, if None the jobs are read
+        as json lines from the standard input (command line "-q").
+        Default: None.
+    poll_interval: int or float, optional
+        Time in seconds between two checks of the queue folder for new jobs (command line
+        "-poll").
+        Default: DEFAULT_WORKER_POLL_INTERVAL.
+    exit_when_empty: bool, optional
+        Stop the worker once the queue folder is empty (command line "-exit").
+        Default: False.
+    display_output: str, optional
+        Level of the displayed logging messages, "debug", "info", "warning" or "error"
+        (command line "-log").
+        Default: "info".
+
+    Returns
+    -------
+    Number of jobs run
+    """
+    # Parse the arguments from the command line
+    parser = A0.worker_arg_parser()
+    args = vars(parser.parse_args())
+    # Give priority from user input kwargs over command line arguments
+    args.update(kwargs)
+
+    setup_worker_logging(args.get(DISPLAY_OUTPUT, "info"))
+
+    if args.get(ARG_QUEUE_FOLDER) is None:
+        logging.info("The MVS worker reads the jobs from the standard input")
+        return serve_json_lines()
+    else:
+        logging.info(
+            f"The MVS worker reads the jobs from the folder {args[ARG_QUEUE_FOLDER]}"
+        )
+        return serve_queue_folder(
+            args[ARG_QUEUE_FOLDER],
+            poll_interval=args.get(ARG_POLL_INTERVAL, DEFAULT_WORKER_POLL_INTERVAL),
+            exit_when_empty=args.get(ARG_EXIT_WHEN_EMPTY, False),
+        )
+
+
+if __name__ == "__main__":
+    main()
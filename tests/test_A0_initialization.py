@@ -326,6 +326,58 @@ class TestCommandLineInput:
             parsed = self.parser.parse_args(["-log", "something"])
         assert str(argparse_error.value) == "2"
 
+    def test_solver_options_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.solver is None
+        assert parsed.threads is None
+        assert parsed.mip_gap is None
+        assert parsed.time_limit is None
+
+    def test_solver_options_assignation(self):
+        parsed = self.parser.parse_args(
+            ["-solver", "highs", "-threads", "4", "-mipgap", "0.01", "-timelimit", "60"]
+        )
+        assert parsed.solver == "highs"
+        assert parsed.threads == 4
+        assert parsed.mip_gap == 0.01
+        assert parsed.time_limit == 60
+
+    def test_profiling_trace_false_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.profiling_trace is False
+
+    def test_profiling_trace_activation(self):
+        parsed = self.parser.parse_args(["-trace"])
+        assert parsed.profiling_trace is True
+
+    def test_timeseries_output_format_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.timeseries_output_format is None
+
+    def test_timeseries_output_format_assignation(self):
+        parsed = self.parser.parse_args(["-tsformat", "csv", "hdf5"])
+        assert parsed.timeseries_output_format == ["csv", "hdf5"]
+
+    def test_timeseries_output_format_not_accepting_other_choices(self):
+        with pytest.raises(SystemExit) as argparse_error:
+            parsed = self.parser.parse_args(["-tsformat", "xls"])
+        assert str(argparse_error.value) == "2"
+
+    def test_png_options_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.png_scale == 5
+        assert parsed.png_max_points is None
+
+    def test_png_options_assignation(self):
+        parsed = self.parser.parse_args(["-pngscale", "2", "-pngmaxpoints", "2000"])
+        assert parsed.png_scale == 2
+        assert parsed.png_max_points == 2000
+
+    def test_solver_not_accepting_other_choices(self):
+        with pytest.raises(SystemExit) as argparse_error:
+            parsed = self.parser.parse_args(["-solver", "something"])
+        assert str(argparse_error.value) == "2"
+
     # this ensure that the test is only ran if explicitly executed,
     # ie not when the `pytest` command alone it called
     @pytest.mark.skipif(
@@ -1,5 +1,7 @@
 import os
 import logging
+import shutil
+import mock
 import pytest
 import pandas as pd
 import numpy as np
@@ -22,6 +24,7 @@ from multi_vector_simulator.utils.constants import (
     HEADER,
     INPUT_FOLDER,
     CSV_ELEMENTS,
+    JSON_FILE_EXTENSION,
 )
 
 from multi_vector_simulator.utils.constants_json_strings import (
@@ -117,6 +120,91 @@ def test_create_input_json_already_existing_json_file_raises_FileExistsError():
         A1.create_input_json(input_directory=CSV_PATH)
 
 
+def test_create_input_json_reuses_cached_json_file(tmpdir):
+    input_directory = os.path.join(str(tmpdir), CSV_ELEMENTS)
+    shutil.copytree(CSV_PATH, input_directory)
+    cache_folder = os.path.join(str(tmpdir), "cache")
+    json_file = A1.create_input_json(input_directory, cache_folder=cache_folder)
+    with open(json_file) as fp:
+        json_content = fp.read()
+    os.remove(json_file)
+
+    with mock.patch.object(A1, "create_json_from_csv") as m_create:
+        assert A1.create_input_json(input_directory, cache_folder=cache_folder) == (
+            json_file
+        )
+        # an existing json file which is up to date does not raise a FileExistsError
+        A1.create_input_json(input_directory, cache_folder=cache_folder)
+    m_create.assert_not_called()
+    with open(json_file) as fp:
+        assert fp.read() == json_content
+    os.remove(json_file)
+
+    # the csv files are read again once one of them is modified
+    path_csv = os.path.join(input_directory, os.listdir(CSV_PATH)[0])
+    os.utime(path_csv, ns=(0, 0))
+    A1.create_input_json(input_directory, cache_folder=cache_folder)
+    cache_key = A1.get_csv_folder_key(input_directory)
+    assert sorted(os.listdir(cache_folder)) == sorted(
+        [
+            cache_key + JSON_FILE_EXTENSION,
+            os.path.basename(A1.get_cached_messages_filename(cache_folder, cache_key)),
+        ]
+    )
+
+
+def test_create_input_json_logs_cached_messages_again(tmpdir, caplog):
+    input_directory = os.path.join(str(tmpdir), CSV_ELEMENTS)
+    shutil.copytree(CSV_PATH, input_directory)
+    cache_folder = os.path.join(str(tmpdir), "cache")
+    with caplog.at_level(logging.WARNING):
+        json_file = A1.create_input_json(input_directory, cache_folder=cache_folder)
+    messages = [(record.levelname, record.getMessage()) for record in caplog.records]
+    assert len(messages) > 0
+    os.remove(json_file)
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING), mock.patch.object(
+        A1, "create_json_from_csv"
+    ) as m_create:
+        A1.create_input_json(input_directory, cache_folder=cache_folder)
+        # also if the json file of the input folder is reused
+        A1.create_input_json(input_directory, cache_folder=cache_folder)
+    m_create.assert_not_called()
+    assert [
+        (record.levelname, record.getMessage()) for record in caplog.records
+    ] == messages * 2
+
+
+def test_create_input_json_in_threads_same_as_sequential(tmpdir, caplog):
+    json_contents = []
+    for max_workers in (None, 4):
+        input_directory = os.path.join(str(tmpdir), str(max_workers))
+        shutil.copytree(CSV_PATH, input_directory)
+        caplog.clear()
+        with caplog.at_level(logging.WARNING):
+            json_file = A1.create_input_json(
+                input_directory, use_cache=False, max_workers=max_workers
+            )
+        with open(json_file) as fp:
+            json_contents.append(
+                (
+                    fp.read(),
+                    sorted(
+                        record.getMessage().replace(input_directory, "")
+                        for record in caplog.records
+                    ),
+                )
+            )
+    assert json_contents[0] == json_contents[1]
+
+
+def test_create_input_json_without_cache_not_reading_cache(tmpdir):
+    cache_folder = os.path.join(str(tmpdir), "cache")
+    A1.create_input_json(CSV_PATH, use_cache=False, cache_folder=cache_folder)
+    assert os.path.exists(cache_folder) is False
+
+
 def test_create_input_json_raises_FileNotFoundError_if_missing_required_csv_files():
     with pytest.raises(FileNotFoundError):
         A1.create_input_json(input_directory=DUMMY_CSV_PATH)
@@ -170,6 +258,22 @@ def test_create_json_from_csv_with_unknown_separator_for_csv_raises_CsvParsingEr
         )
 
 
+def test_sniff_csv_separators_most_frequent_first(tmpdir):
+    path_csv = os.path.join(str(tmpdir), "mixed.csv")
+    with open(path_csv, "w") as fp:
+        fp.write(";unit;pv, roof;wind\nparam1;str;a;b\n")
+    assert A1.sniff_csv_separators(path_csv) == [";", ","]
+    assert A1.sniff_csv_separators(
+        os.path.join(DUMMY_CSV_PATH, "csv_ampersand.csv")
+    ) == ["&"]
+    assert (
+        A1.sniff_csv_separators(
+            os.path.join(DUMMY_CSV_PATH, "csv_unknown_separator.csv")
+        )
+        == []
+    )
+
+
 def test_create_json_from_csv_without_providing_parameters_raises_MissingParameterError():
 
     with pytest.raises(MissingParameterError):
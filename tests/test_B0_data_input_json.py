@@ -1,7 +1,9 @@
+import json
 import os
 import shutil
 
 import mock
+import numpy as np
 import pandas as pd
 
 import multi_vector_simulator.A0_initialization as A0
@@ -233,3 +235,41 @@ class TestConversionJsonToPythonTypes:
             in log_msg[2]
         )
         assert (pd_series["series"].values == self.test_result_series.values).all()
+
+    def test_convert_list_to_series_numeric_values_same_as_pandas(self):
+        values = [d + 0.5 for d in range(self.n_days)]
+        pd.testing.assert_series_equal(
+            B0.convert_list_to_series(values, index=self.ti),
+            pd.Series(values, index=self.ti),
+        )
+
+    def test_convert_list_to_series_non_numeric_values_same_as_pandas(self):
+        values = [1, None, 3.5, None]
+        pd.testing.assert_series_equal(
+            B0.convert_list_to_series(values), pd.Series(values)
+        )
+
+    def test_convert_split_dict_to_dataframe_same_as_read_json(self):
+        df = pd.DataFrame(
+            {"a": [0.5, 1.5, 2.5, 3.5], "b": [1, 2, 3, 4]},
+            index=self.ti,
+        )
+        a_dict = json.loads(df.to_json(orient="split"))
+        pd.testing.assert_frame_equal(
+            B0.convert_split_dict_to_dataframe(a_dict),
+            pd.read_json(json.dumps(a_dict), orient="split"),
+        )
+
+    def test_convert_to_json_types_same_as_json_round_trip(self):
+        a_dict = {
+            "series": self.test_result_series,
+            "timestamp": self.start_date,
+            "index": self.ti,
+            "array": np.array([1.5, 2.5]),
+            "frame": pd.DataFrame({"a": [0.5, 1.5]}),
+            "numbers": (np.int64(1), np.float64(0.5), True, None),
+            1: {2.5: "a", None: "b", False: "c"},
+        }
+        assert B0.convert_from_special_types_to_json_types(a_dict) == json.loads(
+            json.dumps(a_dict, default=B0.convert_from_special_types_to_json)
+        )
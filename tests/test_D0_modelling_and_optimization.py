@@ -1,12 +1,24 @@
 import os
 import shutil
+import sys
 import argparse
+import warnings
 
 
 from oemof import solph
 import pandas as pd
 import pytest
 import mock
+from pyomo.repn import generate_standard_repn
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+
+try:
+    from pyomo.contrib.solver.common.factory import (
+        SolverFactory as DirectSolverFactory,
+    )
+except ImportError:
+    # older versions of pyomo do not provide the solver interfaces used for HiGHS
+    DirectSolverFactory = None
 
 from multi_vector_simulator.cli import main
 import multi_vector_simulator.D0_modelling_and_optimization as D0
@@ -15,7 +27,14 @@ from multi_vector_simulator.B0_data_input_json import (
     convert_from_json_to_special_types,
 )
 
-from multi_vector_simulator.utils.constants import LP_FILE
+from multi_vector_simulator.utils.constants import (
+    LP_FILE,
+    WARM_START_STRUCTURE,
+    WARM_START_VALUES,
+    WARM_START_BASIS,
+    WARM_STARTED,
+    SOLVE_TIME,
+)
 
 from multi_vector_simulator.utils.constants_json_strings import (
     ENERGY_BUSSES,
@@ -37,12 +56,25 @@ from multi_vector_simulator.utils.constants_json_strings import (
     MODELLING_TIME,
     ASSET_DICT,
     ENERGY_VECTOR,
+    ENERGY_PRODUCTION,
+    DISPATCH_PRICE,
+    SIMULATION_ANNUITY,
+    TIMESTEP_WEIGHTS,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_MIP_GAP,
+    SOLVER_TIME_LIMIT,
+    SOLVER_STATUS,
+    SOLVER_TERMINATION_CONDITION,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
 )
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
+    UnknownSolverError,
 )
 
 
@@ -266,3 +298,297 @@ def test_if_simulation_results_added_to_dict_values(dict_values):
     D0.run_oemof(dict_values)
     for k in (LABEL, OBJECTIVE_VALUE, SIMULTATION_TIME):
         assert k in dict_values[SIMULATION_RESULTS].keys()
+
+
+def test_create_oemof_model_weighted_objective(dict_values):
+    model, dict_model = D0.model_building.initialize(dict_values)
+    model = D0.model_building.adding_assets_to_energysystem_model(
+        dict_values, dict_model, model
+    )
+    objective = generate_standard_repn(
+        D0.model_building.create_oemof_model(dict_values, model).objective.expr
+    )
+    coefficients = {
+        variable.name: coefficient
+        for variable, coefficient in zip(objective.linear_vars, objective.linear_coefs)
+    }
+
+    timestep_weights = [2] * len(model.timeindex)
+    dict_values[SIMULATION_SETTINGS][TIMESTEP_WEIGHTS] = timestep_weights
+    local_energy_system = D0.model_building.create_oemof_model(dict_values, model)
+    weighted_objective = generate_standard_repn(local_energy_system.objective.expr)
+    for variable, coefficient in zip(
+        weighted_objective.linear_vars, weighted_objective.linear_coefs
+    ):
+        if "flow" in variable.name:
+            assert coefficient == pytest.approx(
+                2 * coefficients[variable.name]
+            ), f"The costs of the flow {variable.name} should be weighted by the timestep weights."
+        else:
+            assert coefficient == pytest.approx(
+                coefficients[variable.name]
+            ), f"The investment costs ({variable.name}) should not be weighted by the timestep weights."
+
+
+class TestUpdateCostParameters:
+    def build_model(self, dict_values):
+        model, dict_model = D0.model_building.initialize(dict_values)
+        model = D0.model_building.adding_assets_to_energysystem_model(
+            dict_values, dict_model, model
+        )
+        return model
+
+    def test_cost_parameters_transferred_to_existing_model(self, dict_values):
+        local_energy_system = solph.Model(self.build_model(dict_values))
+        new_price = 0.1
+        dict_values[ENERGY_PRODUCTION]["DSO_consumption"][DISPATCH_PRICE][
+            VALUE
+        ] = new_price
+        dict_values[ENERGY_PRODUCTION]["pv_plant_01"][SIMULATION_ANNUITY][VALUE] = 0
+        model = self.build_model(dict_values)
+        assert (
+            D0.model_building.update_cost_parameters(local_energy_system, model) is True
+        ), f"The cost parameters of two models with the same components should be transferable."
+        for (i, o), flow in local_energy_system.flows.items():
+            if i.label == "DSO_consumption":
+                assert flow.variable_costs[0] == new_price
+            if i.label == "pv_plant_01":
+                assert flow.investment.ep_costs[0] == 0
+
+    def test_cost_parameters_not_transferred_if_components_differ(
+        self, dict_values, dict_values_minimal
+    ):
+        local_energy_system = solph.Model(self.build_model(dict_values))
+        objective = local_energy_system.objective
+        model = self.build_model(dict_values_minimal)
+        assert (
+            D0.model_building.update_cost_parameters(local_energy_system, model)
+            is False
+        ), f"The cost parameters of two models with different components should not be transferable."
+        assert local_energy_system.objective is objective
+
+
+class TestSolverSettings:
+    def test_default_solver_settings(self, dict_values_minimal):
+        assert D0.model_building.get_solver_settings(dict_values_minimal) == (
+            "cbc",
+            {"ratioGap": 0.03},
+        )
+
+    def test_solver_options_translated_to_solver_option_names(
+        self, dict_values_minimal
+    ):
+        dict_values_minimal[SIMULATION_SETTINGS].update(
+            {
+                SOLVER: {VALUE: "highs"},
+                SOLVER_THREADS: {VALUE: 2},
+                SOLVER_MIP_GAP: {VALUE: 0.01},
+                SOLVER_TIME_LIMIT: {VALUE: 60},
+            }
+        )
+        assert D0.model_building.get_solver_settings(dict_values_minimal) == (
+            "highs",
+            {"threads": 2, "rel_gap": 0.01, "time_limit": 60},
+        )
+
+    def test_solver_option_not_supported_by_solver_ignored(self, dict_values_minimal):
+        dict_values_minimal[SIMULATION_SETTINGS].update(
+            {SOLVER: {VALUE: "glpk"}, SOLVER_THREADS: {VALUE: 2}}
+        )
+        assert D0.model_building.get_solver_settings(dict_values_minimal) == (
+            "glpk",
+            {"mipgap": 0.03},
+        )
+
+    def test_unknown_solver_raises_error(self, dict_values_minimal):
+        dict_values_minimal[SIMULATION_SETTINGS].update({SOLVER: {VALUE: "solver"}})
+        with pytest.raises(UnknownSolverError):
+            D0.model_building.get_solver_settings(dict_values_minimal)
+
+
+class TestCheckSolverResults:
+    def solver_results(self, status, termination_condition):
+        solver_results = SolverResults()
+        solver_results.solver.status = status
+        solver_results.solver.termination_condition = termination_condition
+        return solver_results
+
+    def test_optimal_solution_passes(self):
+        D0.model_building.check_solver_results(
+            self.solver_results(SolverStatus.ok, TerminationCondition.optimal)
+        )
+
+    def test_infeasible_problem_raises_MVSOemofError(self):
+        with pytest.raises(MVSOemofError, match="There are several reasons"):
+            D0.model_building.check_solver_results(
+                self.solver_results(
+                    SolverStatus.warning, TerminationCondition.infeasible
+                )
+            )
+
+    def test_other_termination_condition_raises_MVSOemofError(self):
+        with pytest.raises(MVSOemofError, match="termination condition maxTimeLimit"):
+            D0.model_building.check_solver_results(
+                self.solver_results(
+                    SolverStatus.aborted, TerminationCondition.maxTimeLimit
+                )
+            )
+
+
+@pytest.mark.skipif(
+    DirectSolverFactory is None or not DirectSolverFactory("highs").available(),
+    reason="The solver HiGHS is not installed (pip install highspy)",
+)
+class TestSolveDirectly:
+    def energy_system(self, demand):
+        model = solph.EnergySystem(
+            timeindex=pd.date_range("2020-01-01", periods=3, freq="H"),
+            infer_last_interval=True,
+        )
+        bus = solph.Bus(label="bus")
+        source = solph.components.Source(
+            label="source", outputs={bus: solph.Flow(variable_costs=2, nominal_value=2)}
+        )
+        sink = solph.components.Sink(
+            label="sink", inputs={bus: solph.Flow(nominal_value=1, fix=demand)}
+        )
+        model.add(bus, source, sink)
+        return solph.Model(model)
+
+    def test_solve_directly_stores_results(self):
+        local_energy_system = self.energy_system([1, 2, 1])
+        solver_results = D0.model_building.solve_directly(
+            local_energy_system, "highs", {"tee": False}, {"threads": 1}
+        )
+        assert local_energy_system.es.results is solver_results
+        assert local_energy_system.objective() == 8
+        assert solver_results["Solver"][0]["Time"] >= 0
+
+    def test_solve_directly_warning_if_infeasible(self):
+        local_energy_system = self.energy_system([1, 3, 1])
+        with pytest.warns(UserWarning, match="termination condition infeasible"):
+            D0.model_building.solve_directly(
+                local_energy_system, "highs", {"tee": False}, {}
+            )
+
+    def test_simulating_infeasible_keeps_warnings_filters(self):
+        local_energy_system = self.energy_system([1, 3, 1])
+        warnings_filters = list(warnings.filters)
+        with pytest.raises(MVSOemofError, match="termination condition infeasible"):
+            D0.model_building.simulating(
+                {SIMULATION_SETTINGS: {SOLVER: {VALUE: "highs"}}},
+                local_energy_system.es,
+                local_energy_system,
+            )
+        assert warnings.filters == warnings_filters
+
+    def test_simulating_with_highs_stores_solver_statistics(self, dict_values):
+        dict_values[SIMULATION_SETTINGS][SOLVER] = {VALUE: "highs"}
+        D0.run_oemof(dict_values)
+        simulation_results = dict_values[SIMULATION_RESULTS]
+        assert simulation_results[SOLVER] == "highs"
+        assert simulation_results[SOLVER_STATUS] == "ok"
+        assert simulation_results[SOLVER_TERMINATION_CONDITION] == "optimal"
+        for k in (SIMULTATION_TIME, NUMBER_OF_VARIABLES, NUMBER_OF_CONSTRAINTS):
+            assert simulation_results[k] >= 0
+
+
+def test_solve_directly_without_pyomo_solver_interfaces():
+    # older versions of pyomo do not provide pyomo.contrib.solver.common
+    with mock.patch.dict(
+        sys.modules, {"pyomo.contrib.solver.common.factory": None}
+    ), pytest.raises(ImportError, match="please upgrade pyomo"):
+        D0.model_building.solve_directly(None, "highs", {}, {})
+
+
+class TestWarmStart:
+    def energy_system(self, demand, with_backup=False):
+        model = solph.EnergySystem(
+            timeindex=pd.date_range("2020-01-01", periods=3, freq="H"),
+            infer_last_interval=True,
+        )
+        bus = solph.Bus(label="bus")
+        cheap_source = solph.components.Source(
+            label="cheap_source",
+            outputs={bus: solph.Flow(variable_costs=1, nominal_value=1)},
+        )
+        source = solph.components.Source(
+            label="source", outputs={bus: solph.Flow(variable_costs=2, nominal_value=2)}
+        )
+        sink = solph.components.Sink(
+            label="sink", inputs={bus: solph.Flow(nominal_value=1, fix=demand)}
+        )
+        model.add(bus, cheap_source, source, sink)
+        if with_backup is True:
+            model.add(
+                solph.components.Source(
+                    label="backup",
+                    outputs={bus: solph.Flow(variable_costs=5, nominal_value=1)},
+                )
+            )
+        return solph.Model(model)
+
+    def test_structure_of_models_differing_by_parameters_equal(self):
+        structure = D0.model_building.get_model_structure(self.energy_system([1, 2, 1]))
+        assert structure == D0.model_building.get_model_structure(
+            self.energy_system([2, 2, 2])
+        )
+        assert structure != D0.model_building.get_model_structure(
+            self.energy_system([1, 2, 1], with_backup=True)
+        )
+
+    def test_variable_values_transferred_to_other_model(self):
+        local_energy_system = self.energy_system([1, 2, 1])
+        D0.model_building.solve_directly(
+            local_energy_system, "highs", {"tee": False}, {}
+        )
+        variable_values = D0.model_building.get_variable_values(local_energy_system)
+        other_energy_system = self.energy_system([2, 2, 2])
+        assert D0.model_building.set_variable_values(
+            other_energy_system, variable_values
+        ) == len([value for value in variable_values if value is not None])
+        assert D0.model_building.get_variable_values(other_energy_system) == (
+            variable_values
+        )
+
+    def test_highs_started_from_basis_of_previous_solve(self):
+        solution_store = {}
+        D0.model_building.solve_directly(
+            self.energy_system([1, 2, 1]), "highs", {"tee": False}, {}, solution_store
+        )
+        assert solution_store[WARM_STARTED] is False
+        assert solution_store[WARM_START_BASIS] is not None
+        assert solution_store[WARM_START_STRUCTURE] is not None
+        assert solution_store[SOLVE_TIME] >= 0
+
+        local_energy_system = self.energy_system([1, 1.5, 1])
+        D0.model_building.solve_directly(
+            local_energy_system, "highs", {"tee": False}, {}, solution_store
+        )
+        assert solution_store[WARM_STARTED] is True
+        assert local_energy_system.objective() == pytest.approx(4)
+
+    def test_highs_not_warm_started_if_components_differ(self):
+        solution_store = {}
+        D0.model_building.solve_directly(
+            self.energy_system([1, 2, 1]), "highs", {"tee": False}, {}, solution_store
+        )
+        local_energy_system = self.energy_system([1, 2, 1], with_backup=True)
+        D0.model_building.solve_directly(
+            local_energy_system, "highs", {"tee": False}, {}, solution_store
+        )
+        assert solution_store[WARM_STARTED] is False
+        assert local_energy_system.objective() == pytest.approx(5)
+
+    def test_solution_store_filled_by_run_oemof(self, dict_values):
+        dict_values[SIMULATION_SETTINGS][SOLVER] = {VALUE: "highs"}
+        solution_store = {}
+        D0.run_oemof(dict_values, solution_store=solution_store)
+        objective_value = dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        D0.run_oemof(dict_values, solution_store=solution_store)
+        assert solution_store[WARM_STARTED] is True
+        assert dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+            objective_value
+        )
+        # the values of the variables are only stored for the solvers called through files
+        assert WARM_START_VALUES not in solution_store
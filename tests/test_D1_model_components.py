@@ -3,9 +3,10 @@ import os
 
 from oemof import solph
 from oemof import network
+import numpy as np
 import pandas as pd
 import pytest
-from pandas.testing import assert_series_equal
+from numpy.testing import assert_array_equal
 
 # internal imports
 import multi_vector_simulator.D1_model_components as D1
@@ -42,6 +43,9 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SIMULATION_ANNUITY,
     MAXIMUM_CAP,
     MAXIMUM_ADD_CAP,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    ASSET_TABLE,
 )
 from _constants import TEST_REPO_PATH, TEST_INPUT_DIRECTORY
 
@@ -623,7 +627,7 @@ class TestSinkComponent:
         for i, inflow_direction in enumerate(inflow_direction_s):
             input_bus = self.model._nodes[-1].inputs[self.busses[inflow_direction]]
             if dispatchable is False:
-                assert_series_equal(input_bus.fix, dict_asset[TIMESERIES])
+                assert_array_equal(input_bus.fix, dict_asset[TIMESERIES])
                 assert (
                     input_bus.variable_costs.default == 0
                 )  # this only is a real check if dispatch_price is not 0
@@ -737,14 +741,14 @@ class TestSourceComponent:
             assert output_bus.investment is None
             if dispatchable is False:
                 assert output_bus.nominal_value == dict_asset[INSTALLED_CAP][VALUE]
-                assert_series_equal(output_bus.fix, dict_asset[TIMESERIES])
+                assert_array_equal(output_bus.fix, dict_asset[TIMESERIES])
                 assert output_bus.max == []
             elif dispatchable is True:
                 assert output_bus.nominal_value == dict_asset[INSTALLED_CAP][VALUE]
         elif mode == "optimize":
             assert output_bus.nominal_value is None
             if dispatchable is False:
-                assert_series_equal(output_bus.fix, dict_asset[TIMESERIES_NORMALIZED])
+                assert_array_equal(output_bus.fix, dict_asset[TIMESERIES_NORMALIZED])
                 assert output_bus.max == []
             if timeseries == "normalized":
                 # TODO this might be a change in oemof 0.5.1 as the investment is automatically not set on the bus?
@@ -759,7 +763,7 @@ class TestSourceComponent:
                     / dict_asset[TIMESERIES_PEAK][VALUE]
                 )
                 if dispatchable is True:
-                    assert_series_equal(
+                    assert_array_equal(
                         output_bus.max, dict_asset[TIMESERIES_NORMALIZED]
                     )
             elif timeseries == "not_normalized":
@@ -1149,6 +1153,66 @@ class TestStorageComponent:
         ), f"investment.minimum should be one with non-zero {THERM_LOSSES_ABS}"
 
 
+class TestAssetTable:
+    @pytest.fixture(autouse=True)
+    def setup_class(self, get_json, get_model, get_busses):
+        """Sets up class attributes for the tests."""
+        self.dict_values = get_json
+        self.model = get_model
+        self.busses = get_busses
+        self.sources = {}
+        self.time_series = pd.Series(data=[10.0, 11.0, 12.0])
+        self.dict_values[SIMULATION_SETTINGS][TIME_INDEX] = pd.date_range(
+            "2018-01-01", periods=3, freq="H"
+        )
+        for asset in self.dict_values[ENERGY_PRODUCTION].values():
+            asset[TIMESERIES] = self.time_series
+
+    def test_build_asset_table_timeseries_converted_to_arrays(self):
+        asset_table = D1.build_asset_table(self.dict_values)
+        record = asset_table["Non-dispatchable source fix"]
+        assert isinstance(record, D1.AssetRecord)
+        assert isinstance(record.timeseries, np.ndarray)
+        assert_array_equal(record.timeseries, self.time_series)
+        assert record.timeseries_normalized is None
+        assert record.dispatch_price == 0
+
+    def test_build_asset_table_multiple_busses_parameters_remain_lists(self):
+        asset_table = D1.build_asset_table(self.dict_values)
+        assert asset_table["Dispatchable multiple"].dispatch_price == [0.8, 0.8]
+
+    def test_build_asset_table_storage_input_output_power_records(self):
+        storage = self.dict_values[ENERGY_STORAGE]["storage_fix"]
+        storage[INPUT_POWER][DISPATCH_PRICE][VALUE] = self.time_series
+        record = D1.build_asset_table(self.dict_values)["Storage fix"]
+        assert_array_equal(record.input_power.dispatch_price, self.time_series)
+        assert (
+            record.output_power.efficiency == storage[OUTPUT_POWER][EFFICIENCY][VALUE]
+        )
+
+    def test_build_asset_table_timeseries_of_wrong_length_raises_error(self):
+        self.dict_values[ENERGY_PRODUCTION]["non_dispatchable_source_fix"][
+            TIMESERIES
+        ] = pd.Series([1.0, 2.0])
+        with pytest.raises(WrongParameterFormatError):
+            D1.build_asset_table(self.dict_values)
+
+    def test_source_flow_uses_record_of_asset_table(self):
+        dict_asset = self.dict_values[ENERGY_PRODUCTION]["non_dispatchable_source_fix"]
+        asset_table = D1.build_asset_table(self.dict_values)
+        D1.source(
+            model=self.model,
+            dict_asset=dict_asset,
+            source=self.sources,
+            bus=self.busses,
+            **{ASSET_TABLE: asset_table},
+        )
+        output_bus = self.model._nodes[-1].outputs[
+            self.busses[dict_asset[OUTFLOW_DIRECTION]]
+        ]
+        assert output_bus.fix is asset_table[dict_asset[LABEL]].timeseries
+
+
 ### other functionalities
 
 
@@ -41,6 +41,7 @@ from multi_vector_simulator.utils.constants_json_strings import (
     NET_ZERO_ENERGY,
     EVALUATED_PERIOD,
     SIMULATION_SETTINGS,
+    TIMESTEP_WEIGHTS,
 )
 
 from multi_vector_simulator.utils.constants import OUTPUT_FOLDER
@@ -326,6 +327,62 @@ def test_prepare_energy_provider_feedin_sinks():
         ), f"The expected value (exp[key]) of {key} for {DSO_sink_name} is not met, but is of value {energy_provider_feedin_sinks[DSO_sink_name][key]}."
 
 
+def test_flow_sum_weighted_with_timestep_weights():
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H"),
+        infer_last_interval=True,
+    )
+    bus = solph.Bus(label="bus")
+    source = solph.components.Source(label="source", outputs={bus: solph.Flow()})
+    energy_system.add(bus, source)
+    model = solph.Model(energy_system)
+    timestep_weights = [1, 5, 2]
+
+    assert str(D2.flow_sum(model, {}, source, bus)) == str(
+        sum(model.flow[source, bus, :, :])
+    ), f"Without timestep weights the flow should be summed over all timesteps."
+    weighted_sum = D2.flow_sum(
+        model, {SIMULATION_SETTINGS: {TIMESTEP_WEIGHTS: timestep_weights}}, source, bus
+    )
+    for t, weight in enumerate(timestep_weights):
+        model.flow[source, bus, 0, t].value = 1
+    assert weighted_sum() == sum(
+        timestep_weights
+    ), f"The flow of each timestep should be weighted by its timestep weight."
+
+
+def test_constraint_maximum_emissions_weighted_with_timestep_weights():
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H"),
+        infer_last_interval=True,
+    )
+    bus = solph.Bus(label="bus")
+    flow = solph.Flow(custom_attributes=dict(emission_factor=[0.5, 0.5, 1]))
+    source = solph.components.Source(label="source", outputs={bus: flow})
+    energy_system.add(bus, source)
+    model = solph.Model(energy_system)
+    timestep_weights = [1, 5, 2]
+
+    model = D2.constraint_maximum_emissions(
+        model,
+        {
+            CONSTRAINTS: {MAXIMUM_EMISSIONS: {VALUE: 10}},
+            SIMULATION_SETTINGS: {TIMESTEP_WEIGHTS: timestep_weights},
+        },
+    )
+    assert flow.emission_factor == [
+        0.5,
+        0.5,
+        1,
+    ], f"The emission factor of the flow should not be changed by the constraint."
+    for t in range(len(timestep_weights)):
+        model.flow[source, bus, 0, t].value = 1
+    assert (
+        model.integral_limit_emission_factor() == 0.5 * 1 + 0.5 * 5 + 1 * 2
+    ), f"The emissions of each timestep should be weighted by its timestep weight."
+    assert model.integral_limit_emission_factor_constraint.upper.value == 10
+
+
 class TestConstraints:
     def setup_class(self):
         """Run the simulation up to constraints adding in D2 and define class attributes."""
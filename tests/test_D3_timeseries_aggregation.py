@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.D3_timeseries_aggregation as D3
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    TIMESTEP,
+    PERIODS,
+    TIMESERIES,
+    ENERGY_CONSUMPTION,
+    DISPATCH_PRICE,
+    LABEL,
+    TYPICAL_PERIODS,
+    TYPICAL_PERIOD_LENGTH,
+    TIMESTEP_WEIGHTS,
+    PERIOD_ORDER,
+)
+
+N_DAYS = 10
+TIME_INDEX_DAYS = pd.date_range("2020-01-01", periods=N_DAYS * 24, freq="H")
+# two kinds of days: a low demand day and a high demand day
+LOW_DAY = np.sin(np.linspace(0, np.pi, 24))
+HIGH_DAY = 3 * LOW_DAY
+DAYS = [LOW_DAY, HIGH_DAY, LOW_DAY, LOW_DAY, HIGH_DAY, LOW_DAY, LOW_DAY, LOW_DAY]
+DAYS += [HIGH_DAY * 1.01, LOW_DAY * 0.99]
+DEMAND = pd.Series(np.concatenate(DAYS), index=TIME_INDEX_DAYS)
+
+
+def simulation_settings(typical_periods=None, typical_period_length=None):
+    settings = {TIME_INDEX: TIME_INDEX_DAYS, TIMESTEP: {VALUE: 60}}
+    if typical_periods is not None:
+        settings[TYPICAL_PERIODS] = {VALUE: typical_periods}
+    if typical_period_length is not None:
+        settings[TYPICAL_PERIOD_LENGTH] = {VALUE: typical_period_length}
+    return settings
+
+
+class TestTypicalPeriodsSettings:
+    def test_no_typical_periods_requested(self):
+        assert D3.get_typical_periods_settings(simulation_settings()) is None
+
+    def test_typical_periods_default_length_one_day(self):
+        assert D3.get_typical_periods_settings(simulation_settings(2)) == (2, 24)
+
+    def test_typical_periods_length_in_timesteps(self):
+        settings = simulation_settings(2, 48)
+        settings[TIMESTEP][VALUE] = 15
+        settings[TIME_INDEX] = pd.date_range(
+            "2020-01-01", periods=N_DAYS * 96, freq="15min"
+        )
+        assert D3.get_typical_periods_settings(settings) == (2, 192)
+
+    def test_typical_periods_covering_simulation_period_not_aggregated(self):
+        assert D3.get_typical_periods_settings(simulation_settings(N_DAYS)) is None
+
+    def test_typical_period_length_not_multiple_of_timestep_raises_error(self):
+        settings = simulation_settings(2, 1.5)
+        with pytest.raises(ValueError):
+            D3.get_typical_periods_settings(settings)
+
+
+class TestClusterPeriods:
+    def test_cluster_periods_distinct_days_are_typical_periods(self):
+        typical_periods, period_order = D3.cluster_periods(DEMAND.values, 2, 24)
+        assert len(typical_periods) == 2
+        assert list(typical_periods) == sorted(typical_periods)
+        assert list(period_order) == [0, 1, 0, 0, 1, 0, 0, 0, 1, 0]
+
+    def test_cluster_periods_incomplete_last_period_assigned(self):
+        typical_periods, period_order = D3.cluster_periods(DEMAND.values[:-12], 2, 24)
+        assert len(period_order) == N_DAYS
+        assert period_order[-1] == 0
+
+    def test_cluster_periods_identical_periods_single_typical_period(self):
+        typical_periods, period_order = D3.cluster_periods(
+            np.tile(LOW_DAY, N_DAYS), 3, 24
+        )
+        assert len(typical_periods) == 1
+        assert list(period_order) == [0] * N_DAYS
+
+
+class TestAggregateTimeseries:
+    def setup_method(self):
+        self.dict_values = {
+            SIMULATION_SETTINGS: simulation_settings(2),
+            ENERGY_CONSUMPTION: {
+                "demand": {
+                    LABEL: "demand",
+                    TIMESERIES: DEMAND,
+                    DISPATCH_PRICE: {VALUE: 0.1},
+                }
+            },
+        }
+
+    def test_aggregate_timeseries_not_requested(self):
+        self.dict_values[SIMULATION_SETTINGS].pop(TYPICAL_PERIODS)
+        assert D3.aggregate_timeseries(self.dict_values) is None
+
+    def test_aggregate_timeseries(self):
+        aggregation = D3.aggregate_timeseries(self.dict_values)
+        assert aggregation[TYPICAL_PERIOD_LENGTH] == 24
+        assert len(aggregation[TYPICAL_PERIODS]) == 2
+        assert len(aggregation[PERIOD_ORDER]) == N_DAYS
+
+    def test_reduce_dict_values_timeseries_of_typical_periods(self):
+        aggregation = D3.aggregate_timeseries(self.dict_values)
+        reduced = D3.reduce_dict_values(self.dict_values, aggregation)
+        demand = reduced[ENERGY_CONSUMPTION]["demand"][TIMESERIES]
+        assert len(demand) == 48
+        assert demand.index.equals(reduced[SIMULATION_SETTINGS][TIME_INDEX])
+        assert reduced[SIMULATION_SETTINGS][PERIODS] == 48
+        for slot, period in enumerate(aggregation[TYPICAL_PERIODS]):
+            assert np.array_equal(
+                demand.values[slot * 24 : (slot + 1) * 24],
+                DEMAND.values[period * 24 : (period + 1) * 24],
+            )
+
+    def test_reduce_dict_values_weights_sum_to_number_of_timesteps(self):
+        aggregation = D3.aggregate_timeseries(self.dict_values)
+        reduced = D3.reduce_dict_values(self.dict_values, aggregation)
+        weights = reduced[SIMULATION_SETTINGS][TIMESTEP_WEIGHTS]
+        assert weights.sum() == len(TIME_INDEX_DAYS)
+        assert list(weights[:24]) == [7] * 24
+        assert list(weights[24:]) == [3] * 24
+
+    def test_reduce_dict_values_does_not_modify_dict_values(self):
+        aggregation = D3.aggregate_timeseries(self.dict_values)
+        reduced = D3.reduce_dict_values(self.dict_values, aggregation)
+        reduced[ENERGY_CONSUMPTION]["demand"][DISPATCH_PRICE][VALUE] = 1
+        assert self.dict_values[ENERGY_CONSUMPTION]["demand"][TIMESERIES] is DEMAND
+        assert TIMESTEP_WEIGHTS not in self.dict_values[SIMULATION_SETTINGS]
+        assert (
+            self.dict_values[ENERGY_CONSUMPTION]["demand"][DISPATCH_PRICE][VALUE] == 0.1
+        )
+
+
+class TestExpandResults:
+    def test_expand_results_to_time_index(self):
+        aggregation = {
+            TYPICAL_PERIODS: [0, 1],
+            PERIOD_ORDER: [0, 1, 1],
+            TYPICAL_PERIOD_LENGTH: 2,
+        }
+        reduced_index = pd.date_range("2020-01-01", periods=5, freq="H")
+        results_main = {
+            ("a", "b"): {
+                "sequences": pd.DataFrame(
+                    {"flow": [1, 2, 3, 4, 5]}, index=reduced_index
+                ),
+                "scalars": pd.Series(dtype=float),
+            }
+        }
+        time_index = pd.date_range("2020-01-01", periods=5, freq="H")
+        expanded = D3.expand_results(results_main, aggregation, time_index)
+        sequences = expanded[("a", "b")]["sequences"]
+        assert list(sequences["flow"]) == [1, 2, 3, 4, 3, 5]
+        assert len(sequences.index) == 6
+        assert sequences.index[:-1].equals(time_index)
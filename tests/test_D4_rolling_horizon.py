@@ -0,0 +1,309 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from pyomo.contrib.solver.common.factory import (
+        SolverFactory as DirectSolverFactory,
+    )
+except ImportError:
+    # older versions of pyomo do not provide the solver interfaces used for HiGHS
+    DirectSolverFactory = None
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D4_rolling_horizon as D4
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    VALUE,
+    LABEL,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    TIMESTEP,
+    PERIODS,
+    TIMESERIES,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    MINIMAL_RENEWABLE_FACTOR,
+    ENERGY_CONSUMPTION,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    STORAGE_CAPACITY,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    OPTIMIZE_CAP,
+    INSTALLED_CAP,
+    SIMULATION_ANNUITY,
+    SOC_INITIAL,
+    DISPATCH_PRICE,
+    SOLVER,
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+    SIMULTATION_TIME,
+    NUMBER_OF_VARIABLES,
+    ROLLING_HORIZON,
+    ROLLING_HORIZON_WINDOW,
+    ROLLING_HORIZON_OVERLAP,
+    ROLLING_HORIZON_WINDOWS,
+)
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    JSON_FNAME,
+)
+
+TIME_INDEX_HOURS = pd.date_range("2020-01-01", periods=48, freq="H")
+
+
+def simulation_settings(window=None, overlap=None):
+    settings = {TIME_INDEX: TIME_INDEX_HOURS, TIMESTEP: {VALUE: 60}}
+    if window is not None:
+        settings[ROLLING_HORIZON_WINDOW] = {VALUE: window}
+    if overlap is not None:
+        settings[ROLLING_HORIZON_OVERLAP] = {VALUE: overlap}
+    return settings
+
+
+class TestRollingHorizonSettings:
+    def test_no_rolling_horizon_requested(self):
+        assert D4.get_rolling_horizon_settings(simulation_settings()) is None
+
+    def test_rolling_horizon_default_overlap(self):
+        assert D4.get_rolling_horizon_settings(simulation_settings(12)) == (12, 0)
+
+    def test_rolling_horizon_lengths_in_timesteps(self):
+        settings = simulation_settings(6, 1.5)
+        settings[TIMESTEP][VALUE] = 15
+        settings[TIME_INDEX] = pd.date_range("2020-01-01", periods=96, freq="15min")
+        assert D4.get_rolling_horizon_settings(settings) == (24, 6)
+
+    def test_window_covering_simulation_period_not_rolled(self):
+        assert D4.get_rolling_horizon_settings(simulation_settings(48)) is None
+
+    def test_window_not_multiple_of_timestep_raises_error(self):
+        with pytest.raises(ValueError):
+            D4.get_rolling_horizon_settings(simulation_settings(1.5))
+
+    def test_overlap_not_shorter_than_window_raises_error(self):
+        with pytest.raises(ValueError):
+            D4.get_rolling_horizon_settings(simulation_settings(12, 12))
+
+
+class TestWindows:
+    def test_windows_without_overlap(self):
+        assert D4.get_windows(10, 4, 0) == [[0, 4, 4], [4, 8, 8], [8, 10, 10]]
+
+    def test_windows_with_overlap(self):
+        assert D4.get_windows(10, 4, 2) == [
+            [0, 4, 2],
+            [2, 6, 4],
+            [4, 8, 6],
+            [6, 10, 10],
+        ]
+
+    def test_windows_kept_timesteps_cover_simulation_period(self):
+        windows = D4.get_windows(100, 24, 6)
+        kept = np.concatenate([np.arange(start, end) for start, _, end in windows])
+        assert list(kept) == list(range(100))
+
+
+class TestPeriodCouplings:
+    def setup_method(self):
+        self.dict_values = {
+            SIMULATION_SETTINGS: simulation_settings(12),
+            ENERGY_PRODUCTION: {
+                "pv": {
+                    LABEL: "pv",
+                    OPTIMIZE_CAP: {VALUE: False},
+                    SIMULATION_ANNUITY: {VALUE: 10},
+                },
+                "dso": {
+                    LABEL: "dso",
+                    OPTIMIZE_CAP: {VALUE: True},
+                    SIMULATION_ANNUITY: {VALUE: 0},
+                },
+            },
+            CONSTRAINTS: {
+                MAXIMUM_EMISSIONS: {VALUE: None},
+                MINIMAL_RENEWABLE_FACTOR: {VALUE: 0},
+            },
+        }
+
+    def test_pure_dispatch_problem_no_couplings(self):
+        assert D4.get_period_couplings(self.dict_values) == []
+        assert D4.get_rolling_horizon_windows(self.dict_values) == [
+            [0, 12, 12],
+            [12, 24, 24],
+            [24, 36, 36],
+            [36, 48, 48],
+        ]
+
+    def test_capacity_optimized_at_a_cost_couples_period(self):
+        self.dict_values[ENERGY_PRODUCTION]["pv"][OPTIMIZE_CAP][VALUE] = True
+        assert D4.get_period_couplings(self.dict_values) == ["pv"]
+        assert D4.get_rolling_horizon_windows(self.dict_values) is None
+
+    def test_optimized_storage_couples_period(self):
+        self.dict_values[ENERGY_STORAGE] = {
+            "ess": {
+                LABEL: "ess",
+                OPTIMIZE_CAP: {VALUE: True},
+                SIMULATION_ANNUITY: {VALUE: 0},
+            }
+        }
+        assert D4.get_period_couplings(self.dict_values) == ["ess"]
+
+    def test_active_constraint_couples_period(self):
+        self.dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE] = 0.2
+        assert D4.get_period_couplings(self.dict_values) == [MINIMAL_RENEWABLE_FACTOR]
+
+
+class TestWindowDictValues:
+    def setup_method(self):
+        self.demand = pd.Series(np.arange(48, dtype=float), index=TIME_INDEX_HOURS)
+        self.dict_values = {
+            SIMULATION_SETTINGS: simulation_settings(12, 6),
+            ENERGY_CONSUMPTION: {
+                "demand": {
+                    LABEL: "demand",
+                    TIMESERIES: self.demand,
+                    DISPATCH_PRICE: {VALUE: 0.1},
+                }
+            },
+            ENERGY_STORAGE: {
+                "ess": {
+                    LABEL: "ess",
+                    STORAGE_CAPACITY: {SOC_INITIAL: {VALUE: None}},
+                }
+            },
+        }
+
+    def test_window_dict_values_timeseries_of_window(self):
+        window = D4.window_dict_values(self.dict_values, [6, 18, 12])
+        demand = window[ENERGY_CONSUMPTION]["demand"][TIMESERIES]
+        assert list(demand.values) == list(range(6, 18))
+        assert demand.index.equals(window[SIMULATION_SETTINGS][TIME_INDEX])
+        assert window[SIMULATION_SETTINGS][PERIODS] == 12
+
+    def test_window_dict_values_initial_storage_levels(self):
+        window = D4.window_dict_values(self.dict_values, [6, 18, 12], {"ess": 0.4})
+        assert (
+            window[ENERGY_STORAGE]["ess"][STORAGE_CAPACITY][SOC_INITIAL][VALUE] == 0.4
+        )
+
+    def test_window_dict_values_does_not_modify_dict_values(self):
+        D4.window_dict_values(self.dict_values, [6, 18, 12], {"ess": 0.4})
+        assert self.dict_values[ENERGY_CONSUMPTION]["demand"][TIMESERIES] is self.demand
+        assert len(self.dict_values[SIMULATION_SETTINGS][TIME_INDEX]) == 48
+        assert (
+            self.dict_values[ENERGY_STORAGE]["ess"][STORAGE_CAPACITY][SOC_INITIAL][
+                VALUE
+            ]
+            is None
+        )
+
+
+class TestStitchResults:
+    def window_results(self, flow, time_index):
+        return {
+            ("a", "b"): {
+                "sequences": pd.DataFrame({"flow": flow}, index=time_index),
+                "scalars": pd.Series({"invest": max(flow)}, dtype=float),
+            }
+        }
+
+    def test_stitch_results_of_windows(self):
+        time_index = pd.date_range("2020-01-01", periods=6, freq="H")
+        # oemof results have a row after the last timestep of the window
+        first = self.window_results([1, 2, 3, 4, 9], time_index[:5])
+        last = self.window_results([5, 6, 7, 0], time_index[2:])
+        windows_results = [D4.keep_results(first, 2), D4.keep_results(last, 3)]
+        stitched = D4.stitch_results(last, windows_results)
+        sequences = stitched[("a", "b")]["sequences"]
+        assert list(sequences["flow"]) == [1, 2, 5, 6, 7, 0]
+        assert sequences.index.equals(time_index)
+        assert stitched[("a", "b")]["scalars"]["invest"] == 9
+
+
+@pytest.mark.skipif(
+    DirectSolverFactory is None or not DirectSolverFactory("highs").available(),
+    reason="The solver HiGHS is not installed (pip install highspy)",
+)
+class TestRollingHorizonDispatch:
+    def setup_method(self):
+        self.dict_values = load_json(
+            os.path.join(
+                TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME
+            ),
+            flag_missing_values=False,
+        )
+        self.dict_values[SIMULATION_SETTINGS][SOLVER] = {VALUE: "highs"}
+        self.dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE] = None
+        for asset_group in (ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_STORAGE):
+            for dict_asset in self.dict_values[asset_group].values():
+                dict_asset[OPTIMIZE_CAP][VALUE] = False
+                if INSTALLED_CAP in dict_asset:
+                    dict_asset[INSTALLED_CAP][VALUE] = max(
+                        dict_asset[INSTALLED_CAP][VALUE], 1500
+                    )
+        for dict_asset in self.dict_values[ENERGY_STORAGE].values():
+            dict_asset[STORAGE_CAPACITY][INSTALLED_CAP][VALUE] = 1000
+            dict_asset[STORAGE_CAPACITY][SOC_INITIAL][VALUE] = 0.5
+            dict_asset[INPUT_POWER][INSTALLED_CAP][VALUE] = 200
+            dict_asset[OUTPUT_POWER][INSTALLED_CAP][VALUE] = 200
+
+    def storage_content(self, results_main):
+        return [
+            results["sequences"][D4.STORAGE_CONTENT]
+            for key, results in results_main.items()
+            if key[1] is None and D4.STORAGE_CONTENT in results["sequences"]
+        ][0]
+
+    def test_rolling_horizon_results_cover_simulation_period(self):
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_WINDOW] = {VALUE: 12}
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_OVERLAP] = {VALUE: 6}
+        results_meta, results_main = D0.run_oemof(self.dict_values)
+        time_index = self.dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+        for results in results_main.values():
+            assert len(results["sequences"].index) == len(time_index) + 1
+            assert results["sequences"].index[:-1].equals(time_index)
+        windows = self.dict_values[SIMULATION_RESULTS][ROLLING_HORIZON]
+        assert windows[ROLLING_HORIZON_WINDOWS] == D4.get_windows(48, 12, 6)
+
+    def test_rolling_horizon_storage_levels_start_and_end_at_initial_level(self):
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_WINDOW] = {VALUE: 12}
+        results_meta, results_main = D0.run_oemof(self.dict_values)
+        storage_content = self.storage_content(results_main)
+        assert storage_content.iloc[0] == pytest.approx(500)
+        assert storage_content.iloc[-1] == pytest.approx(500)
+        assert storage_content.between(0, 1000).all()
+
+    def test_rolling_horizon_returns_meta_results_of_whole_period(self):
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_WINDOW] = {VALUE: 12}
+        results_meta, results_main = D0.run_oemof(self.dict_values)
+        simulation_results = self.dict_values[SIMULATION_RESULTS]
+        assert set(results_meta) == {"objective", "problem", "solver"}
+        assert results_meta["objective"] == simulation_results[OBJECTIVE_VALUE]
+        assert results_meta["solver"]["Time"] == pytest.approx(
+            simulation_results[SIMULTATION_TIME], abs=0.01
+        )
+        assert str(results_meta["solver"]["Status"]) == "ok"
+        assert str(results_meta["solver"]["Termination condition"]) == "optimal"
+        assert (
+            results_meta["problem"]["Number of variables"]
+            == simulation_results[NUMBER_OF_VARIABLES]
+        )
+
+    def test_rolling_horizon_objective_close_to_optimization_at_once(self):
+        D0.run_oemof(self.dict_values)
+        objective_value = self.dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_WINDOW] = {VALUE: 24}
+        self.dict_values[SIMULATION_SETTINGS][ROLLING_HORIZON_OVERLAP] = {VALUE: 12}
+        D0.run_oemof(self.dict_values)
+        rolling_objective_value = self.dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        assert rolling_objective_value >= objective_value - 1e-6
+        assert rolling_objective_value == pytest.approx(objective_value, rel=0.01)
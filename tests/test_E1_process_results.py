@@ -16,7 +16,7 @@ import multi_vector_simulator.C0_data_processing as C0
 import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E1_process_results as E1
 
-from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT
+from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT, TYPE_NONE
 
 from multi_vector_simulator.utils.constants_json_strings import *
 
@@ -308,6 +308,115 @@ def test_cut_below_micro_pd_Series_larger_0_smaller_threshold(caplog):
     ).all(), f"One value in pd.Series is below 0 but smaller then the threshold, its value should be changed to zero (but it is {result})."
 
 
+class TestCutBelowMicroDataFrame:
+    def test_cut_below_micro_pd_DataFrame_trimmed_column_by_column(self):
+        value = pd.DataFrame(
+            {
+                "small_negative": [0, -0.5 * E1.THRESHOLD, 1, np.nan],
+                "large_negative": [0, -0.5 * E1.THRESHOLD, -1, np.nan],
+                "small_positive": [0, 0.5 * E1.THRESHOLD, 1, np.nan],
+            }
+        )
+        result = E1.cut_below_micro(value=value, label="label")
+        for column in value.columns:
+            assert_series_equal(
+                result[column].dropna(),
+                E1.cut_below_micro(value=value[column].dropna(), label=column),
+                check_index=False,
+                check_dtype=False,
+                check_names=False,
+                obj=column,
+            )
+        assert np.isnan(result.iloc[-1]).all()
+
+    def test_cut_below_micro_pd_DataFrame_below_0_larger_threshold(self, caplog):
+        value = pd.DataFrame({"a": [0, -1], "b": [1, 2]})
+        with caplog.at_level(logging.WARNING):
+            result = E1.cut_below_micro(value=value, label="label")
+        assert "This is so far below 0, that the value is not changed" in caplog.text
+        assert (result == value).all().all()
+
+
+class TestResultMatrix:
+    def setup_method(self):
+        index = pd.date_range("2020-01-01", freq="H", periods=3)
+        self.results_main = {
+            ("pv", "bus"): {
+                E1.OEMOF_SEQUENCES: pd.DataFrame(
+                    {E1.OEMOF_FLOW: [1, 0.5 * E1.THRESHOLD, np.nan]}, index=index
+                ),
+                E1.OEMOF_SCALARS: pd.Series({E1.OEMOF_INVEST: -0.5 * E1.THRESHOLD}),
+            },
+            ("bus", "demand"): {
+                E1.OEMOF_SEQUENCES: pd.DataFrame(
+                    {E1.OEMOF_FLOW: [1, -0.5 * E1.THRESHOLD, np.nan]}, index=index
+                ),
+                E1.OEMOF_SCALARS: pd.Series(dtype=float),
+            },
+            ("battery", None): {
+                E1.OEMOF_SEQUENCES: pd.DataFrame(
+                    {E1.OEMOF_STORAGE_CONTENT: [2, 1, 0]}, index=index
+                ),
+                E1.OEMOF_SCALARS: pd.Series(dtype=float),
+            },
+        }
+
+    def test_result_matrix_one_column_per_sequence(self):
+        result_matrix = E1.get_result_matrix(self.results_main)
+        sequences = result_matrix[E1.OEMOF_SEQUENCES]
+        assert list(sequences.columns) == [
+            ("battery", TYPE_NONE, E1.OEMOF_STORAGE_CONTENT),
+            ("bus", "demand", E1.OEMOF_FLOW),
+            ("pv", "bus", E1.OEMOF_FLOW),
+        ]
+        assert list(sequences.columns.names) == E1.RESULT_MATRIX_LEVELS
+
+    def test_result_matrix_values_cut_below_micro(self):
+        result_matrix = E1.get_result_matrix(self.results_main)
+        sequences = result_matrix[E1.OEMOF_SEQUENCES]
+        assert sequences[("pv", "bus", E1.OEMOF_FLOW)].iloc[1] == 0
+        assert sequences[("bus", "demand", E1.OEMOF_FLOW)].iloc[1] == 0
+        assert result_matrix[E1.OEMOF_SCALARS][("pv", "bus", E1.OEMOF_INVEST)] == 0
+
+    def test_get_bus_data_as_solph_views_node(self):
+        result_matrix = E1.get_result_matrix(self.results_main)
+        bus_data = E1.get_bus_data(result_matrix, "bus")
+        expected = solph.views.node(self.results_main, "bus")
+        assert bus_data[E1.CUT_BELOW_MICRO] is True
+        assert list(bus_data[E1.OEMOF_SEQUENCES].keys()) == list(
+            expected[E1.OEMOF_SEQUENCES].keys()
+        )
+        assert list(bus_data[E1.OEMOF_SCALARS].index) == list(
+            expected[E1.OEMOF_SCALARS].index
+        )
+        flow = bus_data[E1.OEMOF_SEQUENCES][(("pv", "bus"), E1.OEMOF_FLOW)]
+        assert list(flow.dropna()) == [1, 0]
+
+    def test_get_bus_data_storage(self):
+        result_matrix = E1.get_result_matrix(self.results_main)
+        bus_data = E1.get_bus_data(result_matrix, "battery")
+        assert list(bus_data[E1.OEMOF_SEQUENCES].keys()) == [
+            (("battery", TYPE_NONE), E1.OEMOF_STORAGE_CONTENT)
+        ]
+        assert E1.OEMOF_SCALARS not in bus_data
+
+    def test_get_timeseries_per_bus_from_result_matrix(self):
+        result_matrix = E1.get_result_matrix(self.results_main)
+        dict_values = {
+            SIMULATION_SETTINGS: {
+                TIME_INDEX: pd.date_range("2020-01-01", freq="H", periods=2)
+            }
+        }
+        E1.get_timeseries_per_bus(
+            dict_values=dict_values,
+            bus_data={"bus": E1.get_bus_data(result_matrix, "bus")},
+        )
+        df = dict_values[OPTIMIZED_FLOWS]["bus"]
+        assert list(df.columns) == ["pv", "demand"]
+        assert list(df["pv"]) == [1, 0]
+        assert list(df["demand"]) == [-1, 0]
+
+
 def test_add_info_flows_storage_capacity():
     dict_test = {}
     flow = pd.Series(
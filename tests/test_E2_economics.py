@@ -41,6 +41,9 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
     PROJECT_DURATION,
     SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+    OUTFLOW_DIRECTION,
+    COST_UPFRONT,
+    COST_REPLACEMENT,
 )
 
 dict_asset = {
@@ -139,6 +142,32 @@ def test_all_cost_info_parameters_added_to_dict_asset():
         ), f"Attribute {k} is not in the asset dictionary, eventhough it should have been added."
 
 
+def test_get_costs_of_asset_with_several_output_busses():
+    """Tests the costs of an asset with a dispatch price for each of its output busses."""
+    dict_chp = {
+        LABEL: "CHP",
+        SPECIFIC_COSTS: {VALUE: 500, UNIT: CURR},
+        INSTALLED_CAP: {VALUE: 10, UNIT: "kW"},
+        OPTIMIZED_ADD_CAP: {VALUE: 5, UNIT: "kW"},
+        DEVELOPMENT_COSTS: {VALUE: 100, UNIT: CURR},
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED: {VALUE: 30, UNIT: CURR},
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: {VALUE: 40, UNIT: CURR},
+        LIFETIME_SPECIFIC_COST: {VALUE: 700, UNIT: CURR},
+        LIFETIME_SPECIFIC_COST_OM: {VALUE: 50, UNIT: CURR},
+        LIFETIME_PRICE_DISPATCH: {VALUE: [0.1, 0.2], UNIT: CURR},
+        OUTFLOW_DIRECTION: ["Heat", "Electricity"],
+        FLOW: {"Heat": pd.Series([1, 2, 0]), "Electricity": pd.Series([2, 1, 1])},
+    }
+    E2.get_costs(dict_chp, dict_economic)
+    assert dict_chp[COST_UPFRONT][VALUE] == 2600
+    assert dict_chp[COST_REPLACEMENT][VALUE] == 500
+    assert dict_chp[COST_OM][VALUE] == 750
+    assert dict_chp[COST_DISPATCH][VALUE] == pytest.approx((0.1 + 0.2) * 7)
+    assert dict_chp[ANNUITY_TOTAL][VALUE] == pytest.approx(
+        dict_chp[COST_TOTAL][VALUE] * dict_economic[CRF][VALUE]
+    )
+
+
 def test_calculate_costs_replacement():
     """Tests whether replacement costs both for existing and future capacities were calculated correctly"""
     installed_capacity = 1
@@ -287,8 +316,8 @@ def test_calculation_of_lcoe_of_asset_total_flow_is_0():
     for group in [ENERGY_CONVERSION, ENERGY_STORAGE]:
         for asset in dict_values[group]:
             E2.lcoe_assets(dict_values[group][asset], group)
-    assert dict_values[ENERGY_CONVERSION]["inverter"][LCOE_ASSET][VALUE] is 0
-    assert dict_values[ENERGY_STORAGE]["battery_2"][LCOE_ASSET][VALUE] is 0
+    assert dict_values[ENERGY_CONVERSION]["inverter"][LCOE_ASSET][VALUE] == 0
+    assert dict_values[ENERGY_STORAGE]["battery_2"][LCOE_ASSET][VALUE] == 0
 
 
 def test_calculation_of_lcoe_asset_storage_flow_not_0_provider_flow_not_0():
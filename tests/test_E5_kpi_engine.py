@@ -0,0 +1,387 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.C2_economic_functions as C2
+import multi_vector_simulator.E0_evaluation as E0
+import multi_vector_simulator.E2_economics as E2
+import multi_vector_simulator.E3_indicator_calculation as E3
+import multi_vector_simulator.E5_kpi_engine as E5
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    UNIT,
+    VALUE,
+    LABEL,
+    CURR,
+    CRF,
+    ANNUITY_FACTOR,
+    DISCOUNTFACTOR,
+    PROJECT_DURATION,
+    ECONOMIC_DATA,
+    KPI,
+    KPI_COST_MATRIX,
+    KPI_SCALAR_MATRIX,
+    ENERGY_CONVERSION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_STORAGE,
+    STORAGE_CAPACITY,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    OUTFLOW_DIRECTION,
+    FLOW,
+    TOTAL_FLOW,
+    INSTALLED_CAP,
+    OPTIMIZED_ADD_CAP,
+    DEVELOPMENT_COSTS,
+    SPECIFIC_COSTS,
+    LIFETIME_SPECIFIC_COST,
+    LIFETIME_SPECIFIC_COST_OM,
+    LIFETIME_PRICE_DISPATCH,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+    EMISSION_FACTOR,
+    TOTAL_EMISSIONS,
+    COST_UPFRONT,
+    COST_REPLACEMENT,
+    COST_INVESTMENT,
+    COST_OM,
+    COST_DISPATCH,
+    COST_OPERATIONAL_TOTAL,
+    COST_TOTAL,
+    ANNUITY_TOTAL,
+    ANNUITY_OM,
+    LCOE_ASSET,
+)
+
+TIMESTEPS = 4
+
+dict_economic = {
+    CURR: "Euro",
+    DISCOUNTFACTOR: {VALUE: 0.08},
+    PROJECT_DURATION: {VALUE: 20},
+}
+dict_economic.update(
+    {
+        ANNUITY_FACTOR: {
+            VALUE: C2.annuity_factor(project_life=20, discount_factor=0.08)
+        },
+        CRF: {VALUE: C2.crf(project_life=20, discount_factor=0.08)},
+    }
+)
+
+
+def asset(label, flow, dispatch_price=0.0, installed=0.0, optimized=0.0, **kwargs):
+    flow = pd.Series(flow, dtype=float)
+    dict_asset = {
+        LABEL: label,
+        FLOW: flow,
+        TOTAL_FLOW: {VALUE: flow.sum(), UNIT: "kWh"},
+        INSTALLED_CAP: {VALUE: installed, UNIT: "kW"},
+        OPTIMIZED_ADD_CAP: {VALUE: optimized, UNIT: "kW"},
+        DEVELOPMENT_COSTS: {VALUE: 100, UNIT: CURR},
+        SPECIFIC_COSTS: {VALUE: 500, UNIT: CURR},
+        LIFETIME_SPECIFIC_COST: {VALUE: 700, UNIT: CURR},
+        LIFETIME_SPECIFIC_COST_OM: {VALUE: 50, UNIT: CURR},
+        LIFETIME_PRICE_DISPATCH: {VALUE: dispatch_price, UNIT: CURR},
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED: {VALUE: 30, UNIT: CURR},
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: {VALUE: 40, UNIT: CURR},
+    }
+    dict_asset.update(kwargs)
+    return dict_asset
+
+
+def storage_capacity(label):
+    # the storage content has a value at the end of the last timestep
+    dict_asset = asset(label, [5, 6, 4, 3, 5], installed=10, optimized=2)
+    dict_asset.update({TOTAL_FLOW: {VALUE: None, UNIT: "NaN"}})
+    return dict_asset
+
+
+@pytest.fixture
+def dict_values():
+    chp_flow = pd.DataFrame({"Heat": [1, 2, 0, 1], "Electricity": [2, 1, 1, 0]})
+    chp = asset(
+        "CHP",
+        [0] * TIMESTEPS,
+        dispatch_price=[0.1, 0.2],
+        installed=5,
+        optimized=1,
+        **{OUTFLOW_DIRECTION: ["Heat", "Electricity"]},
+    )
+    chp.update(
+        {
+            FLOW: {bus: chp_flow[bus] for bus in chp_flow},
+            TOTAL_FLOW: {VALUE: chp_flow.to_numpy().sum(), UNIT: "kWh"},
+        }
+    )
+    return {
+        ECONOMIC_DATA: copy.deepcopy(dict_economic),
+        ENERGY_STORAGE: {
+            "battery": {
+                LABEL: "battery",
+                STORAGE_CAPACITY: storage_capacity("battery storage capacity"),
+                INPUT_POWER: asset(
+                    "battery input power", [1, 0, 0, 2], 0.01, installed=3
+                ),
+                OUTPUT_POWER: asset(
+                    "battery output power", [0, 2, 1, 0], 0.02, installed=3
+                ),
+            }
+        },
+        ENERGY_CONVERSION: {"CHP": chp},
+        ENERGY_PRODUCTION: {
+            "PV": asset(
+                "PV",
+                [0, 3, 4, 0],
+                installed=10,
+                optimized=5,
+                **{EMISSION_FACTOR: {VALUE: 0.05, UNIT: "kgCO2eq/kWh"}},
+            ),
+            "DSO_consumption": asset(
+                "DSO_consumption",
+                [4, 1, 0, 2],
+                dispatch_price=pd.Series([0.3, 0.3, 0.5, 0.5]),
+                **{EMISSION_FACTOR: {VALUE: 0.4, UNIT: "kgCO2eq/kWh"}},
+            ),
+        },
+        ENERGY_CONSUMPTION: {
+            "demand": asset("demand", [3, 2, 1, 2]),
+            "DSO_feedin": asset("DSO_feedin", [0, 0, 3, 0], dispatch_price=-0.1),
+        },
+    }
+
+
+def evaluate_asset_by_asset(dict_values):
+    """Evaluation of the KPI of the assets one by one, with the functions of E2 and E3"""
+    for storage in dict_values[ENERGY_STORAGE].values():
+        for component in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            E2.get_costs(storage[component], dict_values[ECONOMIC_DATA])
+        E2.lcoe_assets(storage, ENERGY_STORAGE)
+        for component in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            E0.store_result_matrix(dict_values[KPI], storage[component])
+    for group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
+        for dict_asset in dict_values[group].values():
+            E2.get_costs(dict_asset, dict_values[ECONOMIC_DATA])
+            E2.lcoe_assets(dict_asset, group)
+            if group == ENERGY_PRODUCTION:
+                E3.calculate_emissions_from_flow(dict_asset)
+            E0.store_result_matrix(dict_values[KPI], dict_asset)
+
+
+class TestEvaluatedAssets:
+    def test_storage_components_listed_first(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        assert [dict_asset[LABEL] for _, dict_asset in assets] == [
+            "battery storage capacity",
+            "battery input power",
+            "battery output power",
+            "CHP",
+            "PV",
+            "DSO_consumption",
+            "demand",
+            "DSO_feedin",
+        ]
+
+    def test_asset_groups(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        assert [group for group, _ in assets] == [ENERGY_STORAGE] * 3 + [
+            ENERGY_CONVERSION
+        ] + [ENERGY_PRODUCTION] * 2 + [ENERGY_CONSUMPTION] * 2
+
+    def test_missing_asset_group(self, dict_values):
+        dict_values.pop(ENERGY_STORAGE)
+        assert len(E5.get_evaluated_assets(dict_values)) == 5
+
+
+class TestKpiArrays:
+    def setup_method(self):
+        self.number_of_timesteps = TIMESTEPS + 1
+
+    def test_flow_matrix_padded_with_zeros(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        kpi_arrays = E5.build_kpi_arrays(assets, self.number_of_timesteps)
+        assert kpi_arrays[FLOW].shape == (self.number_of_timesteps, len(assets))
+        assert list(kpi_arrays[FLOW][:, 0]) == [5, 6, 4, 3, 5]
+        assert list(kpi_arrays[FLOW][:, 1]) == [1, 0, 0, 2, 0]
+
+    def test_flows_of_several_busses_summed(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        kpi_arrays = E5.build_kpi_arrays(assets, self.number_of_timesteps)
+        assert list(kpi_arrays[FLOW][:, 3]) == [3, 3, 1, 1, 0]
+
+    def test_dispatch_prices(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        kpi_arrays = E5.build_kpi_arrays(assets, self.number_of_timesteps)
+        assert kpi_arrays[LIFETIME_PRICE_DISPATCH][:, 3] == pytest.approx([0.3] * 5)
+        assert list(kpi_arrays[LIFETIME_PRICE_DISPATCH][:, 5]) == [
+            0.3,
+            0.3,
+            0.5,
+            0.5,
+            0,
+        ]
+
+    def test_parameter_none_as_zero(self, dict_values):
+        assets = E5.get_evaluated_assets(dict_values)
+        kpi_arrays = E5.build_kpi_arrays(assets, self.number_of_timesteps)
+        assert kpi_arrays[TOTAL_FLOW][0] == 0
+
+    def test_emission_factor_only_of_production_assets(self, dict_values):
+        dict_values[ENERGY_CONSUMPTION]["demand"].update(
+            {EMISSION_FACTOR: {VALUE: 1, UNIT: "kgCO2eq/kWh"}}
+        )
+        assets = E5.get_evaluated_assets(dict_values)
+        kpi_arrays = E5.build_kpi_arrays(assets, self.number_of_timesteps)
+        assert list(kpi_arrays[EMISSION_FACTOR]) == [0, 0, 0, 0, 0.05, 0.4, 0, 0]
+
+    def test_dispatch_price_of_unknown_type_raises_error(self, dict_values):
+        dict_values[ENERGY_CONSUMPTION]["demand"][LIFETIME_PRICE_DISPATCH][
+            VALUE
+        ] = "0.1"
+        assets = E5.get_evaluated_assets(dict_values)
+        with pytest.raises(TypeError):
+            E5.build_kpi_arrays(assets, self.number_of_timesteps)
+
+
+class TestCalculateKpi:
+    def setup_method(self):
+        self.kpi_arrays = {
+            INSTALLED_CAP: np.array([10.0, 0.0]),
+            OPTIMIZED_ADD_CAP: np.array([5.0, 2.0]),
+            DEVELOPMENT_COSTS: np.array([100.0, 0.0]),
+            SPECIFIC_COSTS: np.array([500.0, 200.0]),
+            LIFETIME_SPECIFIC_COST_OM: np.array([50.0, 10.0]),
+            SPECIFIC_REPLACEMENT_COSTS_INSTALLED: np.array([30.0, 0.0]),
+            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: np.array([40.0, 20.0]),
+            TOTAL_FLOW: np.array([10.0, 0.0]),
+            EMISSION_FACTOR: np.array([0.5, 0.0]),
+            FLOW: np.array([[4.0, 0.0], [6.0, 0.0]]),
+            LIFETIME_PRICE_DISPATCH: np.array([[1.0, 2.0], [2.0, 2.0]]),
+        }
+        self.kpi = E5.calculate_kpi(self.kpi_arrays, crf=0.1)
+
+    def test_costs(self):
+        assert list(self.kpi[COST_UPFRONT]) == [2600, 400]
+        assert list(self.kpi[COST_REPLACEMENT]) == [500, 40]
+        assert list(self.kpi[COST_INVESTMENT]) == [3100, 440]
+        assert list(self.kpi[COST_OM]) == [750, 20]
+        assert list(self.kpi[COST_DISPATCH]) == [16, 0]
+        assert list(self.kpi[COST_OPERATIONAL_TOTAL]) == [766, 20]
+        assert list(self.kpi[COST_TOTAL]) == [3866, 460]
+
+    def test_annuities(self):
+        assert self.kpi[ANNUITY_TOTAL] == pytest.approx([386.6, 46])
+        assert self.kpi[ANNUITY_OM] == pytest.approx([76.6, 2])
+
+    def test_lcoe_zero_without_flow(self):
+        assert self.kpi[LCOE_ASSET] == pytest.approx([38.66, 0])
+
+    def test_emissions(self):
+        assert list(self.kpi[TOTAL_EMISSIONS]) == [5, 0]
+
+    def test_costs_without_total_flow(self):
+        for parameter in [TOTAL_FLOW, EMISSION_FACTOR]:
+            self.kpi_arrays.pop(parameter)
+        kpi = E5.calculate_costs(self.kpi_arrays, crf=0.1)
+        assert list(kpi[COST_TOTAL]) == [3866, 460]
+        assert LCOE_ASSET not in kpi
+
+    def test_levelized_costs(self):
+        lcoe = E5.calculate_levelized_costs([10, 10, 10], [4, 0, -1])
+        assert list(lcoe) == [2.5, 0, 0]
+
+    def test_emissions_of_single_asset(self):
+        assert list(E5.calculate_emissions([100], [0.5])) == [50]
+
+
+class TestAddKpiOfAssets:
+    def setup_method(self):
+        self.parameters = [
+            COST_UPFRONT,
+            COST_REPLACEMENT,
+            COST_INVESTMENT,
+            COST_OM,
+            COST_DISPATCH,
+            COST_OPERATIONAL_TOTAL,
+            COST_TOTAL,
+            ANNUITY_TOTAL,
+            ANNUITY_OM,
+            LCOE_ASSET,
+        ]
+
+    def evaluate(self, dict_values):
+        dict_values_expected = copy.deepcopy(dict_values)
+        E0.initalize_kpi(dict_values_expected)
+        evaluate_asset_by_asset(dict_values_expected)
+        E0.initalize_kpi(dict_values)
+        E5.add_kpi_of_assets(dict_values)
+        return dict_values_expected
+
+    def test_kpi_of_assets_as_evaluated_asset_by_asset(self, dict_values):
+        dict_values_expected = self.evaluate(dict_values)
+        assets_expected = E5.get_evaluated_assets(dict_values_expected)
+        for (_, expected), (_, dict_asset) in zip(
+            assets_expected, E5.get_evaluated_assets(dict_values)
+        ):
+            for parameter in self.parameters:
+                assert dict_asset[parameter][VALUE] == pytest.approx(
+                    expected[parameter][VALUE]
+                ), f"{parameter} of {dict_asset[LABEL]}"
+                assert dict_asset[parameter].get(UNIT) == expected[parameter].get(
+                    UNIT
+                ), f"unit of {parameter} of {dict_asset[LABEL]}"
+
+    def test_lcoe_of_storage(self, dict_values):
+        dict_values_expected = self.evaluate(dict_values)
+        assert dict_values[ENERGY_STORAGE]["battery"][LCOE_ASSET][
+            VALUE
+        ] == pytest.approx(
+            dict_values_expected[ENERGY_STORAGE]["battery"][LCOE_ASSET][VALUE]
+        )
+
+    def test_lcoe_of_storage_components(self, dict_values):
+        E0.initalize_kpi(dict_values)
+        E5.add_kpi_of_assets(dict_values)
+        storage = dict_values[ENERGY_STORAGE]["battery"]
+        annuity = {
+            component: storage[component][ANNUITY_TOTAL][VALUE]
+            for component in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]
+        }
+        input_flow = storage[INPUT_POWER][TOTAL_FLOW][VALUE]
+        output_flow = storage[OUTPUT_POWER][TOTAL_FLOW][VALUE]
+        assert storage[LCOE_ASSET][VALUE] == pytest.approx(
+            sum(annuity.values()) / output_flow
+        )
+        assert storage[STORAGE_CAPACITY][LCOE_ASSET][VALUE] == pytest.approx(
+            annuity[STORAGE_CAPACITY] / input_flow
+        )
+        for component, flow in [(INPUT_POWER, input_flow), (OUTPUT_POWER, output_flow)]:
+            assert storage[component][LCOE_ASSET][VALUE] == pytest.approx(
+                annuity[component] / flow
+            )
+
+    def test_emissions_of_production_assets(self, dict_values):
+        dict_values_expected = self.evaluate(dict_values)
+        for asset_name, dict_asset in dict_values[ENERGY_PRODUCTION].items():
+            assert dict_asset[TOTAL_EMISSIONS] == pytest.approx(
+                dict_values_expected[ENERGY_PRODUCTION][asset_name][TOTAL_EMISSIONS]
+            )
+        assert TOTAL_EMISSIONS not in dict_values[ENERGY_CONSUMPTION]["demand"]
+
+    def test_kpi_matrices_as_evaluated_asset_by_asset(self, dict_values):
+        dict_values_expected = self.evaluate(dict_values)
+        for kpi_storage in [KPI_COST_MATRIX, KPI_SCALAR_MATRIX]:
+            pd.testing.assert_frame_equal(
+                dict_values[KPI][kpi_storage],
+                dict_values_expected[KPI][kpi_storage],
+                check_dtype=False,
+            )
+
+    def test_no_assets(self):
+        dict_values = {ECONOMIC_DATA: copy.deepcopy(dict_economic)}
+        E0.initalize_kpi(dict_values)
+        E5.add_kpi_of_assets(dict_values)
+        assert dict_values[KPI][KPI_COST_MATRIX].empty
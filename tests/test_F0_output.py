@@ -10,6 +10,7 @@
 """
 
 import copy
+import json
 import os
 import shutil
 
@@ -23,7 +24,15 @@ import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.F0_output as F0
 from multi_vector_simulator.cli import main
 
-from multi_vector_simulator.utils.constants import JSON_WITH_RESULTS, CSV_EXT
+from multi_vector_simulator.utils.constants import (
+    JSON_WITH_RESULTS,
+    CSV_EXT,
+    TIMESERIES_FORMAT_XLSX,
+    TIMESERIES_FORMAT_CSV,
+    TIMESERIES_FORMAT_PARQUET,
+    TIMESERIES_FORMAT_HDF5,
+    TIMESERIES_ALL_BUSSES,
+)
 
 from multi_vector_simulator.utils.constants_json_strings import (
     PROJECT_DATA,
@@ -39,7 +48,9 @@ from multi_vector_simulator.utils.constants_json_strings import (
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
     MODELLING_TIME,
+    TIMESERIES_OUTPUT_FORMAT,
 )
+from multi_vector_simulator.utils.exceptions import UnknownOutputFormatError
 from _constants import (
     EXECUTE_TESTS_ON,
     TESTS_ON_MASTER,
@@ -57,6 +68,11 @@ from _constants import (
     TYPE_STR,
     PATH_OUTPUT_FOLDER,
     START_DATE,
+    EVALUATED_PERIOD,
+    TIMESTEP,
+    VALUE,
+    DATA,
+    NPZ_FILE_EXTENSION,
     BENCHMARK_TEST_INPUT_FOLDER,
 )
 
@@ -421,3 +437,170 @@ class TestLoadDictionaryFromJson:
         """ """
         if os.path.exists(OUTPUT_PATH):
             shutil.rmtree(OUTPUT_PATH, ignore_errors=True)
+
+
+class TestTimeseriesSidecar:
+    def setup_method(self):
+        if os.path.exists(OUTPUT_PATH):
+            shutil.rmtree(OUTPUT_PATH, ignore_errors=True)
+        os.mkdir(OUTPUT_PATH)
+        self.file_name = "test_json_sidecar"
+        # the flow covers the evaluated period of the simulation settings
+        self.flow = pd.Series(
+            np.arange(24.0),
+            index=pd.date_range(start=START_TIME, periods=24, freq="60min"),
+        )
+        self.dict_values = {
+            SIMULATION_SETTINGS: {
+                START_DATE: START_TIME,
+                EVALUATED_PERIOD: {VALUE: 1},
+                TIMESTEP: {VALUE: 60},
+            },
+            "asset": {"flow": self.flow, "label": "asset"},
+            OPTIMIZED_FLOWS: {"bus": BUS},
+            TYPE_DATAFRAME: pandas_Dataframe,
+        }
+        F0.store_as_json(
+            self.dict_values, OUTPUT_PATH, self.file_name, timeseries_sidecar=True
+        )
+        self.json_file = os.path.join(OUTPUT_PATH, self.file_name + ".json")
+
+    def test_store_as_json_timeseries_not_in_json_file(self):
+        assert os.path.exists(
+            os.path.join(OUTPUT_PATH, self.file_name + NPZ_FILE_EXTENSION)
+        )
+        with open(self.json_file) as json_file:
+            json_values = json.load(json_file)
+        assert VALUE not in json_values["asset"]["flow"]
+        assert DATA not in json_values[OPTIMIZED_FLOWS]["bus"]
+
+    def test_load_json_timeseries_resolved_on_access(self):
+        value_dict = B0.load_json(self.json_file, flag_missing_values=False)
+        asset = value_dict["asset"]
+        assert isinstance(asset, B0.LazyTimeseriesDict)
+        assert isinstance(dict.__getitem__(asset, "flow"), B0.TimeseriesReference)
+        pd.testing.assert_series_equal(asset["flow"], self.flow, check_freq=False)
+        assert isinstance(dict.__getitem__(asset, "flow"), pd.Series)
+
+    def test_load_json_dataframes_same_as_stored(self):
+        value_dict = B0.load_json(self.json_file, flag_missing_values=False)
+        pd.testing.assert_frame_equal(
+            value_dict[OPTIMIZED_FLOWS]["bus"], BUS, check_freq=False
+        )
+        pd.testing.assert_frame_equal(value_dict[TYPE_DATAFRAME], pandas_Dataframe)
+
+    def test_copy_of_lazy_dict_contains_timeseries(self):
+        value_dict = B0.load_json(self.json_file, flag_missing_values=False)
+        for asset in (
+            copy.deepcopy(value_dict["asset"]),
+            dict(value_dict["asset"]),
+            value_dict["asset"].copy(),
+        ):
+            assert isinstance(asset["flow"], pd.Series)
+            assert isinstance(dict.__getitem__(asset, "flow"), pd.Series)
+
+    def test_store_loaded_json_without_sidecar(self):
+        value_dict = B0.load_json(self.json_file, flag_missing_values=False)
+        F0.store_as_json(value_dict, OUTPUT_PATH, "test_json_no_sidecar")
+        with open(os.path.join(OUTPUT_PATH, "test_json_no_sidecar.json")) as json_file:
+            json_values = json.load(json_file)
+        assert json_values["asset"]["flow"][VALUE] == self.flow.to_list()
+
+    def teardown_method(self):
+        if os.path.exists(OUTPUT_PATH):
+            shutil.rmtree(OUTPUT_PATH, ignore_errors=True)
+
+
+class TestTimeseriesOutputFormats:
+    def setup_method(self):
+        if os.path.exists(OUTPUT_PATH):
+            shutil.rmtree(OUTPUT_PATH, ignore_errors=True)
+        os.mkdir(OUTPUT_PATH)
+        self.dict_values = {
+            SIMULATION_SETTINGS: {PATH_OUTPUT_FOLDER: OUTPUT_PATH},
+            OPTIMIZED_FLOWS: {"a_bus": BUS, "b_bus": BUS * 2},
+        }
+
+    def set_output_format(self, output_format):
+        self.dict_values[SIMULATION_SETTINGS][TIMESERIES_OUTPUT_FORMAT] = {
+            VALUE: output_format
+        }
+
+    def test_default_format_xlsx(self):
+        assert F0.get_timeseries_output_formats(self.dict_values) == [
+            TIMESERIES_FORMAT_XLSX
+        ]
+
+    def test_formats_from_comma_separated_string(self):
+        self.set_output_format("csv, HDF5,csv")
+        assert F0.get_timeseries_output_formats(self.dict_values) == [
+            TIMESERIES_FORMAT_CSV,
+            TIMESERIES_FORMAT_HDF5,
+        ]
+
+    def test_no_format(self):
+        for output_format in (None, [], ""):
+            self.set_output_format(output_format)
+            assert F0.get_timeseries_output_formats(self.dict_values) == []
+            assert F0.store_timeseries_all_busses(self.dict_values) == []
+        assert os.listdir(OUTPUT_PATH) == []
+
+    def test_unknown_format_raises_error(self):
+        self.set_output_format(["csv", "xls"])
+        with pytest.raises(UnknownOutputFormatError):
+            F0.get_timeseries_output_formats(self.dict_values)
+
+    def test_store_timeseries_to_csv_in_chunks(self):
+        self.set_output_format(TIMESERIES_FORMAT_CSV)
+        F0.store_timeseries_all_busses(self.dict_values)
+        assert not os.path.exists(
+            os.path.join(OUTPUT_PATH, TIMESERIES_ALL_BUSSES + ".xlsx")
+        )
+        folder = F0.store_timeseries_all_busses_to_csv(self.dict_values, chunksize=2)
+        for bus, timeseries in self.dict_values[OPTIMIZED_FLOWS].items():
+            stored = pd.read_csv(
+                os.path.join(folder, bus + ".csv"), index_col=0, parse_dates=True
+            )
+            pd.testing.assert_frame_equal(stored, timeseries, check_freq=False)
+
+    def test_store_timeseries_to_parquet(self):
+        pytest.importorskip("pyarrow")
+        self.set_output_format(TIMESERIES_FORMAT_PARQUET)
+        F0.store_timeseries_all_busses(self.dict_values)
+        stored = pd.read_parquet(
+            os.path.join(OUTPUT_PATH, TIMESERIES_ALL_BUSSES, "b_bus.parquet")
+        )
+        pd.testing.assert_frame_equal(stored, BUS * 2, check_freq=False)
+
+    def test_store_timeseries_to_hdf5(self):
+        pytest.importorskip("tables")
+        self.set_output_format(TIMESERIES_FORMAT_HDF5)
+        F0.store_timeseries_all_busses(self.dict_values)
+        stored = pd.read_hdf(
+            os.path.join(OUTPUT_PATH, TIMESERIES_ALL_BUSSES + ".h5"), key="b_bus"
+        )
+        pd.testing.assert_frame_equal(stored, BUS * 2)
+
+    def test_missing_dependency_stored_as_csv(self):
+        self.set_output_format([TIMESERIES_FORMAT_HDF5, TIMESERIES_FORMAT_CSV])
+        with mock.patch.dict(
+            F0.TIMESERIES_WRITERS,
+            {TIMESERIES_FORMAT_HDF5: mock.Mock(side_effect=ImportError("tables"))},
+        ):
+            stored_formats = F0.store_timeseries_all_busses(self.dict_values)
+        assert stored_formats == [TIMESERIES_FORMAT_CSV]
+        assert os.path.exists(
+            os.path.join(OUTPUT_PATH, TIMESERIES_ALL_BUSSES, "a_bus.csv")
+        )
+
+    def test_too_many_rows_for_excel_stored_as_csv(self):
+        with mock.patch.object(F0, "EXCEL_MAX_ROWS", PERIODS):
+            stored_formats = F0.store_timeseries_all_busses(self.dict_values)
+        assert stored_formats == [TIMESERIES_FORMAT_CSV]
+        assert not os.path.exists(
+            os.path.join(OUTPUT_PATH, TIMESERIES_ALL_BUSSES + ".xlsx")
+        )
+
+    def teardown_method(self):
+        if os.path.exists(OUTPUT_PATH):
+            shutil.rmtree(OUTPUT_PATH, ignore_errors=True)
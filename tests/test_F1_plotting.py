@@ -1,5 +1,6 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 import mock
 import pandas as pd
@@ -223,3 +224,116 @@ def test_fixed_width_text_smaller_than_limit_returns_text():
 def test_fixed_width_text_smaller_than_limit_returns_text():
     txt = "12345"
     assert F1.fixed_width_text(txt, char_num=2) == "12\n34\n5"
+
+
+@pytest.mark.skipif(
+    F1.PLOTLY_INSTALLED is False,
+    reason="Test deactivated because plotly package is not installed",
+)
+class TestPlotRenderQueue:
+    def setup_method(self):
+        self.n_points = 1000
+        self.timestamps = pd.date_range("2020-01-01", periods=self.n_points, freq="H")
+        self.values = pd.Series(range(self.n_points), dtype=float)
+        self.values[123] = 5000
+        self.values[456] = -10
+        self.fig = F1.create_plotly_line_fig(
+            x_data=self.timestamps, y_data=self.values, plot_title="a_title"
+        )
+
+    def test_downsample_figure_keeps_peaks(self):
+        fig = F1.downsample_figure(self.fig, max_points=100)
+        y_values = list(fig.data[0].y)
+        assert len(y_values) <= 100
+        assert max(y_values) == 5000
+        assert min(y_values) == -10
+        assert len(fig.data[0].x) == len(y_values)
+        # the original figure is not modified
+        assert len(self.fig.data[0].y) == self.n_points
+
+    def test_downsample_figure_short_timeseries_unchanged(self):
+        fig = F1.downsample_figure(self.fig, max_points=self.n_points)
+        assert list(fig.data[0].y) == list(self.fig.data[0].y)
+
+    def test_downsample_figure_pie_chart_unchanged(self):
+        fig = F1.create_plotly_piechart_fig(
+            title_of_plot="a_title", names=["costs1", "costs2"], values=[0.2, 0.8]
+        )
+        assert list(F1.downsample_figure(fig, max_points=1).data[0].values) == [
+            0.2,
+            0.8,
+        ]
+
+    def test_figures_added_to_queue_instead_of_saved(self):
+        render_queue = F1.PlotRenderQueue()
+        with mock.patch.object(F1.go.Figure, "write_image") as m_write_image:
+            F1.create_plotly_line_fig(
+                x_data=self.timestamps,
+                y_data=self.values,
+                plot_title="a_title",
+                file_path=OUTPUT_PATH,
+                render_queue=render_queue,
+            )
+        m_write_image.assert_not_called()
+        assert len(render_queue.plots) == 1
+        assert render_queue.plots[0]["file"] == os.path.join(
+            OUTPUT_PATH, "input_timeseries_a_title.png"
+        )
+        assert render_queue.plots[0]["scale"] == F1.DEFAULT_PNG_SCALE
+
+    def test_queue_scale_and_downsampling_applied(self):
+        render_queue = F1.PlotRenderQueue(scale=1, max_points=100)
+        render_queue.add(self.fig, "a_file.png", width=1200, height=600, scale=5)
+        assert render_queue.plots[0]["scale"] == 1
+        assert len(render_queue.plots[0]["fig"].data[0].y) <= 100
+
+    def test_render_exports_all_figures_at_once(self):
+        render_queue = F1.PlotRenderQueue(scale=2)
+        render_queue.add(self.fig, "a_file.png", width=1200, height=600)
+        render_queue.add(self.fig, "b_file.png", width=800, height=600)
+        with mock.patch.object(
+            F1.pio, "write_images", create=True
+        ) as m_write_images, mock.patch.object(
+            F1.metadata, "version", return_value="1.0.0"
+        ):
+            files = render_queue.render()
+        assert files == ["a_file.png", "b_file.png"]
+        m_write_images.assert_called_once()
+        assert m_write_images.call_args.kwargs["file"] == files
+        assert m_write_images.call_args.kwargs["width"] == [1200, 800]
+        assert m_write_images.call_args.kwargs["scale"] == [2, 2]
+        assert render_queue.plots == []
+
+    def test_render_on_process_pool_with_kaleido_before_1(self):
+        # plotly>=6.1 provides write_images, which fails with kaleido<1.0
+        render_queue = F1.PlotRenderQueue(scale=2, n_workers=2)
+        render_queue.add(self.fig, "a_file.png", width=1200, height=600)
+        render_queue.add(self.fig, "b_file.png", width=800, height=600)
+        with mock.patch.object(
+            F1.pio, "write_images", create=True
+        ) as m_write_images, mock.patch.object(
+            F1.metadata, "version", return_value="0.2.1"
+        ), mock.patch.object(
+            F1, "ProcessPoolExecutor", ThreadPoolExecutor
+        ), mock.patch.object(
+            F1, "write_plot_image"
+        ) as m_write_plot_image:
+            files = render_queue.render()
+        assert files == ["a_file.png", "b_file.png"]
+        m_write_images.assert_not_called()
+        assert [
+            call.args[0]["file"] for call in m_write_plot_image.call_args_list
+        ] == files
+        # the figures are passed to the processes as dicts
+        assert isinstance(m_write_plot_image.call_args.args[0]["fig"], dict)
+
+    def test_kaleido_exports_several_images_if_not_installed(self):
+        with mock.patch.object(F1.pio, "write_images", create=True), mock.patch.object(
+            F1.metadata, "version", side_effect=F1.metadata.PackageNotFoundError
+        ):
+            assert F1.kaleido_exports_several_images() is False
+
+    def test_render_empty_queue(self):
+        with mock.patch.object(F1.pio, "write_images", create=True) as m_write_images:
+            assert F1.PlotRenderQueue().render() == []
+        m_write_images.assert_not_called()
@@ -0,0 +1,133 @@
+import os
+import pathlib
+
+import mock
+import pytest
+
+F2 = pytest.importorskip("multi_vector_simulator.F2_autoreport")
+
+from dash import dash_table, dcc, html
+import plotly.graph_objs as go
+
+
+class TestStaticReport:
+    def test_style_to_css_converts_camel_case(self):
+        assert (
+            F2.style_to_css({"fontWeight": "bold", "page-break-after": "avoid"})
+            == "font-weight: bold; page-break-after: avoid"
+        )
+
+    def test_render_static_html_converts_html_components(self):
+        layout = html.Div(
+            className="cell",
+            style={"pageBreakBefore": "always"},
+            children=[html.H2("Title"), html.Img(src="data:image/png;base64,abc")],
+        )
+        assert F2.render_static_html(layout) == (
+            '<div class="cell" style="page-break-before: always"><h2>Title</h2>'
+            '<img src="data:image/png;base64,abc"></div>'
+        )
+
+    def test_render_static_html_escapes_text(self):
+        assert (
+            F2.render_static_html(html.P("Costs < 5 & more"))
+            == "<p>Costs &lt; 5 &amp; more</p>"
+        )
+
+    def test_render_static_html_leaves_out_interactive_graphs(self):
+        layout = html.Div(
+            children=[
+                html.Img(className="print-only dash-plot", src="abc"),
+                dcc.Graph(className="no-print", figure=go.Figure()),
+            ]
+        )
+        assert F2.render_static_html(layout) == (
+            '<div><img class="print-only dash-plot" src="abc"></div>'
+        )
+
+    def test_render_static_table(self):
+        table = F2.make_dash_data_table(
+            F2.pd.DataFrame({"Label": ["a", "b"], "Value": [1, 2]}), title="A table"
+        )
+        rendered = F2.render_static_html(table)
+        assert '<h4 class="report_table_title">A table</h4>' in rendered
+        assert rendered.count("<th ") == 2
+        assert rendered.count("<tr") == 3
+        assert "font-weight: bold" in rendered
+        # odd rows are highlighted as in the app
+        assert rendered.count('<tr style="background-color: rgb(248, 248, 248)">') == 1
+        assert ">b</td>" in rendered
+
+    def test_create_static_report_is_standalone(self, tmpdir):
+        asset_folder = tmpdir.mkdir("assets")
+        asset_folder.join("styles.css").write(".print-only {display: none;}")
+        app = F2.dash.Dash(assets_folder=str(asset_folder), title="a_scenario")
+        app.layout = html.Div(children=html.H1("A report"))
+        with mock.patch.object(F2, "create_app", return_value=app):
+            report_html = F2.create_static_report({})
+        assert report_html.startswith("<!DOCTYPE html>")
+        assert "<title>a_scenario</title>" in report_html
+        assert "<style>.print-only {display: none;}</style>" in report_html
+        assert "<div><h1>A report</h1></div>" in report_html
+
+
+class TestStaticReportPrinter:
+    def setup_method(self):
+        self.page = mock.AsyncMock()
+        self.browser = mock.AsyncMock()
+        self.browser.newPage.return_value = self.page
+
+    def test_print_pdfs_launches_one_browser(self, tmpdir):
+        reports = {
+            os.path.join(tmpdir, f"report_{i}.pdf"): f"<p>{i}</p>" for i in range(3)
+        }
+        with mock.patch.object(
+            F2, "launch", mock.AsyncMock(return_value=self.browser)
+        ) as m_launch:
+            with F2.StaticReportPrinter() as printer:
+                paths = printer.print_pdfs(reports)
+                printer.print_pdf("<p>3</p>", os.path.join(tmpdir, "report_3.pdf"))
+        assert m_launch.call_count == 1
+        assert self.browser.newPage.call_count == 4
+        assert self.page.pdf.call_count == 4
+        self.browser.close.assert_called_once()
+        assert paths == list(reports.keys())
+
+    def test_print_pdfs_saves_html_next_to_pdf(self, tmpdir):
+        path_pdf_report = os.path.join(tmpdir, "report", "simulation_report.pdf")
+        with mock.patch.object(F2, "launch", mock.AsyncMock(return_value=self.browser)):
+            with F2.StaticReportPrinter() as printer:
+                printer.print_pdf("<p>report</p>", path_pdf_report)
+        path_html_report = os.path.join(tmpdir, "report", "simulation_report.html")
+        with open(path_html_report, "r") as html_file:
+            assert html_file.read() == "<p>report</p>"
+        assert (
+            self.page.goto.call_args[0][0]
+            == pathlib.Path(path_html_report).resolve().as_uri()
+        )
+        assert self.page.pdf.call_args[0][0]["path"] == path_pdf_report
+
+    def test_print_pdf_escapes_special_characters_of_html_path(self, tmpdir):
+        path_pdf_report = os.path.join(tmpdir, "my report #1", "simulation report.pdf")
+        with mock.patch.object(F2, "launch", mock.AsyncMock(return_value=self.browser)):
+            with F2.StaticReportPrinter() as printer:
+                printer.print_pdf("<p>report</p>", path_pdf_report)
+        uri = self.page.goto.call_args[0][0]
+        assert uri.startswith("file:///")
+        assert uri.endswith("/my%20report%20%231/simulation%20report.html")
+
+    def test_print_static_pdf_reuses_printer(self, tmpdir):
+        printer = mock.MagicMock()
+        with mock.patch.object(
+            F2, "create_static_report", return_value="<p>report</p>"
+        ), mock.patch.object(F2, "StaticReportPrinter") as m_printer:
+            F2.print_static_pdf({}, os.path.join(tmpdir, "out.pdf"), printer=printer)
+        printer.print_pdf.assert_called_once_with(
+            "<p>report</p>", os.path.join(tmpdir, "out.pdf")
+        )
+        m_printer.assert_not_called()
+
+
+def test_get_free_port_returns_a_port():
+    assert isinstance(F2.get_free_port(), int)
+    assert F2.get_free_port() > 0
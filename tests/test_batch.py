@@ -0,0 +1,195 @@
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+import mock
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.batch as batch
+from multi_vector_simulator.utils.constants import (
+    JSON_FNAME,
+    CSV_EXT,
+    CSV_ELEMENTS,
+    JSON_WITH_RESULTS,
+    JSON_FILE_EXTENSION,
+    JOB_STATUS,
+    JOB_ERROR,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_TIMEOUT,
+    BATCH_SCENARIO,
+    BATCH_ATTEMPTS,
+    BATCH_SUMMARY,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_RESULTS,
+    OBJECTIVE_VALUE,
+    PROFILING,
+    KPI,
+    KPI_SCALARS_DICT,
+)
+
+from _constants import (
+    EXECUTE_TESTS_ON,
+    TESTS_ON_MASTER,
+    TEST_REPO_PATH,
+    INPUT_FOLDER,
+)
+
+# the fake simulations are only known to the scenario processes if they are forked
+requires_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="The scenario processes do not inherit the mocked simulation",
+)
+
+
+def fake_simulation(path_input_folder, path_output_folder, **kwargs):
+    """Save fake results of the scenario, fail or sleep if the scenario name asks for it"""
+    name = os.path.basename(path_input_folder)
+    if name == "fail":
+        raise ValueError("The simulation failed")
+    if name == "slow":
+        time.sleep(30)
+    if name == "flaky":
+        # fails at the first attempt only
+        marker = os.path.join(path_input_folder, "attempted")
+        if os.path.exists(marker) is False:
+            open(marker, "w").close()
+            raise ValueError("The first attempt failed")
+    os.makedirs(path_output_folder, exist_ok=True)
+    results = {
+        SIMULATION_RESULTS: {
+            OBJECTIVE_VALUE: 2.0,
+            PROFILING: {"D0_modelling_and_optimization": {"wall_time": 0.5}},
+        },
+        KPI: {KPI_SCALARS_DICT: {"costs_total": 10.0, "label": "not a number"}},
+    }
+    with open(
+        os.path.join(path_output_folder, JSON_WITH_RESULTS + JSON_FILE_EXTENSION), "w"
+    ) as json_file:
+        json.dump(results, json_file)
+
+
+def make_scenarios(path, names):
+    for name in names:
+        os.makedirs(os.path.join(path, name))
+        open(os.path.join(path, name, JSON_FNAME), "w").close()
+
+
+class TestFindScenarios:
+    def test_json_input_folders_found_outside_ignored_folder(self, tmpdir):
+        path = str(tmpdir)
+        make_scenarios(path, ["a", os.path.join("b", "c"), os.path.join("out", "a")])
+        assert batch.find_scenarios(path, ignore_folder=os.path.join(path, "out")) == [
+            os.path.join(path, "a"),
+            os.path.join(path, "b", "c"),
+        ]
+
+    def test_csv_input_folders_found(self, tmpdir):
+        path = str(tmpdir)
+        os.makedirs(os.path.join(path, "a", CSV_ELEMENTS))
+        make_scenarios(path, ["b"])
+        assert batch.find_scenarios(path, input_type=CSV_EXT) == [
+            os.path.join(path, "a")
+        ]
+
+    def test_scenario_name_relative_to_searched_folder(self, tmpdir):
+        path = str(tmpdir)
+        assert batch.get_scenario_name(path, os.path.join(path, "b", "c")) == (
+            os.path.join("b", "c")
+        )
+        assert batch.get_scenario_name(path, path) == os.path.basename(path)
+
+
+@requires_fork
+@mock.patch.object(batch.cli, "main", side_effect=fake_simulation)
+class TestRunBatch:
+    def test_summary_of_scenarios(self, m_main, tmpdir):
+        path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+        make_scenarios(path_input, ["b", "a", "fail"])
+        summary = batch.run_batch(path_input, path_output, n_workers=2)
+
+        assert summary[BATCH_SCENARIO].tolist() == ["a", "b", "fail"]
+        assert summary[JOB_STATUS].tolist() == [JOB_DONE, JOB_DONE, JOB_FAILED]
+        assert summary[BATCH_ATTEMPTS].tolist() == [1, 1, 1]
+        assert summary[JOB_ERROR].iloc[2] == "ValueError: The simulation failed"
+        assert summary[OBJECTIVE_VALUE].iloc[0] == 2.0
+        assert summary["costs_total"].iloc[1] == 10.0
+        assert summary["D0_modelling_and_optimization wall_time"].iloc[0] == 0.5
+        assert "label" not in summary.columns
+        pd.testing.assert_frame_equal(
+            pd.read_csv(os.path.join(path_output, BATCH_SUMMARY)),
+            summary,
+            check_dtype=False,
+        )
+
+    def test_scenario_options_passed_to_simulation(self, m_main, tmpdir):
+        path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+        make_scenarios(path_input, ["a"])
+        calls = tmpdir.join("calls.json")
+
+        def record_call(**kwargs):
+            calls.write(json.dumps(kwargs))
+            fake_simulation(**kwargs)
+
+        m_main.side_effect = record_call
+        batch.run_batch(path_input, path_output, solver="highs")
+        assert json.loads(calls.read()) == {
+            "path_input_folder": os.path.join(path_input, "a"),
+            "path_output_folder": os.path.join(path_output, "a"),
+            "input_type": "json",
+            "overwrite": True,
+            "display_output": "error",
+            "solver": "highs",
+        }
+
+    def test_failed_scenario_retried(self, m_main, tmpdir):
+        path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+        make_scenarios(path_input, ["flaky", "fail"])
+        summary = batch.run_batch(path_input, path_output, retries=1)
+        assert summary.set_index(BATCH_SCENARIO)[[JOB_STATUS, BATCH_ATTEMPTS]].to_dict(
+            "index"
+        ) == {
+            "fail": {JOB_STATUS: JOB_FAILED, BATCH_ATTEMPTS: 2},
+            "flaky": {JOB_STATUS: JOB_DONE, BATCH_ATTEMPTS: 2},
+        }
+
+    def test_scenario_exceeding_timeout_terminated(self, m_main, tmpdir):
+        path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+        make_scenarios(path_input, ["slow", "a"])
+        start = time.perf_counter()
+        summary = batch.run_batch(path_input, path_output, n_workers=2, timeout=1)
+        assert time.perf_counter() - start < 10
+        assert summary[JOB_STATUS].tolist() == [JOB_DONE, JOB_TIMEOUT]
+
+    def test_existing_output_folder_not_overwritten(self, m_main, tmpdir):
+        path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+        make_scenarios(path_input, ["a"])
+        os.makedirs(os.path.join(path_output, "a"))
+        summary = batch.run_batch(path_input, path_output)
+        assert summary[JOB_STATUS].tolist() == [JOB_FAILED]
+        assert summary[BATCH_ATTEMPTS].tolist() == [0]
+        m_main.assert_not_called()
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+def test_batch_of_two_scenarios(tmpdir):
+    pytest.importorskip("highspy")
+    path_input, path_output = str(tmpdir.mkdir("in")), str(tmpdir.join("out"))
+    for name in ("scenario_a", "scenario_b"):
+        shutil.copytree(
+            os.path.join(TEST_REPO_PATH, INPUT_FOLDER),
+            os.path.join(path_input, name),
+        )
+    summary = batch.run_batch(path_input, path_output, n_workers=2, solver="highs")
+    assert summary[JOB_STATUS].tolist() == [JOB_DONE, JOB_DONE]
+    assert summary[OBJECTIVE_VALUE].iloc[0] == pytest.approx(
+        summary[OBJECTIVE_VALUE].iloc[1]
+    )
@@ -0,0 +1,416 @@
+"""
+In this module the computation time of some functions of the MVS is compared to the one of their
+previous implementation, on the inputs of the benchmark tests
+
+The tests make sure that the new implementations return the same results as the previous ones and
+that they are faster.
+"""
+
+import copy
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import timeit
+
+import mock
+import numpy as np
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.A1_csv_to_json as A1
+import multi_vector_simulator.B0_data_input_json as B0
+import multi_vector_simulator.C0_data_processing as C0
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.E0_evaluation as E0
+from multi_vector_simulator.F0_output import store_as_json
+from multi_vector_simulator.utils import data_parser
+
+from _constants import (
+    EXECUTE_TESTS_ON,
+    TESTS_ON_MASTER,
+    TEST_REPO_PATH,
+    BENCHMARK_TEST_INPUT_FOLDER,
+    BENCHMARK_TEST_OUTPUT_FOLDER,
+    CSV_ELEMENTS,
+    CSV_FNAME,
+    DATA_TYPE_JSON_KEY,
+    TYPE_DATAFRAME,
+    TYPE_DATETIMEINDEX,
+    TYPE_SERIES,
+    TYPE_NDARRAY,
+    TYPE_TIMESTAMP,
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    TIMESERIES,
+    VALUE,
+    DATA,
+    KPI,
+    KPI_SCALARS_DICT,
+    COST_TOTAL,
+    LCOeleq,
+    TYPICAL_PERIODS,
+)
+
+TEST_INPUT_PATH = os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER)
+TEST_OUTPUT_PATH = os.path.join(
+    TEST_REPO_PATH, BENCHMARK_TEST_OUTPUT_FOLDER, "performance"
+)
+
+
+def process_benchmark_input(use_case):
+    """Return the dict_values of a benchmark input after processing by C0, None if it fails"""
+    path_input_folder = os.path.join(TEST_OUTPUT_PATH, use_case, "inputs")
+    shutil.copytree(os.path.join(TEST_INPUT_PATH, use_case), path_input_folder)
+    A1.create_input_json(os.path.join(path_input_folder, CSV_ELEMENTS), pass_back=False)
+    dict_values = B0.load_json(
+        os.path.join(path_input_folder, CSV_ELEMENTS, CSV_FNAME),
+        path_input_folder=path_input_folder,
+        path_output_folder=os.path.join(TEST_OUTPUT_PATH, use_case),
+        flag_missing_values=False,
+        set_default_values=True,
+    )
+    try:
+        C0.all(dict_values)
+    except ValueError:
+        # some benchmark inputs are meant to fail during the processing
+        dict_values = None
+    return dict_values
+
+
+def processed_benchmark_inputs():
+    """Return the json of each benchmark input after processing by C0, as stored to file by F0"""
+    answer = {}
+    for use_case in sorted(os.listdir(TEST_INPUT_PATH)):
+        if (
+            os.path.isdir(os.path.join(TEST_INPUT_PATH, use_case, CSV_ELEMENTS))
+            is False
+        ):
+            continue
+        dict_values = process_benchmark_input(use_case)
+        if dict_values is None:
+            continue
+        # add the timeseries of a simulation result for each bus
+        time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+        dict_values["optimizedFlows"] = pd.DataFrame(
+            np.random.rand(len(time_index), 10), index=time_index
+        )
+        answer[use_case] = store_as_json(dict_values)
+    return answer
+
+
+def legacy_convert_from_json_to_special_types(a_dict, prev_key=None, time_index=None):
+    """Previous implementation of B0.convert_from_json_to_special_types"""
+    answer = a_dict
+    if isinstance(a_dict, dict):
+        if DATA_TYPE_JSON_KEY not in a_dict:
+            answer = {}
+            for k in a_dict:
+                answer[k] = legacy_convert_from_json_to_special_types(
+                    a_dict[k], prev_key=k, time_index=time_index
+                )
+        elif prev_key == data_parser.MAP_MVS_EPA[TIMESERIES]:
+            answer = pd.Series(a_dict[DATA])
+            if time_index is not None and len(answer.index) == len(time_index):
+                answer.index = time_index
+        else:
+            data_type = a_dict.pop(DATA_TYPE_JSON_KEY)
+            if TYPE_DATAFRAME in data_type:
+                a_dict = json.dumps(a_dict)
+                answer = pd.read_json(a_dict, orient="split")
+            elif TYPE_DATETIMEINDEX in data_type:
+                if time_index is not None:
+                    answer = time_index
+                else:
+                    answer = pd.DatetimeIndex(a_dict.get(VALUE, []))
+                answer.freq = answer.inferred_freq
+            elif TYPE_SERIES in data_type:
+                name = a_dict.get("name", None)
+                answer = pd.Series(a_dict[VALUE])
+                if time_index is not None and len(answer.index) == len(time_index):
+                    answer.index = time_index
+                if isinstance(name, list):
+                    name[0] = tuple(name[0])
+                    name = tuple(name)
+                if name is not None:
+                    answer.name = name
+            elif TYPE_TIMESTAMP in data_type:
+                answer = pd.Timestamp(a_dict[VALUE])
+            elif TYPE_NDARRAY in data_type:
+                answer = np.array(a_dict[VALUE])
+    return answer
+
+
+def assert_same_special_types(value, reference, path=()):
+    if isinstance(reference, dict):
+        assert set(value.keys()) == set(reference.keys()), f"Keys differ at {path}"
+        for k in reference:
+            assert_same_special_types(value[k], reference[k], path + (k,))
+    elif isinstance(reference, pd.DataFrame):
+        pd.testing.assert_frame_equal(value, reference, check_dtype=False)
+    elif isinstance(reference, pd.Series):
+        pd.testing.assert_series_equal(value, reference)
+    elif isinstance(reference, (pd.Index, np.ndarray)):
+        assert (value == reference).all(), f"Values differ at {path}"
+    else:
+        assert value == reference or (
+            value != value and reference != reference
+        ), f"Values differ at {path}"
+
+
+def decode(convert_function, json_values):
+    dict_values = json.loads(json_values)
+    dict_values[SIMULATION_SETTINGS] = convert_function(
+        dict_values[SIMULATION_SETTINGS]
+    )
+    return convert_function(
+        dict_values, time_index=dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    )
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+class TestJsonDecoding:
+    def setup_class(self):
+        logging.disable(logging.ERROR)
+        if os.path.exists(TEST_OUTPUT_PATH):
+            shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+        self.json_inputs = processed_benchmark_inputs()
+        logging.disable(logging.NOTSET)
+
+    def teardown_class(self):
+        if os.path.exists(TEST_OUTPUT_PATH):
+            shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+    def test_decoding_same_as_legacy_implementation(self):
+        for use_case, json_values in self.json_inputs.items():
+            assert_same_special_types(
+                decode(B0.convert_from_json_to_special_types, json_values),
+                decode(legacy_convert_from_json_to_special_types, json_values),
+                path=(use_case,),
+            )
+
+    def test_decoding_faster_than_legacy_implementation(self):
+        durations = {}
+        for convert_function in (
+            legacy_convert_from_json_to_special_types,
+            B0.convert_from_json_to_special_types,
+        ):
+            durations[convert_function.__name__] = min(
+                timeit.repeat(
+                    lambda: [
+                        decode(convert_function, json_values)
+                        for json_values in self.json_inputs.values()
+                    ],
+                    number=1,
+                    repeat=3,
+                )
+            )
+        print(f"Decoding time of the benchmark inputs [s]: {durations}")
+        assert (
+            durations["convert_from_json_to_special_types"]
+            < durations["legacy_convert_from_json_to_special_types"]
+        )
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+class TestTypicalPeriods:
+    # benchmark inputs simulated over a year with hourly timesteps
+    use_cases = ("AE_grid_battery_peak_pricing", "Economic_KPI_C2_E2")
+    typical_periods = 16
+    # maximal relative deviation of the KPI computed with typical periods
+    tolerance = 0.01
+
+    def setup_class(self):
+        logging.disable(logging.ERROR)
+        if os.path.exists(TEST_OUTPUT_PATH):
+            shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+        self.durations = {}
+        self.kpis = {}
+        for use_case in self.use_cases:
+            dict_values = process_benchmark_input(use_case)
+            for typical_periods in (None, self.typical_periods):
+                simulated_values = copy.deepcopy(dict_values)
+                if typical_periods is not None:
+                    simulated_values[SIMULATION_SETTINGS][TYPICAL_PERIODS] = {
+                        VALUE: typical_periods
+                    }
+                start = timeit.default_timer()
+                results_meta, results_main = D0.run_oemof(simulated_values)
+                self.durations[use_case, typical_periods] = (
+                    timeit.default_timer() - start
+                )
+                E0.evaluate_dict(simulated_values, results_main, results_meta)
+                self.kpis[use_case, typical_periods] = simulated_values[KPI][
+                    KPI_SCALARS_DICT
+                ]
+        logging.disable(logging.NOTSET)
+
+    def teardown_class(self):
+        if os.path.exists(TEST_OUTPUT_PATH):
+            shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+    def test_typical_periods_kpi_close_to_full_simulation(self):
+        for use_case in self.use_cases:
+            for kpi in (COST_TOTAL, LCOeleq):
+                assert self.kpis[use_case, self.typical_periods][kpi] == pytest.approx(
+                    self.kpis[use_case, None][kpi], rel=self.tolerance
+                ), f"The {kpi} of {use_case} with {self.typical_periods} typical periods deviates from the full simulation."
+
+    def test_typical_periods_faster_than_full_simulation(self):
+        print(
+            f"Modelling and optimization time of the benchmark inputs [s]: {self.durations}"
+        )
+        for use_case in self.use_cases:
+            assert (
+                self.durations[use_case, self.typical_periods]
+                < self.durations[use_case, None]
+            )
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+class TestEpaConversion:
+    def setup_class(self):
+        with open(os.path.join(TEST_INPUT_PATH, "epa_benchmark.json")) as json_file:
+            self.epa_dict = json.load(json_file)
+
+    def convert_epa_params_to_mvs(self, legacy=False):
+        """Convert the EPA benchmark input, with the deepcopy of the previous implementation"""
+        logging.disable(logging.WARNING)
+        try:
+            if legacy is True:
+                with mock.patch.object(
+                    data_parser, "copy_nested_dicts", side_effect=copy.deepcopy
+                ):
+                    return data_parser.convert_epa_params_to_mvs(self.epa_dict)
+            return data_parser.convert_epa_params_to_mvs(self.epa_dict)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_epa_to_mvs_same_as_legacy_implementation(self):
+        assert self.convert_epa_params_to_mvs() == self.convert_epa_params_to_mvs(
+            legacy=True
+        )
+
+    def test_epa_to_mvs_input_not_modified(self):
+        reference = copy.deepcopy(self.epa_dict)
+        dict_values = self.convert_epa_params_to_mvs()
+        B0.convert_from_json_to_special_types(dict_values)
+        assert self.epa_dict == reference
+
+    def test_epa_to_mvs_faster_than_legacy_implementation(self):
+        durations = {}
+        for legacy in (True, False):
+            durations["legacy" if legacy else "new"] = min(
+                timeit.repeat(
+                    lambda: self.convert_epa_params_to_mvs(legacy=legacy),
+                    number=10,
+                    repeat=5,
+                )
+            )
+        print(f"Conversion time of the EPA benchmark input to MVS [s]: {durations}")
+        assert durations["new"] < durations["legacy"]
+
+
+# Packages only needed for the png figures (F1) and the report (F2)
+PLOTTING_AND_REPORT_MODULES = (
+    "multi_vector_simulator.F1_plotting",
+    "multi_vector_simulator.F2_autoreport",
+    "plotly",
+    "graphviz",
+    "dash",
+    "folium",
+    "reverse_geocoder",
+    "staticmap",
+    "pyppeteer",
+)
+
+
+def get_import_times(statement, top_level_only=False):
+    """Return the cumulative import time in us of each module imported by the statement
+
+    The statement is executed in a new interpreter with `python -X importtime`. With
+    top_level_only, the modules imported by other modules are left out, so that the sum of the
+    import times is the total import time of the statement.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            # the nested imports are indented
+            if top_level_only and module.startswith("  "):
+                continue
+            if cumulative.strip().isdigit():
+                import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+class TestImportTime:
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "multi_vector_simulator.cli",
+            "multi_vector_simulator.server",
+            "multi_vector_simulator.F0_output",
+        ],
+    )
+    def test_plotting_and_report_packages_not_imported(self, module):
+        import_times = get_import_times(f"import {module}")
+        assert module in import_times
+        imported = [
+            name
+            for name in import_times
+            for heavy_module in PLOTTING_AND_REPORT_MODULES
+            if name == heavy_module or name.startswith(heavy_module + ".")
+        ]
+        assert imported == []
+
+    @pytest.mark.skipif(
+        EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+        reason="Benchmark test deactivated, set env variable "
+        "EXECUTE_TESTS_ON to 'master' to run this test",
+    )
+    def test_cli_import_faster_than_with_plotting(self):
+        cli_import_time = min(
+            sum(
+                get_import_times(
+                    "import multi_vector_simulator.cli", top_level_only=True
+                ).values()
+            )
+            for _ in range(3)
+        )
+        # the plotting module was imported by F0 and therefore by the cli before
+        cli_with_plots_import_time = min(
+            sum(
+                get_import_times(
+                    "import multi_vector_simulator.F1_plotting; "
+                    "import multi_vector_simulator.cli",
+                    top_level_only=True,
+                ).values()
+            )
+            for _ in range(3)
+        )
+        logging.info(
+            f"Import of the cli: {cli_import_time / 1e6:.2f} s, with the plotting "
+            f"module: {cli_with_plots_import_time / 1e6:.2f} s"
+        )
+        assert cli_import_time < cli_with_plots_import_time
@@ -6,11 +6,80 @@ What should differ between the different functions is the input file
 """
 
 import os
+import mock
+import pytest
 from multi_vector_simulator.utils import analysis
+from multi_vector_simulator.utils.constants import WARM_STARTED, SOLVE_TIME
 
 from _constants import TEST_REPO_PATH, REPO_PATH
 
 
+class TestSingleParamVariationAnalysis:
+    def setup_method(self):
+        self.json_input = {"a": {"b": {"value": 0}}}
+        self.param_values = [1, 2, 3]
+
+    @mock.patch(
+        "multi_vector_simulator.utils.analysis.run_simulation",
+        side_effect=lambda dct, **kwargs: dct,
+    )
+    def test_outputs_ordered_as_param_values(self, m_args):
+        res = analysis.single_param_variation_analysis(
+            self.param_values,
+            self.json_input,
+            ("a", "b"),
+            json_path_to_output_value=(("a", "b", "value"),),
+        )
+        assert [out[("a", "b", "value")] for out in res["outputs"]] == self.param_values
+        assert res["errors"] == [None, None, None]
+
+    def test_failing_steps_do_not_abort_sweep(self):
+        # the input is not a valid mvs input, therefore each simulation step should fail
+        res = analysis.single_param_variation_analysis(
+            self.param_values, self.json_input, ("a", "b"), n_workers=2
+        )
+        assert res["parameters"] == self.param_values
+        assert res["outputs"] == [None, None, None]
+        assert len(res["errors"]) == len(self.param_values)
+        assert all(isinstance(err, str) for err in res["errors"])
+
+    def test_solution_store_passed_between_steps(self):
+        stores = []
+
+        def fake_simulation(dct, solution_store=None, **kwargs):
+            stores.append(solution_store)
+            solution_store[WARM_STARTED] = len(stores) > 1
+            solution_store[SOLVE_TIME] = 1.0 if len(stores) == 1 else 0.25
+            return dct
+
+        with mock.patch(
+            "multi_vector_simulator.utils.analysis.run_simulation",
+            side_effect=fake_simulation,
+        ):
+            res = analysis.single_param_variation_analysis(
+                self.param_values, self.json_input, ("a", "b"), warm_start=True
+            )
+        assert all(store is stores[0] for store in stores)
+        assert res["solve_times"] == [1.0, 0.25, 0.25]
+        assert res["warm_started"] == [False, True, True]
+        assert res["solve_time_reduction"] == pytest.approx(0.75)
+
+    @mock.patch(
+        "multi_vector_simulator.utils.analysis.run_simulation",
+        side_effect=lambda dct, **kwargs: dct,
+    )
+    def test_no_solution_store_without_warm_start(self, m_args):
+        res = analysis.single_param_variation_analysis(
+            self.param_values, self.json_input, ("a", "b")
+        )
+        assert "solution_store" not in m_args.call_args[1]
+        assert "solve_times" not in res
+
+    def test_solve_time_reduction_without_warm_started_steps(self):
+        assert analysis.get_solve_time_reduction([1.0, None], [False, False]) is None
+        assert analysis.get_solve_time_reduction([None, 0.5], [False, True]) is None
+
+
 if __name__ == "__main__":
     print(
         analysis.single_param_variation_analysis(
@@ -0,0 +1,294 @@
+import asyncio
+import json
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import mock
+import pytest
+
+import multi_vector_simulator.server as server
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+from multi_vector_simulator.utils.constants import (
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_FAILED,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    VALUE,
+    UNIT,
+    LABEL,
+    KPI,
+    KPI_SCALARS_DICT,
+    ENERGY_PRODUCTION,
+    MAXIMUM_CAP,
+)
+from multi_vector_simulator.utils.data_parser import (
+    convert_epa_params_to_mvs,
+    get_output_groups,
+    select_output_sections,
+)
+
+from _constants import (
+    EXECUTE_TESTS_ON,
+    TESTS_ON_MASTER,
+    TEST_REPO_PATH,
+    BENCHMARK_TEST_INPUT_FOLDER,
+)
+
+
+SIMULATIONS_CAN_END = threading.Event()
+SIMULATIONS_CAN_END.set()
+
+
+def fake_simulation(json_dict, progress=None, **kwargs):
+    """Report the stages of a simulation and return the input, fail if the input asks for it"""
+    for stage in server.SIMULATION_STAGES:
+        progress(stage, STAGE_STARTED)
+        if stage == json_dict.get("fail_at"):
+            progress(stage, STAGE_FAILED)
+            raise ValueError(f"The simulation failed at {stage}")
+        SIMULATIONS_CAN_END.wait(5)
+        progress(stage, STAGE_FINISHED)
+    return {"input": json_dict, "kwargs": kwargs}
+
+
+async def collect_events(job):
+    return [event for event in [e async for e in job.events()]]
+
+
+@mock.patch.object(server, "run_simulation", side_effect=fake_simulation)
+class TestSubmitSimulation:
+    def test_result_and_events_of_simulation(self, m_run):
+        async def submit():
+            job = server.submit_simulation({"a": 1}, use_cache=False)
+            events = await collect_events(job)
+            return job, events, await job.result()
+
+        job, events, result = asyncio.run(submit())
+        assert result["input"] == {"a": 1}
+        # the logging handlers are not redefined by default
+        assert result["kwargs"] == {"use_cache": False, "setup_logging": False}
+        assert events == [
+            (stage, status)
+            for stage in server.SIMULATION_STAGES
+            for status in (STAGE_STARTED, STAGE_FINISHED)
+        ]
+        assert job.progress == 1.0
+        assert job.stage == server.SIMULATION_STAGES[-1]
+
+    def test_events_of_finished_job(self, m_run):
+        async def submit():
+            job = server.submit_simulation({})
+            await job.result()
+            return await collect_events(job)
+
+        assert len(asyncio.run(submit())) == 2 * len(server.SIMULATION_STAGES)
+
+    def test_exception_of_failing_simulation(self, m_run):
+        async def submit():
+            job = server.submit_simulation({"fail_at": "D0_modelling_and_optimization"})
+            events = await collect_events(job)
+            with pytest.raises(ValueError):
+                await job.result()
+            return job, events
+
+        job, events = asyncio.run(submit())
+        assert events[-1] == ("D0_modelling_and_optimization", STAGE_FAILED)
+        assert job.stage == "D0_modelling_and_optimization"
+        assert job.progress == 2 / len(server.SIMULATION_STAGES)
+
+    def test_simulations_do_not_block_event_loop(self, m_run):
+        async def submit():
+            SIMULATIONS_CAN_END.clear()
+            try:
+                jobs = [server.submit_simulation({}) for _ in range(3)]
+                # the event loop is free while the simulations run
+                await asyncio.sleep(0.1)
+                running = [job.done() for job in jobs]
+            finally:
+                SIMULATIONS_CAN_END.set()
+            await asyncio.gather(*[job.result() for job in jobs])
+            return running, jobs
+
+        running, jobs = asyncio.run(submit())
+        assert running == [False, False, False]
+        assert all(job.progress == 1.0 for job in jobs)
+
+    def test_submit_outside_event_loop_raises(self, m_run):
+        with pytest.raises(RuntimeError):
+            server.submit_simulation({})
+
+
+def test_run_simulation_not_profiled_by_default():
+    pytest.importorskip("highspy")
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        dict_values = convert_epa_params_to_mvs(json.load(json_file))
+    dict_values[SIMULATION_SETTINGS]["solver"] = {VALUE: "highs", UNIT: "str"}
+    events = []
+    with mock.patch.object(server, "Profiler") as m_profiler:
+        server.run_simulation(
+            dict_values,
+            use_cache=False,
+            progress=lambda stage, status: events.append((stage, status)),
+        )
+    # no thread sampling the memory use is started for the stages
+    m_profiler.assert_not_called()
+    assert [stage for stage, status in events if status == STAGE_FINISHED] == list(
+        server.SIMULATION_STAGES
+    )
+
+
+def test_submit_two_simulations_in_threads():
+    pytest.importorskip("highspy")
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        dict_values = convert_epa_params_to_mvs(json.load(json_file))
+    dict_values[SIMULATION_SETTINGS]["solver"] = {VALUE: "highs", UNIT: "str"}
+    # C0 warns that the maximumCap of zero is disregarded
+    dict_values_with_warning = json.loads(json.dumps(dict_values))
+    dict_values_with_warning[ENERGY_PRODUCTION]["pv_plant_01"][MAXIMUM_CAP] = {
+        VALUE: 0,
+        UNIT: "kWp",
+    }
+
+    warnings_filters_during_solve = []
+    solve_directly = D0.model_building.solve_directly
+
+    def spy_solve_directly(*args, **kwargs):
+        warnings_filters_during_solve.append(list(warnings.filters))
+        return solve_directly(*args, **kwargs)
+
+    async def submit():
+        jobs = [
+            server.submit_simulation(json_dict, use_cache=False)
+            for json_dict in (dict_values, dict_values_with_warning, dict_values)
+        ]
+        return await asyncio.gather(*[job.result() for job in jobs])
+
+    warnings_filters = list(warnings.filters)
+    with mock.patch.object(
+        D0.model_building, "solve_directly", side_effect=spy_solve_directly
+    ):
+        results = asyncio.run(submit())
+    assert results[0] == results[2]
+    assert len(warnings_filters_during_solve) == 3
+    # the warnings of the other simulations are not turned into errors during a solve
+    for filters in warnings_filters_during_solve:
+        assert filters == warnings_filters
+    assert warnings.filters == warnings_filters
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_submit_epa_benchmark(use_processes):
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        dict_values = convert_epa_params_to_mvs(json.load(json_file))
+    dict_values[SIMULATION_SETTINGS]["solver"] = {VALUE: "highs", UNIT: "str"}
+
+    async def submit(executor):
+        jobs = [
+            server.submit_simulation(dict_values, executor=executor, use_cache=False)
+            for _ in range(2)
+        ]
+        events = await asyncio.gather(*[collect_events(job) for job in jobs])
+        results = await asyncio.gather(*[job.result() for job in jobs])
+        return events, results
+
+    if use_processes is True:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            events, results = asyncio.run(submit(executor))
+    else:
+        events, results = asyncio.run(submit(None))
+    for job_events in events:
+        assert [stage for stage, status in job_events if status == STAGE_FINISHED] == (
+            list(server.SIMULATION_STAGES)
+        )
+    assert results[0] == results[1]
+
+
+class TestOutputSections:
+    def setup_method(self):
+        self.epa_dict = {
+            "kpi": {"scalars": {"costs": 1.0}, "cost_matrix": {"pv": {"costs": 1.0}}},
+            "energy_production": [
+                {LABEL: "pv", "flow": {VALUE: [1.0, 2.0]}, "unit": "kW"},
+                {LABEL: "wind", "flow": {VALUE: [3.0, 4.0]}, "unit": "kW"},
+            ],
+            "raw_results": "{}",
+        }
+
+    def test_output_groups_of_sections(self):
+        assert get_output_groups(
+            [
+                ("kpi", "scalars"),
+                "raw_results",
+                ["energy_production", "pv", "flow"],
+                ("energy_production", "wind"),
+            ]
+        ) == {
+            KPI: {"scalars"},
+            "raw_results": None,
+            ENERGY_PRODUCTION: {"pv", "wind"},
+        }
+
+    def test_unknown_section_raises_value_error(self):
+        with pytest.raises(ValueError):
+            get_output_groups([("unknown_section", "scalars")])
+
+    def test_select_output_sections(self):
+        assert select_output_sections(
+            self.epa_dict,
+            [("kpi", "scalars"), ("energy_production", "wind", "flow")],
+        ) == {
+            "kpi": {"scalars": {"costs": 1.0}},
+            "energy_production": [{LABEL: "wind", "flow": {VALUE: [3.0, 4.0]}}],
+        }
+
+    def test_missing_path_raises_key_error(self):
+        with pytest.raises(KeyError):
+            select_output_sections(self.epa_dict, [("energy_production", "diesel")])
+        with pytest.raises(KeyError):
+            select_output_sections(self.epa_dict, [("kpi", "scalars", "co2")])
+
+    def test_stream_json_same_as_json_dumps(self):
+        value = dict(self.epa_dict, timeseries=[float(i) for i in range(25)])
+        chunks = list(server.stream_json(value, chunk_size=10))
+        assert json.loads("".join(chunks)) == value
+        # the long timeseries is split in chunks of at most 10 values
+        assert ", ".join(str(float(i)) for i in range(10)) in chunks
+        assert ", " + ", ".join(str(float(i)) for i in range(20, 25)) in chunks
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+def test_output_sections_of_epa_benchmark_same_as_full_results():
+    pytest.importorskip("highspy")
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        epa_json = json.load(json_file)
+    results = []
+    for kwargs in ({}, {"output_sections": [("kpi", "scalars"), "energy_production"]}):
+        dict_values = convert_epa_params_to_mvs(epa_json)
+        dict_values[SIMULATION_SETTINGS]["solver"] = {VALUE: "highs", UNIT: "str"}
+        results.append(server.run_simulation(dict_values, use_cache=False, **kwargs))
+    full_results, selected_results = results
+    assert selected_results == {
+        "kpi": {"scalars": full_results["kpi"]["scalars"]},
+        "energy_production": full_results["energy_production"],
+    }
@@ -1,8 +1,15 @@
+import json
+import logging
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import unittest
 
+import mock
+
 from _constants import TEST_REPO_PATH
 from multi_vector_simulator.utils import (
     nested_dict_crawler,
@@ -10,11 +17,36 @@ from multi_vector_simulator.utils import (
     get_nested_value,
 )
 from multi_vector_simulator.utils.helpers import find_value_by_key
+from multi_vector_simulator.utils.result_cache import ResultCache
+from multi_vector_simulator.utils.timeseries_store import TimeseriesStore
+from multi_vector_simulator.utils.profiling import Profiler, StageReporter
+from multi_vector_simulator.utils.log_capture import LogCapture, map_in_context
+from multi_vector_simulator.utils.constants import (
+    PROFILING_TRACE_FILE,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+    STAGE_FAILED,
+)
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
     LABEL,
     ENERGY_PROVIDERS,
     ENERGY_PRODUCTION,
+    SIMULATION_RESULTS,
+    PROFILING,
+    WALL_TIME,
+    CPU_TIME,
+    PEAK_RSS,
+    LOGS,
+    ERRORS,
+    WARNINGS,
+    LOG_RECORDS,
+    LOG_DROPPED,
+    LOG_LEVEL,
+    LOG_MESSAGE,
+    LOG_MODULE,
+    LOG_STAGE,
+    LOG_ASSET,
 )
 
 
@@ -139,3 +171,305 @@ class TestAccessKPIs(unittest.TestCase):
         dct = dict(a=dict(a1=1, a2=2), b=dict(b1=dict(b11=11, b12=dict(b121=121))))
         with self.assertRaises(KeyError):
             get_nested_value(dct, ("b", "b1", "b12", "b122"))
+
+
+class TestResultCache:
+    def setup_method(self):
+        self.folder = os.path.join(TEST_REPO_PATH, "result_cache")
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder)
+        self.dict_values = {
+            "asset": {"timeseries": pd.Series([1.0, 2.0, 3.0]), UNIT: "kW"}
+        }
+
+    def teardown_method(self):
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_key_independent_of_dict_order(self):
+        other_dict_values = {
+            "asset": {UNIT: "kW", "timeseries": pd.Series([1.0, 2.0, 3.0])}
+        }
+        assert ResultCache.key(self.dict_values) == ResultCache.key(other_dict_values)
+
+    def test_key_depends_on_timeseries_content(self):
+        other_dict_values = {
+            "asset": {"timeseries": pd.Series([1.0, 2.0, 4.0]), UNIT: "kW"}
+        }
+        assert ResultCache.key(self.dict_values) != ResultCache.key(other_dict_values)
+
+    def test_key_depends_on_options(self):
+        assert ResultCache.key(self.dict_values, verbatim=True) != ResultCache.key(
+            self.dict_values, verbatim=False
+        )
+
+    def test_get_returns_stored_results(self):
+        cache = ResultCache(folder=self.folder)
+        key = cache.key(self.dict_values)
+        assert cache.get(key) is None
+        cache.set(key, '{"kpi": 1}')
+        assert cache.get(key) == '{"kpi": 1}'
+
+    def test_least_recently_used_results_evicted(self):
+        json_values = '{"kpi": 1}'
+        cache = ResultCache(folder=self.folder, max_size=2 * len(json_values))
+        for key in ("first", "second"):
+            cache.set(key, json_values)
+        # make sure the first results are used more recently than the second ones
+        os.utime(cache.path("second"), (0, 0))
+        cache.get("first")
+        cache.set("third", json_values)
+        assert cache.get("second") is None
+        assert cache.get("first") == json_values
+        assert cache.get("third") == json_values
+
+
+class TestTimeseriesStore:
+    def setup_method(self):
+        self.folder = os.path.join(TEST_REPO_PATH, "timeseries_store")
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder)
+        os.makedirs(self.folder)
+        self.csv_path = os.path.join(self.folder, "demand.csv")
+        pd.DataFrame({"kW": [1.0, 2.0, 3.0], "count": [1, 2, 3]}).to_csv(
+            self.csv_path, index=False
+        )
+        self.store = TimeseriesStore(folder=os.path.join(self.folder, "store"))
+
+    def teardown_method(self):
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_csv_parsed_once(self):
+        data_set = self.store.read_csv(self.csv_path, sep=",")
+        with mock.patch.object(pd, "read_csv") as m_read_csv:
+            stored_data_set = self.store.read_csv(self.csv_path, sep=",")
+        m_read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(stored_data_set, data_set)
+        assert stored_data_set.columns.tolist() == ["kW", "count"]
+        assert stored_data_set["count"].tolist() == [1.0, 2.0, 3.0]
+
+    def test_values_memory_mapped_and_copy_on_write(self):
+        data_set = self.store.read_csv(self.csv_path, sep=",")
+        values = data_set["kW"].values
+        while not isinstance(values, np.memmap):
+            values = values.base
+        data_set.iloc[0, 0] = 10
+        assert self.store.read_csv(self.csv_path, sep=",").iloc[0, 0] == 1.0
+
+    def test_modified_csv_parsed_again(self):
+        self.store.read_csv(self.csv_path, sep=",")
+        pd.DataFrame({"kW": [4.0, 5.0]}).to_csv(self.csv_path, index=False)
+        os.utime(self.csv_path, ns=(0, 0))
+        assert self.store.read_csv(self.csv_path, sep=",")["kW"].tolist() == [4.0, 5.0]
+        # only the latest version of the file is kept
+        assert len(os.listdir(self.store.folder)) == 1
+
+    def test_key_depends_on_read_options(self):
+        assert self.store.key(self.csv_path, sep=",") != self.store.key(
+            self.csv_path, sep=";"
+        )
+
+    def test_non_numeric_csv_not_stored(self):
+        pd.DataFrame({"kW": [1.0, 2.0], "unit": ["a", "b"]}).to_csv(
+            self.csv_path, index=False
+        )
+        data_set = self.store.read_csv(self.csv_path, sep=",")
+        assert data_set["unit"].tolist() == ["a", "b"]
+        assert os.listdir(self.store.folder) == []
+
+
+class TestProfiler:
+    def setup_method(self):
+        self.folder = os.path.join(TEST_REPO_PATH, "profiling")
+        os.makedirs(self.folder, exist_ok=True)
+        self.profiler = Profiler()
+
+    def teardown_method(self):
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_stage_records_wall_time_cpu_time_and_peak_rss(self):
+        with self.profiler.stage("stage"):
+            sum(i * i for i in range(10**6))
+        measures = self.profiler.stages["stage"]
+        assert measures[WALL_TIME] > 0
+        assert measures[CPU_TIME] > 0
+        assert measures[PEAK_RSS] > 0
+
+    def test_stage_peak_rss_includes_temporary_memory(self):
+        with self.profiler.stage("small"):
+            pass
+        with self.profiler.stage("large"):
+            array = np.ones(50 * 1024**2)
+            del array
+        assert (
+            self.profiler.stages["large"][PEAK_RSS]
+            >= self.profiler.stages["small"][PEAK_RSS] + 300
+        ), f"The 400 MB array allocated within the stage should be part of its peak RSS."
+
+    def test_stage_as_decorator(self):
+        @self.profiler.stage("decorated")
+        def function():
+            return 1
+
+        assert function() == 1
+        assert "decorated" in self.profiler.stages
+
+    def test_stage_recorded_if_exception_raised(self):
+        try:
+            with self.profiler.stage("failing"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert "failing" in self.profiler.stages
+
+    def test_stage_reported_to_callback(self):
+        events = []
+        profiler = Profiler(callback=lambda name, status: events.append((name, status)))
+        with profiler.stage("first"):
+            pass
+        try:
+            with profiler.stage("failing"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert events == [
+            ("first", STAGE_STARTED),
+            ("first", STAGE_FINISHED),
+            ("failing", STAGE_STARTED),
+            ("failing", STAGE_FAILED),
+        ]
+
+    def test_add_to_dict_values(self):
+        with self.profiler.stage("stage"):
+            pass
+        dict_values = self.profiler.add_to_dict_values({})
+        assert dict_values[SIMULATION_RESULTS][LABEL] == SIMULATION_RESULTS
+        assert list(dict_values[SIMULATION_RESULTS][PROFILING]) == ["stage"]
+
+    def test_save_trace_chrome_trace_event_format(self):
+        for name in ("first", "second"):
+            with self.profiler.stage(name):
+                pass
+        file_path = self.profiler.save_trace(self.folder)
+        assert file_path == os.path.join(self.folder, PROFILING_TRACE_FILE)
+        with open(file_path) as fp:
+            trace = json.load(fp)
+        events = trace["traceEvents"]
+        assert [event["name"] for event in events] == ["first", "second"]
+        for event in events:
+            assert event["ph"] == "X"
+            assert event["dur"] >= 0
+        assert events[1]["ts"] >= events[0]["ts"]
+
+
+class TestStageReporter:
+    def test_stage_reported_to_callback_without_sampling_thread(self):
+        events = []
+        reporter = StageReporter(
+            callback=lambda name, status: events.append((name, status))
+        )
+        with mock.patch("threading.Thread") as m_thread:
+            with reporter.stage("first"):
+                pass
+            try:
+                with reporter.stage("failing"):
+                    raise ValueError
+            except ValueError:
+                pass
+        m_thread.assert_not_called()
+        assert events == [
+            ("first", STAGE_STARTED),
+            ("first", STAGE_FINISHED),
+            ("failing", STAGE_STARTED),
+            ("failing", STAGE_FAILED),
+        ]
+
+
+class TestLogCapture:
+    def setup_method(self):
+        self.logger = logging.getLogger("test_log_capture")
+        self.logger.setLevel(logging.DEBUG)
+
+    def test_warnings_and_errors_captured_within_context(self):
+        self.logger.warning("before")
+        with LogCapture() as log_capture:
+            self.logger.info("info")
+            self.logger.warning("a warning")
+            self.logger.error("an error")
+        self.logger.warning("after")
+        dict_values = log_capture.add_to_dict_values({})
+        logs = dict_values[SIMULATION_RESULTS][LOGS]
+        assert logs[WARNINGS] == {1: "a warning"}
+        assert logs[ERRORS] == {1: "an error"}
+        assert [record[LOG_LEVEL] for record in logs[LOG_RECORDS]] == [
+            "WARNING",
+            "ERROR",
+        ]
+        assert logs[LOG_RECORDS][0][LOG_MODULE] == "test_utils"
+        assert log_capture not in logging.getLogger().handlers
+
+    def test_messages_of_other_threads_ignored(self):
+        with LogCapture() as log_capture:
+            thread = threading.Thread(
+                target=self.logger.warning, args=("from another thread",)
+            )
+            thread.start()
+            thread.join()
+            self.logger.warning("from this thread")
+        assert [record[LOG_MESSAGE] for record in log_capture.records] == [
+            "from this thread"
+        ]
+
+    def test_messages_of_tasks_mapped_in_context_captured(self):
+        def log_warning(i):
+            self.logger.warning(f"from task {i}")
+            return i
+
+        with LogCapture() as log_capture:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                assert map_in_context(executor, log_warning, range(4)) == [0, 1, 2, 3]
+                # tasks submitted without the context are not captured
+                executor.submit(log_warning, 4).result()
+        assert sorted(record[LOG_MESSAGE] for record in log_capture.records) == [
+            f"from task {i}" for i in range(4)
+        ]
+
+    def test_messages_of_nested_captures(self):
+        with LogCapture() as outer_capture:
+            with LogCapture() as inner_capture:
+                self.logger.warning("inner")
+            self.logger.warning("outer")
+        assert [record[LOG_MESSAGE] for record in inner_capture.records] == ["inner"]
+        assert [record[LOG_MESSAGE] for record in outer_capture.records] == [
+            "inner",
+            "outer",
+        ]
+
+    def test_stage_and_asset_recorded(self):
+        log_capture = LogCapture()
+        log_capture.set_asset_labels(
+            {
+                ENERGY_PRODUCTION: {"pv": {LABEL: "pv"}, "pv plant": {}},
+                ENERGY_PROVIDERS: {"grid": {LABEL: "grid"}},
+            }
+        )
+        profiler = Profiler(callback=log_capture.set_stage)
+        with log_capture:
+            with profiler.stage("C0_data_processing"):
+                self.logger.warning("The asset pv plant has no capacity")
+            self.logger.warning("No asset", extra={LOG_ASSET: "grid"})
+        assert [
+            (record[LOG_STAGE], record[LOG_ASSET]) for record in log_capture.records
+        ] == [("C0_data_processing", "pv plant"), (None, "grid")]
+
+    def test_number_of_records_bounded_per_level(self):
+        with LogCapture(max_records=2) as log_capture:
+            for i in range(5):
+                self.logger.warning(f"warning {i}")
+            self.logger.error("an error")
+        logs = log_capture.add_to_dict_values({})[SIMULATION_RESULTS][LOGS]
+        assert logs[WARNINGS] == {1: "warning 0", 2: "warning 1"}
+        assert logs[ERRORS] == {1: "an error"}
+        assert logs[LOG_DROPPED] == 3
@@ -0,0 +1,224 @@
+import io
+import json
+import logging
+import os
+import warnings
+
+import mock
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.worker as W
+from multi_vector_simulator.utils.constants import (
+    WORKER_RUNNING_FOLDER,
+    WORKER_RESULTS_FOLDER,
+    JOB_ID,
+    JOB_INPUT,
+    JOB_OPTIONS,
+    JOB_STATUS,
+    JOB_RESULT,
+    JOB_ERROR,
+    JOB_DURATION,
+    JOB_DONE,
+    JOB_FAILED,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    VALUE,
+    UNIT,
+)
+
+from _constants import (
+    EXECUTE_TESTS_ON,
+    TESTS_ON_MASTER,
+    TEST_REPO_PATH,
+    BENCHMARK_TEST_INPUT_FOLDER,
+)
+
+
+def fake_simulation(json_input, **kwargs):
+    """Return the input as result, fail if the input asks for it"""
+    if json_input.get("fail", False) is True:
+        raise ValueError("The simulation failed")
+    print("printed during the simulation")
+    return {"input": json_input, "kwargs": kwargs}
+
+
+@mock.patch.object(W.server, "run_simulation", side_effect=fake_simulation)
+class TestRunJob:
+    def test_result_of_successful_job(self, m_run):
+        answer = W.run_job({JOB_ID: 1, JOB_INPUT: {"a": 1}})
+        assert answer[JOB_ID] == 1
+        assert answer[JOB_STATUS] == JOB_DONE
+        assert answer[JOB_RESULT]["input"] == {"a": 1}
+        assert answer[JOB_DURATION] >= 0
+
+    def test_options_passed_and_logging_not_redefined(self, m_run):
+        answer = W.run_job(
+            {
+                JOB_ID: 1,
+                JOB_INPUT: {},
+                JOB_OPTIONS: {"use_cache": False, "return_les": True},
+            }
+        )
+        assert answer[JOB_RESULT]["kwargs"] == {
+            "setup_logging": False,
+            "use_cache": False,
+        }
+
+    def test_error_returned_in_result(self, m_run):
+        answer = W.run_job({JOB_ID: "a", JOB_INPUT: {"fail": True}})
+        assert answer[JOB_STATUS] == JOB_FAILED
+        assert answer[JOB_ERROR] == "ValueError: The simulation failed"
+        assert JOB_RESULT not in answer
+
+    def test_missing_input_returned_as_error(self, m_run):
+        answer = W.run_job({JOB_ID: "a"})
+        assert answer[JOB_STATUS] == JOB_FAILED
+        m_run.assert_not_called()
+
+    def test_logging_handlers_restored_after_job(self, m_run):
+        log = logging.getLogger("")
+        handlers, level = list(log.handlers), log.level
+
+        def add_handler(json_input, **kwargs):
+            log.addHandler(logging.StreamHandler())
+            log.setLevel(logging.DEBUG)
+            return {}
+
+        m_run.side_effect = add_handler
+        W.run_job({JOB_ID: 1, JOB_INPUT: {}})
+        assert log.handlers == handlers
+        assert log.level == level
+
+    def test_warnings_filters_restored_after_failing_job(self, m_run):
+        warnings_filters = list(warnings.filters)
+
+        def turn_warnings_into_errors(json_input, **kwargs):
+            warnings.filterwarnings("error")
+            raise ValueError("The simulation failed")
+
+        m_run.side_effect = turn_warnings_into_errors
+        answer = W.run_job({JOB_ID: 1, JOB_INPUT: {}})
+        assert answer[JOB_STATUS] == JOB_FAILED
+        assert warnings.filters == warnings_filters
+
+    def test_prints_not_on_standard_output(self, m_run, capsys):
+        W.run_job({JOB_ID: 1, JOB_INPUT: {}})
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "printed during the simulation" in captured.err
+
+    def test_results_in_mvs_format_converted_to_json(self, m_run):
+        m_run.side_effect = lambda json_input, **kwargs: {
+            "timeseries": pd.Series([1.0, 2.0])
+        }
+        answer = W.run_job(
+            {JOB_ID: 1, JOB_INPUT: {}, JOB_OPTIONS: {"epa_format": False}}
+        )
+        json.dumps(answer)
+        assert answer[JOB_STATUS] == JOB_DONE
+
+
+@mock.patch.object(W.server, "run_simulation", side_effect=fake_simulation)
+class TestServeJsonLines:
+    def test_one_result_line_per_job(self, m_run):
+        jobs = [
+            {JOB_ID: 1, JOB_INPUT: {"a": 1}},
+            {JOB_ID: 2, JOB_INPUT: {"fail": True}},
+            {JOB_ID: 3, JOB_INPUT: {"a": 3}},
+        ]
+        output_stream = io.StringIO()
+        n_jobs = W.serve_json_lines(
+            io.StringIO("\n".join(json.dumps(job) for job in jobs) + "\n\n"),
+            output_stream,
+        )
+        answers = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        assert n_jobs == 3
+        assert [answer[JOB_ID] for answer in answers] == [1, 2, 3]
+        # a failing job does not stop the worker
+        assert [answer[JOB_STATUS] for answer in answers] == [
+            JOB_DONE,
+            JOB_FAILED,
+            JOB_DONE,
+        ]
+
+    def test_invalid_json_line(self, m_run):
+        output_stream = io.StringIO()
+        W.serve_json_lines(io.StringIO("not json\n"), output_stream)
+        answer = json.loads(output_stream.getvalue())
+        assert answer[JOB_STATUS] == JOB_FAILED
+        m_run.assert_not_called()
+
+
+@mock.patch.object(W.server, "run_simulation", side_effect=fake_simulation)
+class TestServeQueueFolder:
+    def test_results_saved_in_results_folder(self, m_run, tmpdir):
+        queue_folder = str(tmpdir)
+        for job_name, job in (
+            ("job_a", {JOB_ID: "a", JOB_INPUT: {"a": 1}}),
+            ("job_b", {JOB_INPUT: {"fail": True}}),
+        ):
+            with open(os.path.join(queue_folder, job_name + ".json"), "w") as fp:
+                json.dump(job, fp)
+        with open(os.path.join(queue_folder, "job_c.json.part"), "w") as fp:
+            fp.write("{")
+
+        n_jobs = W.serve_queue_folder(queue_folder, exit_when_empty=True)
+
+        assert n_jobs == 2
+        results_folder = os.path.join(queue_folder, WORKER_RESULTS_FOLDER)
+        assert sorted(os.listdir(results_folder)) == ["job_a.json", "job_b.json"]
+        with open(os.path.join(results_folder, "job_a.json")) as fp:
+            assert json.load(fp)[JOB_STATUS] == JOB_DONE
+        with open(os.path.join(results_folder, "job_b.json")) as fp:
+            answer = json.load(fp)
+        # the name of the job file is the id of jobs without id
+        assert answer[JOB_ID] == "job_b"
+        assert answer[JOB_STATUS] == JOB_FAILED
+        assert os.listdir(os.path.join(queue_folder, WORKER_RUNNING_FOLDER)) == []
+        # files which are not json files are not claimed
+        assert os.path.exists(os.path.join(queue_folder, "job_c.json.part"))
+
+    def test_claim_next_job_oldest_first(self, m_run, tmpdir):
+        queue_folder = str(tmpdir)
+        os.makedirs(os.path.join(queue_folder, WORKER_RUNNING_FOLDER))
+        for idx, job_name in enumerate(("job_b.json", "job_a.json")):
+            path_job = os.path.join(queue_folder, job_name)
+            with open(path_job, "w") as fp:
+                json.dump({}, fp)
+            os.utime(path_job, (idx, idx))
+        assert W.claim_next_job(queue_folder) == os.path.join(
+            queue_folder, WORKER_RUNNING_FOLDER, "job_b.json"
+        )
+        assert W.claim_next_job(queue_folder) == os.path.join(
+            queue_folder, WORKER_RUNNING_FOLDER, "job_a.json"
+        )
+        assert W.claim_next_job(queue_folder) is None
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+def test_worker_runs_epa_benchmark_twice():
+    pytest.importorskip("highspy")
+    from multi_vector_simulator.utils.data_parser import convert_epa_params_to_mvs
+
+    with open(
+        os.path.join(TEST_REPO_PATH, BENCHMARK_TEST_INPUT_FOLDER, "epa_benchmark.json")
+    ) as json_file:
+        dict_values = convert_epa_params_to_mvs(json.load(json_file))
+    dict_values[SIMULATION_SETTINGS]["solver"] = {VALUE: "highs", UNIT: "str"}
+    job = {JOB_INPUT: dict_values, JOB_OPTIONS: {"use_cache": False}}
+    output_stream = io.StringIO()
+    W.serve_json_lines(
+        io.StringIO(
+            json.dumps({JOB_ID: 1, **job}) + "\n" + json.dumps({JOB_ID: 2, **job})
+        ),
+        output_stream,
+    )
+    answers = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+    assert [answer[JOB_STATUS] for answer in answers] == [JOB_DONE, JOB_DONE]
+    assert answers[0][JOB_RESULT] == answers[1][JOB_RESULT]